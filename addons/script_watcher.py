@@ -24,6 +24,10 @@ import sys
 import time
 import importlib
 import traceback
+import contextlib
+import json
+import secrets
+import socket
 
 
 # ──────────────────────────────────────────────
@@ -39,10 +43,43 @@ _watcher_state = {
     "reload_count": 0,
     "debounce_mtime": 0.0,      # mtime captured during debounce
     "debounce_pending": False,   # whether a debounce is in progress
+    "fill_active": False,        # progressive build still filling the timeline
+    "fill_center": 1,            # frame the background fill grows outward from
+    "fill_remaining": 0,         # keys left to write
+    "fill_restore_preview": None,  # (scene name, preview range) to put back once filled
+    "free_queue": [],            # (bpy.data attribute, name) of the previous build, freed lazily
+    "build_memo": None,          # what the last build recorded for partial rebuilds
+    "built_mtimes": {},          # source mtimes as of the last successful build
+    "last_report": "",           # the last build's summary of what it rebuilt
+    "last_build_seconds": 0.0,   # wall time of the last reload
+    "control_server": None,      # listening socket of the control server
+    "control_clients": {},       # connected socket -> bytes received but not yet handled
+    "control_outbox": {},        # connected socket -> bytes not yet sent
+    "control_token": "",         # secret every control request must carry
+    "control_fill_sent": 0.0,    # when fill progress was last broadcast
 }
 
 POLL_INTERVAL = 1.0      # seconds between file checks
 DEBOUNCE_DELAY = 0.5     # seconds to wait after detecting a change before reloading
+FILL_INTERVAL = 0.05     # seconds between background fill steps
+FILL_TIME_BUDGET = 0.03  # seconds of keyframe writing per fill step
+FREE_INTERVAL = 0.1      # seconds between background teardown steps
+FREE_CHUNK = 200         # datablocks freed per teardown step
+
+# Datablock types a staged build retires and frees (collections are handled per scene)
+BUILD_DATA = (
+    "objects", "meshes", "curves", "materials", "worlds",
+    "lights", "cameras", "actions", "node_groups",
+)
+RETIRED_SUFFIX = "~prev"  # name suffix for the previous build while a new one is staged
+CONTROL_HOST = "127.0.0.1"  # the control server only ever listens on localhost
+CONTROL_INTERVAL = 0.1   # seconds between control socket polls
+CONTROL_PROGRESS_INTERVAL = 0.5  # seconds between fill progress events
+CONTROL_MAX_PENDING = 1 << 20    # bytes queued for a client that stopped reading before it's dropped
+# Where the control server writes its session token (readable by this user only)
+CONTROL_TOKEN_DIR = os.environ.get(
+    "SCRIPT_WATCHER_TOKEN_DIR", os.path.join(os.path.expanduser("~"), ".config", "script_watcher"),
+)
 
 
 # ──────────────────────────────────────────────
@@ -51,59 +88,64 @@ DEBOUNCE_DELAY = 0.5     # seconds to wait after detecting a change before reloa
 
 def reset_scene():
     """
-    Delete all scene contents without resetting the Blender session.
-    Preserves: UI layout, loaded addons, preferences.
-    Removes: all objects, meshes, materials, worlds, cameras, lights,
-             animation data, and orphaned data blocks.
+    Remove the previous build without resetting the Blender session.
+    Preserves: UI layout, loaded addons, preferences, and anything made by
+               hand outside the build collection.
+    Removes: everything the build owns, in one batch (the same teardown
+             as scripts.utils.scene.reset_scene()).
     """
-    # Deselect all, then select all and delete
-    if bpy.context.mode != 'OBJECT':
-        try:
-            bpy.ops.object.mode_set(mode='OBJECT')
-        except RuntimeError:
-            pass
-
-    # Remove all objects
-    for obj in bpy.data.objects:
-        bpy.data.objects.remove(obj, do_unlink=True)
-
-    # Remove all meshes
-    for mesh in bpy.data.meshes:
-        bpy.data.meshes.remove(mesh, do_unlink=True)
-
-    # Remove all curves
-    for curve in bpy.data.curves:
-        bpy.data.curves.remove(curve, do_unlink=True)
-
-    # Remove all materials
-    for mat in bpy.data.materials:
-        bpy.data.materials.remove(mat, do_unlink=True)
+    ownership = _project_module("scripts.utils.ownership")
+    if ownership is None:
+        print("⚠️  scripts.utils.ownership isn't importable — scene not cleared")
+        return
+    ownership.teardown_build()
 
-    # Remove all worlds
-    for world in bpy.data.worlds:
-        bpy.data.worlds.remove(world, do_unlink=True)
 
-    # Remove all lights
-    for light in bpy.data.lights:
-        bpy.data.lights.remove(light, do_unlink=True)
+# ──────────────────────────────────────────────
+# Core: Source Files
+# ──────────────────────────────────────────────
 
-    # Remove all cameras
-    for cam in bpy.data.cameras:
-        bpy.data.cameras.remove(cam, do_unlink=True)
+def find_project_root(filepath):
+    """Search upwards from a script for the directory holding scripts/ and addons/."""
+    curr = os.path.dirname(os.path.abspath(filepath))
+    while curr != os.path.dirname(curr):
+        if os.path.isdir(os.path.join(curr, "scripts")) and os.path.isdir(os.path.join(curr, "addons")):
+            return curr
+        curr = os.path.dirname(curr)
+    # Fallback to old 3-level-up logic
+    return os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(filepath))))
 
-    # Remove all actions (animation data)
-    for action in bpy.data.actions:
-        bpy.data.actions.remove(action, do_unlink=True)
 
-    # Remove all node groups
-    for ng in bpy.data.node_groups:
-        bpy.data.node_groups.remove(ng, do_unlink=True)
+def _source_mtimes(filepath):
+    """
+    mtimes of every file a reload depends on: the script, its sibling
+    modules (e.g. config.py, act1.py in a multi-file project) and
+    scripts/utils/*.py.
+    """
+    dirs = [
+        os.path.join(find_project_root(filepath), "scripts", "utils"),
+        os.path.dirname(os.path.abspath(filepath)),
+    ]
+    mtimes = {}
+    for directory in dirs:
+        if not os.path.isdir(directory):
+            continue
+        for f in os.listdir(directory):
+            if f.endswith('.py'):
+                path = os.path.join(directory, f)
+                try:
+                    mtimes[path] = os.path.getmtime(path)
+                except OSError:
+                    pass
+    return mtimes
 
-    # Purge any remaining orphaned data blocks
-    bpy.ops.outliner.orphans_purge(do_recursive=True)
 
-    # Reset frame to 1
-    bpy.context.scene.frame_set(1)
+def _changed_sources(filepath):
+    """Source files added, removed or modified since the last successful build."""
+    built = _watcher_state["built_mtimes"]
+    current = _source_mtimes(filepath)
+    return {path for path in built.keys() | current.keys()
+            if built.get(path) != current.get(path)}
 
 
 # ──────────────────────────────────────────────
@@ -136,29 +178,345 @@ def reload_project_modules(project_root):
             print(f"⚠️  Failed to reload {name}: {e}")
 
 
+# ──────────────────────────────────────────────
+# Core: Progressive Build
+# ──────────────────────────────────────────────
+
+def _project_module(name):
+    """A project module such as scripts.utils.keying, if importable."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def progressive_window(scene):
+    """
+    Frame window to build first: the pinned range, or the playhead ± radius.
+    Returns (start, end), or None when progressive builds are off.
+    """
+    props = getattr(scene, "script_watcher", None)
+    if props is None or not props.progressive:
+        return None
+    if props.pin_range:
+        start, end = sorted((props.pin_start, props.pin_end))
+    else:
+        start = scene.frame_current - props.window_radius
+        end = scene.frame_current + props.window_radius
+    return max(start, 1), max(end, 1)
+
+
+def cancel_progressive_fill():
+    """Stop filling the timeline and drop any keys still waiting."""
+    state = _watcher_state
+    keying = sys.modules.get("scripts.utils.keying")
+    if keying is not None:
+        keying.reset_key_gate()
+    state["fill_active"] = False
+    state["fill_remaining"] = 0
+
+
+def _start_progressive_fill(window, playhead, scene):
+    """Make the built window playable, then fill the rest in the background."""
+    state = _watcher_state
+    keying = sys.modules.get("scripts.utils.keying")
+
+    remaining = keying.pending_key_count() if keying is not None else 0
+    if remaining == 0:
+        scene.frame_set(playhead)
+        return
+
+    state["fill_restore_preview"] = (
+        scene.name, scene.use_preview_range, scene.frame_preview_start, scene.frame_preview_end,
+    )
+    scene.use_preview_range = True
+    scene.frame_preview_start, scene.frame_preview_end = window
+    scene.frame_set(min(max(playhead, window[0]), window[1]))
+
+    state["fill_active"] = True
+    state["fill_center"] = playhead
+    state["fill_remaining"] = remaining
+    print(f"⏩ Frames {window[0]}–{window[1]} ready — filling {remaining} keys in the background")
+    bpy.app.timers.register(_fill_timer, first_interval=FILL_INTERVAL)
+
+
+def _fill_timer():
+    """
+    Timer callback that writes deferred keys a few milliseconds at a time,
+    growing outward from the playhead so nearby frames fill in first.
+    """
+    state = _watcher_state
+    if not state["fill_active"]:
+        return None
+
+    keying = sys.modules.get("scripts.utils.keying")
+    if keying is None:
+        state["fill_active"] = False
+        return None
+
+    try:
+        remaining = keying.flush_pending_keys(
+            time_budget=FILL_TIME_BUDGET, center=state["fill_center"],
+        )
+    except Exception as e:
+        state["fill_active"] = False
+        state["last_error"] = f"Background fill failed: {e}"
+        print(f"\n❌ Background fill failed:\n{traceback.format_exc()}")
+        _broadcast({"event": "error", "error": state["last_error"]})
+        return None
+
+    state["fill_remaining"] = remaining
+    now = time.perf_counter()
+    if remaining and now - state["control_fill_sent"] >= CONTROL_PROGRESS_INTERVAL:
+        state["control_fill_sent"] = now
+        _broadcast({"event": "fill-progress", "remaining": remaining})
+    if remaining:
+        return FILL_INTERVAL
+
+    state["fill_active"] = False
+    restore = state["fill_restore_preview"]
+    if restore is not None:
+        scene = bpy.data.scenes.get(restore[0])
+        if scene is not None:
+            scene.use_preview_range = restore[1]
+            scene.frame_preview_start, scene.frame_preview_end = restore[2], restore[3]
+        state["fill_restore_preview"] = None
+    print("✅ Timeline fully built")
+    _broadcast({"event": "fill-finished"})
+    return None
+
+
+# ──────────────────────────────────────────────
+# Core: Staged Build
+# ──────────────────────────────────────────────
+
+def scene_only_blocks(scene, candidates):
+    """
+    The scene plus every candidate datablock that nothing outside them uses:
+    its collections and objects, then meshes, materials, actions and so on
+    reachable only from those. Data shared with another scene, or kept with
+    a fake user, stays out. Returns a set of datablocks.
+    """
+    blocks = {scene}
+    candidates = [block for block in candidates
+                  if block.library is None and not block.use_fake_user]
+    users = bpy.data.user_map(subset=candidates)
+    grew = True
+    while grew:
+        grew = False
+        for block, block_users in users.items():
+            if block not in blocks and block_users and block_users <= blocks:
+                blocks.add(block)
+                grew = True
+    return blocks
+
+
+def retire_build_data(scene):
+    """
+    Rename the scene and the build datablocks only it uses out of the way
+    with RETIRED_SUFFIX, so a new build can reuse the original names.
+    Once the scene has been built into, only what the build owns is retired
+    (scripts.utils.ownership); before that, the whole scene is, the same as
+    the first teardown. Returns a list of (bpy.data attribute, original
+    name, retired name), the scene first.
+    """
+    attrs = BUILD_DATA + ("collections",)
+    ownership = _project_module("scripts.utils.ownership")
+    if ownership is not None and any(ownership.is_owned(c) for c in scene.collection.children):
+        candidates = list(ownership.owned_blocks().values())
+    else:
+        candidates = [block for attr in attrs for block in getattr(bpy.data, attr)]
+    doomed = scene_only_blocks(scene, candidates)
+
+    retired = []
+    blocks = [("scenes", scene)]
+    blocks += [(attr, block) for attr in attrs for block in getattr(bpy.data, attr)
+               if block in doomed]
+    for attr, block in blocks:
+        original = block.name
+        block.name = original + RETIRED_SUFFIX
+        retired.append((attr, original, block.name))
+    return retired
+
+
+def restore_build_data(retired):
+    """Undo retire_build_data(): give retired datablocks their names back."""
+    for attr, original, name in retired:
+        block = getattr(bpy.data, attr).get(name)
+        if block is not None:
+            block.name = original
+
+
+def _build_window():
+    """The window a staged build swaps into, or None when there's no UI."""
+    if bpy.app.background:
+        # Background Blender still has a window manager with a window, but
+        # nothing is on screen to keep — build in place
+        return None
+    wm = bpy.context.window_manager
+    if wm is None or not wm.windows:
+        return None
+    return bpy.context.window or wm.windows[0]
+
+
+def begin_staged_build():
+    """
+    Create an empty scene to build into while the current one stays on screen.
+    Returns the staging info dict, or None when staging isn't possible
+    (background mode, no window) and the build should happen in place.
+    """
+    window = _build_window()
+    if window is None:
+        return None
+
+    # A previous teardown still running would collide with this one's names
+    finish_freeing()
+
+    old_scene = window.scene
+    retired = retire_build_data(old_scene)
+    new_scene = bpy.data.scenes.new(retired[0][1])
+
+    existing = {(attr, block.name) for attr in BUILD_DATA + ("collections",)
+                for block in getattr(bpy.data, attr)}
+    return {
+        "window": window,
+        "old_scene": old_scene.name,
+        "new_scene": new_scene.name,
+        "retired": retired,
+        "existing": existing,
+    }
+
+
+def staged_build_context(staging):
+    """
+    Context that points bpy.context (and bpy.ops) at the staging scene.
+
+    The window is left out: it still shows the old scene until the swap, and
+    operators run with a window whose scene isn't the overridden one crash
+    Blender while updating the view layer.
+    """
+    if staging is None:
+        return contextlib.nullcontext()
+    scene = bpy.data.scenes[staging["new_scene"]]
+    ownership = _project_module("scripts.utils.ownership")
+    collection = ownership.build_collection(scene) if ownership is not None else scene.collection
+    return bpy.context.temp_override(
+        scene=scene,
+        view_layer=scene.view_layers[0],
+        collection=collection,
+    )
+
+
+def commit_staged_build(staging):
+    """Swap the staged scene onto the screen and free the old one lazily."""
+    old_scene = bpy.data.scenes.get(staging["old_scene"])
+    new_scene = bpy.data.scenes[staging["new_scene"]]
+
+    if old_scene is not None:
+        # Carry the watcher settings across so the panel looks the same
+        for key in ScriptWatcherProperties.__annotations__:
+            setattr(new_scene.script_watcher, key, getattr(old_scene.script_watcher, key))
+        for window in bpy.context.window_manager.windows:
+            if window.scene == old_scene:
+                window.scene = new_scene
+
+        keep_unretired_data(old_scene, new_scene, staging["retired"])
+
+    # Scene first, so its objects are unused by the time they're freed
+    _watcher_state["free_queue"] = [
+        (attr, name) for attr, _, name in staging["retired"]
+    ]
+    bpy.app.timers.register(_free_timer, first_interval=FREE_INTERVAL)
+    return new_scene
+
+
+def keep_unretired_data(old_scene, new_scene, retired):
+    """
+    Link what the old scene holds besides the build (hand-made objects and
+    collections, a hand-made world) into the new scene, so freeing the old
+    scene doesn't take them with it.
+    """
+    retired = {(attr, name) for attr, _, name in retired}
+    for child in old_scene.collection.children:
+        if ("collections", child.name) not in retired and child.name not in new_scene.collection.children:
+            new_scene.collection.children.link(child)
+    for obj in old_scene.collection.objects:
+        if ("objects", obj.name) not in retired and obj.name not in new_scene.collection.objects:
+            new_scene.collection.objects.link(obj)
+    world = old_scene.world
+    if new_scene.world is None and world is not None and ("worlds", world.name) not in retired:
+        new_scene.world = world
+
+
+def abort_staged_build(staging):
+    """Throw away a failed staged build and put the old scene back as it was."""
+    created = []
+    for attr in BUILD_DATA + ("collections",):
+        for block in getattr(bpy.data, attr):
+            if (attr, block.name) not in staging["existing"]:
+                created.append(block)
+    new_scene = bpy.data.scenes.get(staging["new_scene"])
+    if new_scene is not None:
+        created.insert(0, new_scene)
+    if created:
+        bpy.data.batch_remove(created)
+    restore_build_data(staging["retired"])
+
+
+def _free_timer():
+    """Timer callback that frees the previous build a chunk at a time."""
+    queue = _watcher_state["free_queue"]
+    chunk, queue[:] = queue[:FREE_CHUNK], queue[FREE_CHUNK:]
+
+    blocks = [getattr(bpy.data, attr).get(name) for attr, name in chunk]
+    blocks = [block for block in blocks if block is not None]
+    if blocks:
+        bpy.data.batch_remove(blocks)
+    return FREE_INTERVAL if queue else None
+
+
+def finish_freeing():
+    """Free whatever is left of the previous build right now."""
+    if bpy.app.timers.is_registered(_free_timer):
+        bpy.app.timers.unregister(_free_timer)
+    while _watcher_state["free_queue"]:
+        _free_timer()
+
+
 # ──────────────────────────────────────────────
 # Core: Script Execution
 # ──────────────────────────────────────────────
 
-def execute_script(filepath):
+def _can_rebuild_partially(filepath, changed_files, props, filling):
+    """
+    True when the previous build is still on screen and only files it
+    declared as config have changed — the script may then rebuild in place.
+    """
+    memo = _watcher_state["build_memo"]
+    if not changed_files or props is None or not props.partial_rebuilds or filling:
+        return False
+    if not memo or memo.get("script") != filepath:
+        return False
+    if memo.get("scene") != bpy.context.scene.name:
+        return False
+    return changed_files <= set(memo.get("config_files", ()))
+
+
+def execute_script(filepath, changed_files=None, key_window=None):
     """
     Execute an animation script file inside Blender.
     Handles scene cleanup, module reloading, and error capture.
+
+    `changed_files` is the set of source files changed since the last build
+    (None forces a full rebuild). If they are all config files the last
+    build declared, the script is told it may rebuild only what they affect.
+    `key_window` builds that (start, end) range first, like a pinned
+    progressive build. Returns True if the script ran without errors.
     """
     state = _watcher_state
-
-    # Robustly find project root by searching upwards for 'scripts/' directory
-    curr = os.path.dirname(os.path.abspath(filepath))
-    project_root = None
-    while curr != os.path.dirname(curr):
-        if os.path.isdir(os.path.join(curr, "scripts")) and os.path.isdir(os.path.join(curr, "addons")):
-            project_root = curr
-            break
-        curr = os.path.dirname(curr)
-    
-    if project_root is None:
-        # Fallback to old 3-level-up logic
-        project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(filepath))))
+    started = time.perf_counter()
+    _broadcast({"event": "reload-started", "file": filepath})
+    project_root = find_project_root(filepath)
 
     # Ensure project root is in sys.path
     if project_root not in sys.path:
@@ -169,12 +527,49 @@ def execute_script(filepath):
     print(f"🔄 Reloading: {os.path.basename(filepath)}")
     print(f"{'='*50}")
 
-    reset_scene()
+    # Remember where the user was looking before reset_scene() rewinds it
+    playhead = bpy.context.scene.frame_current
+    window = key_window or progressive_window(bpy.context.scene)
+    props = getattr(bpy.context.scene, "script_watcher", None)
+
+    partial = _can_rebuild_partially(filepath, changed_files, props, state["fill_active"])
+    cancel_progressive_fill()
+
+    # A partial rebuild updates the scene on screen in place. Otherwise build
+    # into a fresh scene while the current one stays on screen, or clear and
+    # rebuild in place when there's no window to swap.
+    staging = None
+    if partial:
+        print("🧩 Only config changed — the script may rebuild in place")
+    else:
+        state["build_memo"] = {} if props is not None and props.partial_rebuilds else None
+        if props is not None and props.double_buffer:
+            staging = begin_staged_build()
+        if staging is None:
+            reset_scene()
 
     # Step 2: Reload project modules (pick up changes to utils)
     reload_project_modules(project_root)
 
+    # Hand the panel's build options to the script
+    build = _project_module("scripts.utils.build")
+    if build is not None:
+        build.set_build_overrides(
+            tier=props.build_tier if props is not None else None,
+            staged=staging is not None,
+            memo=state["build_memo"],
+            partial=partial,
+        )
+
+    if window is not None:
+        keying = _project_module("scripts.utils.keying")
+        if keying is None:
+            window = None
+        else:
+            keying.set_key_window(window, defer=True)
+
     # Step 3: Execute the script
+    original_cwd = os.getcwd()
     try:
         # Use exec with a clean globals dict that includes builtins
         script_globals = {
@@ -184,29 +579,67 @@ def execute_script(filepath):
         }
 
         # Set CWD to project root so relative paths work
-        original_cwd = os.getcwd()
         os.chdir(project_root)
 
         with open(filepath, 'r') as f:
             code = compile(f.read(), filepath, 'exec')
+        with staged_build_context(staging):
             exec(code, script_globals)
 
         os.chdir(original_cwd)
 
+        scene = bpy.context.scene
+        if staging is not None:
+            scene = commit_staged_build(staging)
+
         state["last_error"] = ""
         state["reload_count"] += 1
         state["last_reload"] = time.time()
+        state["built_mtimes"] = _source_mtimes(filepath)
+        state["last_build_seconds"] = time.perf_counter() - started
+        state["last_report"] = build.get_build_report() if build is not None else ""
+        if state["build_memo"] is not None:
+            state["build_memo"]["script"] = filepath
+            state["build_memo"]["scene"] = scene.name
         print(f"✅ Reload #{state['reload_count']} successful")
 
-        # Jump to frame 1 for preview
-        bpy.context.scene.frame_set(1)
+        if window is not None:
+            _start_progressive_fill(window, playhead, scene)
+        elif staging is not None:
+            # The swap keeps the viewer where they were
+            scene.frame_set(playhead)
+        else:
+            # Jump to frame 1 for preview
+            scene.frame_set(1)
 
     except Exception as e:
         os.chdir(original_cwd)
+        cancel_progressive_fill()
+        if staging is not None:
+            abort_staged_build(staging)
+            print("↩️  Kept the previous build on screen")
+        # Whatever the failed build recorded can't be trusted — rebuild fully next time
+        state["build_memo"] = None
+        state["last_report"] = ""
         error_msg = traceback.format_exc()
         state["last_error"] = str(e)
         print(f"\n❌ Script error:\n{error_msg}")
 
+    # Anything run outside the watcher (tests, the console) does a plain full build
+    if build is not None:
+        build.clear_build_overrides()
+
+    ok = not state["last_error"]
+    _broadcast({
+        "event": "reload-finished",
+        "ok": ok,
+        "seconds": round(time.perf_counter() - started, 3),
+        "report": state["last_report"],
+        "error": state["last_error"],
+        "filling": state["fill_active"],
+    })
+    return ok
+
 
 # ──────────────────────────────────────────────
 # Timer: File Watcher
@@ -232,42 +665,7 @@ def _watch_timer():
     except OSError:
         return POLL_INTERVAL
 
-    # Find project root robustly
-    curr = os.path.dirname(os.path.abspath(filepath))
-    project_root = None
-    while curr != os.path.dirname(curr):
-        if os.path.isdir(os.path.join(curr, "scripts")) and os.path.isdir(os.path.join(curr, "addons")):
-            project_root = curr
-            break
-        curr = os.path.dirname(curr)
-    if project_root is None:
-        project_root = os.path.dirname(os.path.dirname(os.path.dirname(filepath)))
-
-    # Check utils directory for changes
-    utils_dir = os.path.join(project_root, "scripts", "utils")
-    extra_mtime = 0.0
-    if os.path.isdir(utils_dir):
-        for f in os.listdir(utils_dir):
-            if f.endswith('.py'):
-                try:
-                    mt = os.path.getmtime(os.path.join(utils_dir, f))
-                    extra_mtime = max(extra_mtime, mt)
-                except OSError:
-                    pass
-
-    # Also check the script's own directory for sibling modules
-    # (e.g. config.py, characters.py, act1.py in a multi-file project)
-    script_dir = os.path.dirname(os.path.abspath(filepath))
-    if os.path.isdir(script_dir):
-        for f in os.listdir(script_dir):
-            if f.endswith('.py'):
-                try:
-                    mt = os.path.getmtime(os.path.join(script_dir, f))
-                    extra_mtime = max(extra_mtime, mt)
-                except OSError:
-                    pass
-
-    effective_mtime = max(current_mtime, extra_mtime)
+    effective_mtime = max(_source_mtimes(filepath).values(), default=current_mtime)
 
     if effective_mtime != state["last_mtime"]:
         if not state["debounce_pending"]:
@@ -280,7 +678,7 @@ def _watch_timer():
                 # File hasn't changed since debounce started — safe to reload
                 state["debounce_pending"] = False
                 state["last_mtime"] = effective_mtime
-                execute_script(filepath)
+                execute_script(filepath, changed_files=_changed_sources(filepath))
             else:
                 # File changed again during debounce — restart debounce
                 state["debounce_mtime"] = effective_mtime
@@ -289,6 +687,318 @@ def _watch_timer():
     return POLL_INTERVAL
 
 
+# ──────────────────────────────────────────────
+# Control Server
+# ──────────────────────────────────────────────
+#
+# An optional JSON-lines TCP server on localhost, so editors, git hooks and
+# CI can drive a running session (see addons/watch_ctl.py). Each request is
+# one JSON object per line, e.g. {"cmd": "set-frame", "frame": 120, "id": 1,
+# "token": "..."}; each gets one reply carrying the same "id" and "ok". Every
+# connected client also receives progress events ({"event": "reload-finished", ...}).
+#
+# Any local process (or web page) can reach a localhost port, so requests
+# must carry the session token, which is written to a file only this user
+# can read. A line that isn't a JSON object, or has the wrong token, closes
+# the connection. Commands only ever act on the script the watcher already
+# watches, and stills are only written under ./output.
+
+def control_token_path(port):
+    """File holding the control server's token for `port`."""
+    return os.path.join(CONTROL_TOKEN_DIR, f"control_{port}.token")
+
+
+def _write_control_token(port):
+    """Create a fresh session token and store it for this user only."""
+    token = secrets.token_hex(16)
+    os.makedirs(CONTROL_TOKEN_DIR, mode=0o700, exist_ok=True)
+    path = control_token_path(port)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(token)
+    os.chmod(path, 0o600)
+    return token
+
+
+def start_control_server(port):
+    """Listen for control commands on localhost:port."""
+    stop_control_server()
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    try:
+        server.bind((CONTROL_HOST, port))
+    except OSError:
+        server.close()
+        raise
+    server.listen(4)
+    server.setblocking(False)
+    port = server.getsockname()[1]
+    _watcher_state["control_server"] = server
+    _watcher_state["control_token"] = _write_control_token(port)
+    if not bpy.app.timers.is_registered(_control_timer):
+        bpy.app.timers.register(_control_timer, first_interval=CONTROL_INTERVAL)
+    print(f"🔌 Control server listening on {CONTROL_HOST}:{port} "
+          f"(token in {control_token_path(port)})")
+    return port
+
+
+def stop_control_server():
+    """Close the control server and every client connection."""
+    state = _watcher_state
+    for client in list(state["control_clients"]):
+        client.close()
+    state["control_clients"] = {}
+    state["control_outbox"] = {}
+    if state["control_server"] is not None:
+        with contextlib.suppress(OSError):
+            os.remove(control_token_path(state["control_server"].getsockname()[1]))
+        state["control_server"].close()
+        state["control_server"] = None
+    state["control_token"] = ""
+    if bpy.app.timers.is_registered(_control_timer):
+        bpy.app.timers.unregister(_control_timer)
+
+
+def _drop_client(client):
+    state = _watcher_state
+    state["control_clients"].pop(client, None)
+    state["control_outbox"].pop(client, None)
+    client.close()
+
+
+def _flush(client):
+    """Send as much of the client's queued output as it will take right now."""
+    outbox = _watcher_state["control_outbox"]
+    pending = outbox.get(client)
+    if not pending:
+        return
+    try:
+        sent = client.send(pending)
+    except (BlockingIOError, InterruptedError):
+        sent = 0
+    except OSError:
+        _drop_client(client)
+        return
+    outbox[client] = pending[sent:]
+    if len(outbox[client]) > CONTROL_MAX_PENDING:
+        # The client stopped reading; don't let it hold messages forever
+        _drop_client(client)
+
+
+def _send(client, message):
+    """Queue one JSON line for a client and send what fits without blocking."""
+    if client not in _watcher_state["control_clients"]:
+        return
+    outbox = _watcher_state["control_outbox"]
+    outbox[client] = outbox.get(client, b"") + (json.dumps(message) + "\n").encode()
+    _flush(client)
+
+
+def _broadcast(message):
+    """Send an event to every connected control client."""
+    for client in list(_watcher_state["control_clients"]):
+        _send(client, message)
+
+
+def _control_timer():
+    """Timer callback that accepts connections and handles complete command lines."""
+    state = _watcher_state
+    server = state["control_server"]
+    if server is None:
+        return None
+
+    while True:
+        try:
+            client, _ = server.accept()
+        except (BlockingIOError, InterruptedError):
+            break
+        except OSError:
+            return None
+        client.setblocking(False)
+        state["control_clients"][client] = b""
+
+    for client in list(state["control_clients"]):
+        _flush(client)
+        if client not in state["control_clients"]:
+            continue
+        try:
+            data = client.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            continue
+        except OSError:
+            data = b""
+        if not data:
+            _drop_client(client)
+            continue
+
+        buffer = state["control_clients"][client] + data
+        *lines, state["control_clients"][client] = buffer.split(b"\n")
+        for line in lines:
+            if not line.strip():
+                continue
+            request = _parse_request(line)
+            if request is None:
+                # Not a JSON-lines client (e.g. a browser's HTTP request)
+                _drop_client(client)
+                break
+            if not secrets.compare_digest(str(request.get("token", "")), state["control_token"]):
+                _send(client, {"id": request.get("id"), "ok": False, "error": "Bad or missing token"})
+                _drop_client(client)
+                break
+            _send(client, run_control_request(request))
+            if client not in state["control_clients"]:
+                break
+
+    return CONTROL_INTERVAL
+
+
+def _parse_request(line):
+    """A request line as a dict, or None if it isn't a JSON object."""
+    try:
+        request = json.loads(line)
+    except ValueError:
+        return None
+    return request if isinstance(request, dict) else None
+
+
+def _watched_file(request):
+    """The script commands act on: always the one the watcher is watching."""
+    if "file" in request:
+        raise ValueError("Commands act on the watched script; \"file\" isn't accepted")
+    filepath = _watcher_state["filepath"]
+    if not filepath:
+        props = getattr(bpy.context.scene, "script_watcher", None)
+        filepath = bpy.path.abspath(props.filepath) if props is not None else ""
+    if not filepath or not os.path.exists(filepath):
+        raise ValueError(f"File not found: {filepath or '(no script set)'}")
+    return os.path.abspath(filepath)
+
+
+def _reload_now(filepath, key_window=None, full=False):
+    """Reload straight away and stop the poller from reloading the same save again."""
+    state = _watcher_state
+    state["filepath"] = filepath
+    changed = None if full else _changed_sources(filepath)
+    ok = execute_script(filepath, changed_files=changed, key_window=key_window)
+    state["debounce_pending"] = False
+    state["last_mtime"] = max(_source_mtimes(filepath).values(), default=0.0)
+    return {
+        "ok": ok,
+        "seconds": round(state["last_build_seconds"], 3),
+        "report": state["last_report"],
+        "error": state["last_error"],
+    }
+
+
+def _cmd_reload(request):
+    return _reload_now(_watched_file(request), full=bool(request.get("full")))
+
+
+def _cmd_build_range(request):
+    start, end = int(request["start"]), int(request["end"])
+    return _reload_now(_watched_file(request), key_window=tuple(sorted((start, end))))
+
+
+def _cmd_set_frame(request):
+    scene = bpy.context.scene
+    scene.frame_set(int(request["frame"]))
+    return {"frame": scene.frame_current}
+
+
+def _cmd_stats(request):
+    state = _watcher_state
+    scene = bpy.context.scene
+    return {
+        "file": state["filepath"],
+        "watching": state["is_watching"],
+        "reloads": state["reload_count"],
+        "last_build_seconds": round(state["last_build_seconds"], 3),
+        "last_report": state["last_report"],
+        "last_error": state["last_error"],
+        "filling": state["fill_active"],
+        "keys_remaining": state["fill_remaining"],
+        "frame": scene.frame_current,
+        "frame_range": [scene.frame_start, scene.frame_end],
+        "objects": len(scene.objects),
+    }
+
+
+def _still_path(request, frame):
+    """
+    Where render-still writes: the request's "path" (relative to the project
+    root) or output/still_####.png, which must land inside ./output.
+    """
+    filepath = _watcher_state["filepath"]
+    root = find_project_root(filepath) if filepath else os.getcwd()
+    output = os.path.realpath(os.path.join(root, "output"))
+    path = os.path.realpath(os.path.join(root, request.get("path") or f"output/still_{frame:04d}.png"))
+    if os.path.commonpath([output, path]) != output or path == output:
+        raise ValueError(f"Stills are written under {output}")
+    return path
+
+
+def _cmd_render_still(request):
+    scene = bpy.context.scene
+    frame = int(request.get("frame", scene.frame_current))
+    path = _still_path(request, frame)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    previous = scene.render.filepath
+    scene.frame_set(frame)
+    scene.render.filepath = path
+    try:
+        bpy.ops.render.render(write_still=True)
+    finally:
+        scene.render.filepath = previous
+    return {"frame": frame, "path": path}
+
+
+CONTROL_COMMANDS = {
+    "reload": _cmd_reload,
+    "build-range": _cmd_build_range,
+    "set-frame": _cmd_set_frame,
+    "stats": _cmd_stats,
+    "render-still": _cmd_render_still,
+}
+
+
+def handle_control_command(line):
+    """
+    Run one control command and return its reply.
+
+    Args:
+        line: A JSON object (bytes or str) with a "cmd" key
+    Returns a dict with the request's "id", "ok" and the command's result,
+    or "error" if the request was malformed or the command failed.
+    """
+    request = _parse_request(line)
+    if request is None:
+        return {"id": None, "ok": False, "error": "Bad request: not a JSON object"}
+    return run_control_request(request)
+
+
+def run_control_request(request):
+    """Run a parsed control request (see handle_control_command())."""
+    reply = {"id": request.get("id"), "cmd": request.get("cmd")}
+    handler = CONTROL_COMMANDS.get(request.get("cmd"))
+    if handler is None:
+        reply.update(ok=False, error=f"Unknown command: {request.get('cmd')}")
+        return reply
+    try:
+        result = handler(request)
+    except KeyError as e:
+        reply.update(ok=False, error=f"Missing field: {e.args[0]}")
+        return reply
+    except Exception as e:
+        # Anything escaping would stop the control timer for good
+        reply.update(ok=False, error=str(e) or type(e).__name__)
+        return reply
+
+    reply["ok"] = result.pop("ok", True)
+    reply.update(result)
+    return reply
+
+
 # ──────────────────────────────────────────────
 # Operators
 # ──────────────────────────────────────────────
@@ -326,6 +1036,7 @@ class SCRIPTWATCHER_OT_stop(bpy.types.Operator):
 
     def execute(self, context):
         _watcher_state["is_watching"] = False
+        cancel_progressive_fill()
         self.report({'INFO'}, "Stopped watching")
         return {'FINISHED'}
 
@@ -358,6 +1069,21 @@ class SCRIPTWATCHER_OT_reload(bpy.types.Operator):
 # Properties
 # ──────────────────────────────────────────────
 
+def _update_control_server(props, context):
+    """Start or stop the control server when the panel toggle changes."""
+    if not props.control_enabled:
+        stop_control_server()
+        return
+    server = _watcher_state["control_server"]
+    if server is not None and server.getsockname()[1] == props.control_port:
+        return  # already listening (e.g. settings copied to a freshly built scene)
+    try:
+        start_control_server(props.control_port)
+    except OSError as e:
+        _watcher_state["last_error"] = f"Control server: {e}"
+        print(f"❌ Could not start the control server: {e}")
+
+
 class ScriptWatcherProperties(bpy.types.PropertyGroup):
     filepath: bpy.props.StringProperty(
         name="Script",
@@ -365,6 +1091,61 @@ class ScriptWatcherProperties(bpy.types.PropertyGroup):
         subtype='FILE_PATH',
         default="",
     )
+    progressive: bpy.props.BoolProperty(
+        name="Progressive Build",
+        description="Build the frames around the playhead first, then fill in "
+                    "the rest of the timeline in the background",
+        default=False,
+    )
+    window_radius: bpy.props.IntProperty(
+        name="Window",
+        description="Frames either side of the playhead to build first",
+        default=150,
+        min=10,
+    )
+    pin_range: bpy.props.BoolProperty(
+        name="Pin Range",
+        description="Build a fixed frame range first instead of following the playhead",
+        default=False,
+    )
+    pin_start: bpy.props.IntProperty(name="Start", default=1, min=1)
+    pin_end: bpy.props.IntProperty(name="End", default=250, min=1)
+    double_buffer: bpy.props.BoolProperty(
+        name="Keep Previous Build Visible",
+        description="Build into a separate scene and swap it in when the script "
+                    "finishes, so a slow or failing reload never blanks the viewport",
+        default=True,
+    )
+    partial_rebuilds: bpy.props.BoolProperty(
+        name="Rebuild Only What Changed",
+        description="When only config files change, rebuild just the parts of the "
+                    "scene that read the changed values (scripts must support it)",
+        default=True,
+    )
+    control_enabled: bpy.props.BoolProperty(
+        name="Control Server",
+        description="Accept reload/set-frame/stats/render commands on localhost "
+                    "(see addons/watch_ctl.py)",
+        default=False,
+        update=_update_control_server,
+    )
+    control_port: bpy.props.IntProperty(
+        name="Port",
+        description="Localhost TCP port for the control server",
+        default=8765,
+        min=1024,
+        max=65535,
+    )
+    build_tier: bpy.props.EnumProperty(
+        name="Tier",
+        description="Level of detail to build the scene at",
+        items=[
+            ('draft', "Draft", "Coarse keys, no ambient detail, quarter resolution"),
+            ('review', "Review", "Every other key, half the ambient detail, half resolution"),
+            ('final', "Final", "Full detail — what a headless render produces"),
+        ],
+        default='final',
+    )
 
 
 # ──────────────────────────────────────────────
@@ -398,9 +1179,40 @@ class SCRIPTWATCHER_PT_panel(bpy.types.Panel):
                 else:
                     box.label(text=f"  Last reload: {elapsed/60:.0f}m ago")
             box.label(text=f"  Reloads: {state['reload_count']}")
+            if state["last_report"]:
+                box.label(text=f"  {state['last_report']}")
+            if state["fill_active"]:
+                box.label(text=f"  Filling timeline: {state['fill_remaining']} keys left",
+                          icon='TIME')
+            if state["free_queue"]:
+                box.label(text=f"  Freeing previous build: {len(state['free_queue'])} left",
+                          icon='TRASH')
         else:
             box.label(text="○ Not watching", icon='PAUSE')
 
+        # Progressive build
+        build_box = layout.box()
+        build_box.prop(props, "build_tier")
+        build_box.prop(props, "double_buffer")
+        build_box.prop(props, "partial_rebuilds")
+        build_box.prop(props, "progressive")
+        if props.progressive:
+            build_box.prop(props, "pin_range")
+            if props.pin_range:
+                row = build_box.row(align=True)
+                row.prop(props, "pin_start")
+                row.prop(props, "pin_end")
+            else:
+                build_box.prop(props, "window_radius")
+
+        # Control server
+        control_box = layout.box()
+        row = control_box.row()
+        row.prop(props, "control_enabled")
+        row.prop(props, "control_port")
+        if state["control_server"] is not None:
+            control_box.label(text=f"  {len(state['control_clients'])} client(s) connected")
+
         # Error display
         if state["last_error"]:
             err_box = layout.box()
@@ -442,6 +1254,9 @@ def register():
 
 def unregister():
     _watcher_state["is_watching"] = False
+    cancel_progressive_fill()
+    finish_freeing()
+    stop_control_server()
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
     del bpy.types.Scene.script_watcher
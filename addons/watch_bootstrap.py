@@ -7,7 +7,8 @@ This is executed by Blender at startup (via --python) to:
 3. Trigger the initial load and start watching
 
 Usage (called by render.sh --watch):
-    blender --python addons/watch_bootstrap.py -- /absolute/path/to/script.py
+    blender --python addons/watch_bootstrap.py -- /absolute/path/to/script.py [--tier draft]
+                                                   [--control-port 8765]
 """
 
 import bpy
@@ -18,11 +19,13 @@ import os
 def bootstrap():
     # Parse the script path from argv (comes after the "--" separator)
     script_path = None
+    build_args = []
     argv = sys.argv
     if "--" in argv:
         custom_args = argv[argv.index("--") + 1:]
         if custom_args:
             script_path = custom_args[0]
+            build_args = custom_args[1:]
 
     if not script_path:
         print("❌ No script path provided. Usage: blender --python watch_bootstrap.py -- /path/to/script.py")
@@ -52,6 +55,27 @@ def bootstrap():
         scene = bpy.context.scene
         scene.script_watcher.filepath = script_path
 
+        # Seed the panel with build flags from the command line (e.g. --tier draft)
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        if project_root not in sys.path:
+            sys.path.insert(0, project_root)
+        from scripts.utils.build import parse_build_args
+        tier = parse_build_args(build_args).get("tier")
+        if tier:
+            try:
+                scene.script_watcher.build_tier = tier
+            except TypeError:
+                print(f"⚠️  Unknown build tier '{tier}', using '{scene.script_watcher.build_tier}'")
+
+        # Optional control server for editors and hooks (see addons/watch_ctl.py)
+        if "--control-port" in build_args:
+            i = build_args.index("--control-port")
+            try:
+                scene.script_watcher.control_port = int(build_args[i + 1])
+            except (IndexError, ValueError):
+                print("⚠️  --control-port needs a port number, using the default")
+            scene.script_watcher.control_enabled = True
+
         # Trigger initial load
         from script_watcher import _watcher_state, execute_script
         _watcher_state["filepath"] = script_path
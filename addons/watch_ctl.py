@@ -0,0 +1,132 @@
+"""
+Command-line client for the Script Watcher control server.
+
+Talks to a Blender session started with `./render.sh <script> --watch
+--control-port 8765` (or with "Control Server" ticked in the Watcher panel).
+Plain Python — no Blender needed — so it can run from editors and git hooks.
+
+Usage:
+    python addons/watch_ctl.py reload                 # reload now, skip the poll/debounce
+    python addons/watch_ctl.py reload --full          # force a full rebuild
+    python addons/watch_ctl.py build-range 2790-2940  # build these frames first
+    python addons/watch_ctl.py set-frame 1200
+    python addons/watch_ctl.py stats
+    python addons/watch_ctl.py render-still 1200 output/beat.png
+
+Requests carry the session token the server writes to
+~/.config/script_watcher/control_<port>.token (or $SCRIPT_WATCHER_TOKEN_DIR),
+so only this user's processes can drive the session. Stills are written
+under ./output only.
+
+Progress events are printed as they arrive; the exit status is 0 if the
+command succeeded.
+
+Example save hook (VS Code "Run on Save", a git post-commit hook, ...):
+    python addons/watch_ctl.py reload --quiet
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+
+DEFAULT_PORT = 8765
+
+
+def read_token(port=DEFAULT_PORT):
+    """The running server's session token (see control_token_path() in script_watcher.py)."""
+    directory = os.environ.get(
+        "SCRIPT_WATCHER_TOKEN_DIR", os.path.join(os.path.expanduser("~"), ".config", "script_watcher"),
+    )
+    with open(os.path.join(directory, f"control_{port}.token")) as f:
+        return f.read().strip()
+
+
+def send_command(request, port=DEFAULT_PORT, timeout=600.0, on_event=None, token=None):
+    """
+    Send one command and wait for its reply.
+
+    Args:
+        request: Command dict, e.g. {"cmd": "set-frame", "frame": 120}
+        port: Control server port on localhost
+        timeout: Seconds to wait for the reply (reloads can take a while)
+        on_event: Called with each progress event received before the reply
+        token: Session token (default: read from the server's token file)
+    Returns the reply dict.
+    """
+    request = dict(request, id=1, token=token or read_token(port))
+    with socket.create_connection(("127.0.0.1", port), timeout=timeout) as conn:
+        conn.sendall((json.dumps(request) + "\n").encode())
+        stream = conn.makefile("r", encoding="utf-8")
+        for line in stream:
+            message = json.loads(line)
+            if "event" in message:
+                if on_event is not None:
+                    on_event(message)
+                continue
+            if message.get("id") == request["id"]:
+                return message
+    raise ConnectionError("Control server closed the connection without replying")
+
+
+def _parse_range(text):
+    start, _, end = text.partition("-")
+    return int(start), int(end or start)
+
+
+def build_request(args):
+    """Turn parsed command-line arguments into a control request."""
+    if args.command == "reload":
+        return {"cmd": "reload", "full": args.full}
+    if args.command == "build-range":
+        start, end = _parse_range(args.range)
+        return {"cmd": "build-range", "start": start, "end": end}
+    if args.command == "set-frame":
+        return {"cmd": "set-frame", "frame": args.frame}
+    if args.command == "render-still":
+        request = {"cmd": "render-still", "frame": args.frame}
+        if args.path:
+            request["path"] = args.path
+        return request
+    return {"cmd": "stats"}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive a running Script Watcher session")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--quiet", action="store_true", help="Only print errors")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    reload_cmd = sub.add_parser("reload", help="Reload the watched script now")
+    reload_cmd.add_argument("--full", action="store_true", help="Force a full rebuild")
+    range_cmd = sub.add_parser("build-range", help="Reload, building START-END first")
+    range_cmd.add_argument("range", help="Frame range, e.g. 2790-2940")
+    frame_cmd = sub.add_parser("set-frame", help="Move the playhead")
+    frame_cmd.add_argument("frame", type=int)
+    sub.add_parser("stats", help="Print build timings and status")
+    still_cmd = sub.add_parser("render-still", help="Render one frame to an image")
+    still_cmd.add_argument("frame", type=int)
+    still_cmd.add_argument("path", nargs="?", default="")
+
+    args = parser.parse_args(argv)
+
+    def show_event(event):
+        if not args.quiet:
+            print(json.dumps(event))
+
+    try:
+        reply = send_command(build_request(args), port=args.port, on_event=show_event)
+    except OSError as e:
+        print(f"❌ Could not reach the Script Watcher on port {args.port}: {e}", file=sys.stderr)
+        return 2
+
+    if not reply.get("ok"):
+        print(f"❌ {reply.get('error', 'Command failed')}", file=sys.stderr)
+        return 1
+    if not args.quiet:
+        print(json.dumps(reply, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,32 +5,86 @@
 #   ./render.sh scripts/animations/your_script.py              # headless render
 #   ./render.sh scripts/animations/your_script.py --gui        # open in Blender GUI
 #   ./render.sh scripts/animations/your_script.py --watch      # GUI + hot-reload on save
+#   ./render.sh scripts/animations/your_script.py --tier draft # fast low-detail build
+#   ./render.sh scripts/animations/your_script.py --profile preview
+#                                                  # quick low-cost render of the whole film
+#   ./render.sh scripts/animations/your_script.py --engine workbench
+#                                                  # flat-colour Workbench render (CPU-only machines)
+#   ./render.sh scripts/animations/your_script.py --frames 2790-2940
+#                                                  # build + render just these frames
+#   ./render.sh scripts/animations/your_script.py --workers 8
+#                                                  # render with 8 headless Blender processes
+#   ./render.sh scripts/animations/your_script.py --incremental
+#                                                  # re-render only frames that changed
+#   ./render.sh scripts/animations/your_script.py --stream [--keep-frames]
+#                                                  # encode the video while frames render
+#   ./render.sh scripts/animations/your_script.py --flat-preview
+#                                                  # NumPy-rasterised preview, no render engine
+#   ./render.sh scripts/animations/your_script.py --lottie
+#                                                  # vector animation (Lottie JSON), no render
+#   ./render.sh scripts/animations/your_script.py --watch --control-port 8765
+#                                                  # + localhost control server (addons/watch_ctl.py)
+#
+# Build tiers (draft | review | final, default final) trade fidelity for build
+# speed. Render profiles (preview | review | final, default final) trade output
+# quality for render time and disk space: resolution, samples, frame step, PNG
+# and encoder settings (scripts/utils/scene.py RENDER_PROFILES). --engine
+# eevee|workbench|cycles overrides the script's render engine. --frames limits the build and render to a window of the timeline
+# (scripts that support it, e.g. Finding the One). --workers N renders PNG
+# chunks in N parallel Blender processes, each on its share of the cores,
+# then stitches them, and --incremental re-renders only frames whose content
+# changed since the last render. --stream pipes each frame into ffmpeg as soon
+# as it's written, so the video is done moments after the last frame; add
+# --keep-frames to keep the PNGs too. --flat-preview samples the finished
+# scene's flat shapes and rasterises them with NumPy in plain Python
+# processes (scripts/utils/raster.py), for a whole-film preview in seconds
+# (scripts that support them). --lottie writes the keyed shapes as a Lottie
+# animation next to the video (scripts/utils/lottie.py). Any flag other than
+# --gui/--watch is passed to the script after "--".
 #
 # The --watch mode installs the Script Watcher addon, loads your script,
 # and auto-reloads whenever you save in your editor. Press Space to play.
 
-BLENDER="/Applications/Blender.app/Contents/MacOS/Blender"
+# $BLENDER wins; otherwise the macOS app, or `blender` on the PATH (Linux nodes)
+BLENDER="${BLENDER:-/Applications/Blender.app/Contents/MacOS/Blender}"
+if [ ! -x "$BLENDER" ] && command -v blender >/dev/null 2>&1; then
+    BLENDER="$(command -v blender)"
+fi
 SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
 
 if [ -z "$1" ]; then
-    echo "Usage: ./render.sh <script.py> [--gui | --watch]"
+    echo "Usage: ./render.sh <script.py> [--gui | --watch] [--tier draft|review|final] [--profile preview|review|final] [--engine NAME] [--frames START-END] [--workers N] [--incremental] [--stream [--keep-frames]] [--flat-preview] [--lottie]"
     echo ""
     echo "Modes:"
     echo "  (default)  Headless render — renders frames and stitches video"
     echo "  --gui      Open in Blender GUI for manual preview"
     echo "  --watch    GUI + hot-reload — auto-reloads on file save"
+    echo ""
+    echo "Options:"
+    echo "  --tier T   Build tier: draft, review or final (default)"
+    echo "  --profile P   Render profile: preview, review or final (default)"
+    echo "  --engine E    Render engine: eevee, workbench or cycles (default: the script's)"
+    echo "  --frames S-E  Build and render only frames S to E"
+    echo "  --workers N   Render with N parallel headless Blender processes"
+    echo "  --incremental Re-render only frames that changed since the last render"
+    echo "  --stream      Encode the video while frames render"
+    echo "  --keep-frames With --stream, keep the PNG frames too"
+    echo "  --flat-preview Rasterise a quick preview with NumPy instead of rendering"
+    echo "  --lottie      Export a Lottie (JSON) vector animation instead of rendering"
     exit 1
 fi
 
 SCRIPT="$1"
 shift
 
-# Parse flags
+# Parse flags — anything that isn't a mode is forwarded to the script
 MODE="headless"
+SCRIPT_ARGS=()
 for arg in "$@"; do
     case "$arg" in
         --gui)   MODE="gui" ;;
         --watch) MODE="watch" ;;
+        *)       SCRIPT_ARGS+=("$arg") ;;
     esac
 done
 
@@ -40,11 +94,11 @@ mkdir -p output
 case "$MODE" in
     headless)
         echo "🎬 Rendering headlessly: $SCRIPT"
-        "$BLENDER" --background --python "$SCRIPT"
+        "$BLENDER" --background --python "$SCRIPT" -- "${SCRIPT_ARGS[@]}"
         ;;
     gui)
         echo "🎬 Opening in Blender GUI: $SCRIPT"
-        "$BLENDER" --no-splash --python "$SCRIPT"
+        "$BLENDER" --no-splash --python "$SCRIPT" -- "${SCRIPT_ARGS[@]}"
         ;;
     watch)
         # Convert script path to absolute
@@ -53,6 +107,6 @@ case "$MODE" in
         echo "   Hot-reload is active — save your script to see changes."
         echo "   Press Space in the Blender viewport to play the animation."
         echo ""
-        "$BLENDER" --no-splash --python "$SCRIPT_DIR/addons/watch_bootstrap.py" -- "$ABS_SCRIPT"
+        "$BLENDER" --no-splash --python "$SCRIPT_DIR/addons/watch_bootstrap.py" -- "$ABS_SCRIPT" "${SCRIPT_ARGS[@]}"
         ;;
 esac
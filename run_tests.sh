@@ -7,7 +7,11 @@
 #
 # Exit code: 0 = all passed, non-zero = failures
 
-BLENDER="/Applications/Blender.app/Contents/MacOS/Blender"
+# $BLENDER wins; otherwise the macOS app, or `blender` on the PATH (Linux nodes)
+BLENDER="${BLENDER:-/Applications/Blender.app/Contents/MacOS/Blender}"
+if [ ! -x "$BLENDER" ] && command -v blender >/dev/null 2>&1; then
+    BLENDER="$(command -v blender)"
+fi
 SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
 
 echo "🧪 Running tests via Blender..."
@@ -4,11 +4,16 @@ Clean transition from Act 3's locked angle.
 Timings updated for extended timeline (Gap phase added previously).
 """
 import math
-import bpy
 from scripts.utils.animation import lerp, ease_in_out_cubic
-from scripts.utils.materials import create_emission_material, assign_material
+from scripts.utils.materials import (
+    create_emission_material, create_attribute_emission_material,
+    set_emission_attributes, assign_material,
+)
+from scripts.utils.primitives import create_primitive, link_objects
+from scripts.utils.pool import create_pool, spawn
 from scripts.animations.finding_the_one.config import (
     ACT4_START, ACT4_END, FRAME_END, SEEKER_SIZE, ONE_SIZE,
+    SHARED_AMBIENT_MATERIALS,
 )
 from scripts.animations.finding_the_one.helpers import (
     kf_loc, kf_scale, kf_rot_z, kf_emission_strength, kf_emission_color,
@@ -93,26 +98,31 @@ def animate_act4(seeker, seeker_mat, the_one, one_mat,
     apply_pulse(the_one, beat1_end, beat2_end, period=35, amplitude=0.04)
 
     # ── Trail squares (during Accel) ──
-    trail_objects = []
+    # Each square lives 40 frames; a pool reuses the ones that have faded
     spawn_start = beat1_end + 20
     spawn_end = beat2_end - 10
-    
+    # One shared material; each square keys its own strength property
+    trail_mat = None
+    if SHARED_AMBIENT_MATERIALS:
+        trail_mat = create_attribute_emission_material("TrailMat")
+
+    def make_trail(i):
+        dot = create_primitive(f"Tr_{i:02d}", "plane", SEEKER_SIZE * 0.6, link=False)
+        if trail_mat is not None:
+            set_emission_attributes(dot, color=(1, 1, 1, 1), strength=0.0)
+            assign_material(dot, trail_mat)
+            return dot, dot
+        tmat = create_emission_material(f"Tr_{i:02d}M", color=(1, 1, 1, 1), strength=0.0)
+        assign_material(dot, tmat)
+        return dot, tmat
+
+    trails = create_pool(make_trail, key_emission=kf_emission_strength)
     for spawn_f in range(spawn_start, spawn_end, 10):
         wx = seeker_world_positions.get(spawn_f, 0)
-        for ci, (cn, xo) in enumerate([("TS", half), ("TO", -half)]):
-            sway = 0.2 * math.sin(((spawn_f - beat1_end) / 180.0) * 8 * math.pi)
-            tmat = create_emission_material(f"Tr_{spawn_f}_{ci}M", color=(1,1,1,1), strength=0.5)
-            bpy.ops.mesh.primitive_plane_add(size=SEEKER_SIZE * 0.6, location=(wx + xo, sway, -0.01))
-            dot = bpy.context.active_object
-            dot.name = f"Tr_{spawn_f}_{cn}"
-            assign_material(dot, tmat)
-            kf_scale(dot, 0.0, spawn_f - 1)
-            kf_emission_strength(tmat, 0.0, spawn_f - 1)
-            kf_scale(dot, 1.0, spawn_f)
-            kf_emission_strength(tmat, 0.5, spawn_f)
-            kf_scale(dot, 0.3, spawn_f + 40)
-            kf_emission_strength(tmat, 0.0, spawn_f + 40)
-            trail_objects.append(dot)
+        sway = 0.2 * math.sin(((spawn_f - beat1_end) / 180.0) * 8 * math.pi)
+        for xo in (half, -half):
+            spawn(trails, spawn_f, 40, (wx + xo, sway, -0.01), scale=(1.0, 0.3), strength=(0.5, 0.0))
+    trail_objects = link_objects(trails["objects"])
 
     # ── Beat 4.3: Into the Light (beat2_end–end) ──
     for f in range(beat2_end, end + 1):
@@ -2,11 +2,14 @@
 Finding the One — Character Creation.
 Factory functions that create each shape and its material.
 """
-import bpy
 import math
 import random
 
-from scripts.utils.materials import create_emission_material, assign_material
+from scripts.utils.materials import (
+    create_emission_material, create_attribute_emission_material,
+    set_emission_attributes, assign_material,
+)
+from scripts.utils.primitives import create_primitive, link_objects
 from scripts.animations.finding_the_one.config import (
     PARENT_TRI_LEG, PARENT_FILL_GRAY, PARENT_EMISSION,
     SEEKER_SIZE, SEEKER_FILL_GRAY, SEEKER_EMISSION,
@@ -15,68 +18,16 @@ from scripts.animations.finding_the_one.config import (
     ONE_SIZE, ONE_FILL_GRAY, ONE_EMISSION,
     BG_TRI_SIZE, BG_TRI_FILL_GRAY_MIN, BG_TRI_FILL_GRAY_MAX,
     BG_TRI_EMISSION, BG_TRI_COUNT, BG_TRI_EXCLUSION_Y,
-    WORLD_PATH_LENGTH,
+    WORLD_PATH_LENGTH, SHARED_AMBIENT_MATERIALS,
 )
 
 
-def _create_right_angle_tri(name, leg_size, location=(0, 0, 0)):
-    import bmesh
-    mesh = bpy.data.meshes.new(f"{name}_mesh")
-    obj = bpy.data.objects.new(name, mesh)
-    bpy.context.collection.objects.link(obj)
-    bm = bmesh.new()
-    half = leg_size / 2
-    v1 = bm.verts.new((-half, -half, 0))
-    v2 = bm.verts.new((half, -half, 0))
-    v3 = bm.verts.new((-half, half, 0))
-    bm.faces.new([v1, v2, v3])
-    bm.to_mesh(mesh)
-    bm.free()
-    obj.location = location
-    return obj
-
-
-def _create_isosceles_tri(name, base, height, location=(0, 0, 0)):
-    import bmesh
-    mesh = bpy.data.meshes.new(f"{name}_mesh")
-    obj = bpy.data.objects.new(name, mesh)
-    bpy.context.collection.objects.link(obj)
-    bm = bmesh.new()
-    half_base = base / 2
-    v1 = bm.verts.new((-half_base, -height / 3, 0))
-    v2 = bm.verts.new((half_base, -height / 3, 0))
-    v3 = bm.verts.new((0, 2 * height / 3, 0))
-    bm.faces.new([v1, v2, v3])
-    bm.to_mesh(mesh)
-    bm.free()
-    obj.location = location
-    return obj
-
-
-def _create_equilateral_tri(name, size, location=(0, 0, 0)):
-    import bmesh
-    mesh = bpy.data.meshes.new(f"{name}_mesh")
-    obj = bpy.data.objects.new(name, mesh)
-    bpy.context.collection.objects.link(obj)
-    bm = bmesh.new()
-    half = size / 2
-    h = size * math.sqrt(3) / 2
-    v1 = bm.verts.new((-half, -h / 3, 0))
-    v2 = bm.verts.new((half, -h / 3, 0))
-    v3 = bm.verts.new((0, 2 * h / 3, 0))
-    bm.faces.new([v1, v2, v3])
-    bm.to_mesh(mesh)
-    bm.free()
-    obj.location = location
-    return obj
-
-
 def create_parent_triangles():
     results = []
     for idx, name in enumerate(["ParentTriA", "ParentTriB"]):
         g = PARENT_FILL_GRAY
         mat = create_emission_material(f"{name}Mat", color=(g, g, g, 1), strength=PARENT_EMISSION)
-        obj = _create_right_angle_tri(name, PARENT_TRI_LEG, location=(-50, 0, 0))
+        obj = create_primitive(name, "right_tri", PARENT_TRI_LEG, location=(-50, 0, 0))
         assign_material(obj, mat)
         results.append((obj, mat))
     return results
@@ -85,9 +36,7 @@ def create_parent_triangles():
 def create_seeker():
     g = SEEKER_FILL_GRAY
     mat = create_emission_material("SeekerMat", color=(g, g, g, 1), strength=SEEKER_EMISSION)
-    bpy.ops.mesh.primitive_plane_add(size=SEEKER_SIZE, location=(-50, 0, 0))
-    obj = bpy.context.active_object
-    obj.name = "Seeker"
+    obj = create_primitive("Seeker", "plane", SEEKER_SIZE, location=(-50, 0, 0))
     assign_material(obj, mat)
     return obj, mat
 
@@ -95,7 +44,7 @@ def create_seeker():
 def create_right_angle_triangle():
     g = RIGHT_TRI_FILL_GRAY
     mat = create_emission_material("RightTriMat", color=(g, g, g, 1), strength=RIGHT_TRI_EMISSION)
-    obj = _create_right_angle_tri("RightAngleTri", RIGHT_TRI_LEG, location=(-50, 0, 0))
+    obj = create_primitive("RightAngleTri", "right_tri", RIGHT_TRI_LEG, location=(-50, 0, 0))
     assign_material(obj, mat)
     return obj, mat
 
@@ -103,7 +52,7 @@ def create_right_angle_triangle():
 def create_isosceles_triangle():
     g = ISO_TRI_FILL_GRAY
     mat = create_emission_material("IsoTriMat", color=(g, g, g, 1), strength=ISO_TRI_EMISSION)
-    obj = _create_isosceles_tri("IsoscelesTri", ISO_TRI_BASE, ISO_TRI_HEIGHT, location=(-50, 0, 0))
+    obj = create_primitive("IsoscelesTri", "iso_tri", ISO_TRI_BASE, ISO_TRI_HEIGHT, location=(-50, 0, 0))
     assign_material(obj, mat)
     return obj, mat
 
@@ -111,19 +60,19 @@ def create_isosceles_triangle():
 def create_the_one():
     g = ONE_FILL_GRAY
     mat = create_emission_material("TheOneMat", color=(g, g, g, 1), strength=ONE_EMISSION)
-    bpy.ops.mesh.primitive_plane_add(size=ONE_SIZE, location=(-50, 0, 0))
-    obj = bpy.context.active_object
-    obj.name = "TheOne"
+    obj = create_primitive("TheOne", "plane", ONE_SIZE, location=(-50, 0, 0))
     assign_material(obj, mat)
     return obj, mat
 
 
-def create_background_triangles(count=BG_TRI_COUNT, seed=42):
-    """All equilateral, same size, excluded from protagonist's Y path."""
+def background_triangle_layout(count=BG_TRI_COUNT, seed=42):
+    """
+    Where the background triangles sit: (world_x, world_y, gray, angle) each.
+    Deterministic, and shared by the per-object and instanced fields.
+    """
     random.seed(seed)
-    triangles = []
-
-    for i in range(count):
+    layout = []
+    for _ in range(count):
         world_x = random.uniform(-5, WORLD_PATH_LENGTH + 5)
         # Exclude the central Y band where protagonist travels
         if random.random() < 0.5:
@@ -131,14 +80,40 @@ def create_background_triangles(count=BG_TRI_COUNT, seed=42):
         else:
             world_y = random.uniform(BG_TRI_EXCLUSION_Y, 4.5)
         gray = random.uniform(BG_TRI_FILL_GRAY_MIN, BG_TRI_FILL_GRAY_MAX)
-        name = f"BgTri_{i:03d}"
-        mat = create_emission_material(f"{name}Mat", color=(gray, gray, gray, 1), strength=BG_TRI_EMISSION)
-        obj = _create_equilateral_tri(name, BG_TRI_SIZE, location=(world_x, world_y, -0.01))
-        assign_material(obj, mat)
-        obj.rotation_euler[2] = random.uniform(0, 2 * math.pi)
-        triangles.append((obj, mat, world_x, world_y))
+        angle = random.uniform(0, 2 * math.pi)
+        layout.append((world_x, world_y, gray, angle))
+    return layout
 
-    return triangles
 
+def create_background_triangles(count=BG_TRI_COUNT, seed=42):
+    """
+    All equilateral, same size, excluded from protagonist's Y path.
+
+    Returns (obj, emission target, world_x, world_y) tuples. The emission
+    target is the triangle's own material, or the triangle itself when
+    SHARED_AMBIENT_MATERIALS puts them all on one attribute material —
+    kf_emission_strength() takes either.
+    """
+    triangles = []
+    shared_mat = None
+    if SHARED_AMBIENT_MATERIALS:
+        shared_mat = create_attribute_emission_material("BgTriMat")
 
+    for i, (world_x, world_y, gray, angle) in enumerate(background_triangle_layout(count, seed)):
+        name = f"BgTri_{i:03d}"
+        # All share one mesh; linked as a batch below
+        obj = create_primitive(
+            name, "equilateral_tri", BG_TRI_SIZE, location=(world_x, world_y, -0.01), link=False,
+        )
+        if shared_mat is not None:
+            set_emission_attributes(obj, color=(gray, gray, gray, 1), strength=BG_TRI_EMISSION)
+            assign_material(obj, shared_mat)
+            mat = obj
+        else:
+            mat = create_emission_material(f"{name}Mat", color=(gray, gray, gray, 1), strength=BG_TRI_EMISSION)
+            assign_material(obj, mat)
+        obj.rotation_euler[2] = angle
+        triangles.append((obj, mat, world_x, world_y))
 
+    link_objects([obj for obj, _, _, _ in triangles])
+    return triangles
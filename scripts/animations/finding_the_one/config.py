@@ -36,6 +36,17 @@ ACT3_END = 3640
 ACT4_START = 3640
 ACT4_END = 4140
 
+# Video segments: each runs from its first frame to the next one's (gaps
+# join the act before them). Segments are encoded and cached separately.
+ENCODE_SEGMENTS = (
+    ("prologue", PROLOGUE_START),
+    ("act1", ACT1_START),
+    ("act2", ACT2_START),
+    ("valley", VALLEY_START),
+    ("act3", ACT3_START),
+    ("act4", ACT4_START),
+)
+
 # ── SCROLL SPEEDS ──
 SCROLL_STOP = 0.005
 SCROLL_CRAWL = 0.008
@@ -79,6 +90,45 @@ BG_TRI_EMISSION = 0.4
 BG_TRI_COUNT = 50
 BG_TRI_EXCLUSION_Y = 2.5  # no BG triangles within ±this of Y=0
 
+# "objects": one keyed object per shape, the shipped look (visibility fades
+# in over a few frames of emission). "instances": the background field and
+# dust are each one Geometry Nodes carrier object, animated procedurally
+# (BG_TRI_COUNT can reach the thousands), but shapes switch on without the
+# emission ramp and are left out of Lottie exports. "swarm": as
+# "instances", but the background is a simulated crowd (SWARM_* below).
+BG_FIELD_MODE = "objects"
+DUST_COUNT = 25
+
+# Recycled background (instances mode only): a fixed pool of triangles that
+# wraps around the camera, reappearing ahead with a new height, angle and
+# shade, instead of BG_TRI_COUNT scattered along the whole world
+BG_RECYCLE = False
+BG_POOL_SIZE = 12        # ≥ the highest BG_DENSITY_CURVE value
+BG_RECYCLE_MARGIN = 2    # world units past each edge of the view
+
+# Swarm background (BG_FIELD_MODE = "swarm"): SWARM_COUNT small triangles
+# that flock, part around the characters and wrap around the camera,
+# simulated at build time and baked into one carrier
+SWARM_COUNT = 5000
+SWARM_TRI_SIZE = 0.12
+SWARM_HALF_HEIGHT = 5.5    # crowd spans ±this in Y
+SWARM_AVOID_RADIUS = 1.5   # characters clear a disc this wide around them
+SWARM_SIM_STEP = 5         # frames per simulation step
+SWARM_BAKE_STEP = 10       # frames between baked positions
+
+# True: background triangles, dust and Act IV trails share one material per
+# group, with colour and strength set per object. False (default): one
+# material each, as the film has always been built
+SHARED_AMBIENT_MATERIALS = False
+
+# Background bob and dust motion is keyed only while each shape is on
+# screen, plus this many frames either side; off screen it holds still
+AMBIENT_CULL_PAD = 6
+
+# Key hide_render / hide_viewport wherever a shape is off camera, faded to
+# zero emission or scaled to nothing, so renders skip it on those frames
+KEY_RENDER_VISIBILITY = True
+
 # ── PULSE PARAMETERS ──
 PULSE_BASE_PERIOD = 45
 PULSE_BASE_AMP = 0.03
@@ -9,6 +9,14 @@ Run:
     ./render.sh scripts/animations/finding_the_one/finding_the_one.py
     ./render.sh scripts/animations/finding_the_one/finding_the_one.py --gui
     ./render.sh scripts/animations/finding_the_one/finding_the_one.py --watch
+    ./render.sh scripts/animations/finding_the_one/finding_the_one.py --frames 2790-2940
+    ./render.sh scripts/animations/finding_the_one/finding_the_one.py --profile preview
+    ./render.sh scripts/animations/finding_the_one/finding_the_one.py --engine workbench
+    ./render.sh scripts/animations/finding_the_one/finding_the_one.py --workers 8
+    ./render.sh scripts/animations/finding_the_one/finding_the_one.py --incremental
+    ./render.sh scripts/animations/finding_the_one/finding_the_one.py --stream --workers 8
+    ./render.sh scripts/animations/finding_the_one/finding_the_one.py --flat-preview
+    ./render.sh scripts/animations/finding_the_one/finding_the_one.py --lottie
 
 Architecture:
     This is the orchestrator. It imports all modules and calls them
@@ -39,12 +47,26 @@ from scripts.utils.scene import (
     clear_scene, setup_ortho_camera, setup_world_color,
     setup_render, frames_to_video,
 )
+from scripts.utils.keying import (
+    set_key_step, close_key_runs, when_keys_flushed, set_key_window, close_key_window,
+)
+from scripts.utils.build import get_build_options
+from scripts.utils.rebuild import plan_rebuild, run_stage, keep_handles, finish_rebuild
+from scripts.utils.visibility import key_render_visibility
+from scripts.utils.parallel_render import render_in_parallel
+from scripts.utils.frame_store import render_incremental
+from scripts.utils.video_stream import render_streaming
+from scripts.utils.segment_encode import segment_ranges, encode_segments
+from scripts.utils.workbench import use_workbench_flat
+from scripts.utils.flat_samples import render_flat_preview
+from scripts.utils.lottie import export_lottie
 
 # ── Project imports ──
+from scripts.animations.finding_the_one import config
 from scripts.animations.finding_the_one.config import (
-    FPS, FRAME_START, FRAME_END,
+    FPS, FRAME_START, FRAME_END, ACT4_START, ENCODE_SEGMENTS,
     ORTHO_NORMAL, ORTHO_ENCOUNTER, ORTHO_LONELY, ORTHO_CLICK, ORTHO_WIDE,
-    CAMERA_HEIGHT,
+    CAMERA_HEIGHT, BG_FIELD_MODE, BG_RECYCLE, KEY_RENDER_VISIBILITY,
 )
 from scripts.animations.finding_the_one.helpers import (
     set_all_linear_interpolation, set_viewport_to_camera,
@@ -64,6 +86,11 @@ from scripts.animations.finding_the_one.systems import (
     animate_background_triangles,
     apply_ortho_scale_shifts,
     animate_particle_dust,
+    create_background_field,
+    create_background_ring,
+    create_background_swarm,
+    animate_background_field,
+    animate_dust_field,
 )
 from scripts.animations.finding_the_one.prologue import animate_prologue
 from scripts.animations.finding_the_one.act1 import animate_act1
@@ -74,47 +101,147 @@ from scripts.animations.finding_the_one.act4 import animate_act4
 
 
 # ══════════════════════════════════════════════════════════════
-#  SCENE SETUP
+#  BUILD STAGES
 # ══════════════════════════════════════════════════════════════
 
-clear_scene()
-setup_world_color(color=(0, 0, 0, 1))
+# The background field and dust are either Geometry Nodes instancers or one
+# keyed object per shape (BG_FIELD_MODE in config.py). A swarm background is
+# instanced too, but simulated around the characters once the acts are keyed.
+SWARM = BG_FIELD_MODE == "swarm"
+INSTANCED = BG_FIELD_MODE in ("instances", "swarm")
+animate_background = animate_background_field if INSTANCED else animate_background_triangles
+animate_dust = animate_dust_field if INSTANCED else animate_particle_dust
+create_field = create_background_ring if BG_RECYCLE else create_background_field
+
+# The swarm steers around the characters, so it reads every act's keys
+ACTS = ("schedule", "prologue", "act1", "act2", "valley", "act3", "act4")
+
+# Everything after character creation runs as a stage, so a watcher reload
+# that only changes config.py rebuilds just the stages that read what changed.
+#   name, function, upstream stages whose results it uses, creates objects
+STAGES = [
+    ("schedule",        build_scroll_schedule,        (),                       False),
+    ("prologue",        animate_prologue,             ("schedule",),            False),
+    ("act1",            animate_act1,                 ("schedule", "prologue"), False),
+    ("act2",            animate_act2,                 ("schedule", "act1"),     False),
+    ("valley",          animate_valley,               ("schedule", "act2"),     False),
+    ("act3",            animate_act3,                 ("schedule", "valley"),   False),
+    ("act4",            animate_act4,                 ("schedule", "act3"),     True),
+    ("camera_scroll",   setup_scrolling_camera,       ("schedule",),            False),
+    ("seeker_emission", apply_seeker_emission_curve,  (),                       False),
+    ("swarm",           create_background_swarm,      ACTS,                     True),
+    ("background",      animate_background,           ("schedule", "swarm"),    False),
+    ("dust",            animate_dust,                 ("schedule",),            True),
+    ("ortho_scale",     apply_ortho_scale_shifts,     (),                       False),
+]
 
-camera = setup_ortho_camera(
-    location=(0, 0, CAMERA_HEIGHT),
-    ortho_scale=ORTHO_NORMAL,
-)
+# Frames keyed by stages that create objects — a --frames window that misses
+# a span skips that stage outright (act4's trail squares key from spawn - 1)
+STAGE_SPANS = {
+    "act4": (ACT4_START - 1, FRAME_END),
+}
 
-setup_render(
-    resolution=(1920, 1080),
-    fps=FPS,
-    frame_start=FRAME_START,
-    frame_end=FRAME_END,
-    output_path='./output/finding_the_one',
-)
+build = get_build_options()
+print(f"🎬 Build tier: {build['tier']}")
+
+# --frames START-END builds and renders just that window of the timeline
+frames = build["frames"]
+if frames is not None:
+    frames = (max(frames[0], FRAME_START), min(frames[1], FRAME_END))
+    if frames[0] > frames[1]:
+        print(f"⚠️  --frames is outside the timeline ({FRAME_START}–{FRAME_END}), building all of it")
+        frames = None
+    else:
+        print(f"🎬 Frame window: {frames[0]}–{frames[1]}")
+    build["frames"] = frames
+
+plan = plan_rebuild(STAGES, config, build, script_path=__file__, spans=STAGE_SPANS)
+
+
+# ══════════════════════════════════════════════════════════════
+#  SCENE SETUP
+# ══════════════════════════════════════════════════════════════
+
+if plan["full"]:
+    clear_scene()
+    setup_world_color(color=(0, 0, 0, 1))
+
+    camera = setup_ortho_camera(
+        location=(0, 0, CAMERA_HEIGHT),
+        ortho_scale=ORTHO_NORMAL,
+    )
+
+    output_path = './output/finding_the_one'
+    if build['tier'] != 'final':
+        output_path += f"_{build['tier']}"
+    if build['profile'] != 'final':
+        output_path += f"_{build['profile']}"
+    if frames is not None:
+        output_path += f"_f{frames[0]}-{frames[1]}"
+
+    setup_render(
+        resolution=(1920, 1080),
+        fps=FPS,
+        frame_start=frames[0] if frames else FRAME_START,
+        frame_end=frames[1] if frames else FRAME_END,
+        output_path=output_path,
+        resolution_percentage=build['resolution_percentage'],
+    )
+
+# Lower tiers key per-frame motion on a coarser grid (run ends stay exact)
+set_key_step(build['key_step'], origin=FRAME_START)
+
+# A frame window keys only inside it, plus each channel's nearest key either
+# side so the window interpolates exactly. Every act still runs, so scroll
+# positions and hand-offs are computed as in a full build.
+if frames is not None:
+    set_key_window(frames, keep_edges=True)
 
 
 # ══════════════════════════════════════════════════════════════
 #  BUILD SCROLL SCHEDULE
 # ══════════════════════════════════════════════════════════════
 
-seeker_world_positions, scroll_speeds = build_scroll_schedule()
+seeker_world_positions, scroll_speeds = run_stage(plan, "schedule", build_scroll_schedule)
 
 
 # ══════════════════════════════════════════════════════════════
 #  CREATE CHARACTERS
 # ══════════════════════════════════════════════════════════════
 
-parents = create_parent_triangles()
+if plan["full"]:
+    parents = create_parent_triangles()
+    seeker, seeker_mat = create_seeker()
+    right_tri, right_tri_mat = create_right_angle_triangle()
+    iso_tri, iso_tri_mat = create_isosceles_triangle()
+    the_one, one_mat = create_the_one()
+    if SWARM:
+        bg_triangles = None   # simulated after the acts, see GLOBAL SYSTEMS
+    elif INSTANCED:
+        bg_triangles = create_field(camera)
+    else:
+        bg_triangles = create_background_triangles()
+
+    keep_handles(
+        plan, camera=camera, parents=parents,
+        seeker=(seeker, seeker_mat), right_tri=(right_tri, right_tri_mat),
+        iso_tri=(iso_tri, iso_tri_mat), the_one=(the_one, one_mat),
+        bg_triangles=bg_triangles,
+    )
+else:
+    # Partial rebuild — the characters from the last build are still in the scene
+    handles = plan["handles"]
+    camera = handles["camera"]
+    parents = handles["parents"]
+    seeker, seeker_mat = handles["seeker"]
+    right_tri, right_tri_mat = handles["right_tri"]
+    iso_tri, iso_tri_mat = handles["iso_tri"]
+    the_one, one_mat = handles["the_one"]
+    bg_triangles = handles["bg_triangles"]
+
 parent_a, parent_a_mat = parents[0]
 parent_b, parent_b_mat = parents[1]
 
-seeker, seeker_mat = create_seeker()
-right_tri, right_tri_mat = create_right_angle_triangle()
-iso_tri, iso_tri_mat = create_isosceles_triangle()
-the_one, one_mat = create_the_one()
-bg_triangles = create_background_triangles()
-
 
 # (Trail lines removed — not rendering properly)
 
@@ -129,7 +256,8 @@ seeker_y_positions = {}
 
 # ── Prologue (1–330) ──
 print("🎬 Building Prologue...")
-animate_prologue(
+run_stage(
+    plan, "prologue", animate_prologue,
     parent_a, parent_a_mat, parent_b, parent_b_mat,
     seeker, seeker_mat, seeker_world_positions,
 )
@@ -140,47 +268,57 @@ for f in range(1, 331):
 
 # ── Act I (330–990) ──
 print("🎬 Building Act I...")
-animate_act1(
+run_stage(
+    plan, "act1", animate_act1,
     seeker, seeker_mat, right_tri, right_tri_mat,
     the_one, one_mat,
     seeker_world_positions, seeker_y_positions,
     camera,
+    shared=seeker_y_positions,
 )
 
 
 # ── Act II (990–1650) ──
 print("🎬 Building Act II...")
-animate_act2(
+run_stage(
+    plan, "act2", animate_act2,
     seeker, seeker_mat, iso_tri, iso_tri_mat,
     seeker_world_positions, seeker_y_positions,
     camera,
+    shared=seeker_y_positions,
 )
 
 
 # ── The Valley (1650–1800) ──
 print("🎬 Building The Valley...")
-animate_valley(
+run_stage(
+    plan, "valley", animate_valley,
     seeker, seeker_mat, the_one, one_mat,
     seeker_world_positions, seeker_y_positions,
     camera,
+    shared=seeker_y_positions,
 )
 
 
 # ── Act III (1800–2460) ──
 print("🎬 Building Act III...")
-final_angle = animate_act3(
+final_angle = run_stage(
+    plan, "act3", animate_act3,
     seeker, seeker_mat, the_one, one_mat,
     seeker_world_positions, seeker_y_positions,
     camera,
+    shared=seeker_y_positions,
 )
 
 
 # ── Act IV (2460–3150) ──
 print("🎬 Building Act IV...")
-animate_act4(
+run_stage(
+    plan, "act4", animate_act4,
     seeker, seeker_mat, the_one, one_mat,
     seeker_world_positions, seeker_y_positions,
     camera, final_angle,
+    shared=seeker_y_positions,
 )
 
 
@@ -191,19 +329,37 @@ animate_act4(
 print("🎬 Applying global systems...")
 
 # Camera tracking — follows Seeker's world X position
-setup_scrolling_camera(camera, seeker_world_positions)
+run_stage(plan, "camera_scroll", setup_scrolling_camera, camera, seeker_world_positions)
 
 # Seeker emission curve (emotional barometer)
-apply_seeker_emission_curve(seeker_mat)
+run_stage(plan, "seeker_emission", apply_seeker_emission_curve, seeker_mat)
+
+# Background swarm — steered around the characters' finished paths
+if SWARM:
+    print("   🐟 Background swarm...")
+    bg_triangles = run_stage(
+        plan, "swarm", create_background_swarm,
+        camera, seeker_world_positions,
+        [seeker, the_one, right_tri, iso_tri, parent_a, parent_b],
+    )
 
 # Background triangle density and fading
-animate_background_triangles(bg_triangles, seeker_world_positions)
+if INSTANCED:
+    run_stage(plan, "background", animate_background, bg_triangles, ambient=build['ambient'])
+else:
+    run_stage(
+        plan, "background", animate_background,
+        bg_triangles, seeker_world_positions, ambient=build['ambient'],
+    )
 
 # (Trail lines removed)
 
 # Particle dust (subtle ambient atmosphere)
 print("   ✨ Particle dust...")
-animate_particle_dust(seeker_world_positions, camera)
+run_stage(
+    plan, "dust", animate_dust,
+    seeker_world_positions, camera, ambient=build['ambient'],
+)
 
 # Orthographic scale shifts for emotional moments
 ortho_keyframes = [
@@ -223,7 +379,7 @@ ortho_keyframes = [
     (3200, ORTHO_WIDE),         # Hold
     (3250, ORTHO_WIDE),         # End
 ]
-apply_ortho_scale_shifts(camera, ortho_keyframes)
+run_stage(plan, "ortho_scale", apply_ortho_scale_shifts, camera, ortho_keyframes)
 
 
 # ══════════════════════════════════════════════════════════════
@@ -231,7 +387,33 @@ apply_ortho_scale_shifts(camera, ortho_keyframes)
 # ══════════════════════════════════════════════════════════════
 
 print("🎬 Applying polish...")
+close_key_runs()
+close_key_window()
+finish_rebuild(plan)
 set_all_linear_interpolation()
+# A progressive watch build writes the rest of the timeline later — flatten those keys too
+when_keys_flushed(set_all_linear_interpolation)
+
+
+def use_flat_shading():
+    converted = use_workbench_flat()
+    print(f"   🎨 Workbench: {converted} objects drawn in flat emission colours")
+
+
+# Emission-only, so Workbench (--engine workbench) can draw it without EEVEE
+if bpy.context.scene.render.engine == 'BLENDER_WORKBENCH':
+    use_flat_shading()
+    when_keys_flushed(use_flat_shading)
+
+
+def hide_unseen_objects():
+    hidden, intervals = key_render_visibility(camera)
+    print(f"   🙈 Render visibility: {hidden} objects hidden over {intervals} unseen stretches")
+
+
+if KEY_RENDER_VISIBILITY:
+    hide_unseen_objects()
+    when_keys_flushed(hide_unseen_objects)
 set_viewport_to_camera()
 
 print("✅ 'Finding the One' (v4) scene built successfully!")
@@ -243,9 +425,41 @@ print(f"   Timeline: {FRAME_START}–{FRAME_END} ({FRAME_END // FPS}s at {FPS}fp
 # ══════════════════════════════════════════════════════════════
 
 if "--background" in sys.argv or "-b" in sys.argv:
-    print(f"🎬 Rendering 'Finding the One' directly to video...")
-    print(f"   Output: {bpy.context.scene.render.filepath}")
-    bpy.ops.render.render(animation=True)
+    video_file = bpy.context.scene.render.filepath
+    frames_dir = os.path.splitext(video_file)[0] + "_frames"
+    # PNG sequences are encoded per act, so an edit re-encodes only its act
+    segments = segment_ranges(ENCODE_SEGMENTS, bpy.context.scene.frame_start,
+                              bpy.context.scene.frame_end)
+    if build['lottie']:
+        # A vector animation of the keyed shapes, nothing rendered
+        print("🎬 Exporting 'Finding the One' as Lottie...")
+        export_lottie(os.path.splitext(video_file)[0] + ".json")
+    elif build['flat_preview']:
+        # Blender only samples the shapes; NumPy rasterises them, no render engine involved
+        print("🎬 Rasterising a flat preview of 'Finding the One'...")
+        render_flat_preview(video_file, processes=build['workers'] if build['workers'] > 1 else None)
+    elif build['incremental']:
+        # Only frames whose content changed render; the rest come from the store
+        print("🎬 Rendering 'Finding the One' incrementally...")
+        print(f"   Output: {video_file}")
+        render_incremental(frames_dir, workers=build['workers'])
+        encode_segments(frames_dir, video_file, segments, fps=FPS)
+    elif build['stream']:
+        # Frames are piped into ffmpeg as they finish, so encoding overlaps the render
+        print("🎬 Rendering 'Finding the One' and encoding as it goes...")
+        print(f"   Output: {video_file}")
+        render_streaming(video_file, frames_dir, workers=build['workers'],
+                         keep_frames=build['keep_frames'])
+    elif build['workers'] > 1:
+        # PNG frames from several headless processes, then encoded per act
+        print(f"🎬 Rendering 'Finding the One' with {build['workers']} workers...")
+        print(f"   Output: {video_file}")
+        render_in_parallel(build['workers'], frames_dir)
+        encode_segments(frames_dir, video_file, segments, fps=FPS)
+    else:
+        print("🎬 Rendering 'Finding the One' directly to video...")
+        print(f"   Output: {bpy.context.scene.render.filepath}")
+        bpy.ops.render.render(animation=True)
     print("✅ Render complete!")
 else:
     print("👀 'Finding the One' loaded in GUI mode.")
@@ -7,7 +7,9 @@ keyframe operations into convenient shorthand.
 import bpy
 import math
 
-from scripts.utils.animation import ease_in_out_cubic, lerp
+from scripts.utils.animation import ease_in_out_cubic, lerp, get_fcurves
+from scripts.utils.keying import insert_key
+from scripts.utils.materials import EMISSION_COLOR_ATTRIBUTE, EMISSION_STRENGTH_ATTRIBUTE
 
 from scripts.animations.finding_the_one.config import (
     PULSE_BASE_PERIOD, PULSE_BASE_AMP,
@@ -20,52 +22,56 @@ from scripts.animations.finding_the_one.config import (
 
 def kf_loc(obj, x, y, frame):
     """Insert a location keyframe (Z always 0 for top-down)."""
-    obj.location = (x, y, 0)
-    obj.keyframe_insert(data_path="location", frame=frame)
+    insert_key(obj, "location", (x, y, 0), frame)
 
 
 def kf_scale(obj, s, frame):
     """Insert a uniform scale keyframe."""
-    obj.scale = (s, s, s)
-    obj.keyframe_insert(data_path="scale", frame=frame)
+    insert_key(obj, "scale", (s, s, s), frame)
 
 
 def kf_rot_z(obj, angle_rad, frame):
     """Insert a Z-rotation keyframe."""
-    obj.rotation_euler[2] = angle_rad
-    obj.keyframe_insert(data_path="rotation_euler", index=2, frame=frame)
+    insert_key(obj, "rotation_euler", angle_rad, frame, index=2)
 
 
-def kf_emission_strength(mat, strength, frame):
-    """Keyframe the emission strength of an emission material."""
-    emission_node = None
+def _emission_node(mat):
     for node in mat.node_tree.nodes:
         if node.type == 'EMISSION':
-            emission_node = node
-            break
+            return node
+    return None
+
+
+def kf_emission_strength(target, strength, frame):
+    """
+    Keyframe emission strength.
+
+    `target` is an emission material, or an object using a shared attribute
+    emission material — then its own "emission_strength" property is keyed.
+    """
+    if isinstance(target, bpy.types.Object):
+        insert_key(target, f'["{EMISSION_STRENGTH_ATTRIBUTE}"]', strength, frame)
+        return
+    emission_node = _emission_node(target)
     if emission_node is None:
         return
-    emission_node.inputs["Strength"].default_value = strength
-    emission_node.inputs["Strength"].keyframe_insert("default_value", frame=frame)
+    insert_key(emission_node.inputs["Strength"], "default_value", strength, frame)
 
 
-def kf_emission_color(mat, r, g, b, a, frame):
-    """Keyframe the RGBA color of an emission material."""
-    emission_node = None
-    for node in mat.node_tree.nodes:
-        if node.type == 'EMISSION':
-            emission_node = node
-            break
+def kf_emission_color(target, r, g, b, a, frame):
+    """Keyframe the RGBA emission color of a material, or of an object (see kf_emission_strength)."""
+    if isinstance(target, bpy.types.Object):
+        insert_key(target, f'["{EMISSION_COLOR_ATTRIBUTE}"]', (r, g, b, a), frame)
+        return
+    emission_node = _emission_node(target)
     if emission_node is None:
         return
-    emission_node.inputs["Color"].default_value = (r, g, b, a)
-    emission_node.inputs["Color"].keyframe_insert("default_value", frame=frame)
+    insert_key(emission_node.inputs["Color"], "default_value", (r, g, b, a), frame)
 
 
 def kf_ortho_scale(camera, scale, frame):
     """Keyframe the orthographic scale of a camera."""
-    camera.data.ortho_scale = scale
-    camera.data.keyframe_insert(data_path="ortho_scale", frame=frame)
+    insert_key(camera.data, "ortho_scale", scale, frame)
 
 
 # ══════════════════════════════════════════════════════════════
@@ -194,23 +200,17 @@ def orbit_single(obj, center_x, center_y, frame_start, frame_end,
 
 def set_all_linear_interpolation():
     """
-    Set all object and material F-Curves to LINEAR interpolation.
+    Set all object, camera, material and node group F-Curves to LINEAR
+    interpolation.
     The easing is baked into the keyframe values, so Blender's
     built-in interpolation should be linear.
     """
-    for obj in bpy.data.objects:
-        if obj.animation_data and obj.animation_data.action:
-            if hasattr(obj.animation_data.action, "fcurves"):
-                for fcurve in obj.animation_data.action.fcurves:
-                    for kp in fcurve.keyframe_points:
-                        kp.interpolation = 'LINEAR'
-
-    for mat in bpy.data.materials:
-        if mat.node_tree and mat.node_tree.animation_data and mat.node_tree.animation_data.action:
-            if hasattr(mat.node_tree.animation_data.action, "fcurves"):
-                for fcurve in mat.node_tree.animation_data.action.fcurves:
-                    for kp in fcurve.keyframe_points:
-                        kp.interpolation = 'LINEAR'
+    animated = list(bpy.data.objects) + list(bpy.data.cameras) + list(bpy.data.node_groups)
+    animated += [mat.node_tree for mat in bpy.data.materials if mat.node_tree]
+    for id_data in animated:
+        for fcurve in get_fcurves(id_data):
+            for kp in fcurve.keyframe_points:
+                kp.interpolation = 'LINEAR'
 
 
 # ══════════════════════════════════════════════════════════════
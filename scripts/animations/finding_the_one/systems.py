@@ -3,21 +3,40 @@ Finding the One — Visual Systems.
 Scrolling camera, emission curves, background management, ortho scale.
 Updated for extended timeline with Gap.
 """
-import bpy
 import math
 
-from scripts.utils.materials import create_emission_material, assign_material
-from scripts.utils.animation import lerp, ease_in_out_cubic
+import numpy as np
+
+from scripts.utils.materials import (
+    create_emission_material, create_attribute_emission_material,
+    set_emission_attributes, assign_material, EMISSION_STRENGTH_ATTRIBUTE,
+)
+from scripts.utils.primitives import create_primitive, link_objects
+from scripts.utils.spatial import build_axis_index, range_bounds
+from scripts.utils.instancing import (
+    create_point_carrier, create_baked_carrier, add_geometry_nodes, new_geometry_tree,
+    node, connect, math_node, named_attribute, keyable_value, baked_position,
+)
+from scripts.utils.animation import lerp, ease_in_out_cubic, world_xy_at
+from scripts.utils.swarm import create_swarm, simulate_swarm
+from scripts.utils.keying import insert_key
+from scripts.utils.workbench import FLAT_STRENGTH_PROPERTY
 
 from scripts.animations.finding_the_one.config import (
     FRAME_START, FRAME_END, FPS,
     CAMERA_HEIGHT, VISIBLE_HALF_WIDTH, SEEKER_SIZE,
     ORTHO_NORMAL, BG_TRI_EMISSION,
-    SEEKER_EMISSION_CURVE, BG_DENSITY_CURVE,
+    SEEKER_EMISSION_CURVE, BG_DENSITY_CURVE, SHARED_AMBIENT_MATERIALS,
+    BG_TRI_SIZE, BG_TRI_COUNT, DUST_COUNT,
+    BG_TRI_EXCLUSION_Y, BG_TRI_FILL_GRAY_MIN, BG_TRI_FILL_GRAY_MAX,
+    BG_POOL_SIZE, BG_RECYCLE_MARGIN, AMBIENT_CULL_PAD,
+    SWARM_COUNT, SWARM_TRI_SIZE, SWARM_HALF_HEIGHT, SWARM_AVOID_RADIUS,
+    SWARM_SIM_STEP, SWARM_BAKE_STEP,
 )
 from scripts.animations.finding_the_one.helpers import (
-    kf_loc, kf_scale, kf_emission_strength, kf_ortho_scale,
+    kf_scale, kf_emission_strength, kf_ortho_scale,
 )
+from scripts.animations.finding_the_one.characters import background_triangle_layout
 
 
 # ══════════════════════════════════════════════════════════════
@@ -105,8 +124,7 @@ def build_scroll_schedule():
 def setup_scrolling_camera(camera, seeker_world_positions):
     for f in range(FRAME_START, FRAME_END + 1):
         world_x = seeker_world_positions.get(f, 0)
-        camera.location = (world_x, 0, CAMERA_HEIGHT)
-        camera.keyframe_insert(data_path="location", frame=f)
+        insert_key(camera, "location", (world_x, 0, CAMERA_HEIGHT), f)
 
 
 # ══════════════════════════════════════════════════════════════
@@ -124,6 +142,46 @@ def apply_seeker_emission_curve(seeker_mat):
             kf_emission_strength(seeker_mat, emission, f)
 
 
+# ══════════════════════════════════════════════════════════════
+#  ON-SCREEN CULLING
+# ══════════════════════════════════════════════════════════════
+#
+# Ambient motion only matters while a shape is on screen. These work out,
+# from the scroll schedule (the camera follows seeker_world_positions) and
+# the ortho scale, the frames each shape can be seen in, so the ambient
+# loops key motion there and hold a single key everywhere else.
+
+def on_screen_intervals(offset_at, reach=0.0, pad=AMBIENT_CULL_PAD):
+    """
+    Frame intervals in which something is within the camera's view.
+
+    Args:
+        offset_at: function(frame) -> its world X minus the camera's
+        reach: How far it extends either side of that X
+        pad: Frames added to both ends of every interval
+    Returns sorted, non-overlapping inclusive (start, end) intervals.
+    """
+    intervals = []
+    for f in range(FRAME_START, FRAME_END + 1):
+        if abs(offset_at(f)) > visible_half_width_at(f) + reach:
+            continue
+        start, end = max(FRAME_START, f - pad), min(FRAME_END, f + pad)
+        if intervals and start <= intervals[-1][1] + 1:
+            intervals[-1][1] = end
+        else:
+            intervals.append([start, end])
+    return [tuple(interval) for interval in intervals]
+
+
+def culled_frames(frames, intervals):
+    """
+    The frames that fall inside the intervals, or just the first frame if
+    none do (one key holds the shape where it is while unseen).
+    """
+    kept = [f for f in frames if any(start <= f <= end for start, end in intervals)]
+    return kept or list(frames)[:1]
+
+
 # ══════════════════════════════════════════════════════════════
 #  BACKGROUND TRIANGLE MANAGEMENT
 # ══════════════════════════════════════════════════════════════
@@ -139,11 +197,41 @@ def _interp_density(frame):
     return curve[-1][1]
 
 
-def animate_background_triangles(bg_triangles, seeker_world_positions):
-    sorted_tris = sorted(bg_triangles, key=lambda t: t[2])
-    tri_target_emission = {}
-    for obj, mat, wx, wy in sorted_tris:
-        tri_target_emission[id(obj)] = 0.0
+def _background_bob_params(count, seed=99):
+    """(rot_speed, drift_radius, drift_speed_x, drift_speed_y, phase_x, phase_y) per triangle."""
+    import random
+    random.seed(seed)
+    return [
+        (
+            random.uniform(-0.02, 0.02),
+            random.uniform(0.3, 0.8),
+            random.uniform(0.005, 0.015),
+            random.uniform(0.005, 0.015),
+            random.uniform(0, 2 * math.pi),
+            random.uniform(0, 2 * math.pi),
+        )
+        for _ in range(count)
+    ]
+
+
+def animate_background_triangles(bg_triangles, seeker_world_positions, ambient=1.0):
+    """
+    Key background density (emission) and the ambient rotation/bob.
+
+    Density is sampled every 5th frame: the first `density` triangles (in
+    world X order) inside the camera window are lit. Emission is keyed only
+    where a triangle switches on or off — its old value at the previous
+    sample and its new one at this sample — which draws the same curve as
+    keying every triangle at every sample.
+
+    `ambient` scales the rotation/bob detail: 1.0 keys every 3rd frame,
+    lower values key less often, 0.0 leaves the triangles still. The
+    rotation/bob is keyed only while each triangle is on screen.
+    """
+    index = build_axis_index(bg_triangles, key=lambda t: t[2])
+    mats = [mat for _, mat, _, _ in index["items"]]
+    lit = set()  # positions in index["items"]
+    prev_f = None
 
     for f in range(FRAME_START, FRAME_END + 1):
         if f % 5 != 0 and f != FRAME_START: 
@@ -151,50 +239,52 @@ def animate_background_triangles(bg_triangles, seeker_world_positions):
 
         cam_x = seeker_world_positions.get(f, 0)
         target_density = _interp_density(f)
-        view_left = cam_x - VISIBLE_HALF_WIDTH - 2
-        view_right = cam_x + VISIBLE_HALF_WIDTH + 2
-
-        visible_count = 0
-        for obj, mat, wx, wy in sorted_tris:
-            in_view = view_left <= wx <= view_right
-
-            if in_view and visible_count < target_density:
-                visible_count += 1
-                kf_emission_strength(mat, BG_TRI_EMISSION, f)
-            else:
-                kf_emission_strength(mat, 0.0, f)
+        start, stop = range_bounds(
+            index, cam_x - VISIBLE_HALF_WIDTH - 2, cam_x + VISIBLE_HALF_WIDTH + 2,
+        )
+        now = set(range(start, min(stop, start + math.ceil(target_density))))
 
-    import random
-    random.seed(99)
-    for obj, mat, wx, wy in bg_triangles:
-        rot_speed = random.uniform(-0.02, 0.02)
-        drift_radius = random.uniform(0.3, 0.8)
-        drift_speed_x = random.uniform(0.005, 0.015)
-        drift_speed_y = random.uniform(0.005, 0.015)
-        phase_x = random.uniform(0, 2 * math.pi)
-        phase_y = random.uniform(0, 2 * math.pi)
-
-        for f in range(FRAME_START, FRAME_END + 1, 3):
+        if prev_f is None:
+            for i, mat in enumerate(mats):
+                kf_emission_strength(mat, BG_TRI_EMISSION if i in now else 0.0, f)
+        else:
+            for i in now ^ lit:
+                kf_emission_strength(mats[i], BG_TRI_EMISSION if i in lit else 0.0, prev_f)
+                kf_emission_strength(mats[i], BG_TRI_EMISSION if i in now else 0.0, f)
+        lit = now
+        prev_f = f
+
+    if ambient <= 0:
+        return
+    bob_step = max(3, round(3 / ambient))
+
+    bob = _background_bob_params(len(bg_triangles))
+    for (obj, mat, wx, wy), params in zip(bg_triangles, bob):
+        rot_speed, drift_radius, drift_speed_x, drift_speed_y, phase_x, phase_y = params
+
+        # Only while on screen (the pad covers the key grid either side)
+        on_screen = on_screen_intervals(
+            lambda f: wx + drift_radius * math.sin(drift_speed_x * f + phase_x)
+            - seeker_world_positions.get(f, 0),
+            reach=BG_TRI_SIZE, pad=max(AMBIENT_CULL_PAD, bob_step),
+        )
+        for f in culled_frames(range(FRAME_START, FRAME_END + 1, bob_step), on_screen):
             angle = rot_speed * f
-            obj.rotation_euler[2] = angle
-            obj.keyframe_insert(data_path="rotation_euler", index=2, frame=f)
+            insert_key(obj, "rotation_euler", angle, f, index=2)
 
             bob_x = drift_radius * math.sin(drift_speed_x * f + phase_x)
             bob_y = drift_radius * math.cos(drift_speed_y * f + phase_y)
-            obj.location[0] = wx + bob_x
-            obj.location[1] = wy + bob_y
-            obj.keyframe_insert(data_path="location", index=0, frame=f)
-            obj.keyframe_insert(data_path="location", index=1, frame=f)
+            insert_key(obj, "location", wx + bob_x, f, index=0)
+            insert_key(obj, "location", wy + bob_y, f, index=1)
 
 
 # ══════════════════════════════════════════════════════════════
 #  ORTHOGRAPHIC SCALE ANIMATION
 # ══════════════════════════════════════════════════════════════
 
-def apply_ortho_scale_shifts(camera, scale_keyframes):
-    # Updated keyframes for new timeline
-    # 2460 -> 3250 Act 3 Ends
-    new_kf = [
+# Updated keyframes for new timeline
+# 2460 -> 3250 Act 3 Ends
+ORTHO_SCALE_KEYS = [
         (1,    20),
         (880,  18),    # Act 1 Encounter
         (1300, 20),    # Act 1 End / Recovery
@@ -204,55 +294,103 @@ def apply_ortho_scale_shifts(camera, scale_keyframes):
         (3640, 16),    # The Click (Act 3 End, +290)
         (3840, 20),    # (+290)
         (4140, 24),    # End (+290)
-    ]
-    
-    for i in range(len(new_kf) - 1):
-        f0, s0 = new_kf[i]
-        f1, s1 = new_kf[i + 1]
-        for f in range(f0, f1 + 1):
-            t = (f - f0) / max(f1 - f0, 1)
-            scale = lerp(s0, s1, ease_in_out_cubic(t))
-            kf_ortho_scale(camera, scale, f)
+]
+
+
+def ortho_scale_at(frame):
+    """The camera's ortho scale at a frame (eased between ORTHO_SCALE_KEYS)."""
+    keys = ORTHO_SCALE_KEYS
+    for i in range(len(keys) - 1):
+        f0, s0 = keys[i]
+        f1, s1 = keys[i + 1]
+        if f0 <= frame <= f1:
+            t = (frame - f0) / max(f1 - f0, 1)
+            return lerp(s0, s1, ease_in_out_cubic(t))
+    return keys[0][1] if frame < keys[0][0] else keys[-1][1]
+
+
+def visible_half_width_at(frame):
+    """Half the visible world width at a frame — VISIBLE_HALF_WIDTH at ORTHO_NORMAL."""
+    return VISIBLE_HALF_WIDTH * ortho_scale_at(frame) / ORTHO_NORMAL
+
+
+def apply_ortho_scale_shifts(camera, scale_keyframes):
+    for f in range(ORTHO_SCALE_KEYS[0][0], ORTHO_SCALE_KEYS[-1][0] + 1):
+        kf_ortho_scale(camera, ortho_scale_at(f), f)
 
 
 # ══════════════════════════════════════════════════════════════
 #  PARTICLE DUST (Ambient atmosphere)
 # ══════════════════════════════════════════════════════════════
 
-def animate_particle_dust(seeker_world_positions, camera):
-    """Create and animate ultra-dim particle dust across the void."""
+def _dust_params(count, seed=42):
+    """
+    (gray, base_world_x_offset, base_y, drift_speed_x, drift_speed_y,
+    wobble_freq, wobble_amp) per particle. Deterministic for consistency.
+    """
     import random as _rng
-    _rng.seed(42)  # Deterministic for consistency
+    _rng.seed(seed)
+    return [
+        (
+            _rng.uniform(0.2, 0.5),
+            _rng.uniform(-8, 20),        # Scattered along path
+            _rng.uniform(-4.0, 4.0),
+            _rng.uniform(-0.001, 0.001),   # Even slower drift
+            _rng.uniform(0.0005, 0.002),   # Barely moving up
+            _rng.uniform(0.02, 0.05),      # Much lower frequency (slower bounce)
+            _rng.uniform(0.02, 0.08),      # Much lower amplitude (less bounce)
+        )
+        for _ in range(count)
+    ]
+
+
+def animate_particle_dust(seeker_world_positions, camera, ambient=1.0):
+    """
+    Create and animate ultra-dim particle dust across the void.
 
-    NUM_PARTICLES = 25
+    The particles are parented to the camera and move only while on screen.
+    `ambient` scales the particle count (0.0 skips the dust entirely).
+    """
+    NUM_PARTICLES = round(DUST_COUNT * ambient)
     particles = []
+    if NUM_PARTICLES <= 0:
+        return particles
 
-    for i in range(NUM_PARTICLES):
+    # Every particle fades together, so a shared material keys strength once per frame
+    shared_mat = None
+    if SHARED_AMBIENT_MATERIALS:
+        shared_mat = create_attribute_emission_material("DustMat", strength=0.0)
+
+    for i, params in enumerate(_dust_params(NUM_PARTICLES)):
         name = f"Dust_{i}"
-        gray = _rng.uniform(0.2, 0.5)
-        mat = create_emission_material(
-            f"{name}Mat", color=(gray, gray, gray, 1), strength=0.0
-        )
-        # Tiny plane
-        bpy.ops.mesh.primitive_plane_add(size=0.06, location=(0, 0, -0.01))
-        obj = bpy.context.active_object
-        obj.name = name
+        gray = params[0]
+        # Tiny plane, all sharing one mesh; linked as a batch below
+        obj = create_primitive(name, "plane", 0.06, location=(0, 0, -0.01), link=False)
+        if shared_mat is not None:
+            set_emission_attributes(obj, color=(gray, gray, gray, 1))
+            mat = shared_mat
+        else:
+            mat = create_emission_material(
+                f"{name}Mat", color=(gray, gray, gray, 1), strength=0.0
+            )
         assign_material(obj, mat)
 
-        # Random drift parameters
-        base_world_x_offset = _rng.uniform(-8, 20)  # Scattered along path
-        base_y = _rng.uniform(-4.0, 4.0)
-        drift_speed_x = _rng.uniform(-0.001, 0.001)  # Even slower drift
-        drift_speed_y = _rng.uniform(0.0005, 0.002)   # Barely moving up
-        wobble_freq = _rng.uniform(0.02, 0.05)       # Much lower frequency (slower bounce)
-        wobble_amp = _rng.uniform(0.02, 0.08)        # Much lower amplitude (less bounce)
-        particles.append((obj, mat, base_world_x_offset, base_y,
-                          drift_speed_x, drift_speed_y, wobble_freq, wobble_amp))
+        particles.append((obj, mat) + params[1:])
+    link_objects([p[0] for p in particles])
+
+    # Each particle sits at a fixed offset from the camera plus its drift, so
+    # key it in the camera's space: its X offset is linear in the frame, and
+    # a culled stretch interpolates exactly along the offsets it really has
+    for obj, *_ in particles:
+        obj.parent = camera
+    frames = range(FRAME_START, FRAME_END + 1)
+    keyed = [
+        set(culled_frames(frames, on_screen_intervals(lambda f: bxo + dsx * f, reach=0.03)))
+        for _, _, bxo, _, dsx, _, _, _ in particles
+    ]
 
     # Animate
     for f in range(FRAME_START, FRAME_END + 1):
-        wx = seeker_world_positions.get(f, 0)
-
         # Emission follows bg density curve (fade during Valley)
         em_base = 0.08
         for j in range(len(BG_DENSITY_CURVE) - 1):
@@ -264,10 +402,397 @@ def animate_particle_dust(seeker_world_positions, camera):
                 em_base = 0.08 * density
                 break
 
-        for obj, mat, bxo, by, dsx, dsy, wf, wa in particles:
-            x = wx + bxo + dsx * f
+        if shared_mat is not None:
+            kf_emission_strength(shared_mat, em_base, f)
+        for (obj, mat, bxo, by, dsx, dsy, wf, wa), frames_keyed in zip(particles, keyed):
+            if f not in frames_keyed:
+                continue
+            x = bxo + dsx * f
             y = by + dsy * f * 0.1 + wa * math.sin(f * wf)
-            kf_loc(obj, x, y, f)
-            kf_emission_strength(mat, em_base, f)
+            insert_key(obj, "location", (x, y, -CAMERA_HEIGHT), f)
+            if shared_mat is None:
+                kf_emission_strength(mat, em_base, f)
 
     return particles
+
+
+# ══════════════════════════════════════════════════════════════
+#  INSTANCED FIELDS (BG_FIELD_MODE = "instances")
+# ══════════════════════════════════════════════════════════════
+#
+# The background field and the dust as one Geometry Nodes carrier each.
+# Per-shape parameters are point attributes; position, rotation and
+# brightness are worked out in the node tree from the scene frame and the
+# camera's location (which tracks seeker_world_positions), so nothing is
+# keyed per shape. Only a "Density" value following BG_DENSITY_CURVE is keyed.
+
+def _key_density(density):
+    """Key a tree's Density value at the BG_DENSITY_CURVE points (linear between)."""
+    for f, d in BG_DENSITY_CURVE:
+        insert_key(density, "default_value", float(d), f)
+
+
+def _camera_x(tree, camera):
+    location = node(tree, 'GeometryNodeObjectInfo', {"Object": camera}).outputs["Location"]
+    return node(tree, 'ShaderNodeSeparateXYZ', {0: location}).outputs["X"]
+
+
+def _bob_params_attributes(bob):
+    """Point attributes for _background_bob_params() tuples."""
+    return {
+        "rot_speed": [p[0] for p in bob],
+        "drift_radius": [p[1] for p in bob],
+        "drift_speed_x": [p[2] for p in bob],
+        "drift_speed_y": [p[3] for p in bob],
+        "phase_x": [p[4] for p in bob],
+        "phase_y": [p[5] for p in bob],
+    }
+
+
+def _bob_offset(tree, frame, motion):
+    """Bob: drift_radius * (sin, cos)(speed * frame + phase), scaled by Motion."""
+    def wave(func, speed, phase):
+        angle = math_node(tree, 'MULTIPLY_ADD', named_attribute(tree, speed), frame)
+        connect(tree, angle.node.inputs[2], named_attribute(tree, phase))
+        radius = math_node(tree, 'MULTIPLY', named_attribute(tree, "drift_radius"), motion)
+        return math_node(tree, 'MULTIPLY', math_node(tree, func, angle), radius)
+
+    return node(tree, 'ShaderNodeCombineXYZ', {
+        0: wave('SINE', "drift_speed_x", "phase_x"),
+        1: wave('COSINE', "drift_speed_y", "phase_y"),
+    }).outputs[0]
+
+
+def _instance_triangles(tree, points, frame, motion, angle, group_out, size=BG_TRI_SIZE):
+    """
+    Instance a background triangle `size` wide on `points` and wire it to
+    the output.
+
+    Rotation is rot_speed * frame while moving, `angle` when still. The
+    circle's first vertex is on +X; a quarter turn puts the apex on +Y.
+    """
+    spin = math_node(tree, 'MULTIPLY', math_node(tree, 'MULTIPLY', named_attribute(tree, "rot_speed"), frame), motion)
+    still = math_node(tree, 'MULTIPLY', angle, math_node(tree, 'SUBTRACT', 1.0, motion))
+    rotation = node(tree, 'ShaderNodeCombineXYZ', {
+        2: math_node(tree, 'ADD', math_node(tree, 'ADD', spin, still), math.pi / 2),
+    }).outputs[0]
+
+    triangle = node(tree, 'GeometryNodeMeshCircle',
+                    {"Vertices": 3, "Radius": size / math.sqrt(3)}, fill_type='NGON')
+    material = create_attribute_emission_material("BgFieldMat", attribute_type='INSTANCER')
+    shaped = node(tree, 'GeometryNodeSetMaterial',
+                  {"Geometry": triangle.outputs["Mesh"], "Material": material})
+    instances = node(tree, 'GeometryNodeInstanceOnPoints', {
+        "Points": points,
+        "Instance": shaped.outputs[0],
+        "Rotation": rotation,
+    })
+    tree.links.new(instances.outputs[0], group_out.inputs[0])
+
+
+def create_background_field(camera, count=BG_TRI_COUNT, seed=42):
+    """
+    Create the background triangles as one instancing carrier object.
+
+    Same layout, colours and motion parameters as create_background_triangles().
+    Visibility matches animate_background_triangles(): sorted by world X,
+    the first `density` triangles within view of the camera light up.
+    Returns the carrier; animate it with animate_background_field().
+    """
+    # Paired up in creation order (as the per-object field does), then sorted by X
+    pairs = sorted(
+        zip(background_triangle_layout(count, seed), _background_bob_params(count)),
+        key=lambda pair: pair[0][0],
+    )
+    layout = [tri for tri, _ in pairs]
+    bob = [params for _, params in pairs]
+    field = create_point_carrier(
+        "BgField",
+        [(wx, wy, -0.01) for wx, wy, _, _ in layout],
+        {
+            "emission_color": [(g, g, g, 1.0) for _, _, g, _ in layout],
+            "angle": [angle for _, _, _, angle in layout],
+            **_bob_params_attributes(bob),
+        },
+    )
+
+    tree, group_in, group_out = new_geometry_tree("BgFieldNodes")
+    frame = node(tree, 'GeometryNodeInputSceneTime').outputs["Frame"]
+    density = keyable_value(tree, "Density")
+    motion = keyable_value(tree, "Motion", 1.0)
+
+    # Brightness: in view of the camera, and among the first `density` such
+    # triangles by world X (points are stored in X order)
+    x = node(tree, 'ShaderNodeSeparateXYZ',
+             {0: node(tree, 'GeometryNodeInputPosition').outputs[0]}).outputs["X"]
+    distance = math_node(tree, 'ABSOLUTE', math_node(tree, 'SUBTRACT', x, _camera_x(tree, camera)))
+    in_view = math_node(tree, 'LESS_THAN', distance, VISIBLE_HALF_WIDTH + 2 + 1e-4)
+    seen_before = node(tree, 'GeometryNodeAccumulateField', {0: in_view},
+                       data_type='FLOAT', domain='POINT').outputs["Trailing"]
+    lit = math_node(tree, 'MULTIPLY', in_view, math_node(tree, 'LESS_THAN', seen_before, density))
+    stored = node(tree, 'GeometryNodeStoreNamedAttribute', {
+        "Geometry": group_in.outputs[0],
+        "Name": EMISSION_STRENGTH_ATTRIBUTE,
+        "Value": math_node(tree, 'MULTIPLY', lit, BG_TRI_EMISSION),
+    }, data_type='FLOAT', domain='POINT')
+
+    moved = node(tree, 'GeometryNodeSetPosition',
+                 {"Geometry": stored.outputs[0], "Offset": _bob_offset(tree, frame, motion)})
+    _instance_triangles(tree, moved.outputs[0], frame, motion,
+                        named_attribute(tree, "angle"), group_out)
+
+    add_geometry_nodes(field, tree)
+    field[FLAT_STRENGTH_PROPERTY] = BG_TRI_EMISSION
+    return field
+
+
+def _hash01(tree, index, cycle, salt):
+    """Deterministic pseudo-random 0..1 per (index, cycle) — fract(sin(n) * 43758.5453)."""
+    seed = math_node(tree, 'MULTIPLY_ADD', index, 78.233)
+    connect(tree, seed.node.inputs[2], salt)
+    n = math_node(tree, 'MULTIPLY_ADD', cycle, 12.9898)
+    connect(tree, n.node.inputs[2], seed)
+    return math_node(tree, 'FRACT', math_node(tree, 'MULTIPLY', math_node(tree, 'SINE', n), 43758.5453))
+
+
+def create_background_ring(camera, pool_size=BG_POOL_SIZE, seed=7):
+    """
+    Create a recycled background field: a fixed pool of triangles that
+    wraps around the camera.
+
+    Each triangle keeps its spot in the world until it scrolls off the left
+    edge of a window VISIBLE_HALF_WIDTH + BG_RECYCLE_MARGIN either side of
+    the camera, then reappears at the right edge with a new height, angle
+    and shade chosen from how many times it has wrapped. Size, memory and
+    keys stay the same however long the world is; density works as in the
+    scattered field (the first `density` of the pool light up).
+    Returns the carrier; animate it with animate_background_field().
+    """
+    import random
+    random.seed(seed)
+    half_span = VISIBLE_HALF_WIDTH + BG_RECYCLE_MARGIN
+    span = 2 * half_span
+    # Evenly spaced around the ring with jitter, in shuffled order so the lit
+    # first-N triangles spread across the window instead of bunching up
+    slots = list(range(pool_size))
+    random.shuffle(slots)
+    ring = [(slot + random.uniform(0.1, 0.9)) * span / pool_size for slot in slots]
+
+    field = create_point_carrier(
+        "BgRing",
+        [(u, 0, -0.01) for u in ring],
+        _bob_params_attributes(_background_bob_params(pool_size)),
+    )
+
+    tree, group_in, group_out = new_geometry_tree("BgRingNodes")
+    frame = node(tree, 'GeometryNodeInputSceneTime').outputs["Frame"]
+    density = keyable_value(tree, "Density")
+    motion = keyable_value(tree, "Motion", 1.0)
+    index = node(tree, 'GeometryNodeInputIndex').outputs[0]
+
+    # Ring position → world X, and how many times this triangle has wrapped
+    u = node(tree, 'ShaderNodeSeparateXYZ',
+             {0: node(tree, 'GeometryNodeInputPosition').outputs[0]}).outputs["X"]
+    left = math_node(tree, 'SUBTRACT', _camera_x(tree, camera), half_span)
+    along = math_node(tree, 'SUBTRACT', u, left)
+    cycle = math_node(tree, 'FLOOR', math_node(tree, 'DIVIDE', along, span))
+    world_x = math_node(tree, 'ADD', left, math_node(tree, 'FLOORED_MODULO', along, span))
+
+    # New height (outside the protagonist's band), shade and angle per wrap
+    side = math_node(tree, 'SUBTRACT', math_node(tree, 'MULTIPLY', _hash01(tree, index, cycle, 1.0), 2.0), 1.0)
+    reach = math_node(tree, 'MULTIPLY_ADD', math_node(tree, 'ABSOLUTE', side), 4.5 - BG_TRI_EXCLUSION_Y)
+    connect(tree, reach.node.inputs[2], BG_TRI_EXCLUSION_Y)
+    world_y = math_node(tree, 'MULTIPLY', math_node(tree, 'SIGN', side), reach)
+    gray = math_node(tree, 'MULTIPLY_ADD', _hash01(tree, index, cycle, 2.0),
+                     BG_TRI_FILL_GRAY_MAX - BG_TRI_FILL_GRAY_MIN)
+    connect(tree, gray.node.inputs[2], BG_TRI_FILL_GRAY_MIN)
+    angle = math_node(tree, 'MULTIPLY', _hash01(tree, index, cycle, 3.0), 2 * math.pi)
+
+    colored = node(tree, 'GeometryNodeStoreNamedAttribute', {
+        "Geometry": group_in.outputs[0],
+        "Name": "emission_color",
+        "Value": node(tree, 'ShaderNodeCombineXYZ', {0: gray, 1: gray, 2: gray}).outputs[0],
+    }, data_type='FLOAT_COLOR', domain='POINT')
+    in_view = math_node(tree, 'LESS_THAN',
+                        math_node(tree, 'ABSOLUTE', math_node(tree, 'SUBTRACT', world_x, _camera_x(tree, camera))),
+                        VISIBLE_HALF_WIDTH + 2 + 1e-4)
+    lit = math_node(tree, 'MULTIPLY', in_view, math_node(tree, 'LESS_THAN', index, density))
+    stored = node(tree, 'GeometryNodeStoreNamedAttribute', {
+        "Geometry": colored.outputs[0],
+        "Name": EMISSION_STRENGTH_ATTRIBUTE,
+        "Value": math_node(tree, 'MULTIPLY', lit, BG_TRI_EMISSION),
+    }, data_type='FLOAT', domain='POINT')
+
+    moved = node(tree, 'GeometryNodeSetPosition', {
+        "Geometry": stored.outputs[0],
+        "Position": node(tree, 'ShaderNodeCombineXYZ', {0: world_x, 1: world_y, 2: -0.01}).outputs[0],
+        "Offset": _bob_offset(tree, frame, motion),
+    })
+    _instance_triangles(tree, moved.outputs[0], frame, motion, angle, group_out)
+
+    add_geometry_nodes(field, tree)
+    field[FLAT_STRENGTH_PROPERTY] = BG_TRI_EMISSION
+    return field
+
+
+def animate_background_field(field, ambient=1.0):
+    """
+    Key the field's density curve; `ambient` 0.0 holds every triangle still.
+    The instanced counterpart of animate_background_triangles().
+    """
+    tree = field.modifiers[0].node_group
+    tree.nodes["Motion"].outputs[0].default_value = 1.0 if ambient > 0 else 0.0
+    _key_density(tree.nodes["Density"].outputs[0])
+
+
+def animate_dust_field(seeker_world_positions, camera, ambient=1.0):
+    """
+    Create the particle dust as one instancing carrier object.
+
+    The instanced counterpart of animate_particle_dust(): same particles and
+    drift, positioned relative to the camera (which follows
+    seeker_world_positions) and faded by BG_DENSITY_CURVE inside the tree.
+    Returns [carrier], or [] when `ambient` leaves no particles.
+    """
+    params = _dust_params(round(DUST_COUNT * ambient))
+    if not params:
+        return []
+
+    field = create_point_carrier(
+        "DustField",
+        [(bxo, by, -0.01) for _, bxo, by, _, _, _, _ in params],
+        {
+            "emission_color": [(p[0], p[0], p[0], 1.0) for p in params],
+            "drift_speed_x": [p[3] for p in params],
+            "drift_speed_y": [p[4] for p in params],
+            "wobble_freq": [p[5] for p in params],
+            "wobble_amp": [p[6] for p in params],
+        },
+    )
+
+    tree, group_in, group_out = new_geometry_tree("DustFieldNodes")
+    frame = node(tree, 'GeometryNodeInputSceneTime').outputs["Frame"]
+    density = keyable_value(tree, "Density")
+
+    stored = node(tree, 'GeometryNodeStoreNamedAttribute', {
+        "Geometry": group_in.outputs[0],
+        "Name": EMISSION_STRENGTH_ATTRIBUTE,
+        "Value": math_node(tree, 'MULTIPLY', density, 0.08),
+    }, data_type='FLOAT', domain='POINT')
+
+    # x = camera x + drift_speed_x * f,  y += drift_speed_y * f * 0.1 + wobble
+    drift_x = math_node(tree, 'MULTIPLY', named_attribute(tree, "drift_speed_x"), frame)
+    rise = math_node(tree, 'MULTIPLY', math_node(tree, 'MULTIPLY', named_attribute(tree, "drift_speed_y"), frame), 0.1)
+    wobble = math_node(tree, 'MULTIPLY', named_attribute(tree, "wobble_amp"),
+                       math_node(tree, 'SINE', math_node(tree, 'MULTIPLY', frame, named_attribute(tree, "wobble_freq"))))
+    offset = node(tree, 'ShaderNodeCombineXYZ', {
+        0: math_node(tree, 'ADD', _camera_x(tree, camera), drift_x),
+        1: math_node(tree, 'ADD', rise, wobble),
+    }).outputs[0]
+    moved = node(tree, 'GeometryNodeSetPosition', {"Geometry": stored.outputs[0], "Offset": offset})
+
+    square = node(tree, 'GeometryNodeMeshGrid',
+                  {"Size X": 0.06, "Size Y": 0.06, "Vertices X": 2, "Vertices Y": 2})
+    material = create_attribute_emission_material("DustFieldMat", attribute_type='INSTANCER')
+    shaped = node(tree, 'GeometryNodeSetMaterial', {"Geometry": square.outputs["Mesh"], "Material": material})
+    instances = node(tree, 'GeometryNodeInstanceOnPoints',
+                     {"Points": moved.outputs[0], "Instance": shaped.outputs[0]})
+    tree.links.new(instances.outputs[0], group_out.inputs[0])
+
+    add_geometry_nodes(field, tree)
+    _key_density(density)
+    # Every particle shares one strength, so flat shading can follow it exactly
+    field[FLAT_STRENGTH_PROPERTY] = 0.0
+    for f, d in BG_DENSITY_CURVE:
+        insert_key(field, f'["{FLAT_STRENGTH_PROPERTY}"]', 0.08 * d, f)
+    return [field]
+
+
+# ══════════════════════════════════════════════════════════════
+#  SWARM FIELD (BG_FIELD_MODE = "swarm")
+# ══════════════════════════════════════════════════════════════
+#
+# The background as a crowd simulated with scripts/utils/swarm.py. Motion
+# comes from the simulation rather than scene time, so it is baked into the
+# carrier's mesh; brightness, wrapping and spin are still worked out in the
+# node tree, and Density is keyed by animate_background_field().
+
+def create_background_swarm(camera, seeker_world_positions, obstacles, count=SWARM_COUNT, seed=11):
+    """
+    Create the background as a simulated crowd of small triangles.
+
+    The crowd flocks loosely, parts around `obstacles` (the characters, read
+    from their finished location curves, so run this after the acts) and
+    wraps around a window VISIBLE_HALF_WIDTH + BG_RECYCLE_MARGIN either side
+    of the camera, which follows seeker_world_positions. Positions are
+    simulated once here and baked into the carrier every SWARM_BAKE_STEP
+    frames; the tree interpolates between them and wraps X per frame.
+    Density lights up the first Density / max(BG_DENSITY_CURVE) of the crowd.
+    Returns the carrier; animate it with animate_background_field().
+    """
+    rng = np.random.default_rng(seed)
+    half_span = VISIBLE_HALF_WIDTH + BG_RECYCLE_MARGIN
+    span = 2 * half_span
+    swarm = create_swarm(
+        np.column_stack([rng.uniform(-half_span, half_span, count),
+                         rng.uniform(-SWARM_HALF_HEIGHT, SWARM_HALF_HEIGHT, count)]),
+        rng.normal(0.0, 0.004, (count, 2)),
+    )
+
+    def camera_x(f):
+        return seeker_world_positions.get(min(f, FRAME_END), 0)
+
+    tracks = [world_xy_at(obj) for obj in obstacles]
+    # Simulate past FRAME_END to the next whole sample, so samples are evenly spaced
+    end = FRAME_START + math.ceil((FRAME_END - FRAME_START) / SWARM_BAKE_STEP) * SWARM_BAKE_STEP
+    frames, samples = simulate_swarm(
+        swarm, FRAME_START, end,
+        obstacles_at=lambda f: [(x(f), y(f), SWARM_AVOID_RADIUS) for x, y in tracks],
+        window_at=lambda f: (camera_x(f) - half_span, span),
+        step=SWARM_SIM_STEP, sample=SWARM_BAKE_STEP,
+    )
+    sample_step = frames[1] - frames[0]
+
+    gray = rng.uniform(BG_TRI_FILL_GRAY_MIN, BG_TRI_FILL_GRAY_MAX, count)
+    field = create_baked_carrier("BgSwarm", samples, {
+        "emission_color": np.column_stack([gray, gray, gray, np.ones(count)]),
+        "angle": rng.uniform(0, 2 * math.pi, count),
+        "rot_speed": rng.uniform(-0.02, 0.02, count),
+    }, z=-0.01)
+
+    tree, group_in, group_out = new_geometry_tree("BgSwarmNodes")
+    frame = node(tree, 'GeometryNodeInputSceneTime').outputs["Frame"]
+    density = keyable_value(tree, "Density")
+    motion = keyable_value(tree, "Motion", 1.0)
+    index = node(tree, 'GeometryNodeInputIndex').outputs[0]
+
+    sample = math_node(tree, 'DIVIDE', math_node(tree, 'SUBTRACT', frame, FRAME_START), sample_step)
+    crowd, position = baked_position(tree, group_in.outputs[0], count, len(frames), sample)
+
+    # Unwrapped X → back inside the window around the camera
+    xyz = node(tree, 'ShaderNodeSeparateXYZ', {0: position})
+    left = math_node(tree, 'SUBTRACT', _camera_x(tree, camera), half_span)
+    world_x = math_node(tree, 'ADD', left, math_node(
+        tree, 'FLOORED_MODULO', math_node(tree, 'SUBTRACT', xyz.outputs["X"], left), span))
+
+    in_view = math_node(tree, 'LESS_THAN',
+                        math_node(tree, 'ABSOLUTE', math_node(tree, 'SUBTRACT', world_x, _camera_x(tree, camera))),
+                        VISIBLE_HALF_WIDTH + 2 + 1e-4)
+    share = math_node(tree, 'MULTIPLY', density, count / max(d for _, d in BG_DENSITY_CURVE))
+    lit = math_node(tree, 'MULTIPLY', in_view, math_node(tree, 'LESS_THAN', index, share))
+    stored = node(tree, 'GeometryNodeStoreNamedAttribute', {
+        "Geometry": crowd,
+        "Name": EMISSION_STRENGTH_ATTRIBUTE,
+        "Value": math_node(tree, 'MULTIPLY', lit, BG_TRI_EMISSION),
+    }, data_type='FLOAT', domain='POINT')
+
+    moved = node(tree, 'GeometryNodeSetPosition', {
+        "Geometry": stored.outputs[0],
+        "Position": node(tree, 'ShaderNodeCombineXYZ', {0: world_x, 1: xyz.outputs["Y"], 2: -0.01}).outputs[0],
+    })
+    _instance_triangles(tree, moved.outputs[0], frame, motion,
+                        named_attribute(tree, "angle"), group_out, size=SWARM_TRI_SIZE)
+
+    add_geometry_nodes(field, tree)
+    field[FLAT_STRENGTH_PROPERTY] = BG_TRI_EMISSION
+    return field
@@ -4,6 +4,8 @@ Animation helpers — easing functions, keyframe utilities.
 import bpy
 import math
 
+from scripts.utils.keying import insert_key
+
 
 # ──────────────────────────────────────────────
 # Easing functions (t goes from 0.0 to 1.0)
@@ -84,22 +86,53 @@ def animate_property(obj, data_path, values, frame_start=1, frame_end=120, easin
 
         # Handle tuple values (e.g., location = (x, y, z))
         if isinstance(start_val, (tuple, list)):
-            prop = getattr(obj, data_path)
             for i in range(len(start_val)):
-                prop[i] = lerp(start_val[i], end_val[i], t)
-                obj.keyframe_insert(data_path=data_path, index=i, frame=frame)
+                insert_key(obj, data_path, lerp(start_val[i], end_val[i], t), frame, index=i)
         else:
-            setattr(obj, data_path, lerp(start_val, end_val, t))
-            obj.keyframe_insert(data_path=data_path, frame=frame)
+            insert_key(obj, data_path, lerp(start_val, end_val, t), frame)
 
 
 def set_keyframe(obj, data_path, value, frame, index=-1):
     """Set a single keyframe on a property at the given frame."""
     bpy.context.scene.frame_set(frame)
 
-    if index >= 0:
-        getattr(obj, data_path)[index] = value
-        obj.keyframe_insert(data_path=data_path, index=index, frame=frame)
-    else:
-        setattr(obj, data_path, value)
-        obj.keyframe_insert(data_path=data_path, frame=frame)
+    insert_key(obj, data_path, value, frame, index=index)
+
+
+def get_fcurves(id_data):
+    """
+    F-Curves animating a datablock (object, camera data, node tree).
+
+    Blender 4.4+ keeps F-Curves in a per-slot channelbag on layered actions;
+    older versions expose action.fcurves directly. Returns [] if not animated.
+    """
+    anim = getattr(id_data, "animation_data", None)
+    if anim is None or anim.action is None:
+        return []
+    action = anim.action
+
+    try:
+        from bpy_extras.anim_utils import action_get_channelbag_for_slot
+    except ImportError:
+        return list(action.fcurves)
+
+    channelbag = action_get_channelbag_for_slot(action, anim.action_slot)
+    return list(channelbag.fcurves) if channelbag is not None else []
+
+
+def channel_at(id_data, data_path, index, default):
+    """function(frame) -> the channel's animated value, or `default` if not animated."""
+    for fcurve in get_fcurves(id_data):
+        if fcurve.data_path == data_path and fcurve.array_index == index:
+            return fcurve.evaluate
+    return lambda frame: default
+
+
+def world_xy_at(obj):
+    """(x(frame), y(frame)) of an object's origin, following translating parents."""
+    x = channel_at(obj, "location", 0, obj.location.x)
+    y = channel_at(obj, "location", 1, obj.location.y)
+    if obj.parent is None:
+        return x, y
+    parent_x, parent_y = world_xy_at(obj.parent)
+    return (lambda f: x(f) + parent_x(f)), (lambda f: y(f) + parent_y(f))
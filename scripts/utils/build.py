@@ -0,0 +1,166 @@
+"""
+Build options — how much of a scene to build, and at what fidelity.
+
+Options are resolved from three places, later ones winning:
+  1. Defaults (the "final" tier)
+  2. Flags after "--" on the Blender command line (render.sh passes these)
+  3. Overrides set by the Script Watcher just before it re-executes a script
+"""
+import sys
+
+
+# ──────────────────────────────────────────────
+# Build tiers
+# ──────────────────────────────────────────────
+
+# key_step:              key every Nth frame of per-frame motion (run ends kept)
+# ambient:               0.0 skips ambient systems, 1.0 builds them in full
+# resolution_percentage: render resolution scale
+BUILD_TIERS = {
+    "draft": {
+        "key_step": 5,
+        "ambient": 0.0,
+        "resolution_percentage": 25,
+    },
+    "review": {
+        "key_step": 2,
+        "ambient": 0.5,
+        "resolution_percentage": 50,
+    },
+    "final": {
+        "key_step": 1,
+        "ambient": 1.0,
+        "resolution_percentage": 100,
+    },
+}
+
+DEFAULT_TIER = "final"
+
+
+# ──────────────────────────────────────────────
+# Option sources
+# ──────────────────────────────────────────────
+
+_overrides = {}
+_report = {"text": ""}
+
+
+def parse_build_args(argv=None):
+    """
+    Parse build flags from the arguments after "--".
+
+    Supports `--tier NAME`, `--profile NAME`, `--engine NAME`,
+    `--frames START-END`, `--workers N` (or the `--flag=value` forms) and
+    the `--incremental`, `--stream`, `--keep-frames`, `--flat-preview` and
+    `--lottie` switches. Unknown arguments are ignored so scripts can take their own
+    flags alongside these.
+    """
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+
+    options = {}
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        name, _, value = arg.partition("=")
+        if arg in ("--incremental", "--stream", "--keep-frames", "--flat-preview",
+                   "--lottie"):
+            options[arg[2:].replace("-", "_")] = True
+        elif name in ("--tier", "--profile", "--engine", "--frames", "--workers"):
+            if not value and i + 1 < len(argv):
+                i += 1
+                value = argv[i]
+            if name in ("--tier", "--profile", "--engine"):
+                options[name[2:]] = value
+            elif name == "--workers":
+                if value.isdigit() and int(value) > 0:
+                    options["workers"] = int(value)
+                else:
+                    print(f"⚠️  Ignoring --workers '{value}', expected a positive number")
+            else:
+                frames = parse_frame_range(value)
+                if frames is None:
+                    print(f"⚠️  Ignoring --frames '{value}', expected START-END")
+                else:
+                    options["frames"] = frames
+        i += 1
+    return options
+
+
+def parse_frame_range(text):
+    """Parse "START-END" (or a single frame) into an inclusive (start, end), or None."""
+    start, _, end = text.partition("-")
+    try:
+        start, end = int(start), int(end or start)
+    except ValueError:
+        return None
+    return (start, end) if start <= end else (end, start)
+
+
+def set_build_overrides(**options):
+    """Override build options for the next script run (used by the watcher)."""
+    _overrides.update({k: v for k, v in options.items() if v is not None})
+
+
+def clear_build_overrides():
+    """Forget any watcher overrides."""
+    _overrides.clear()
+
+
+def get_build_options():
+    """
+    Resolve the build options for this run.
+
+    Returns a dict with the tier name plus that tier's settings, e.g.
+    {"tier": "draft", "key_step": 5, "ambient": 0.0, ...}, the render options
+        profile: render profile setup_render() applies (RENDER_PROFILES in
+                 scripts/utils/scene.py)
+        engine:  RENDER_ENGINES name overriding the script's engine, or None
+        frames:  inclusive (start, end) to build and render, or None for all
+        workers: headless Blender processes to render with (1: render in
+                 this process)
+        incremental: render only frames whose content changed since the
+                 last render (see scripts/utils/frame_store.py)
+        stream:  encode the video while frames render (see
+                 scripts/utils/video_stream.py)
+        keep_frames: keep the streamed PNG sequence as well as the video
+        flat_preview: sample the scene and rasterise it with NumPy instead
+                 of rendering (see scripts/utils/flat_samples.py)
+        lottie:  export the scene as a Lottie animation instead of
+                 rendering (see scripts/utils/lottie.py)
+    and the watcher-only options:
+        staged:  True while the watcher builds into a fresh scene
+        memo:    dict kept between watcher builds for partial rebuilds
+        partial: True if only config files changed since the last build
+    """
+    options = {
+        "tier": DEFAULT_TIER, "profile": "final", "engine": None, "frames": None, "workers": 1,
+        "incremental": False, "stream": False, "keep_frames": False,
+        "flat_preview": False, "lottie": False,
+        "staged": False, "memo": None, "partial": False,
+    }
+    options.update(parse_build_args())
+    options.update(_overrides)
+
+    tier = options["tier"]
+    if tier not in BUILD_TIERS:
+        print(f"⚠️  Unknown build tier '{tier}', using '{DEFAULT_TIER}'")
+        tier = options["tier"] = DEFAULT_TIER
+
+    resolved = dict(BUILD_TIERS[tier])
+    resolved.update(options)
+    return resolved
+
+
+# ──────────────────────────────────────────────
+# Build report
+# ──────────────────────────────────────────────
+
+def set_build_report(text):
+    """Publish a one-line summary of what this build did (shown by the watcher)."""
+    _report["text"] = text
+
+
+def get_build_report():
+    """The summary published by the last build, or ""."""
+    return _report["text"]
@@ -0,0 +1,325 @@
+"""
+Flat samples — record a flat emission scene for the NumPy rasterizer.
+
+Every shape in a flat emission scene is a polygon with a colour, seen
+through a top-down orthographic camera. sample_flat_scene() reads the
+finished scene once and writes what each frame shows to a NumPy file:
+  - each shape's triangles, in its own coordinates,
+  - per frame, every lit shape's 2D transform and emission (colour ×
+    strength), and the camera's position and ortho scale.
+
+Objects are sampled from their F-Curves, all frames at once: linear and
+constant curves with np.interp / np.searchsorted, anything else through
+fcurve.evaluate(). Geometry Nodes fields compute their motion from scene
+time, so they are read from the evaluated instances frame by frame.
+
+scripts/utils/raster.py renders the file without Blender.
+
+Assumptions that hold for flat emission scenes: rotation about Z only, a
+camera that doesn't rotate, and emission that adds up on a black world.
+
+Usage (after everything is keyed):
+    sample_flat_scene("./output/finding_the_one_flat.npz")
+    render_flat_preview("./output/finding_the_one.mp4")   # samples, then rasterises
+"""
+import os
+import subprocess
+import sys
+
+import bpy
+import numpy as np
+
+from scripts.utils.animation import get_fcurves
+from scripts.utils.materials import EMISSION_COLOR_ATTRIBUTE, EMISSION_STRENGTH_ATTRIBUTE
+from scripts.utils.workbench import flat_color, field_tree, field_material
+
+
+# Shapes dimmer than this (max channel) or smaller (|det|) aren't stored
+MIN_EMISSION = 1e-4
+MIN_AREA = 1e-10
+
+
+# ──────────────────────────────────────────────
+# Sampling curves
+# ──────────────────────────────────────────────
+
+def sample_channel(id_data, data_path, index, default, frames):
+    """A channel's value on every frame of `frames` (float64 array)."""
+    frames = np.asarray(frames, dtype=np.float64)
+    fcurve = next((fc for fc in get_fcurves(id_data)
+                   if fc.data_path == data_path and fc.array_index == index), None)
+    if fcurve is None or len(fcurve.keyframe_points) == 0:
+        return np.full(len(frames), float(default))
+
+    points = fcurve.keyframe_points
+    interpolation = {kp.interpolation for kp in points[:-1]} or {'LINEAR'}
+    if fcurve.modifiers or fcurve.extrapolation != 'CONSTANT' or len(interpolation) > 1:
+        return np.array([fcurve.evaluate(f) for f in frames])
+    co = np.empty(len(points) * 2)
+    points.foreach_get("co", co)
+    x, y = co[0::2], co[1::2]
+    if interpolation == {'LINEAR'}:
+        return np.interp(frames, x, y)
+    if interpolation == {'CONSTANT'}:
+        return y[np.clip(np.searchsorted(x, frames, side="right") - 1, 0, len(y) - 1)]
+    return np.array([fcurve.evaluate(f) for f in frames])
+
+
+def render_hidden(obj, frames):
+    """
+    Bool per frame: is `obj` hidden from renders? Reads keyed hide_render
+    (scripts/utils/visibility.py) rather than whatever value it was left at.
+    """
+    return sample_channel(obj, "hide_render", 0, obj.hide_render, frames) > 0.5
+
+
+def _affine(matrix):
+    """2D affine (3×3) part of a 4×4 matrix."""
+    return np.array([
+        [matrix[0][0], matrix[0][1], matrix[0][3]],
+        [matrix[1][0], matrix[1][1], matrix[1][3]],
+        [0.0, 0.0, 1.0],
+    ])
+
+
+def world_matrices(obj, frames, cache=None):
+    """(F, 3, 3) 2D world transforms of `obj` over `frames`, through its parents."""
+    cache = {} if cache is None else cache
+    if obj.name in cache:
+        return cache[obj.name]
+    x = sample_channel(obj, "location", 0, obj.location.x, frames)
+    y = sample_channel(obj, "location", 1, obj.location.y, frames)
+    angle = sample_channel(obj, "rotation_euler", 2, obj.rotation_euler.z, frames)
+    sx = sample_channel(obj, "scale", 0, obj.scale.x, frames)
+    sy = sample_channel(obj, "scale", 1, obj.scale.y, frames)
+
+    cos, sin = np.cos(angle), np.sin(angle)
+    matrices = np.zeros((len(x), 3, 3))
+    matrices[:, 0, 0], matrices[:, 0, 1], matrices[:, 0, 2] = cos * sx, -sin * sy, x
+    matrices[:, 1, 0], matrices[:, 1, 1], matrices[:, 1, 2] = sin * sx, cos * sy, y
+    matrices[:, 2, 2] = 1.0
+    if obj.parent is not None:
+        parent = world_matrices(obj.parent, frames, cache) @ _affine(obj.matrix_parent_inverse)
+        matrices = parent @ matrices
+    cache[obj.name] = matrices
+    return matrices
+
+
+def emission_colors(obj, material, frames):
+    """(F, 3) emission colour × strength of `obj`, or None if it isn't emission-only."""
+    color = flat_color(obj, material)
+    if color is None:
+        return None
+    keys, color_at = color
+    if len(keys) < 2:
+        return np.tile(np.array(color_at(keys[0] if keys else frames[0])[:3]), (len(frames), 1))
+    # Keyed values run linearly between the key frames (as use_workbench_flat() keys them)
+    values = np.array([color_at(f)[:3] for f in keys])
+    return np.stack([np.interp(frames, keys, values[:, c]) for c in range(3)], axis=1)
+
+
+# ──────────────────────────────────────────────
+# Shapes
+# ──────────────────────────────────────────────
+
+def mesh_triangles(mesh):
+    """(T, 3, 2) triangles of a mesh's faces (fanned), in its own XY."""
+    co = np.empty(len(mesh.vertices) * 3)
+    mesh.vertices.foreach_get("co", co)
+    xy = co.reshape(-1, 3)[:, :2]
+    fan = [(poly.vertices[0], poly.vertices[k], poly.vertices[k + 1])
+           for poly in mesh.polygons for k in range(1, len(poly.vertices) - 1)]
+    return xy[np.array(fan, dtype=np.int64).reshape(-1, 3)]
+
+
+def _shape_index(shapes, triangles):
+    """Index of a shape in the shape table, adding it if new."""
+    key = np.round(triangles, 6).tobytes()
+    if key not in shapes:
+        shapes[key] = (len(shapes), triangles)
+    return shapes[key][0]
+
+
+def _mesh_of(reference):
+    """The mesh an instance reference draws, or None."""
+    if getattr(reference, "mesh", None) is not None:
+        return reference.mesh           # GeometrySet
+    data = getattr(reference, "data", None)
+    return data if isinstance(data, bpy.types.Mesh) else None
+
+
+# ──────────────────────────────────────────────
+# Fields
+# ──────────────────────────────────────────────
+
+def _read_attribute(points, name, width, prop, dtype=np.float32):
+    attribute = points.attributes.get(name)
+    if attribute is None:
+        return None
+    values = np.empty(len(attribute.data) * width, dtype=dtype)
+    attribute.data.foreach_get(prop, values)
+    return values.reshape(-1, width) if width > 1 else values
+
+
+def _field_items(carrier, depsgraph, shapes, fallback):
+    """(shape indices, (N, 3, 3) world transforms, (N, 3) emission) of a field's instances."""
+    evaluated = carrier.evaluated_get(depsgraph)
+    geometry = evaluated.evaluated_geometry()
+    points = geometry.instances_pointcloud()
+    if points is None or len(points.points) == 0:
+        return None
+    shape_of = []
+    for reference in geometry.instance_references():
+        mesh = _mesh_of(reference)
+        shape_of.append(_shape_index(shapes, mesh_triangles(mesh)) if mesh and len(mesh.polygons) else -1)
+
+    # Matrix attributes are stored column by column
+    transforms = _read_attribute(points, "instance_transform", 16, "value").reshape(-1, 4, 4).transpose(0, 2, 1)
+    reference = _read_attribute(points, ".reference_index", 1, "value", np.int32)
+    reference = np.zeros(len(transforms), dtype=np.int64) if reference is None else reference.astype(np.int64)
+    color = _read_attribute(points, EMISSION_COLOR_ATTRIBUTE, 4, "color")
+    strength = _read_attribute(points, EMISSION_STRENGTH_ATTRIBUTE, 1, "value")
+    if color is None or strength is None:
+        emission = np.tile(fallback, (len(transforms), 1))
+    else:
+        emission = color[:, :3] * strength[:, None]
+
+    local = np.zeros((len(transforms), 3, 3))
+    local[:, :2, :2], local[:, :2, 2], local[:, 2, 2] = transforms[:, :2, :2], transforms[:, :2, 3], 1.0
+    shape = np.array(shape_of, dtype=np.int64)[reference] if shape_of else np.full(len(local), -1)
+    return shape, _affine(evaluated.matrix_world) @ local, emission
+
+
+# ──────────────────────────────────────────────
+# Writing the file
+# ──────────────────────────────────────────────
+
+def sample_flat_scene(path, frame_start=None, frame_end=None, camera=None, fields=True):
+    """
+    Sample the scene's shapes, emission and camera on every frame to `path` (.npz).
+
+    Args:
+        path: NumPy file to write
+        frame_start, frame_end: Inclusive range (default: the scene's)
+        camera: The orthographic camera (default: the scene's)
+        fields: Also sample Geometry Nodes fields (a scene update per frame)
+    Returns the number of shapes drawn over all frames.
+    """
+    scene = bpy.context.scene
+    frame_start = scene.frame_start if frame_start is None else frame_start
+    frame_end = scene.frame_end if frame_end is None else frame_end
+    camera = camera or scene.camera
+    frames = np.arange(frame_start, frame_end + 1)
+    cache, shapes = {}, {}
+
+    # Objects: every frame at once, from their curves
+    shape_ids, matrices, colors, hidden = [], [], [], []
+    carriers = []
+    for obj in scene.objects:
+        if obj.type != 'MESH':
+            continue
+        obj_hidden = render_hidden(obj, frames)
+        if obj_hidden.all():
+            continue
+        if field_tree(obj) is not None:
+            carriers.append((obj, obj_hidden))
+            continue
+        if obj.active_material is None or not len(obj.data.polygons):
+            continue
+        emission = emission_colors(obj, obj.active_material, frames)
+        if emission is None:
+            continue
+        shape_ids.append(_shape_index(shapes, mesh_triangles(obj.data)))
+        matrices.append(world_matrices(obj, frames, cache))
+        colors.append(emission)
+        hidden.append(obj_hidden)
+
+    camera_xy = world_matrices(camera, frames, cache)[:, :2, 2]
+    ortho = sample_channel(camera.data, "ortho_scale", 0, camera.data.ortho_scale, frames)
+
+    if shape_ids:
+        matrices = np.stack(matrices, axis=1)               # (F, O, 3, 3)
+        colors = np.stack(colors, axis=1)                   # (F, O, 3)
+        lit = (colors.max(axis=2) > MIN_EMISSION) & (np.abs(np.linalg.det(matrices)) > MIN_AREA)
+        lit &= ~np.stack(hidden, axis=1)
+        shape_ids = np.array(shape_ids, dtype=np.int64)
+        per_frame = [[(shape_ids[lit[i]], matrices[i][lit[i]], colors[i][lit[i]])]
+                     for i in range(len(frames))]
+    else:
+        per_frame = [[] for _ in frames]
+
+    # Fields: evaluated instances, one scene update per frame
+    if fields and carriers:
+        current = scene.frame_current
+        fallbacks = {}
+        for carrier, _ in carriers:
+            material = field_material(field_tree(carrier)) or carrier.active_material
+            flat = emission_colors(carrier, material, frames) if material else None
+            fallbacks[carrier.name] = flat if flat is not None else np.ones((len(frames), 3))
+        for i, frame in enumerate(frames):
+            scene.frame_set(int(frame))
+            depsgraph = bpy.context.evaluated_depsgraph_get()
+            for carrier, carrier_hidden in carriers:
+                if carrier_hidden[i]:
+                    continue
+                items = _field_items(carrier, depsgraph, shapes, fallbacks[carrier.name][i])
+                if items is None:
+                    continue
+                shape, matrix, emission = items
+                lit = (shape >= 0) & (emission.max(axis=1) > MIN_EMISSION)
+                per_frame[i].append((shape[lit], matrix[lit], emission[lit]))
+        scene.frame_set(current)
+
+    counts = [sum(len(s) for s, _, _ in items) for items in per_frame]
+    offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+    def gather(k, shape, dtype):
+        parts = [part[k] for items in per_frame for part in items]
+        return np.concatenate(parts).astype(dtype) if parts else np.zeros(shape, dtype)
+
+    table = sorted(shapes.values(), key=lambda entry: entry[0])
+    counts_per_shape = np.array([len(tris) for _, tris in table], dtype=np.int64)
+    world = scene.world
+    background = np.zeros(3)
+    if world is not None and world.use_nodes:
+        node = next((n for n in world.node_tree.nodes if n.type == 'BACKGROUND'), None)
+        if node is not None:
+            background = np.array(node.inputs["Color"].default_value[:3]) * node.inputs["Strength"].default_value
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    np.savez_compressed(
+        path,
+        frames=frames,
+        fps=np.array(scene.render.fps),
+        resolution=np.array([scene.render.resolution_x, scene.render.resolution_y]),
+        background=background.astype(np.float32),
+        camera=np.column_stack([camera_xy, ortho]).astype(np.float32),
+        triangles=(np.concatenate([tris for _, tris in table]) if table else np.zeros((0, 3, 2))).astype(np.float32),
+        shape_start=np.cumsum(counts_per_shape) - counts_per_shape,
+        shape_count=counts_per_shape,
+        frame_offsets=offsets,
+        item_shape=gather(0, (0,), np.int32),
+        item_matrix=gather(1, (0, 3, 3), np.float32)[:, :2, :],
+        item_color=gather(2, (0, 3), np.float32),
+    )
+    print(f"📐 Sampled {len(frames)} frames, {len(table)} shapes, {offsets[-1]} drawn shapes → {path}")
+    return int(offsets[-1])
+
+
+def render_flat_preview(video_file, processes=None, supersample=1):
+    """
+    Sample the scene next to `video_file` and rasterise it to "<name>_flat.mp4".
+
+    The rasterizer runs as a plain Python process (scripts/utils/raster.py),
+    so its workers don't start copies of Blender.
+    Returns True if the preview was written.
+    """
+    base = os.path.splitext(video_file)[0]
+    samples_file, preview_file = base + "_flat.npz", base + "_flat.mp4"
+    sample_flat_scene(samples_file)
+    command = [sys.executable, "-m", "scripts.utils.raster", samples_file, preview_file,
+               "--supersample", str(supersample)]
+    if processes:
+        command += ["--processes", str(processes)]
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return subprocess.run(command, cwd=project_root).returncode == 0
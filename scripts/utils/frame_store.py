@@ -0,0 +1,342 @@
+"""
+Frame store — re-render only the frames whose content changed.
+
+Every frame gets a hash of everything that decides its pixels:
+  - the render settings (engine, resolution, samples, colour management),
+  - the scene's static content (meshes, materials, node trees, cameras,
+    object settings) — anything not animated,
+  - the value every F-Curve in the file takes on that frame,
+  - the frame number itself, but only when something reads scene time
+    directly (a Geometry Nodes Scene Time node, a driver).
+
+Rendered frames are kept in a content-addressed store, one PNG per hash
+(store/ab/abcdef….png). render_incremental() hashes the range, renders
+only the hashes the store doesn't have yet, and copies every
+frame of the output sequence from the store. A tweak to one act changes
+the hashes of that act's frames only, so that's all that renders again.
+
+Frames enter the store as soon as they're rendered, and a file only
+appears there once it's complete. An interrupted render therefore resumes
+where it stopped: the next run finds the finished hashes already stored.
+
+Usage (in a headless build, after everything is keyed):
+    render_incremental("./output/finding_the_one_frames/",
+                       video_file="./output/finding_the_one.mp4")
+"""
+import hashlib
+import os
+import shutil
+import struct
+import time
+from array import array
+
+import bpy
+
+from scripts.utils.animation import get_fcurves
+from scripts.utils.parallel_render import (
+    frame_path, render_in_parallel, use_png_output, restore_output,
+)
+from scripts.utils.scene import frames_to_video, get_render_profile
+
+
+DEFAULT_STORE = "./output/frame_store"
+
+# Datablock types whose F-Curves and settings can change a rendered frame
+HASHED_DATA = (
+    "objects", "meshes", "curves", "materials", "node_groups", "worlds",
+    "cameras", "lights", "shape_keys", "scenes",
+)
+
+# Node properties that change what a node does (besides its input values)
+NODE_SETTINGS = (
+    "operation", "data_type", "domain", "blend_type", "fill_type", "mode",
+    "attribute_name", "attribute_type", "interpolation_type", "use_clamp",
+)
+
+
+# ──────────────────────────────────────────────
+# Hashing
+# ──────────────────────────────────────────────
+
+def _value(value):
+    """A stable, hashable form of a property value."""
+    if isinstance(value, bpy.types.ID):
+        return value.name
+    if isinstance(value, float):
+        return round(value, 6)
+    if isinstance(value, (str, int, bool)) or value is None:
+        return value
+    try:
+        return tuple(_value(v) for v in value)
+    except TypeError:
+        return repr(value)
+
+
+def render_settings_digest(scene=None):
+    """What the render settings contribute to every frame's hash."""
+    scene = scene or bpy.context.scene
+    render = scene.render
+    view = scene.view_settings
+    # Stored frames are written with the render profile's PNG settings
+    profile = get_render_profile()
+    settings = [
+        render.engine, render.resolution_x, render.resolution_y,
+        render.resolution_percentage, render.film_transparent,
+        render.pixel_aspect_x, render.pixel_aspect_y,
+        view.view_transform, view.look, _value(view.exposure), _value(view.gamma),
+        scene.display_settings.display_device,
+        profile["color_mode"], profile["color_depth"],
+        scene.camera.name if scene.camera else None,
+    ]
+    if render.engine == 'BLENDER_WORKBENCH':
+        shading = scene.display.shading
+        settings += [scene.display.render_aa, shading.light, shading.color_type,
+                     _value(scene.world.color) if scene.world else None]
+    for engine, names in (("eevee", ("taa_render_samples", "use_bloom")),
+                          ("cycles", ("samples", "device", "use_denoising",
+                                      "use_adaptive_sampling", "adaptive_threshold"))):
+        engine_settings = getattr(scene, engine, None)
+        for name in names:
+            settings.append(_value(getattr(engine_settings, name, None)))
+    return repr(settings)
+
+
+def _node_tree_digest(tree):
+    entries = []
+    for n in sorted(tree.nodes, key=lambda n: n.name):
+        settings = [(name, _value(getattr(n, name))) for name in NODE_SETTINGS if hasattr(n, name)]
+        values = [
+            (socket.identifier, _value(getattr(socket, "default_value", None)))
+            for socket in list(n.inputs) + list(n.outputs)
+            if not socket.is_linked or socket.is_output
+        ]
+        entries.append((n.bl_idname, n.name, settings, values))
+    links = sorted(
+        (link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier)
+        for link in tree.links
+    )
+    return repr((entries, links))
+
+
+def _mesh_digest(mesh):
+    digest = hashlib.sha1()
+    for collection, prop, width, kind in ((mesh.vertices, "co", 3, "f"), (mesh.loops, "vertex_index", 1, "i"),
+                                          (mesh.polygons, "loop_total", 1, "i")):
+        values = array(kind, [0]) * (len(collection) * width)
+        collection.foreach_get(prop, values)
+        digest.update(values.tobytes())
+    for attr in mesh.attributes:
+        if attr.name.startswith(".") or attr.domain != 'POINT' or attr.data_type not in ('FLOAT', 'FLOAT_COLOR'):
+            continue
+        prop, width = ("value", 1) if attr.data_type == 'FLOAT' else ("color", 4)
+        values = array("f", [0]) * (len(attr.data) * width)
+        attr.data.foreach_get(prop, values)
+        digest.update(attr.name.encode() + values.tobytes())
+    return digest.hexdigest()
+
+
+def static_digest(scene=None):
+    """What the scene's non-animated content contributes to every frame's hash."""
+    scene = scene or bpy.context.scene
+    digest = hashlib.sha1()
+    for obj in sorted(scene.objects, key=lambda o: o.name):
+        digest.update(repr((
+            obj.name, obj.type, obj.data.name if obj.data else None,
+            obj.parent.name if obj.parent else None,
+            _value(obj.location), _value(obj.rotation_euler), _value(obj.scale),
+            obj.hide_render, obj.visible_camera, _value(obj.color),
+            [(m.type, m.node_group.name if getattr(m, "node_group", None) else None) for m in obj.modifiers],
+            [slot.material.name if slot.material else None for slot in obj.material_slots],
+            sorted((k, _value(obj[k])) for k in obj.keys() if isinstance(obj[k], (int, float, str))),
+        )).encode())
+    for mesh in sorted(bpy.data.meshes, key=lambda m: m.name):
+        digest.update(f"{mesh.name}:{_mesh_digest(mesh)}".encode())
+    for camera in bpy.data.cameras:
+        digest.update(repr((camera.name, camera.type, _value(camera.ortho_scale),
+                            _value(camera.lens), _value(camera.clip_start), _value(camera.clip_end))).encode())
+    for light in bpy.data.lights:
+        digest.update(repr((light.name, light.type, _value(light.energy), _value(light.color))).encode())
+    # Material and world trees are embedded, so they go by their owner's name
+    trees = [(m.name, m.node_tree) for m in bpy.data.materials if m.node_tree]
+    trees += [(w.name, w.node_tree) for w in bpy.data.worlds if w.node_tree]
+    trees += [(tree.name, tree) for tree in bpy.data.node_groups]
+    for owner, tree in sorted(trees, key=lambda entry: entry[0]):
+        digest.update(f"{owner}:{_node_tree_digest(tree)}".encode())
+    return digest.hexdigest()
+
+
+def _animated_ids():
+    """(name, datablock) for everything that could carry F-Curves, embedded node trees included."""
+    for attr in HASHED_DATA:
+        for block in getattr(bpy.data, attr):
+            yield f"{attr}:{block.name}", block
+            tree = getattr(block, "node_tree", None)
+            if tree is not None:
+                yield f"{attr}:{block.name}:node_tree", tree
+
+
+def reads_scene_time():
+    """True if anything in the file can change with the frame number alone."""
+    for tree in bpy.data.node_groups:
+        if any(n.bl_idname == 'GeometryNodeInputSceneTime' for n in tree.nodes):
+            return True
+    for _, block in _animated_ids():
+        anim = getattr(block, "animation_data", None)
+        if anim is not None and len(anim.drivers):
+            return True
+    return False
+
+
+def frame_hashes(frame_start, frame_end, scene=None):
+    """
+    {frame: hash} for an inclusive range — equal hashes render identically.
+
+    F-Curves are evaluated directly rather than by stepping the scene, so
+    hashing the whole film takes seconds.
+    """
+    scene = scene or bpy.context.scene
+    # Animated properties read back their value on the current frame, so
+    # take the static snapshot from the same frame every time
+    current = scene.frame_current
+    scene.frame_set(frame_start)
+    try:
+        base = hashlib.sha1(f"{render_settings_digest(scene)}|{static_digest(scene)}".encode())
+    finally:
+        scene.frame_set(current)
+    timed = reads_scene_time()
+
+    curves = []
+    for name, block in _animated_ids():
+        for fcurve in get_fcurves(block):
+            if not fcurve.mute:
+                curves.append(((name, fcurve.data_path, fcurve.array_index), fcurve))
+    curves.sort(key=lambda entry: entry[0])
+    base.update(repr([key for key, _ in curves]).encode())
+
+    frames = range(frame_start, frame_end + 1)
+    columns = [[round(fcurve.evaluate(f), 6) for f in frames] for _, fcurve in curves]
+    hashes = {}
+    for k, frame in enumerate(frames):
+        digest = base.copy()
+        digest.update(struct.pack(f"{len(columns)}d", *(column[k] for column in columns)))
+        if timed:
+            digest.update(struct.pack("i", frame))
+        hashes[frame] = digest.hexdigest()
+    return hashes
+
+
+# ──────────────────────────────────────────────
+# Store
+# ──────────────────────────────────────────────
+
+def stored_path(store_dir, frame_hash):
+    """Where the store keeps the frame with this hash."""
+    return os.path.join(store_dir, frame_hash[:2], f"{frame_hash}.png")
+
+
+def _place(source, target):
+    """
+    Copy source to target atomically. Never a hard link: renderers write
+    frames in place, and a shared inode would let a later render into the
+    sequence overwrite the store's copy under its old hash.
+    """
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    partial = f"{target}.partial"
+    if os.path.lexists(partial):
+        os.remove(partial)
+    shutil.copyfile(source, partial)
+    os.replace(partial, target)
+
+
+def store_frame(store_dir, frame_hash, rendered, move=False):
+    """Add a rendered PNG to the store under its hash (moving it in with `move`)."""
+    target = stored_path(store_dir, frame_hash)
+    if os.path.exists(target):
+        if move:
+            os.remove(rendered)
+    elif move:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(rendered, target)
+    else:
+        _place(rendered, target)
+    return target
+
+
+def link_frame(store_dir, frame_hash, frames_dir, frame):
+    """Copy the stored frame into the output sequence as `frame`."""
+    _place(stored_path(store_dir, frame_hash), frame_path(frames_dir, frame))
+
+
+# ──────────────────────────────────────────────
+# Incremental render
+# ──────────────────────────────────────────────
+
+def _render_here(frames, hashes, store_dir):
+    """Render frames one by one in this process, storing each as it finishes."""
+    scene = bpy.context.scene
+    current = scene.frame_current
+    staging = os.path.join(os.path.abspath(store_dir), "staging")
+    os.makedirs(staging, exist_ok=True)
+    saved = use_png_output(scene, "")
+    try:
+        for done, frame in enumerate(frames, 1):
+            rendered = os.path.join(staging, f"{hashes[frame]}.png")
+            scene.frame_set(frame)
+            scene.render.filepath = rendered
+            bpy.ops.render.render(write_still=True)
+            store_frame(store_dir, hashes[frame], rendered, move=True)
+            print(f"   🎞️  {done}/{len(frames)} new frames (frame {frame})")
+    finally:
+        restore_output(scene, saved)
+        scene.frame_set(current)
+
+
+def render_incremental(frames_dir, store_dir=DEFAULT_STORE, frame_start=None, frame_end=None,
+                       workers=1, video_file=None, fps=None):
+    """
+    Render only frames whose hash isn't in the store, then assemble the
+    full sequence in frames_dir from the store.
+
+    Args:
+        frames_dir: Output PNG sequence (frames are copied from the store)
+        store_dir: Content-addressed frame store, shared between builds
+        frame_start, frame_end: Inclusive range (default: the scene's)
+        workers: >1 renders the new frames with render_in_parallel()
+        video_file: Passed to frames_to_video(); None skips stitching
+        fps: Video frame rate (default: the scene's)
+    Returns the number of frames actually rendered.
+    """
+    scene = bpy.context.scene
+    frame_start = scene.frame_start if frame_start is None else frame_start
+    frame_end = scene.frame_end if frame_end is None else frame_end
+    fps = fps or scene.render.fps
+
+    started = time.time()
+    hashes = frame_hashes(frame_start, frame_end, scene)
+    # One frame renders each new hash; frames sharing it (holds) are copied
+    first_with = {}
+    for frame, frame_hash in hashes.items():
+        if not os.path.exists(stored_path(store_dir, frame_hash)):
+            first_with.setdefault(frame_hash, frame)
+    to_render = sorted(first_with.values())
+    total = frame_end - frame_start + 1
+    print(f"🧮 Hashed {total} frames in {time.time() - started:.1f}s — "
+          f"{len(to_render)} to render, {total - len(to_render)} reused from the store")
+
+    if to_render and workers > 1:
+        def store_chunk(frames):
+            for frame in frames:
+                store_frame(store_dir, hashes[frame], frame_path(frames_dir, frame))
+        render_in_parallel(workers, frames_dir, frame_start, frame_end,
+                           frames=to_render, on_rendered=store_chunk)
+    elif to_render:
+        _render_here(to_render, hashes, store_dir)
+
+    os.makedirs(frames_dir, exist_ok=True)
+    for frame, frame_hash in hashes.items():
+        link_frame(store_dir, frame_hash, frames_dir, frame)
+    print(f"✅ {total} frames in {frames_dir} ({len(to_render)} rendered)")
+
+    if video_file is not None:
+        frames_to_video(frames_dir, video_file, fps=fps, start_frame=frame_start)
+    return len(to_render)
@@ -0,0 +1,218 @@
+"""
+Geometry Nodes instancing — many identical shapes from one object.
+
+A field of shapes is a single "carrier" object: a mesh with one vertex per
+shape plus per-point attributes (phase, speed, colour, ...). A Geometry
+Nodes modifier instances the shape on every point and works out each
+instance's motion and brightness procedurally from scene time, so the
+field costs one object and a handful of keys however many shapes it has.
+
+Point attributes survive instancing, so a shader reading them through an
+Attribute node set to 'INSTANCER' (create_attribute_emission_material with
+attribute_type='INSTANCER') colours every instance individually.
+
+Motion that can't be worked out from scene time (a simulated crowd, say)
+is baked into the carrier instead: create_baked_carrier() stores positions
+sampled over time as extra points, and baked_position() reads them back at
+the current frame.
+
+The helpers below are deliberately small — just enough to wire node trees
+from Python without repeating socket plumbing:
+
+    tree, group_in, group_out = new_geometry_tree("Field")
+    frame = node(tree, 'GeometryNodeInputSceneTime').outputs["Frame"]
+    angle = math_node(tree, 'MULTIPLY', frame, 0.02)
+"""
+import bpy
+import numpy as np
+
+from scripts.utils.ownership import own
+from scripts.utils.primitives import new_object
+
+
+# ──────────────────────────────────────────────
+# Carrier objects
+# ──────────────────────────────────────────────
+
+def create_point_carrier(name, positions, attributes=None, collection=None):
+    """
+    Create an object whose mesh is just points, one per instance.
+
+    Args:
+        name: Object (and mesh) name
+        positions: (x, y, z) per point
+        attributes: {name: values} stored on the points — floats become
+                    FLOAT attributes, 4-tuples FLOAT_COLOR attributes
+        collection: See primitives.new_object()
+    Returns the object.
+    """
+    mesh = own(bpy.data.meshes.new(name))
+    mesh.vertices.add(len(positions))
+    mesh.vertices.foreach_set("co", [c for point in positions for c in point])
+
+    for attr_name, values in (attributes or {}).items():
+        if values and isinstance(values[0], (tuple, list)):
+            attr = mesh.attributes.new(attr_name, 'FLOAT_COLOR', 'POINT')
+            attr.data.foreach_set("color", [c for value in values for c in value])
+        else:
+            attr = mesh.attributes.new(attr_name, 'FLOAT', 'POINT')
+            attr.data.foreach_set("value", [float(v) for v in values])
+
+    mesh.update()
+    return new_object(name, mesh, collection=collection)
+
+
+def create_baked_carrier(name, samples, attributes=None, z=0.0, collection=None):
+    """
+    Create a carrier that holds its points' motion baked in.
+
+    `samples` is an (S, N, 2) array: N points' (x, y) sampled S times. The
+    mesh stores all S × N points, sample after sample, and a tree reads a
+    point's position at any moment with baked_position(). Only the first N
+    points are real; `attributes` (one value per real point) go on those.
+
+    Args:
+        name: Object (and mesh) name
+        samples: (S, N, 2) array of positions
+        attributes: {name: values}, as create_point_carrier()
+        z: Height of every point
+        collection: See primitives.new_object()
+    Returns the object.
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    count, points = samples.shape[0] * samples.shape[1], samples.shape[1]
+    co = np.full((count, 3), z, dtype=np.float32)
+    co[:, :2] = samples.reshape(-1, 2)
+
+    mesh = own(bpy.data.meshes.new(name))
+    mesh.vertices.add(count)
+    mesh.vertices.foreach_set("co", co.ravel())
+
+    for attr_name, values in (attributes or {}).items():
+        values = np.asarray(values, dtype=np.float32)
+        if values.ndim == 2:
+            attr = mesh.attributes.new(attr_name, 'FLOAT_COLOR', 'POINT')
+            padded = np.zeros((count, values.shape[1]), dtype=np.float32)
+            padded[:points] = values
+            attr.data.foreach_set("color", padded.ravel())
+        else:
+            attr = mesh.attributes.new(attr_name, 'FLOAT', 'POINT')
+            padded = np.zeros(count, dtype=np.float32)
+            padded[:points] = values
+            attr.data.foreach_set("value", padded)
+
+    mesh.update()
+    return new_object(name, mesh, collection=collection)
+
+
+def add_geometry_nodes(obj, tree, name="Instances"):
+    """Attach a Geometry Nodes tree to an object as a modifier."""
+    modifier = obj.modifiers.new(name, 'NODES')
+    modifier.node_group = tree
+    return modifier
+
+
+# ──────────────────────────────────────────────
+# Node tree helpers
+# ──────────────────────────────────────────────
+
+def new_geometry_tree(name):
+    """
+    Create an empty Geometry Nodes tree with a geometry input and output.
+
+    Returns (tree, group_input_node, group_output_node).
+    """
+    tree = own(bpy.data.node_groups.new(name, 'GeometryNodeTree'))
+    tree.interface.new_socket("Geometry", in_out='INPUT', socket_type='NodeSocketGeometry')
+    tree.interface.new_socket("Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry')
+    group_in = tree.nodes.new('NodeGroupInput')
+    group_out = tree.nodes.new('NodeGroupOutput')
+    return tree, group_in, group_out
+
+
+def connect(tree, socket, value):
+    """Feed an input socket from another socket, or set its value."""
+    if isinstance(value, bpy.types.NodeSocket):
+        tree.links.new(value, socket)
+    elif value is not None:
+        socket.default_value = value
+
+
+def node(tree, node_type, inputs=None, **props):
+    """
+    Add a node, set its properties, and connect its inputs.
+
+    Args:
+        tree: Node tree
+        node_type: e.g. 'GeometryNodeInstanceOnPoints'
+        inputs: {input name or index: socket or value}
+        props: Node properties, e.g. operation='MULTIPLY'
+    Returns the node.
+    """
+    new = tree.nodes.new(node_type)
+    for prop, value in props.items():
+        setattr(new, prop, value)
+    for key, value in (inputs or {}).items():
+        connect(tree, new.inputs[key], value)
+    return new
+
+
+def math_node(tree, operation, a, b=None):
+    """A float Math node; returns its output socket."""
+    return node(tree, 'ShaderNodeMath', {0: a, 1: b}, operation=operation).outputs[0]
+
+
+def named_attribute(tree, name, data_type='FLOAT'):
+    """Read a stored attribute by name; returns the attribute socket."""
+    return node(
+        tree, 'GeometryNodeInputNamedAttribute', {"Name": name}, data_type=data_type,
+    ).outputs["Attribute"]
+
+
+def keyable_value(tree, name, value=0.0):
+    """
+    A Value node whose output can be keyframed (insert_key on the returned
+    socket's "default_value"), for curves the tree should follow over time.
+    """
+    value_node = node(tree, 'ShaderNodeValue')
+    value_node.name = name
+    value_node.outputs[0].default_value = value
+    return value_node.outputs[0]
+
+
+def baked_position(tree, geometry, points, samples, sample):
+    """
+    Positions from a create_baked_carrier() mesh at a fractional sample.
+
+    Args:
+        tree: Node tree
+        geometry: The carrier's geometry (usually the group input)
+        points, samples: N and S of the baked array
+        sample: Socket or value — which sample to read, fractional values
+                interpolate linearly; clamped to the baked range
+    Returns (the real N points as geometry, their position field).
+    """
+    index = node(tree, 'GeometryNodeInputIndex').outputs[0]
+    real = node(tree, 'GeometryNodeDeleteGeometry', {
+        "Geometry": geometry,
+        "Selection": math_node(tree, 'GREATER_THAN', index, points - 0.5),
+    }, domain='POINT')
+
+    position = node(tree, 'GeometryNodeInputPosition').outputs[0]
+    at = node(tree, 'ShaderNodeClamp', {"Value": sample, "Min": 0.0, "Max": samples - 1}).outputs[0]
+    lower = math_node(tree, 'FLOOR', at)
+    upper = math_node(tree, 'MINIMUM', math_node(tree, 'ADD', lower, 1.0), samples - 1)
+
+    def read(which):
+        point = math_node(tree, 'MULTIPLY_ADD', which, points)
+        connect(tree, point.node.inputs[2], index)
+        return node(tree, 'GeometryNodeSampleIndex', {
+            "Geometry": geometry, "Value": position, "Index": point,
+        }, data_type='FLOAT_VECTOR', domain='POINT').outputs[0]
+
+    start = read(lower)
+    step = node(tree, 'ShaderNodeVectorMath', {0: read(upper), 1: start}, operation='SUBTRACT').outputs[0]
+    scaled = node(tree, 'ShaderNodeVectorMath', {0: step, "Scale": math_node(tree, 'SUBTRACT', at, lower)},
+                  operation='SCALE').outputs[0]
+    moved = node(tree, 'ShaderNodeVectorMath', {0: start, 1: scaled}, operation='ADD').outputs[0]
+    return real.outputs[0], moved
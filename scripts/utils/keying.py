@@ -0,0 +1,465 @@
+"""
+Keyframe gate — windowed and deferred keyframe insertion.
+
+Animation code keys through insert_key() instead of calling
+keyframe_insert() directly. By default every key is written straight away,
+exactly like keyframe_insert(). A build can narrow the gate to a frame
+window: keys inside the window are written immediately, keys outside it are
+either dropped or parked in a pending queue that flush_pending_keys() drains
+later, nearest-to-the-window first. A window that drops keys can keep each
+channel's nearest key on either side of it (keep_edges), so the curve inside
+the window interpolates exactly as it would in a full build.
+
+The gate can also thin per-frame motion to every Nth frame (set_key_step).
+Thinning is run-aware: the first and last key of every contiguous per-frame
+run are always kept, as are isolated keys, so holds, hand-offs and one-off
+pulses land exactly where they would in a full build.
+
+Builds that want to rebuild only part of a scene later can record the keys
+each stage writes into per-stage layers (use_key_layers / begin_key_stage).
+A later run can re-run just one stage in capture mode and apply the
+difference against its previous layer (apply_key_layer), leaving every key
+the other stages wrote untouched.
+
+All values are still computed by the caller, so continuity state (scroll
+position, accumulated angles, Y hand-offs between acts) stays exact no matter
+which frames actually get keyed.
+"""
+import time
+
+
+# ──────────────────────────────────────────────
+# State
+# ──────────────────────────────────────────────
+
+_gate = {
+    "window": None,      # (start, end) inclusive, or None to key everything
+    "defer": False,      # park out-of-window keys instead of dropping them
+    "edges": None,       # channel -> [last key before, first key after] the window, or None
+    "pending": {},       # channel+frame -> (target, data_path, value, index, frame)
+    "queue": None,       # pending keys sorted for draining, built lazily
+    "center": None,      # frame the queue drains outward from
+    "on_flushed": [],    # callbacks to run once the pending queue is empty
+    "step": 1,           # keep every Nth frame of contiguous per-frame runs
+    "origin": 1,         # frame the key-step grid is aligned to
+    "runs": {},          # channel -> [last frame seen, held run-end entry or None]
+    "layers": None,      # stage -> {component channel: {frame: value}}, or None to not record
+    "targets": None,     # component channel -> (target, data_path, index)
+    "stage": None,       # stage keys are currently recorded under
+    "stage_mode": "write",  # "write", "capture" (record only) or "skip" (drop)
+    "capture": None,     # layer being captured for the current stage
+}
+
+# Sentinel for "no key at this frame" in layer diffs
+_NO_KEY = object()
+
+
+def reset_key_gate():
+    """Key everything immediately again and forget any pending keys."""
+    _gate["window"] = None
+    _gate["defer"] = False
+    _gate["edges"] = None
+    _gate["pending"] = {}
+    _gate["queue"] = None
+    _gate["center"] = None
+    _gate["on_flushed"] = []
+    _gate["step"] = 1
+    _gate["origin"] = 1
+    _gate["runs"] = {}
+    _gate["layers"] = None
+    _gate["targets"] = None
+    _gate["stage"] = None
+    _gate["stage_mode"] = "write"
+    _gate["capture"] = None
+
+
+def set_key_window(window=None, defer=False, keep_edges=False):
+    """
+    Restrict immediate keying to a frame window.
+
+    Args:
+        window: (start, end) inclusive frame range, or None for no limit
+        defer: If True, keys outside the window are queued for
+               flush_pending_keys() instead of being dropped
+        keep_edges: If True (and not deferring), each channel's last key
+                    before and first key after the window are kept for
+                    close_key_window() to write
+    """
+    if window is not None:
+        start, end = window
+        if start > end:
+            start, end = end, start
+        window = (int(start), int(end))
+    _gate["window"] = window
+    _gate["defer"] = defer
+    _gate["edges"] = {} if keep_edges and not defer and window is not None else None
+    _gate["center"] = None if window is None else (window[0] + window[1]) / 2
+
+
+def get_key_window():
+    """Return the active (start, end) key window, or None."""
+    return _gate["window"]
+
+
+def key_in_window(frame):
+    """True if a key at this frame would be written immediately."""
+    window = _gate["window"]
+    return window is None or window[0] <= frame <= window[1]
+
+
+def close_key_window():
+    """
+    Write the edge keys kept by a keep_edges window.
+
+    Call once every key is in (after close_key_runs()). Returns the number
+    of edge keys written.
+    """
+    edges = _gate["edges"]
+    if not edges:
+        return 0
+    _gate["edges"] = {}
+    written = 0
+    for entries in edges.values():
+        for entry in entries:
+            if entry is not None:
+                _write_key(*entry)
+                written += 1
+    return written
+
+
+def set_key_step(step=1, origin=1):
+    """
+    Thin contiguous per-frame keys to every `step`th frame.
+
+    Args:
+        step: Keep one key in `step` along per-frame runs (1 keys everything)
+        origin: Frame the keep-grid is aligned to
+    Call close_key_runs() once all keys are in, so trailing run ends get written.
+    """
+    close_key_runs()
+    _gate["step"] = max(1, int(step))
+    _gate["origin"] = int(origin)
+
+
+def close_key_runs():
+    """Write the held final key of every open per-frame run."""
+    runs = _gate["runs"]
+    _gate["runs"] = {}
+    for _, held in runs.values():
+        if held is not None:
+            _emit_key(*held)
+
+
+# ──────────────────────────────────────────────
+# Insertion
+# ──────────────────────────────────────────────
+
+def _write_key(target, data_path, value, frame, index):
+    """Set the property value and insert a keyframe for it."""
+    if data_path.startswith('["'):
+        # Custom property, e.g. '["emission_strength"]'
+        name = data_path[2:-2]
+        if index >= 0:
+            target[name][index] = value
+        else:
+            target[name] = value
+        target.keyframe_insert(data_path=data_path, index=index, frame=frame)
+    elif index >= 0:
+        getattr(target, data_path)[index] = value
+        target.keyframe_insert(data_path=data_path, index=index, frame=frame)
+    else:
+        setattr(target, data_path, value)
+        target.keyframe_insert(data_path=data_path, frame=frame)
+
+
+def _thin_key(target, data_path, value, frame, index):
+    """
+    Decide whether a key survives the key step.
+
+    A key one frame after the channel's previous key continues a run; it is
+    kept on grid frames and otherwise held as the run's possible last key.
+    Any other key starts a new run — it is kept, and the previous run's held
+    last key is written first.
+    """
+    channel = (target.as_pointer(), data_path, index)
+    run = _gate["runs"].get(channel)
+
+    if run is not None and frame == run[0] + 1:
+        run[0] = frame
+        if (frame - _gate["origin"]) % _gate["step"] == 0:
+            run[1] = None
+            return True
+        run[1] = (target, data_path, value, frame, index)
+        return False
+
+    if run is not None and run[1] is not None:
+        _emit_key(*run[1])
+    _gate["runs"][channel] = [frame, None]
+    return True
+
+
+def _route_key(target, data_path, value, frame, index):
+    """Write, defer or drop a key according to the key window."""
+    if key_in_window(frame):
+        _write_key(target, data_path, value, frame, index)
+        return True
+
+    if _gate["defer"]:
+        # Last write wins, same as keyframe_insert on an existing key
+        channel = (target.as_pointer(), data_path, index, frame)
+        _gate["pending"][channel] = (target, data_path, value, index, frame)
+        _gate["queue"] = None
+    elif _gate["edges"] is not None:
+        _keep_edge_key(target, data_path, value, frame, index)
+    return False
+
+
+def _keep_edge_key(target, data_path, value, frame, index):
+    """Keep a dropped key if it is the nearest to the window on its side so far."""
+    edges = _gate["edges"].setdefault((target.as_pointer(), data_path, index), [None, None])
+    entry = (target, data_path, value, frame, index)
+    if frame < _gate["window"][0]:
+        if edges[0] is None or frame >= edges[0][3]:
+            edges[0] = entry
+    elif edges[1] is None or frame <= edges[1][3]:
+        edges[1] = entry
+
+
+def insert_key(target, data_path, value, frame, index=-1):
+    """
+    Set a property and keyframe it, subject to the key step and window.
+
+    Args:
+        target: Any keyable Blender struct (object, camera data, node socket)
+        data_path: Property name on the target, e.g. "location", or a
+                   custom property path like '["emission_strength"]'
+        value: Value to assign (a tuple for whole-vector properties)
+        frame: Frame to key at
+        index: Vector component to key, or -1 for the whole property
+    Returns True if the key was written now.
+    """
+    if _gate["stage_mode"] == "skip":
+        return False
+    if _gate["step"] > 1 and not _thin_key(target, data_path, value, frame, index):
+        return False
+    return _emit_key(target, data_path, value, frame, index)
+
+
+def _emit_key(target, data_path, value, frame, index):
+    """Record a key in the current stage's layer, then write it unless capturing."""
+    if _gate["stage"] is not None and _gate["layers"] is not None:
+        if _gate["stage_mode"] == "capture":
+            layer = _gate["capture"]
+        else:
+            layer = _gate["layers"].setdefault(_gate["stage"], {})
+        _record_key(layer, target, data_path, value, frame, index)
+        if _gate["stage_mode"] == "capture":
+            return False
+    return _route_key(target, data_path, value, frame, index)
+
+
+def _record_key(layer, target, data_path, value, frame, index):
+    """
+    Store a key in a layer, one channel per vector component, so whole-vector
+    and per-component keys on the same property diff against each other.
+    """
+    pointer = target.as_pointer()
+    targets = _gate["targets"]
+    if index < 0 and hasattr(value, "__len__") and not isinstance(value, str):
+        for i, component in enumerate(value):
+            channel = (pointer, data_path, i)
+            layer.setdefault(channel, {})[frame] = component
+            targets[channel] = (target, data_path, i)
+    else:
+        channel = (pointer, data_path, index)
+        layer.setdefault(channel, {})[frame] = value
+        targets[channel] = (target, data_path, index)
+
+
+# ──────────────────────────────────────────────
+# Deferred keys
+# ──────────────────────────────────────────────
+
+def pending_key_count():
+    """Number of keys waiting to be written."""
+    return len(_gate["pending"])
+
+
+def when_keys_flushed(callback):
+    """
+    Run callback() once all pending keys have been written.
+
+    Does nothing when no keys are pending — callers are expected to have
+    already done their work on the keys that exist.
+    """
+    if pending_key_count():
+        _gate["on_flushed"].append(callback)
+
+
+def flush_pending_keys(time_budget=None, center=None):
+    """
+    Write pending keys, nearest to the key window (or `center`) first.
+
+    Args:
+        time_budget: Seconds to spend before returning, or None to write all
+        center: Frame to fill outward from (defaults to the window centre)
+    Returns the number of keys still pending.
+    """
+    if center is not None and center != _gate["center"]:
+        _gate["center"] = center
+        _gate["queue"] = None
+
+    pending = _gate["pending"]
+    queue = _gate["queue"]
+    if queue is None:
+        mid = _gate["center"] or 0
+        # Sorted farthest-first so the nearest key pops off the end cheaply
+        queue = sorted(pending, key=lambda channel: abs(channel[3] - mid), reverse=True)
+        _gate["queue"] = queue
+
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    while queue:
+        entry = pending.pop(queue.pop(), None)
+        if entry is None:
+            continue
+        target, data_path, value, index, frame = entry
+        _write_key(target, data_path, value, frame, index)
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+
+    if not pending:
+        callbacks = _gate["on_flushed"]
+        _gate["on_flushed"] = []
+        for callback in callbacks:
+            callback()
+    return len(pending)
+
+
+# ──────────────────────────────────────────────
+# Stage layers
+# ──────────────────────────────────────────────
+
+def use_key_layers(layers, targets):
+    """
+    Record keys into these dicts from now on (None stops recording).
+
+    Args:
+        layers: stage -> {channel: {frame: value}}, kept by the caller
+                between builds
+        targets: channel -> (target, data_path, index) for those layers
+    """
+    _gate["layers"] = layers
+    _gate["targets"] = targets
+
+
+def begin_key_stage(name, mode="write"):
+    """
+    Start recording keys under a build stage.
+
+    Args:
+        name: Stage name, e.g. "act3"
+        mode: "write" keys and records them, "capture" only records them
+              (apply with apply_key_layer), "skip" drops them entirely
+    """
+    _gate["stage"] = name
+    _gate["stage_mode"] = mode
+    _gate["capture"] = {} if mode == "capture" else None
+
+
+def end_key_stage():
+    """
+    Finish the current stage and return its captured layer (None unless
+    the stage was captured). Open per-frame runs are closed first, so every
+    key the stage keeps lands in its own layer.
+    """
+    close_key_runs()
+    captured = _gate["capture"]
+    _gate["stage"] = None
+    _gate["stage_mode"] = "write"
+    _gate["capture"] = None
+    return captured
+
+
+def _target_alive(target):
+    """False once the datablock behind a recorded target has been freed."""
+    try:
+        target.id_data
+    except ReferenceError:
+        return False
+    return True
+
+
+def forget_key_targets(pointers):
+    """
+    Drop every recorded channel whose datablock is in `pointers` — call this
+    before freeing datablocks, so a new one reusing the address can't be
+    mistaken for the old one.
+    """
+    targets = _gate["targets"]
+    gone = {channel for channel, (target, _, _) in targets.items()
+            if not _target_alive(target) or target.id_data.as_pointer() in pointers}
+    for channel in gone:
+        del targets[channel]
+    for layer in _gate["layers"].values():
+        for channel in gone:
+            layer.pop(channel, None)
+
+
+def _delete_key(target, data_path, frame, index):
+    """Remove a key (and any deferred write of it); missing keys are fine."""
+    _gate["pending"].pop((target.as_pointer(), data_path, index, frame), None)
+    try:
+        target.keyframe_delete(data_path=data_path, index=index, frame=frame)
+    except RuntimeError:
+        pass
+
+
+def apply_key_layer(stage, layer, order):
+    """
+    Replace a stage's previous layer with a freshly captured one, writing
+    only the keys that differ.
+
+    Frames a later stage also keys are left alone (the later stage wins, as
+    it did in the full build). Frames this stage no longer keys fall back to
+    the value an earlier stage keyed there, or are deleted.
+
+    Args:
+        stage: Stage name
+        layer: Captured layer from end_key_stage()
+        order: All stage names in build order
+    Returns the number of keys written or deleted.
+    """
+    layers = _gate["layers"]
+    targets = _gate["targets"]
+    previous = layers.get(stage, {})
+    position = order.index(stage)
+    earlier = [layers[s] for s in order[:position] if s in layers]
+    later = [layers[s] for s in order[position + 1:] if s in layers]
+
+    changed = 0
+    for channel in previous.keys() | layer.keys():
+        target, data_path, index = targets[channel]
+        if not _target_alive(target):
+            continue
+        old = previous.get(channel, {})
+        new = layer.get(channel, {})
+        for frame in old.keys() | new.keys():
+            if any(frame in other.get(channel, ()) for other in later):
+                continue
+            value = new.get(frame, _NO_KEY)
+            if value is _NO_KEY:
+                for other in reversed(earlier):
+                    value = other.get(channel, {}).get(frame, _NO_KEY)
+                    if value is not _NO_KEY:
+                        break
+                if value is _NO_KEY:
+                    _delete_key(target, data_path, frame, index)
+                    changed += 1
+                    continue
+            elif old.get(frame, _NO_KEY) == value:
+                continue
+            _route_key(target, data_path, value, frame, index)
+            changed += 1
+
+    layers[stage] = layer
+    return changed
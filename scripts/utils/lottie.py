@@ -0,0 +1,293 @@
+"""
+Lottie export — write a flat emission scene as a vector animation.
+
+A film made of flat polygons with keyed transforms and emission levels
+doesn't need rendering to be watched: a Lottie player can draw it from a
+description of each shape. export_lottie() writes one, as JSON:
+  - every emission mesh becomes a shape layer, its faces closed paths,
+  - its location, rotation and scale become keyframed layer transforms,
+  - its emission colour × strength becomes the keyframed fill colour, and
+    the layer exists only between the first and last frame it is lit,
+  - the camera becomes a null layer every shape hangs from, so scrolling
+    and zoom are two channels instead of a change to every shape.
+
+Channels are sampled on every frame (through parents, and whatever the
+curves' interpolation) and then thinned: a key is kept only where leaving
+it out would move the linear path between its neighbours by more than
+the tolerance. Per-frame keys baked by the build collapse to a handful of
+linear segments, which keeps the file small.
+
+Geometry Nodes fields are left out: their motion is computed from scene
+time, not keyed, so it has no compact vector form.
+
+Usage (after everything is keyed):
+    export_lottie("./output/finding_the_one.json")
+"""
+import json
+import os
+
+import bpy
+import numpy as np
+
+from scripts.utils.flat_samples import world_matrices, emission_colors, sample_channel, render_hidden
+from scripts.utils.workbench import field_tree
+
+
+LOTTIE_VERSION = "5.7.4"
+
+# Largest error thinning may introduce, per channel (output pixels, degrees,
+# scale percent, 0..1 colour)
+TOLERANCES = {"position": 0.5, "rotation": 0.2, "scale": 0.5, "color": 1.5 / 255}
+
+MIN_EMISSION = 1e-4    # dimmer than this counts as unlit
+
+
+# ──────────────────────────────────────────────
+# Keys
+# ──────────────────────────────────────────────
+
+def thin_keys(values, tolerance):
+    """
+    Indices of the samples to keep as linear keys.
+
+    `values` is (N,) or (N, D), one row per frame. Keeps the first and last
+    sample, and splits each stretch at its worst sample until linear
+    interpolation between the kept ones is within `tolerance` everywhere
+    (in every dimension).
+    """
+    values = np.asarray(values, dtype=np.float64).reshape(len(values), -1)
+    n = len(values)
+    if n <= 2:
+        return list(range(n))
+    keep = {0, n - 1}
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        t = (np.arange(start + 1, end) - start) / (end - start)
+        line = values[start] + t[:, None] * (values[end] - values[start])
+        error = np.abs(values[start + 1:end] - line).max(axis=1)
+        worst = int(np.argmax(error))
+        if error[worst] > tolerance:
+            split = start + 1 + worst
+            keep.add(split)
+            stack += [(start, split), (split, end)]
+    return sorted(keep)
+
+
+def _round(values, digits):
+    return [round(float(v), digits) for v in np.atleast_1d(values)]
+
+
+def animated(frames, values, tolerance, digits=2, scalar=False):
+    """
+    A Lottie property following `values` (one row per frame), thinned.
+
+    Static channels become a plain value. `frames` are relative to the
+    composition's first frame.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    keep = thin_keys(values, tolerance)
+    if len(keep) == 1 or np.all(np.abs(values - values[0]) <= tolerance):
+        value = _round(values[0], digits)
+        return {"a": 0, "k": value[0] if scalar else value}
+    keys = []
+    for k in keep[:-1]:
+        keys.append({
+            "t": int(frames[k]), "s": _round(values[k], digits),
+            "o": {"x": [0], "y": [0]}, "i": {"x": [1], "y": [1]},   # linear
+        })
+    keys.append({"t": int(frames[keep[-1]]), "s": _round(values[keep[-1]], digits)})
+    return {"a": 1, "k": keys}
+
+
+def _static(value):
+    return {"a": 0, "k": value}
+
+
+def _srgb(values):
+    """Scene-linear 0..1 → sRGB-encoded 0..1, the colours Lottie players show."""
+    values = np.clip(values, 0.0, 1.0)
+    return np.where(values <= 0.0031308, values * 12.92, 1.055 * np.power(values, 1 / 2.4) - 0.055)
+
+
+# ──────────────────────────────────────────────
+# Layers
+# ──────────────────────────────────────────────
+
+def shape_paths(mesh, pixels_per_unit):
+    """A closed Lottie path per face of `mesh`, in layer pixels (y down)."""
+    co = np.empty(len(mesh.vertices) * 3)
+    mesh.vertices.foreach_get("co", co)
+    xy = co.reshape(-1, 3)[:, :2] * (pixels_per_unit, -pixels_per_unit)
+    paths = []
+    for poly in mesh.polygons:
+        points = [_round(xy[v], 2) for v in poly.vertices]
+        corners = [[0, 0]] * len(points)    # straight edges
+        paths.append({"ty": "sh", "ks": _static({"i": corners, "o": corners, "v": points, "c": True})})
+    return paths
+
+
+def _transform(position, rotation, scale, anchor=None):
+    return {
+        "o": _static(100),
+        "r": rotation,
+        "p": position,
+        "a": anchor or _static([0, 0]),
+        "s": scale,
+    }
+
+
+def object_layer(obj, frames, index, parent, pixels_per_unit, tolerances=TOLERANCES, cache=None):
+    """
+    A shape layer drawing `obj`, or None if it is never lit and visible.
+
+    Args:
+        obj: Emission mesh object
+        frames: Scene frames sampled (layer times are relative to the first)
+        index: Layer index ("ind")
+        parent: Index of the camera layer it hangs from
+        pixels_per_unit: World units → layer pixels
+        cache: dict of world matrices shared between layers (parents)
+    """
+    emission = emission_colors(obj, obj.active_material, frames)
+    if emission is None:
+        return None
+    shown = (emission.max(axis=1) > MIN_EMISSION) & ~render_hidden(obj, frames)
+    lit = np.nonzero(shown)[0]
+    if len(lit) == 0:
+        return None
+    # Only the lit, visible stretch is sampled; the layer doesn't exist outside it
+    span = slice(lit[0], lit[-1] + 1)
+    times = frames[span] - frames[0]
+
+    matrices = world_matrices(obj, frames, cache)[span]
+    sx = np.hypot(matrices[:, 0, 0], matrices[:, 1, 0])
+    angle = np.unwrap(np.arctan2(matrices[:, 1, 0], matrices[:, 0, 0]))
+    sy = np.linalg.det(matrices[:, :2, :2]) / np.where(sx == 0, 1, sx)
+    position = matrices[:, :2, 2] * (pixels_per_unit, -pixels_per_unit)
+
+    fill = {
+        "ty": "fl", "r": 1,
+        "c": animated(times, np.column_stack([_srgb(emission[span]), np.ones(len(times))]),
+                      tolerances["color"], digits=4),
+        "o": _static(100),
+    }
+    group_transform = {"ty": "tr", **_transform(_static([0, 0]), _static(0), _static([100, 100]))}
+    return {
+        "ddd": 0, "ind": index, "ty": 4, "nm": obj.name, "parent": parent, "sr": 1,
+        "ks": _transform(
+            animated(times, position, tolerances["position"]),
+            # Layer rotation is clockwise on screen, Blender's Z rotation counter-clockwise
+            animated(times, -np.degrees(angle), tolerances["rotation"], scalar=True),
+            animated(times, np.column_stack([sx, sy]) * 100, tolerances["scale"]),
+        ),
+        "ao": 0,
+        "shapes": [{"ty": "gr", "nm": obj.name,
+                    "it": shape_paths(obj.data, pixels_per_unit) + [fill, group_transform]}],
+        "ip": int(times[0]), "op": int(times[-1]) + 1, "st": 0, "bm": 0,
+    }
+
+
+def camera_layer(camera, frames, width, height, pixels_per_unit, ortho_start, tolerances=TOLERANCES):
+    """
+    A null layer turning layer pixels into screen pixels: the camera's
+    position becomes its anchor, its ortho scale a zoom about the centre.
+    """
+    times = frames - frames[0]
+    xy = world_matrices(camera, frames)[:, :2, 2] * (pixels_per_unit, -pixels_per_unit)
+    ortho = sample_channel(camera.data, "ortho_scale", 0, camera.data.ortho_scale, frames)
+    zoom = 100 * ortho_start / ortho
+    return {
+        "ddd": 0, "ind": 1, "ty": 3, "nm": camera.name, "sr": 1,
+        "ks": _transform(
+            _static([width / 2, height / 2]),
+            _static(0),
+            animated(times, np.column_stack([zoom, zoom]), tolerances["scale"]),
+            anchor=animated(times, xy, tolerances["position"]),
+        ),
+        "ao": 0, "ip": 0, "op": int(times[-1]) + 1, "st": 0, "bm": 0,
+    }
+
+
+def _background_layer(scene, index, width, height, frame_count):
+    color = np.zeros(3)
+    world = scene.world
+    if world is not None and world.use_nodes:
+        node = next((n for n in world.node_tree.nodes if n.type == 'BACKGROUND'), None)
+        if node is not None:
+            color = np.array(node.inputs["Color"].default_value[:3]) * node.inputs["Strength"].default_value
+    hex_color = "#" + "".join(f"{round(c * 255):02x}" for c in _srgb(color))
+    return {
+        "ddd": 0, "ind": index, "ty": 1, "nm": "Background", "sr": 1,
+        "ks": _transform(_static([width / 2, height / 2]), _static(0), _static([100, 100]),
+                         anchor=_static([width / 2, height / 2])),
+        "ao": 0, "sw": width, "sh": height, "sc": hex_color,
+        "ip": 0, "op": frame_count, "st": 0, "bm": 0,
+    }
+
+
+# ──────────────────────────────────────────────
+# Export
+# ──────────────────────────────────────────────
+
+def export_lottie(path, frame_start=None, frame_end=None, camera=None, tolerances=TOLERANCES):
+    """
+    Write the scene's emission shapes as a Lottie animation (JSON).
+
+    Args:
+        path: JSON file to write
+        frame_start, frame_end: Inclusive range (default: the scene's)
+        camera: The orthographic camera (default: the scene's)
+        tolerances: Largest error thinning may introduce, per channel (see
+                    TOLERANCES)
+    Returns the number of shape layers written.
+    """
+    scene = bpy.context.scene
+    frame_start = scene.frame_start if frame_start is None else frame_start
+    frame_end = scene.frame_end if frame_end is None else frame_end
+    camera = camera or scene.camera
+    frames = np.arange(frame_start, frame_end + 1)
+    render = scene.render
+    scale = render.resolution_percentage / 100
+    width, height = round(render.resolution_x * scale), round(render.resolution_y * scale)
+    ortho_start = sample_channel(camera.data, "ortho_scale", 0, camera.data.ortho_scale, frames[:1])[0]
+    # ortho_scale spans the longer side of the frame
+    pixels_per_unit = max(width, height) / ortho_start
+
+    meshes, fields = [], 0
+    for obj in scene.objects:
+        # Keyed hide_render is checked per frame in object_layer()
+        if obj.type != 'MESH' or not len(obj.data.polygons):
+            continue
+        if field_tree(obj) is not None:
+            fields += 1
+        elif obj.active_material is not None:
+            meshes.append(obj)
+    # Lottie draws the first layer on top; Blender's camera looks down -Z
+    meshes.sort(key=lambda obj: -obj.matrix_world.translation.z)
+
+    cache = {}
+    layers = [camera_layer(camera, frames, width, height, pixels_per_unit, ortho_start, tolerances)]
+    for obj in meshes:
+        layer = object_layer(obj, frames, len(layers) + 1, 1, pixels_per_unit, tolerances, cache)
+        if layer is not None:
+            layers.append(layer)
+    shapes = len(layers) - 1
+    layers.append(_background_layer(scene, len(layers) + 1, width, height, len(frames)))
+
+    animation = {
+        "v": LOTTIE_VERSION, "nm": os.path.splitext(os.path.basename(path))[0],
+        "fr": render.fps, "ip": 0, "op": len(frames), "w": width, "h": height,
+        "ddd": 0, "assets": [], "layers": layers,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(animation, f, separators=(",", ":"))
+
+    print(f"🧩 Lottie: {shapes} shapes over {len(frames)} frames → {path} "
+          f"({os.path.getsize(path) / 1024:.0f} KB)")
+    if fields:
+        print(f"   {fields} Geometry Nodes fields left out (their motion isn't keyed)")
+    return shapes
@@ -3,6 +3,8 @@ Material and shader creation helpers.
 """
 import bpy
 
+from scripts.utils.ownership import own
+
 
 def create_principled_material(
     name="Material",
@@ -16,7 +18,7 @@ def create_principled_material(
     Create a Principled BSDF material with common properties.
     Returns the material.
     """
-    mat = bpy.data.materials.new(name=name)
+    mat = own(bpy.data.materials.new(name=name))
     mat.use_nodes = True
     nodes = mat.node_tree.nodes
 
@@ -37,7 +39,7 @@ def create_principled_material(
 
 def create_glass_material(name="Glass", color=(0.9, 0.95, 1.0, 1.0), ior=1.45, roughness=0.0):
     """Create a glass-like material."""
-    mat = bpy.data.materials.new(name=name)
+    mat = own(bpy.data.materials.new(name=name))
     mat.use_nodes = True
     nodes = mat.node_tree.nodes
 
@@ -52,7 +54,7 @@ def create_glass_material(name="Glass", color=(0.9, 0.95, 1.0, 1.0), ior=1.45, r
 
 def create_emission_material(name="Emission", color=(1.0, 0.5, 0.2, 1.0), strength=5.0):
     """Create a pure emission (glowing) material."""
-    mat = bpy.data.materials.new(name=name)
+    mat = own(bpy.data.materials.new(name=name))
     mat.use_nodes = True
     nodes = mat.node_tree.nodes
     links = mat.node_tree.links
@@ -72,9 +74,71 @@ def create_emission_material(name="Emission", color=(1.0, 0.5, 0.2, 1.0), streng
     return mat
 
 
+# Object custom properties read by attribute emission materials
+EMISSION_COLOR_ATTRIBUTE = "emission_color"
+EMISSION_STRENGTH_ATTRIBUTE = "emission_strength"
+
+
+def create_attribute_emission_material(name="AttributeEmission", strength=None, attribute_type='OBJECT'):
+    """
+    Create an emission material many objects can share.
+
+    Colour comes from each object's "emission_color" custom property, read
+    through an Attribute node, so one material (and one shader compile)
+    serves any number of differently coloured objects. Strength comes from
+    each object's "emission_strength" property too, unless `strength` is
+    given — then it is a plain node value, keyable once for every user.
+    Set the properties with set_emission_attributes().
+
+    With attribute_type='INSTANCER' the same names are read from the
+    attributes of Geometry Nodes instances instead (see utils/instancing.py).
+    """
+    mat = own(bpy.data.materials.new(name=name))
+    mat.use_nodes = True
+    nodes = mat.node_tree.nodes
+    links = mat.node_tree.links
+
+    for node in nodes:
+        nodes.remove(node)
+
+    emission = nodes.new(type='ShaderNodeEmission')
+    output = nodes.new(type='ShaderNodeOutputMaterial')
+    links.new(emission.outputs["Emission"], output.inputs["Surface"])
+
+    color = nodes.new(type='ShaderNodeAttribute')
+    color.attribute_type = attribute_type
+    color.attribute_name = EMISSION_COLOR_ATTRIBUTE
+    links.new(color.outputs["Color"], emission.inputs["Color"])
+
+    if strength is None:
+        fac = nodes.new(type='ShaderNodeAttribute')
+        fac.attribute_type = attribute_type
+        fac.attribute_name = EMISSION_STRENGTH_ATTRIBUTE
+        links.new(fac.outputs["Fac"], emission.inputs["Strength"])
+    else:
+        emission.inputs["Strength"].default_value = strength
+
+    return mat
+
+
+def set_emission_attributes(obj, color=None, strength=None):
+    """Set the per-object emission colour and/or strength an attribute material reads."""
+    if color is not None:
+        obj[EMISSION_COLOR_ATTRIBUTE] = list(color)
+    if strength is not None:
+        obj[EMISSION_STRENGTH_ATTRIBUTE] = float(strength)
+
+
 def assign_material(obj, material):
-    """Assign a material to an object."""
-    if obj.data.materials:
+    """
+    Assign a material to an object.
+
+    Objects whose first slot is linked to the object (shared primitive
+    meshes) get the material on that slot, leaving the mesh untouched.
+    """
+    if obj.material_slots and obj.material_slots[0].link == 'OBJECT':
+        obj.material_slots[0].material = material
+    elif obj.data.materials:
         obj.data.materials[0] = material
     else:
         obj.data.materials.append(material)
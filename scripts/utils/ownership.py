@@ -0,0 +1,140 @@
+"""
+Build ownership — track what a script build creates, so teardown removes
+exactly that.
+
+Scripts build into an owned collection, and the utils tag every datablock
+they create (own()). Teardown gathers:
+  - tagged datablocks,
+  - objects in the owned collection, including any bpy.ops added there,
+    since teardown leaves it as the active collection,
+  - those objects' data when no other object uses it,
+  - the actions animating any of the above,
+and removes them all with a single bpy.data.batch_remove() call. Anything
+made by hand outside the collection is left alone, and there is no global
+orphan purge.
+
+Tags are custom properties on the datablocks themselves, so they survive
+the Script Watcher's module reloads, which reset module globals.
+
+A file that has never been built into has no owned collection yet. Its
+first teardown clears the whole scene (the startup cube, camera and
+light), the same as reset_scene() always did. From then on, teardown only
+touches the build.
+"""
+import bpy
+
+
+OWNED_TAG = "script_build"          # custom property marking a build's datablocks
+BUILD_COLLECTION = "ScriptBuild"    # name of the collection a build links into
+
+# Datablock types a build creates
+OWNED_DATA = (
+    "objects", "meshes", "curves", "materials", "worlds",
+    "lights", "cameras", "actions", "node_groups", "collections",
+)
+
+
+# ──────────────────────────────────────────────
+# Tracking
+# ──────────────────────────────────────────────
+
+def own(block):
+    """Tag a datablock as part of the build. Returns it."""
+    block[OWNED_TAG] = True
+    return block
+
+
+def is_owned(block):
+    """True if own() tagged this datablock."""
+    return bool(block.get(OWNED_TAG))
+
+
+def build_collection(scene=None):
+    """The scene's owned collection, created and linked on first use."""
+    scene = scene or bpy.context.scene
+    for child in scene.collection.children:
+        if is_owned(child):
+            return child
+    collection = own(bpy.data.collections.new(BUILD_COLLECTION))
+    scene.collection.children.link(collection)
+    return collection
+
+
+def activate_build_collection():
+    """Make the owned collection the active one, so new objects land in it."""
+    collection = build_collection()
+    view_layer = bpy.context.view_layer
+    for layer_collection in view_layer.layer_collection.children:
+        if layer_collection.collection == collection:
+            view_layer.active_layer_collection = layer_collection
+    return collection
+
+
+# ──────────────────────────────────────────────
+# Teardown
+# ──────────────────────────────────────────────
+
+def owned_blocks():
+    """Every datablock the build owns, as {pointer: datablock}."""
+    blocks = {}
+
+    def add(block):
+        if block is not None and block.library is None:
+            blocks[block.as_pointer()] = block
+
+    for attr in OWNED_DATA:
+        for block in getattr(bpy.data, attr):
+            if is_owned(block):
+                add(block)
+
+    # Objects in owned collections, and data only they use
+    objects = {obj.as_pointer(): obj for coll in bpy.data.collections if is_owned(coll)
+               for obj in coll.all_objects}
+    data_users = {}
+    for obj in objects.values():
+        add(obj)
+        if obj.data is not None:
+            entry = data_users.setdefault(obj.data.as_pointer(), [obj.data, 0])
+            entry[1] += 1
+    for data, count in data_users.values():
+        if data.users <= count:
+            add(data)
+
+    # Actions animating any of them (material node trees keep their own)
+    for block in list(blocks.values()):
+        for animated in (block, getattr(block, "node_tree", None)):
+            anim = getattr(animated, "animation_data", None)
+            if anim is not None and anim.action is not None:
+                add(anim.action)
+    return blocks
+
+
+def _all_blocks():
+    """Every local datablock of the types a build creates."""
+    return [block for attr in OWNED_DATA for block in getattr(bpy.data, attr)
+            if block.library is None]
+
+
+def teardown_build():
+    """
+    Remove the build's datablocks in one batch and get ready for the next.
+
+    Leaves an empty owned collection active and the playhead on frame 1.
+    Returns the number of datablocks removed.
+    """
+    if bpy.context.mode != 'OBJECT':
+        try:
+            bpy.ops.object.mode_set(mode='OBJECT')
+        except RuntimeError:
+            pass
+
+    if any(is_owned(coll) for coll in bpy.data.collections):
+        blocks = list(owned_blocks().values())
+    else:
+        blocks = _all_blocks()
+    if blocks:
+        bpy.data.batch_remove(blocks)
+
+    activate_build_collection()
+    bpy.context.scene.frame_set(1)
+    return len(blocks)
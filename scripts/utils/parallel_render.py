@@ -0,0 +1,303 @@
+"""
+Parallel rendering — split an animation across several headless Blender
+processes.
+
+One Blender process rarely keeps a many-core machine busy: scene sync,
+compositing and file output are largely single-threaded, and the render
+itself stops scaling well before 32+ cores. render_in_parallel() instead:
+  1. saves the built scene to a temporary .blend, set to write PNG frames,
+  2. splits the frame range into contiguous chunks, several per worker,
+  3. keeps `workers` headless Blender processes busy, each rendering one
+     chunk with `-s/-e/-a` and `--threads` capped to its share of the cores,
+  4. checks which frames each finished chunk actually wrote, and queues the
+     missing ones again (up to `retries` times),
+  5. hands the complete frame set to frames_to_video().
+
+Small chunks balance the load (a slow act doesn't hold one worker up while
+the others idle) and keep a retry cheap.
+
+Usage (in a headless build, after everything is keyed):
+    render_in_parallel(4, "./output/finding_the_one_frames/",
+                       video_file="./output/finding_the_one.mp4")
+"""
+import math
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+import bpy
+
+from scripts.utils.render_device import allotted_cores
+from scripts.utils.scene import frames_to_video, get_render_profile
+
+
+CHUNKS_PER_WORKER = 4    # chunks queued per worker, for load balancing
+POLL_SECONDS = 2.0       # how often workers are checked
+REPORT_SECONDS = 10.0    # how often progress is printed
+
+
+# ──────────────────────────────────────────────
+# Planning
+# ──────────────────────────────────────────────
+
+def split_frames(frame_start, frame_end, workers, chunks_per_worker=CHUNKS_PER_WORKER):
+    """
+    Split an inclusive frame range into contiguous (start, end) chunks.
+
+    Aims for `workers * chunks_per_worker` chunks of near-equal size, never
+    fewer than one frame each.
+    """
+    total = frame_end - frame_start + 1
+    if total <= 0:
+        return []
+    count = max(1, min(total, workers * chunks_per_worker))
+    size, extra = divmod(total, count)
+    chunks, start = [], frame_start
+    for k in range(count):
+        end = start + size + (1 if k < extra else 0) - 1
+        chunks.append((start, end))
+        start = end + 1
+    return chunks
+
+
+def plan_chunks(frames, workers, chunks_per_worker=CHUNKS_PER_WORKER):
+    """
+    Contiguous (start, end) chunks covering an arbitrary set of frames.
+
+    Each contiguous run of `frames` is cut into pieces of roughly
+    len(frames) / (workers * chunks_per_worker) frames.
+    """
+    frames = sorted(set(frames))
+    if not frames:
+        return []
+    size = math.ceil(len(frames) / max(1, workers * chunks_per_worker))
+    chunks = []
+    for start, end in frame_runs(frames):
+        chunks.extend(split_frames(start, end, math.ceil((end - start + 1) / size), 1))
+    return chunks
+
+
+def frame_path(frames_dir, frame):
+    """Where a worker writes `frame` ("####" padding, PNG)."""
+    return os.path.join(frames_dir, f"{frame:04d}.png")
+
+
+def missing_frames(frames_dir, frame_start, frame_end):
+    """Frames in the inclusive range with no non-empty PNG in frames_dir."""
+    missing = []
+    for frame in range(frame_start, frame_end + 1):
+        path = frame_path(frames_dir, frame)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            missing.append(frame)
+    return missing
+
+
+def frame_runs(frames):
+    """Sorted frames → contiguous inclusive (start, end) runs."""
+    runs = []
+    for frame in sorted(frames):
+        if runs and runs[-1][1] == frame - 1:
+            runs[-1][1] = frame
+        else:
+            runs.append([frame, frame])
+    return [tuple(run) for run in runs]
+
+
+def worker_threads(workers, cores=None):
+    """Render threads per worker, so all workers together use every allotted core."""
+    cores = cores or allotted_cores()
+    return max(1, cores // max(1, workers))
+
+
+def worker_command(blend_file, frames_dir, chunk, threads, blender=None):
+    """
+    Command line for one headless worker rendering one chunk.
+
+    Options are order-sensitive on Blender's command line: output, format
+    and range come before -a, which renders with them. Every frame of the
+    chunk is rendered, whatever frame step the scene has.
+    """
+    start, end = chunk
+    return [
+        blender or bpy.app.binary_path,
+        "--background", blend_file,
+        "--threads", str(threads),
+        "--render-output", os.path.join(os.path.abspath(frames_dir), "####"),
+        "--render-format", "PNG",
+        "--use-extension", "1",
+        "-j", "1",
+        "-s", str(start), "-e", str(end),
+        "-a",
+    ]
+
+
+# ──────────────────────────────────────────────
+# Running workers
+# ──────────────────────────────────────────────
+
+def use_png_output(scene, filepath, compression=None):
+    """
+    Point the scene's output at PNG files at `filepath`, with the active
+    render profile's colour mode, depth and compression. `compression`
+    overrides the profile's (0: fastest, for frames read back once).
+    Returns the previous settings, for restore_output().
+    """
+    settings = scene.render.image_settings
+    profile = get_render_profile()
+    saved = (scene.render.filepath, getattr(settings, "media_type", None), settings.file_format,
+             settings.color_mode, settings.color_depth, settings.compression)
+    if hasattr(settings, "media_type"):
+        settings.media_type = 'IMAGE'
+    settings.file_format = 'PNG'
+    settings.color_mode = profile["color_mode"]
+    settings.color_depth = profile["color_depth"]
+    settings.compression = profile["compression"] if compression is None else compression
+    scene.render.filepath = filepath
+    return saved
+
+
+def restore_output(scene, saved):
+    """Undo use_png_output()."""
+    settings = scene.render.image_settings
+    scene.render.filepath, media_type, file_format, color_mode, color_depth, compression = saved
+    if media_type is not None:
+        settings.media_type = media_type
+    settings.file_format = file_format
+    settings.color_mode = color_mode
+    settings.color_depth = color_depth
+    settings.compression = compression
+
+
+def save_render_copy(frames_dir, directory=None, compression=None):
+    """
+    Save the current scene to a temporary .blend that renders PNG frames
+    into frames_dir (see use_png_output() for `compression`). The open file
+    and its settings are left as they were. Returns the .blend path.
+    """
+    scene = bpy.context.scene
+    saved = use_png_output(scene, os.path.join(os.path.abspath(frames_dir), ""), compression)
+    handle, blend_file = tempfile.mkstemp(suffix=".blend", prefix="render_", dir=directory)
+    os.close(handle)
+    try:
+        bpy.ops.wm.save_as_mainfile(filepath=blend_file, copy=True, compress=False)
+    finally:
+        restore_output(scene, saved)
+    return blend_file
+
+
+def _launch(blend_file, frames_dir, chunk, threads, blender, log_dir):
+    log_path = os.path.join(log_dir, f"worker_{chunk[0]:04d}-{chunk[1]:04d}.log")
+    log = open(log_path, "w")
+    process = subprocess.Popen(
+        worker_command(blend_file, frames_dir, chunk, threads, blender),
+        stdout=log, stderr=subprocess.STDOUT,
+    )
+    return {"process": process, "chunk": chunk, "log": log, "log_path": log_path}
+
+
+def render_in_parallel(workers, frames_dir, frame_start=None, frame_end=None,
+                       video_file=None, fps=None, threads=None, retries=2, blender=None,
+                       frames=None, on_rendered=None, compression=None,
+                       on_poll=None, delivered=None):
+    """
+    Render the current scene's frames with `workers` headless Blender
+    processes, then stitch them into a video.
+
+    Args:
+        workers: Number of Blender processes to run at once
+        frames_dir: Directory the PNG frames are written to
+        frame_start, frame_end: Inclusive range (default: the scene's)
+        video_file: Passed to frames_to_video(); None skips stitching
+        fps: Video frame rate (default: the scene's)
+        threads: Render threads per worker (default: cores / workers)
+        retries: Times a chunk's missing frames are queued again
+        blender: Blender executable (default: the running one)
+        frames: Render only these frames of the range (default: all of it)
+        on_rendered: Called with the frames each finished chunk wrote
+        compression: PNG compression for the frames (default: the profile's)
+        on_poll: Called every time the workers are checked
+        delivered: Frames already handed on (and maybe removed from
+                   frames_dir) by on_poll; they count as rendered
+    Returns the number of frames rendered.
+    Raises RuntimeError if frames are still missing after the retries.
+    """
+    scene = bpy.context.scene
+    frame_start = scene.frame_start if frame_start is None else frame_start
+    frame_end = scene.frame_end if frame_end is None else frame_end
+    fps = fps or scene.render.fps
+    threads = threads or worker_threads(workers)
+    if frames is None:
+        frames = range(frame_start, frame_end + 1)
+    frames = sorted(set(frames))
+    total = len(frames)
+    os.makedirs(frames_dir, exist_ok=True)
+    # Frames left from an earlier build would pass for finished ones
+    for frame in frames:
+        if os.path.lexists(frame_path(frames_dir, frame)):
+            os.remove(frame_path(frames_dir, frame))
+
+    delivered = delivered if delivered is not None else set()
+
+    def missing(start, end):
+        return [f for f in missing_frames(frames_dir, start, end) if f not in delivered]
+
+    blend_file = save_render_copy(frames_dir, compression=compression)
+    log_dir = tempfile.mkdtemp(prefix="render_logs_")
+    queue = [(chunk, 0) for chunk in plan_chunks(frames, workers)]
+    print(f"🖥️  Rendering {total} frames with {workers} workers × {threads} threads "
+          f"({len(queue)} chunks)")
+
+    running, failed = [], []
+    started = last_report = time.time()
+    try:
+        while queue or running:
+            while queue and len(running) < workers:
+                chunk, attempt = queue.pop(0)
+                job = _launch(blend_file, frames_dir, chunk, threads, blender, log_dir)
+                job["attempt"] = attempt
+                running.append(job)
+
+            time.sleep(POLL_SECONDS)
+            if on_poll is not None:
+                on_poll()
+            for job in [job for job in running if job["process"].poll() is not None]:
+                running.remove(job)
+                job["log"].close()
+                left = missing(*job["chunk"])
+                if on_rendered is not None:
+                    start, end = job["chunk"]
+                    on_rendered([f for f in range(start, end + 1) if f not in left])
+                if not left:
+                    continue
+                code = job["process"].returncode
+                if job["attempt"] < retries:
+                    print(f"⚠️  Chunk {job['chunk'][0]}–{job['chunk'][1]} (exit {code}) left "
+                          f"{len(left)} frames — retrying (log: {job['log_path']})")
+                    queue.extend((run, job["attempt"] + 1) for run in frame_runs(left))
+                else:
+                    failed.extend(left)
+
+            if time.time() - last_report >= REPORT_SECONDS:
+                last_report = time.time()
+                done = total - sum(len(missing(*run)) for run in frame_runs(frames))
+                rate = done / max(last_report - started, 1e-6)
+                print(f"   🎞️  {done}/{total} frames ({len(running)} workers busy, {rate:.1f} fps)")
+    finally:
+        for job in running:
+            job["process"].kill()
+            job["log"].close()
+        os.remove(blend_file)
+
+    if failed:
+        raise RuntimeError(
+            f"{len(failed)} frames failed to render after {retries} retries: "
+            f"{', '.join(f'{s}–{e}' for s, e in frame_runs(failed))} (logs in {log_dir})"
+        )
+    shutil.rmtree(log_dir, ignore_errors=True)
+    print(f"✅ Rendered {total} frames in {time.time() - started:.0f}s")
+
+    if video_file is not None:
+        frames_to_video(frames_dir, video_file, fps=fps, start_frame=frame_start)
+    return total
@@ -0,0 +1,112 @@
+"""
+Object pools — reuse a few objects for many short-lived effects.
+
+An effect that spawns a shape every few frames (trails, sparks, ripples)
+would otherwise create a new object per spawn, and each one hangs around
+invisible for the rest of the film once its life is over. A pool hands out
+an object whose previous life has already ended, and creates a new one only
+when every object is still busy. An effect then needs as many objects as it
+has alive at once, not as many as it ever spawns.
+
+Each spawn keys one life on the reused object:
+
+    frame - 1          hidden (scale 0, emission 0, hide_render), moved to `position`
+    frame              shown, scale and emission at their start values
+    frame + lifetime   scale and emission at their end values
+    ... + 1            hidden again, free for the next spawn
+
+hide_render / hide_viewport are keyed like scripts/utils/visibility.py keys
+them, so renders skip pooled objects between lives instead of drawing
+them at zero scale.
+
+Usage:
+    pool = create_pool(lambda i: create_primitive(f"Spark_{i:02d}", "plane", 0.2))
+    for f in range(100, 400, 5):
+        spawn(pool, f, 30, (x, y, 0), scale=(1.0, 0.2), strength=(2.0, 0.0))
+"""
+from scripts.utils.keying import insert_key
+from scripts.utils.materials import EMISSION_STRENGTH_ATTRIBUTE
+from scripts.utils.visibility import HIDE_PATHS
+
+
+# ──────────────────────────────────────────────
+# Pools
+# ──────────────────────────────────────────────
+
+def _key_property_strength(target, strength, frame):
+    insert_key(target, f'["{EMISSION_STRENGTH_ATTRIBUTE}"]', strength, frame)
+
+
+def _key_hidden(obj, hidden, frame):
+    # Written directly, as in visibility.py: a switch, not a curve to thin
+    for path in HIDE_PATHS:
+        setattr(obj, path, hidden)
+        obj.keyframe_insert(data_path=path, frame=frame)
+
+
+def create_pool(make, key_emission=None):
+    """
+    Create an empty pool.
+
+    Args:
+        make: function(index) -> object, or (object, emission target), called
+              when a spawn finds every pooled object busy
+        key_emission: function(target, strength, frame) keying emission;
+                      defaults to the target object's "emission_strength"
+                      property (see set_emission_attributes())
+    Returns the pool (a dict; "objects" lists every object it created).
+    """
+    return {
+        "make": make,
+        "key_emission": key_emission or _key_property_strength,
+        "objects": [],
+        "targets": [],       # emission target per object
+        "free_from": [],     # first frame each object may be moved again
+        "spawns": 0,
+    }
+
+
+def _acquire(pool, frame):
+    """Index of an object free by `frame`, creating one if all are busy."""
+    for i, free_from in enumerate(pool["free_from"]):
+        if free_from <= frame:
+            return i
+
+    made = pool["make"](len(pool["objects"]))
+    obj, target = made if isinstance(made, tuple) else (made, made)
+    pool["objects"].append(obj)
+    pool["targets"].append(target)
+    pool["free_from"].append(frame)
+    return len(pool["objects"]) - 1
+
+
+def spawn(pool, frame, lifetime, position, scale=(1.0, 1.0), strength=(1.0, 0.0)):
+    """
+    Key one life of a pooled object.
+
+    Args:
+        pool: From create_pool()
+        frame: Frame the object appears
+        lifetime: Frames until it reaches its end values
+        position: (x, y, z) it sits at for its whole life
+        scale: (start, end) uniform scale
+        strength: (start, end) emission strength
+    Returns the object used.
+    """
+    i = _acquire(pool, frame - 1)
+    obj, target = pool["objects"][i], pool["targets"][i]
+    key_emission = pool["key_emission"]
+    end = frame + lifetime
+
+    for f, s, e in ((frame - 1, 0.0, 0.0), (frame, scale[0], strength[0]), (end, scale[1], strength[1])):
+        insert_key(obj, "scale", (s, s, s), f)
+        key_emission(target, e, f)
+    insert_key(obj, "location", position, frame - 1)
+    insert_key(obj, "location", position, end)
+    insert_key(obj, "scale", (0.0, 0.0, 0.0), end + 1)
+    for f, hidden in ((frame - 1, True), (frame, False), (end, False), (end + 1, True)):
+        _key_hidden(obj, hidden, f)
+
+    pool["free_from"][i] = end + 1
+    pool["spawns"] += 1
+    return obj
@@ -0,0 +1,132 @@
+"""
+Primitive factory — create objects through bpy.data instead of bpy.ops.
+
+Operators like primitive_plane_add() are slow, depend on the active
+context, and build a brand-new mesh every call. Here each (shape, size)
+mesh is built once and shared by every object that uses it, so creating
+hundreds of identical shapes costs one mesh plus one object each.
+
+Shared meshes carry one material slot linked to the object, not the mesh,
+so assign_material() still gives every instance its own material.
+"""
+import math
+
+import bpy
+
+from scripts.utils.ownership import own
+
+
+# ──────────────────────────────────────────────
+# Shapes
+# ──────────────────────────────────────────────
+
+def _plane(size):
+    half = size / 2
+    return [(-half, -half, 0), (half, -half, 0), (half, half, 0), (-half, half, 0)]
+
+
+def _right_tri(leg):
+    half = leg / 2
+    return [(-half, -half, 0), (half, -half, 0), (-half, half, 0)]
+
+
+def _iso_tri(base, height):
+    half = base / 2
+    return [(-half, -height / 3, 0), (half, -height / 3, 0), (0, 2 * height / 3, 0)]
+
+
+def _equilateral_tri(size):
+    return _iso_tri(size, size * math.sqrt(3) / 2)
+
+
+# shape -> function(*size) returning the vertices of a single flat face
+SHAPES = {
+    "plane": _plane,
+    "right_tri": _right_tri,
+    "iso_tri": _iso_tri,
+    "equilateral_tri": _equilateral_tri,
+}
+
+
+# ──────────────────────────────────────────────
+# Mesh cache
+# ──────────────────────────────────────────────
+
+_meshes = {}  # (shape, size...) -> mesh datablock
+
+
+def primitive_mesh(shape, *size):
+    """
+    Return the shared mesh for a shape at a size, building it on first use.
+
+    Args:
+        shape: A key of SHAPES, e.g. "plane" or "equilateral_tri"
+        size: The shape's dimensions, e.g. 0.6 for a plane or
+              (base, height) for "iso_tri"
+    """
+    key = (shape,) + tuple(float(s) for s in size)
+    mesh = _meshes.get(key)
+    if mesh is not None:
+        try:
+            mesh.name
+            return mesh
+        except ReferenceError:
+            pass  # removed by reset_scene() since it was cached
+
+    verts = SHAPES[shape](*size)
+    mesh = own(bpy.data.meshes.new(f"{shape}_{'x'.join(f'{s:g}' for s in size)}"))
+    mesh.from_pydata(verts, [], [list(range(len(verts)))])
+    mesh.update()
+    # One slot, linked per object by create_primitive()
+    mesh.materials.append(None)
+    _meshes[key] = mesh
+    return mesh
+
+
+# ──────────────────────────────────────────────
+# Objects
+# ──────────────────────────────────────────────
+
+def new_object(name, data=None, location=(0, 0, 0), collection=None, link=True):
+    """
+    Create an object without operators.
+
+    Args:
+        name: Object name
+        data: Mesh, camera or light data, or None for an empty
+        location: World location
+        collection: Collection to link into (default: the active one, which
+                    is the build collection after reset_scene())
+        link: False to leave the object unlinked for link_objects()
+    Returns the object.
+    """
+    obj = own(bpy.data.objects.new(name, data))
+    obj.location = location
+    if link:
+        (collection or bpy.context.collection).objects.link(obj)
+    return obj
+
+
+def create_primitive(name, shape, *size, location=(0, 0, 0), collection=None, link=True):
+    """
+    Create an object sharing the cached mesh for a shape and size.
+
+    Args:
+        name: Object name
+        shape, size: See primitive_mesh()
+        location: World location
+        collection, link: See new_object()
+    Returns the object.
+    """
+    obj = new_object(name, primitive_mesh(shape, *size), location, collection, link)
+    obj.material_slots[0].link = 'OBJECT'
+    return obj
+
+
+def link_objects(objects, collection=None):
+    """Link a batch of unlinked objects into a collection (default: the active one)."""
+    collection = collection or bpy.context.collection
+    link = collection.objects.link
+    for obj in objects:
+        link(obj)
+    return objects
@@ -0,0 +1,287 @@
+"""
+Flat raster — render flat samples to video with NumPy, without Blender.
+
+Reads a file written by sample_flat_scene() (scripts/utils/flat_samples.py)
+and rasterises every frame on the CPU:
+  - each drawn shape's triangles are moved to pixel space through its
+    transform and the frame's camera,
+  - coverage is decided by edge functions, evaluated for a whole batch of
+    similar-sized triangles at once over their bounding boxes,
+  - emission adds up (np.bincount per channel) and is clamped to 1, then
+    encoded with the sRGB curve,
+  - with supersampling, each pixel averages s × s samples.
+
+Frames are rendered in a process pool and piped to ffmpeg as raw RGB, in
+order, as they finish. Nothing here imports bpy: run it with any Python
+that has NumPy.
+
+Shared edges follow a tie rule, so a square split into two triangles isn't
+drawn twice along its diagonal. Overlapping shapes add up rather than
+hiding each other, and the colours go through the plain sRGB curve rather
+than the scene's view transform: this is a preview, not the final look.
+
+Usage:
+    python -m scripts.utils.raster output/finding_the_one_flat.npz output/finding_the_one_flat.mp4
+    python -m scripts.utils.raster samples.npz preview.mp4 --width 1280 --supersample 2 --processes 8
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+PREVIEW_X264 = ['-c:v', 'libx264', '-pix_fmt', 'yuv420p', '-crf', '23', '-preset', 'veryfast']
+BATCH_PIXELS = 1 << 20   # bounding-box pixels evaluated per batch
+
+_worker = {}             # per-process samples and frame settings, see _start_worker()
+
+
+# ──────────────────────────────────────────────
+# Samples
+# ──────────────────────────────────────────────
+
+def load_flat_samples(path):
+    """A flat samples file as a dict of arrays."""
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+def frame_triangles(samples, index, width, height):
+    """
+    Triangles drawn on the index-th sampled frame, in pixel coordinates.
+
+    Returns ((T, 3, 2) vertices, (T, 3) emission).
+    """
+    start, end = samples["frame_offsets"][index], samples["frame_offsets"][index + 1]
+    shapes = samples["item_shape"][start:end]
+    counts = samples["shape_count"][shapes]
+    if counts.sum() == 0:
+        return np.zeros((0, 3, 2), np.float32), np.zeros((0, 3), np.float32)
+
+    # Every triangle of every drawn shape, with the item it belongs to
+    item = np.repeat(np.arange(len(shapes)), counts)
+    first = np.repeat(samples["shape_start"][shapes] - np.cumsum(counts) + counts, counts)
+    local = samples["triangles"][first + np.arange(counts.sum())]
+    matrix = samples["item_matrix"][start:end][item]
+    world = np.einsum('tij,tvj->tvi', matrix[:, :, :2], local) + matrix[:, None, :, 2]
+
+    # Orthographic camera looking straight down; ortho_scale spans the longer side
+    cam_x, cam_y, ortho = samples["camera"][index]
+    scale = max(width, height) / ortho
+    pixels = np.empty_like(world)
+    pixels[..., 0] = width / 2 + (world[..., 0] - cam_x) * scale
+    pixels[..., 1] = height / 2 - (world[..., 1] - cam_y) * scale
+    return pixels, samples["item_color"][start:end][item]
+
+
+# ──────────────────────────────────────────────
+# Rasterising
+# ──────────────────────────────────────────────
+
+def _covered(tris, x0, y0, x1, y1, rows, cols):
+    """
+    Pixels covered by each triangle, over a rows × cols box from (x0, y0).
+
+    Returns (triangle, x, y) of every covered pixel centre.
+    """
+    xs = x0[:, None] + np.arange(cols)[None, :]
+    ys = y0[:, None] + np.arange(rows)[None, :]
+    inside = (ys <= y1[:, None])[:, :, None] & (xs <= x1[:, None])[:, None, :]
+    px, py = xs + 0.5, ys + 0.5
+    for k in range(3):
+        p, q = tris[:, k], tris[:, (k + 1) % 3]
+        # Each edge is measured from its lower endpoint, so an edge two
+        # triangles share gives exactly opposite values in each
+        swap = (p[:, 0] > q[:, 0]) | ((p[:, 0] == q[:, 0]) & (p[:, 1] > q[:, 1]))
+        p, q = np.where(swap[:, None], q, p), np.where(swap[:, None], p, q)
+        dx, dy = q[:, 0] - p[:, 0], q[:, 1] - p[:, 1]
+        sign = np.where(swap, -1.0, 1.0)[:, None]
+        # The edge function separates into a row part and a column part
+        edge = (sign * dx[:, None] * (py - p[:, 1, None]))[:, :, None] \
+            - (sign * dy[:, None] * (px - p[:, 0, None]))[:, None, :]
+        # A centre exactly on a shared edge goes to the triangle that owns it
+        owns = (dy < 0) != swap
+        inside &= edge > np.where(owns, -np.finfo(np.float64).smallest_subnormal, 0.0)[:, None, None]
+    t, j, i = np.nonzero(inside)
+    return t, x0[t] + i, y0[t] + j
+
+
+def _tile(extent):
+    """Round extents up the series 1, 2, 4, 6, 8, 12, 16, 23, 32, 46, ... (steps of about √2)."""
+    return np.ceil(2 ** (np.ceil(2 * np.log2(np.maximum(extent, 1)) - 1e-9) / 2) - 1e-9).astype(np.int64)
+
+
+def rasterize(triangles, colors, width, height):
+    """
+    Add flat-coloured triangles into a (height, width, 3) float image.
+
+    Args:
+        triangles: (T, 3, 2) vertices in pixel coordinates (x right, y down)
+        colors: (T, 3) emission per triangle, added where it covers a pixel centre
+        width, height: Image size
+    """
+    tris = np.array(triangles, np.float64)
+    colors = np.asarray(colors, np.float32)
+    a, b, c = tris[:, 0], tris[:, 1], tris[:, 2]
+    area = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])
+    # Wind every triangle the same way, so "inside" is the same side of each edge
+    flip = area < 0
+    tris[flip] = tris[flip][:, [0, 2, 1]]
+
+    x0 = np.clip(np.ceil(tris[:, :, 0].min(axis=1) - 0.5), 0, width).astype(np.int64)
+    x1 = np.clip(np.floor(tris[:, :, 0].max(axis=1) - 0.5), -1, width - 1).astype(np.int64)
+    y0 = np.clip(np.ceil(tris[:, :, 1].min(axis=1) - 0.5), 0, height).astype(np.int64)
+    y1 = np.clip(np.floor(tris[:, :, 1].max(axis=1) - 0.5), -1, height - 1).astype(np.int64)
+    keep = np.nonzero((area != 0) & (x1 >= x0) & (y1 >= y0))[0]
+
+    # Batches of triangles whose bounding boxes round up to the same tile
+    rows, cols = _tile(y1[keep] - y0[keep] + 1), _tile(x1[keep] - x0[keep] + 1)
+    hits = []
+    for r, c in set(zip(rows.tolist(), cols.tolist())):
+        group = keep[(rows == r) & (cols == c)]
+        step = max(1, BATCH_PIXELS // (r * c))
+        for k in range(0, len(group), step):
+            chosen = group[k:k + step]
+            t, x, y = _covered(tris[chosen], x0[chosen], y0[chosen], x1[chosen], y1[chosen], r, c)
+            hits.append((chosen[t], y * width + x))
+
+    if not hits:
+        return np.zeros((height, width, 3), np.float32)
+    tri = np.concatenate([h[0] for h in hits])
+    pixel = np.concatenate([h[1] for h in hits])
+    channels = [np.bincount(pixel, weights=colors[tri, channel], minlength=width * height)
+                for channel in range(3)]
+    return np.stack(channels, axis=-1).astype(np.float32).reshape(height, width, 3)
+
+
+# Clamped linear value (in _SRGB_STEPS steps) → 8-bit sRGB
+_SRGB_STEPS = 16383
+_SRGB_TABLE = np.linspace(0.0, 1.0, _SRGB_STEPS + 1)
+_SRGB_TABLE = np.round(255 * np.where(
+    _SRGB_TABLE <= 0.0031308, _SRGB_TABLE * 12.92, 1.055 * np.power(_SRGB_TABLE, 1 / 2.4) - 0.055,
+)).astype(np.uint8)
+
+
+def to_srgb8(image):
+    """Scene-linear image → 8-bit sRGB, clamped to 0..1 first."""
+    steps = np.clip(image, 0.0, 1.0) * _SRGB_STEPS + 0.5
+    return _SRGB_TABLE[steps.astype(np.int32)]
+
+
+def render_frame(samples, index, width, height, supersample=1):
+    """The index-th sampled frame as a (height, width, 3) uint8 RGB image."""
+    s = max(1, int(supersample))
+    triangles, colors = frame_triangles(samples, index, width * s, height * s)
+    image = rasterize(triangles, colors, width * s, height * s)
+    image += samples["background"]
+    if s > 1:
+        # Each sample is clamped before the pixel averages them
+        samples_of = np.minimum(image, 1.0).reshape(height, s, width, s, 3)
+        image = sum(samples_of[:, j, :, i] for j in range(s) for i in range(s)) / (s * s)
+    return to_srgb8(image)
+
+
+# ──────────────────────────────────────────────
+# Rendering a video
+# ──────────────────────────────────────────────
+
+def _start_worker(path, width, height, supersample):
+    _worker.update(samples=load_flat_samples(path), size=(width, height), supersample=supersample)
+
+
+def _render_in_worker(index):
+    width, height = _worker["size"]
+    return render_frame(_worker["samples"], index, width, height, _worker["supersample"]).tobytes()
+
+
+def preview_size(samples, width=None):
+    """(width, height) at the sampled aspect ratio, both even (for yuv420p)."""
+    res_x, res_y = (int(v) for v in samples["resolution"])
+    width = width or res_x // 2
+    height = round(width * res_y / res_x)
+    return width - width % 2, height - height % 2
+
+
+def render_flat_video(samples_path, output_file, width=None, supersample=1, processes=None,
+                      frame_range=None, encoder_args=None):
+    """
+    Rasterise a flat samples file to an MP4.
+
+    Args:
+        samples_path: File written by sample_flat_scene()
+        output_file: MP4 to write
+        width: Video width (default: half the sampled resolution); the
+               height follows the sampled aspect ratio
+        supersample: Samples per pixel along each axis
+        processes: Frames rendered at once (default: one per core)
+        frame_range: Inclusive (start, end) of the sampled frames to render
+        encoder_args: ffmpeg output options (default: PREVIEW_X264)
+    Returns True if the video was written.
+    """
+    started = time.time()
+    samples = load_flat_samples(samples_path)
+    width, height = preview_size(samples, width)
+    frames = samples["frames"]
+    indices = np.arange(len(frames))
+    if frame_range is not None:
+        indices = indices[(frames >= frame_range[0]) & (frames <= frame_range[1])]
+    if hasattr(os, "sched_getaffinity"):
+        processes = processes or len(os.sched_getaffinity(0))
+    processes = max(1, processes or os.cpu_count() or 1)
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    ffmpeg = subprocess.Popen(
+        ['ffmpeg', '-y', '-loglevel', 'error',
+         '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f'{width}x{height}',
+         '-framerate', str(samples["fps"]), '-i', '-',
+         *(encoder_args or PREVIEW_X264), output_file],
+        stdin=subprocess.PIPE, stderr=subprocess.PIPE,
+    )
+    print(f"🖌️  Rasterising {len(indices)} frames at {width}×{height} "
+          f"({supersample}× supersampling) in {processes} processes...")
+    try:
+        with ProcessPoolExecutor(processes, initializer=_start_worker,
+                                 initargs=(samples_path, width, height, supersample)) as pool:
+            # A few frames in flight per process, written in order as they finish
+            pending = deque()
+            for index in indices:
+                pending.append(pool.submit(_render_in_worker, int(index)))
+                if len(pending) >= processes * 4:
+                    ffmpeg.stdin.write(pending.popleft().result())
+            while pending:
+                ffmpeg.stdin.write(pending.popleft().result())
+        ffmpeg.stdin.close()
+    except BrokenPipeError:
+        pass
+    ffmpeg.wait()
+    if ffmpeg.returncode != 0:
+        print(f"❌ ffmpeg failed: {ffmpeg.stderr.read().decode(errors='replace').strip()}")
+        print("   Make sure ffmpeg is installed: brew install ffmpeg")
+        return False
+    elapsed = time.time() - started
+    print(f"✅ Preview saved to {output_file} ({elapsed:.1f}s, {len(indices) / max(elapsed, 1e-9):.0f} fps)")
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rasterise flat samples to an MP4 preview.")
+    parser.add_argument("samples", help="File written by sample_flat_scene()")
+    parser.add_argument("output", help="MP4 to write")
+    parser.add_argument("--width", type=int, help="Video width (default: half the sampled width)")
+    parser.add_argument("--supersample", type=int, default=1, help="Samples per pixel per axis")
+    parser.add_argument("--processes", type=int, help="Parallel processes (default: one per core)")
+    parser.add_argument("--frames", help="START-END of the sampled frames to render")
+    args = parser.parse_args(argv)
+    frame_range = tuple(int(f) for f in args.frames.split("-", 1)) if args.frames else None
+    ok = render_flat_video(args.samples, args.output, args.width, args.supersample,
+                           args.processes, frame_range)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
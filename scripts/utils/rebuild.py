@@ -0,0 +1,467 @@
+"""
+Partial rebuilds — rebuild only the stages a config change affects.
+
+A script describes its build as an ordered table of stages:
+
+    STAGES = [
+        # name,      function,         upstream stages, creates objects
+        ("schedule", build_schedule,   (),              False),
+        ("act1",     animate_act1,     ("schedule",),   False),
+        ...
+    ]
+
+plan_rebuild() works out which config names every stage reads (statically,
+from the source of the stage function and every project function it calls)
+and compares the config module against the previous build. Each stage is
+then run through run_stage():
+
+  - a full build runs every stage and records the keys it writes
+  - a partial build re-runs the stages that read a changed name, or whose
+    upstream stages produced different results, in capture mode and writes
+    only the keys that differ from last time (keying.apply_key_layer)
+  - clean stages still run, with their keys dropped, so the values they
+    hand downstream stay exact; clean stages that create objects are
+    skipped and their previous result is reused
+
+A build limited to a frame window (the `frames` build option) runs every
+stage with keys outside the window dropped, so continuity state stays exact.
+Stages that create objects can also declare the frames they cover
+(plan_rebuild's `spans`); if that span misses the window entirely the stage
+is not run at all.
+
+State between builds lives in the `memo` dict the Script Watcher passes in
+through the build options. Without a memo every build is a full build.
+
+Config names are found by reading source rather than by tracing attribute
+access: scripts bind config values with `from config import NAME` at import
+time, so a tracing proxy around the module would never see stage code
+reading them.
+"""
+import ast
+import copy
+import hashlib
+import importlib.util
+import os
+
+import bpy
+
+from scripts.utils.build import set_build_report
+from scripts.utils.keying import (
+    use_key_layers,
+    begin_key_stage,
+    end_key_stage,
+    apply_key_layer,
+    forget_key_targets,
+)
+
+
+# Datablock types a stage may create, tracked so a rebuild can replace them
+CREATED_DATA = ("objects", "meshes", "curves", "materials", "actions", "node_groups")
+
+_MISSING = object()
+
+
+# ──────────────────────────────────────────────
+# Config snapshots
+# ──────────────────────────────────────────────
+
+def snapshot_config(module):
+    """Copy every UPPER_CASE constant in a config module."""
+    return {
+        name: copy.deepcopy(value)
+        for name, value in vars(module).items()
+        if name.isupper() and not name.startswith("_")
+    }
+
+
+def changed_config_names(old, new):
+    """Names added, removed or given a different value between two snapshots."""
+    return {
+        name for name in old.keys() | new.keys()
+        if name not in old or name not in new or old[name] != new[name]
+    }
+
+
+# ──────────────────────────────────────────────
+# Static config reads
+# ──────────────────────────────────────────────
+
+_module_cache = {}
+
+
+def _module_info(path):
+    """Imports, function definitions and module-level assignments of a source file."""
+    mtime = os.path.getmtime(path)
+    cached = _module_cache.get(path)
+    if cached is not None and cached["mtime"] == mtime:
+        return cached
+
+    with open(path, "r") as f:
+        tree = ast.parse(f.read(), path)
+
+    imports = {}   # local name -> (module, attribute or None for a module import)
+    defs = {}      # function name -> FunctionDef
+    assigns = {}   # module-level name -> value expression
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.module:
+            for alias in node.names:
+                imports[alias.asname or alias.name] = (node.module, alias.name)
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                imports[alias.asname or alias.name] = (alias.name, None)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            defs[node.name] = node
+        elif isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    assigns[target.id] = node.value
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            if node.value is not None:
+                assigns[node.target.id] = node.value
+
+    info = {"mtime": mtime, "tree": tree, "imports": imports, "defs": defs, "assigns": assigns}
+    _module_cache[path] = info
+    return info
+
+
+def _module_path(module_name):
+    """Source file of a project module, or None for anything else."""
+    if not module_name.startswith("scripts."):
+        return None
+    try:
+        spec = importlib.util.find_spec(module_name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.origin or not spec.origin.endswith(".py"):
+        return None
+    return spec.origin
+
+
+def _scan_name(module_name, path, name, config_name, seen, names, exclude):
+    """Follow a global name in a module to the config names behind it."""
+    key = (module_name, name)
+    if key in seen or key in exclude:
+        return
+    seen.add(key)
+
+    info = _module_info(path)
+    if name in info["defs"]:
+        _scan_node(info["defs"][name], module_name, path, config_name, seen, names, exclude)
+    elif name in info["assigns"]:
+        _scan_node(info["assigns"][name], module_name, path, config_name, seen, names, exclude)
+    elif name in info["imports"]:
+        source, attr = info["imports"][name]
+        if attr is None:
+            return
+        if source == config_name:
+            names.add(attr)
+            return
+        source_path = _module_path(source)
+        if source_path is not None:
+            _scan_name(source, source_path, attr, config_name, seen, names, exclude)
+
+
+def _scan_node(node, module_name, path, config_name, seen, names, exclude):
+    """Collect config names read anywhere inside an AST node."""
+    info = _module_info(path)
+    for sub in ast.walk(node):
+        if isinstance(sub, ast.Name) and isinstance(sub.ctx, ast.Load):
+            _scan_name(module_name, path, sub.id, config_name, seen, names, exclude)
+        elif isinstance(sub, ast.Attribute) and isinstance(sub.value, ast.Name):
+            # `import ...config as cfg` then `cfg.NAME`
+            source = info["imports"].get(sub.value.id)
+            if source is not None and source[1] is None and source[0] == config_name:
+                names.add(sub.attr)
+
+
+def config_names_read(func, config_name, exclude=()):
+    """
+    Config names a function reads — directly, through module-level values
+    derived from config, or through any project function it calls.
+
+    Args:
+        func: The function to scan
+        config_name: Dotted name of the config module
+        exclude: (module, name) pairs not to follow
+    Returns a set of names. Reads through local variables that shadow a
+    config name are over-reported, never under-reported.
+    """
+    path = _module_path(func.__module__)
+    names = set()
+    if path is not None:
+        _scan_name(func.__module__, path, func.__name__, config_name,
+                   set(), names, set(exclude))
+    return names
+
+
+def script_config_reads(path, config_name, exclude=()):
+    """Config names a top-level script reads outside the functions in `exclude`."""
+    names = set()
+    info = _module_info(path)
+    _scan_node(info["tree"], "__main__", path, config_name, set(), names, set(exclude))
+    return names
+
+
+# ──────────────────────────────────────────────
+# Planning
+# ──────────────────────────────────────────────
+
+def _ids_alive(value):
+    """True if every datablock referenced in a (nested) value still exists."""
+    if isinstance(value, bpy.types.ID):
+        try:
+            value.name
+        except ReferenceError:
+            return False
+        return True
+    if isinstance(value, dict):
+        return all(_ids_alive(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return all(_ids_alive(v) for v in value)
+    return True
+
+
+def _fresh_memo(memo):
+    """Empty a memo for a full build, keeping the same dict object."""
+    memo.clear()
+    memo.update({
+        "layers": {},     # stage -> recorded key layer
+        "targets": {},    # key channel -> (target, data_path, index)
+        "outputs": {},    # stage -> fingerprint of what it hands downstream
+        "results": {},    # stage -> return value
+        "created": {},    # stage -> datablocks it created
+        "handles": {},    # objects created outside the stages
+    })
+
+
+def _outside_window(span, frames):
+    """True if an inclusive frame span misses the frame window entirely."""
+    if span is None or frames is None:
+        return False
+    return span[1] < frames[0] or span[0] > frames[1]
+
+
+def plan_rebuild(stages, config, options, script_path=None, spans=None):
+    """
+    Decide between a full and a partial build.
+
+    Args:
+        stages: Stage table, see the module docstring
+        config: The (freshly reloaded) config module
+        options: Build options from get_build_options()
+        script_path: The orchestrator's source file; config names it reads
+                     itself force a full build when they change
+        spans: stage -> inclusive (start, end) of the frames it keys; only
+               consulted for stages that create objects
+    Returns the plan dict run_stage() and finish_rebuild() work from.
+    plan["full"] tells the script whether to clear and recreate its objects.
+    """
+    memo = options.get("memo")
+    plan = {
+        "order": [stage[0] for stage in stages],
+        "stages": {
+            name: {
+                "func": func, "upstream": set(upstream), "creates": creates,
+                "outside": creates and _outside_window((spans or {}).get(name), options.get("frames")),
+            }
+            for name, func, upstream, creates in stages
+        },
+        "memo": memo,
+        "frames": options.get("frames"),
+        "full": True,
+        "reason": "",
+        "changed": set(),
+        "dirty": set(),
+        "changed_outputs": set(),
+        "rebuilt": [],
+        "outside": [],
+        "keys_changed": 0,
+        "handles": {},
+    }
+
+    if memo is None:
+        use_key_layers(None, None)
+        return plan
+
+    config_name = config.__name__
+    snapshot = snapshot_config(config)
+    exclude = {(func.__module__, func.__name__) for _, func, _, _ in stages}
+    reads = {name: config_names_read(func, config_name)
+             for name, func, _, _ in stages}
+
+    reason = ""
+    if not options.get("partial"):
+        reason = "full reload"
+    elif "config" not in memo:
+        reason = "no previous build"
+    elif memo.get("tier") != options.get("tier"):
+        reason = "build tier changed"
+    elif memo.get("profile") != options.get("profile"):
+        reason = "render profile changed"
+    elif memo.get("engine") != options.get("engine"):
+        reason = "render engine changed"
+    elif memo.get("frames") != options.get("frames"):
+        reason = "frame window changed"
+    elif not _ids_alive(memo.get("handles")) or not _ids_alive(memo.get("created")):
+        reason = "previous build is gone"
+    else:
+        plan["changed"] = changed_config_names(memo["config"], snapshot)
+        own = script_config_reads(script_path, config_name, exclude) if script_path else set()
+        if plan["changed"] & own:
+            reason = f"{', '.join(sorted(plan['changed'] & own))} read by the script itself"
+
+    if reason:
+        plan["reason"] = reason
+        _fresh_memo(memo)
+    else:
+        plan["full"] = False
+        plan["handles"] = memo["handles"]
+        plan["dirty"] = {name for name, names in reads.items() if names & plan["changed"]}
+
+    memo["config"] = snapshot
+    memo["tier"] = options.get("tier")
+    memo["profile"] = options.get("profile")
+    memo["engine"] = options.get("engine")
+    memo["frames"] = options.get("frames")
+    memo["config_files"] = [os.path.abspath(config.__file__)]
+    use_key_layers(memo["layers"], memo["targets"])
+    return plan
+
+
+def keep_handles(plan, **handles):
+    """Remember objects created outside the stages for the next partial build."""
+    plan["handles"] = handles
+    if plan["memo"] is not None:
+        plan["memo"]["handles"] = handles
+
+
+# ──────────────────────────────────────────────
+# Running stages
+# ──────────────────────────────────────────────
+
+def _id_pointers():
+    """Pointers of every datablock a stage could create."""
+    return {block.as_pointer(): block
+            for attr in CREATED_DATA for block in getattr(bpy.data, attr)}
+
+
+def _free_created(memo, name):
+    """Free the datablocks a stage created in the previous build."""
+    blocks = [block for block in memo["created"].pop(name, []) if _ids_alive(block)]
+    if not blocks:
+        return
+    pointers = {block.as_pointer() for block in blocks}
+    for block in blocks:
+        tree = getattr(block, "node_tree", None)
+        if tree is not None:
+            pointers.add(tree.as_pointer())
+    forget_key_targets(pointers)
+    bpy.data.batch_remove(blocks)
+
+
+def _fingerprint(result, shared_before, shared):
+    """Hash of a stage's result and what it changed in the shared dict."""
+    delta = None
+    if shared is not None:
+        delta = sorted(
+            (key, value) for key, value in shared.items()
+            if shared_before.get(key, _MISSING) != value
+        )
+    return hashlib.sha1(repr((result, delta)).encode()).hexdigest()
+
+
+def stage_mode(plan, name):
+    """
+    How a stage runs in this build: "write" (full build), "capture"
+    (rebuild and diff), "skip" (run with keys dropped), "cached"
+    (not run; previous result reused) or "outside" (not run; it creates
+    objects only outside the frame window).
+    """
+    stage = plan["stages"][name]
+    if stage["outside"]:
+        return "outside"
+    if plan["full"]:
+        return "write"
+    if name in plan["dirty"] or stage["upstream"] & plan["changed_outputs"]:
+        return "capture"
+    return "cached" if stage["creates"] else "skip"
+
+
+def run_stage(plan, name, func, *args, shared=None, **kwargs):
+    """
+    Run one stage of the build according to the plan.
+
+    Args:
+        plan: From plan_rebuild()
+        name: Stage name from the stage table
+        func: The stage function, called as func(*args, **kwargs)
+        shared: A dict the stage fills in for later stages (e.g. per-frame
+                positions); what it changes counts as the stage's output
+    Returns the stage function's result.
+    """
+    memo = plan["memo"]
+    mode = stage_mode(plan, name)
+    if mode == "outside":
+        plan["outside"].append(name)
+        return None
+    if mode == "cached":
+        return memo["results"].get(name)
+
+    creates = plan["stages"][name]["creates"] and memo is not None
+    if creates and mode == "capture":
+        _free_created(memo, name)
+    before_ids = _id_pointers() if creates else None
+    shared_before = dict(shared) if shared is not None else None
+
+    begin_key_stage(name, "capture" if mode == "capture" else mode)
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        captured = end_key_stage()
+
+    if memo is None:
+        return result
+
+    if creates:
+        memo["created"][name] = [
+            block for pointer, block in _id_pointers().items() if pointer not in before_ids
+        ]
+    if mode == "capture":
+        plan["keys_changed"] += apply_key_layer(name, captured, plan["order"])
+        plan["rebuilt"].append(name)
+
+    fingerprint = _fingerprint(result, shared_before, shared)
+    if memo["outputs"].get(name) != fingerprint:
+        plan["changed_outputs"].add(name)
+    memo["outputs"][name] = fingerprint
+    memo["results"][name] = result
+    return result
+
+
+def finish_rebuild(plan):
+    """Stop recording keys and publish a one-line report of what was rebuilt."""
+    use_key_layers(None, None)
+
+    if plan["memo"] is None:
+        report = "Full build"
+    elif plan["full"]:
+        report = "Full rebuild" + (f" — {plan['reason']}" if plan["reason"] else "")
+    elif not plan["changed"]:
+        report = "No config changes — nothing rebuilt"
+    elif not plan["rebuilt"]:
+        report = f"{', '.join(sorted(plan['changed']))} changed — no stage reads it"
+    else:
+        report = (
+            f"{', '.join(sorted(plan['changed']))} changed → rebuilt "
+            f"{', '.join(plan['rebuilt'])} ({plan['keys_changed']} keys updated)"
+        )
+
+    if plan["frames"] is not None:
+        start, end = plan["frames"]
+        report += f" — frames {start}–{end}"
+        if plan["outside"]:
+            report += f", skipped {', '.join(plan['outside'])}"
+
+    set_build_report(report)
+    print(f"🧩 {report}")
+    return report
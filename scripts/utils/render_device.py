@@ -0,0 +1,221 @@
+"""
+Render devices — pick and configure the compute device for this host.
+
+setup_render() used to point Cycles at Metal and stop there, so any other
+machine rendered with whatever the preferences happened to say. Instead,
+configure_render_device():
+  1. counts the cores this process may actually use: the CPU affinity mask
+     and the cgroup CPU quota (a container or batch slot often gets fewer
+     cores than the machine has),
+  2. looks for a GPU backend this platform can have (Metal on macOS;
+     OptiX, CUDA, HIP, oneAPI elsewhere) with a device present,
+  3. applies the host's override file on top (DEVICE_OVERRIDE_FILE, or the
+     path in $RENDER_DEVICE_FILE),
+  4. sets the render threads, the Cycles device, tile size, adaptive
+     sampling and persistent data, and prints the configuration it chose.
+
+Override file (JSON, every key optional):
+    {"device": "CPU", "threads": 24, "tile_size": 512,
+     "adaptive_threshold": 0.02, "persistent_data": false}
+
+Usage:
+    configure_render_device()      # setup_render() already does this
+"""
+import json
+import math
+import os
+import platform
+
+import bpy
+
+
+DEVICE_OVERRIDE_FILE = os.path.join(os.path.expanduser("~"), ".config", "render_device.json")
+
+# GPU backends worth trying on each platform, in order of preference
+GPU_BACKENDS = {
+    "Darwin": ("METAL",),
+    "Linux": ("OPTIX", "CUDA", "HIP", "ONEAPI"),
+    "Windows": ("OPTIX", "CUDA", "HIP", "ONEAPI"),
+}
+
+# Tiles only bound memory in Cycles: GPUs want large ones, CPUs gain nothing
+# from going above a few hundred pixels and keep memory per thread low
+TILE_SIZES = {"CPU": 256, "GPU": 2048}
+ADAPTIVE_THRESHOLD = 0.01
+
+_OVERRIDE_KEYS = {
+    "device", "backend", "threads", "tile_size",
+    "adaptive_sampling", "adaptive_threshold", "persistent_data",
+}
+
+
+# ──────────────────────────────────────────────
+# Cores
+# ──────────────────────────────────────────────
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_limit(root="/sys/fs/cgroup"):
+    """
+    Cores the cgroup CPU quota allows (rounded up), or None if unlimited.
+
+    Reads cgroup v2's cpu.max in this process's group and every group above
+    it (the tightest wins), falling back to cgroup v1's cfs quota and period.
+    """
+    group = ""
+    for line in (_read("/proc/self/cgroup") or "").splitlines():
+        if line.startswith("0::"):
+            group = line[3:].strip("/")
+    limits = []
+    while True:
+        quota, _, period = (_read(os.path.join(root, group, "cpu.max")) or "max").partition(" ")
+        if quota != "max":
+            limits.append(math.ceil(int(quota) / int(period or 100000)))
+        if not group:
+            break
+        group = os.path.dirname(group)
+    if limits:
+        return max(1, min(limits))
+
+    quota = _read(os.path.join(root, "cpu", "cpu.cfs_quota_us"))
+    period = _read(os.path.join(root, "cpu", "cpu.cfs_period_us"))
+    if quota and period and int(quota) > 0:
+        return max(1, math.ceil(int(quota) / int(period)))
+    return None
+
+
+def allotted_cores():
+    """
+    Cores this process may use: the smallest of the machine's core count,
+    the CPU affinity mask and the cgroup quota.
+    """
+    cores = os.cpu_count() or 1
+    if hasattr(os, "sched_getaffinity"):
+        cores = min(cores, len(os.sched_getaffinity(0)) or cores)
+    limit = cgroup_cpu_limit()
+    return min(cores, limit) if limit else cores
+
+
+# ──────────────────────────────────────────────
+# Choosing a device
+# ──────────────────────────────────────────────
+
+def load_device_overrides(path=None):
+    """The host's override file as a dict ({} if there is none)."""
+    path = path or os.environ.get("RENDER_DEVICE_FILE") or DEVICE_OVERRIDE_FILE
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            overrides = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Ignoring render device overrides in {path}: {e}")
+        return {}
+    unknown = sorted(set(overrides) - _OVERRIDE_KEYS)
+    if unknown:
+        print(f"⚠️  Unknown render device overrides in {path}: {', '.join(unknown)}")
+    overrides = {k: v for k, v in overrides.items() if k in _OVERRIDE_KEYS}
+    overrides["source"] = path
+    return overrides
+
+
+def _cycles_preferences():
+    addon = bpy.context.preferences.addons.get("cycles")
+    return addon.preferences if addon else None
+
+
+def find_gpu_backend(backends=None):
+    """
+    Enable the devices of the first GPU backend that has any, and return
+    the backend's name. Returns None (leaving Cycles on no backend) if none does.
+    """
+    prefs = _cycles_preferences()
+    if prefs is None:
+        return None
+    for backend in backends or GPU_BACKENDS.get(platform.system(), ()):
+        try:
+            prefs.compute_device_type = backend
+        except TypeError:
+            continue    # not built into this Blender
+        prefs.get_devices()
+        gpus = [d for d in prefs.devices if d.type == backend]
+        if gpus:
+            for device in prefs.devices:
+                device.use = device.type == backend
+            return backend
+    prefs.compute_device_type = 'NONE'
+    return None
+
+
+def choose_render_device(overrides=None):
+    """
+    The device configuration for this host: detected values with the
+    overrides on top. Returns a dict with device, backend, threads,
+    tile_size, adaptive_sampling, adaptive_threshold, persistent_data, and
+    "source" (the override file, if one was used).
+    """
+    overrides = load_device_overrides() if overrides is None else dict(overrides)
+    wanted = str(overrides.get("device", "AUTO")).upper()
+    backend = None
+    if wanted != "CPU":
+        requested = overrides.get("backend")
+        backend = find_gpu_backend((requested.upper(),) if requested else None)
+        if wanted == "GPU" and backend is None:
+            print("⚠️  No GPU device found, rendering on the CPU")
+    device = "GPU" if backend else "CPU"
+    return {
+        "device": device,
+        "backend": backend,
+        "threads": int(overrides.get("threads") or allotted_cores()),
+        "tile_size": int(overrides.get("tile_size") or TILE_SIZES[device]),
+        "adaptive_sampling": bool(overrides.get("adaptive_sampling", True)),
+        "adaptive_threshold": float(overrides.get("adaptive_threshold", ADAPTIVE_THRESHOLD)),
+        "persistent_data": bool(overrides.get("persistent_data", True)),
+        "source": overrides.get("source"),
+    }
+
+
+# ──────────────────────────────────────────────
+# Applying it
+# ──────────────────────────────────────────────
+
+def describe_render_device(config):
+    """One line saying which device configuration is in use."""
+    device = f"GPU ({config['backend']})" if config["device"] == "GPU" else "CPU"
+    adaptive = (f"adaptive sampling {config['adaptive_threshold']}"
+                if config["adaptive_sampling"] else "no adaptive sampling")
+    persistent = "persistent data" if config["persistent_data"] else "no persistent data"
+    source = f" [overrides: {config['source']}]" if config["source"] else ""
+    return (f"{device}, {config['threads']} threads, {config['tile_size']}px tiles, "
+            f"{adaptive}, {persistent}{source}")
+
+
+def configure_render_device(scene=None, overrides=None):
+    """
+    Choose this host's render device (see choose_render_device()) and apply
+    it to the scene. Returns the configuration.
+    """
+    scene = scene or bpy.context.scene
+    config = choose_render_device(overrides)
+
+    # A fixed count, so headless renders don't depend on what Blender detects
+    scene.render.threads_mode = 'FIXED'
+    scene.render.threads = config["threads"]
+    scene.render.use_persistent_data = config["persistent_data"]
+
+    cycles = getattr(scene, "cycles", None)
+    if cycles is not None:
+        cycles.device = config["device"]
+        cycles.use_auto_tile = True
+        cycles.tile_size = config["tile_size"]
+        cycles.use_adaptive_sampling = config["adaptive_sampling"]
+        cycles.adaptive_threshold = config["adaptive_threshold"]
+
+    print(f"🖥️  Render device: {describe_render_device(config)}")
+    return config
@@ -4,49 +4,29 @@ Scene setup helpers — camera, lighting, world environment.
 import bpy
 import math
 
+from scripts.utils.build import get_build_options
+from scripts.utils.primitives import new_object
+from scripts.utils.render_device import configure_render_device
+from scripts.utils.ownership import own, teardown_build
+
 
 def reset_scene():
     """
-    Remove all scene contents without resetting the Blender session.
+    Remove the previous build without resetting the Blender session.
 
     This is the hot-reload-safe version: it preserves the UI layout,
     loaded addons, and preferences. Use this instead of clear_scene()
-    when working with the Script Watcher addon.
+    when working with the Script Watcher addon. Only what the build owns
+    is removed (see scripts.utils.ownership) — anything made by hand
+    outside the build collection stays.
     """
-    # Ensure we're in object mode
-    if bpy.context.mode != 'OBJECT':
-        try:
-            bpy.ops.object.mode_set(mode='OBJECT')
-        except RuntimeError:
-            pass
-
-    # Remove all objects
-    for obj in bpy.data.objects:
-        bpy.data.objects.remove(obj, do_unlink=True)
-
-    # Remove all data blocks by type
-    for mesh in bpy.data.meshes:
-        bpy.data.meshes.remove(mesh, do_unlink=True)
-    for curve in bpy.data.curves:
-        bpy.data.curves.remove(curve, do_unlink=True)
-    for mat in bpy.data.materials:
-        bpy.data.materials.remove(mat, do_unlink=True)
-    for world in bpy.data.worlds:
-        bpy.data.worlds.remove(world, do_unlink=True)
-    for light in bpy.data.lights:
-        bpy.data.lights.remove(light, do_unlink=True)
-    for cam in bpy.data.cameras:
-        bpy.data.cameras.remove(cam, do_unlink=True)
-    for action in bpy.data.actions:
-        bpy.data.actions.remove(action, do_unlink=True)
-    for ng in bpy.data.node_groups:
-        bpy.data.node_groups.remove(ng, do_unlink=True)
-
-    # Purge orphaned data blocks
-    bpy.ops.outliner.orphans_purge(do_recursive=True)
-
-    # Reset timeline
-    bpy.context.scene.frame_set(1)
+    if get_build_options()["staged"]:
+        # The watcher is building into a fresh, empty scene while the previous
+        # build stays on screen — clearing bpy.data would take that with it
+        bpy.context.scene.frame_set(1)
+        return
+
+    teardown_build()
 
 
 def clear_scene():
@@ -64,16 +44,12 @@ def setup_camera(location=(7, -7, 5), target=(0, 0, 0)):
     Add a camera and point it at a target location.
     Returns the camera object.
     """
-    bpy.ops.object.camera_add(location=location)
-    camera = bpy.context.active_object
-    camera.name = "ScriptCamera"
+    camera = new_object("ScriptCamera", own(bpy.data.cameras.new("ScriptCamera")), location)
 
     # Point camera at target using a Track To constraint
     constraint = camera.constraints.new(type='TRACK_TO')
     # Create an empty at the target to track
-    bpy.ops.object.empty_add(location=target)
-    target_empty = bpy.context.active_object
-    target_empty.name = "CameraTarget"
+    target_empty = new_object("CameraTarget", None, target)
     constraint.target = target_empty
     constraint.track_axis = 'TRACK_NEGATIVE_Z'
     constraint.up_axis = 'UP_Y'
@@ -92,9 +68,7 @@ def setup_ortho_camera(location=(0, 0, 10), ortho_scale=20):
         ortho_scale: Width of the orthographic view in Blender units
     Returns the camera object.
     """
-    bpy.ops.object.camera_add(location=location)
-    camera = bpy.context.active_object
-    camera.name = "OrthoCamera"
+    camera = new_object("OrthoCamera", own(bpy.data.cameras.new("OrthoCamera")), location)
     camera.rotation_euler = (0, 0, 0)  # Looking straight down (-Z)
     camera.data.type = 'ORTHO'
     camera.data.ortho_scale = ortho_scale
@@ -105,9 +79,7 @@ def setup_ortho_camera(location=(0, 0, 10), ortho_scale=20):
 
 def setup_sun_light(energy=3.0, direction=(-0.5, -0.5, -1.0)):
     """Add a sun lamp with the given energy and direction."""
-    bpy.ops.object.light_add(type='SUN', location=(0, 0, 10))
-    sun = bpy.context.active_object
-    sun.name = "SunLight"
+    sun = new_object("SunLight", own(bpy.data.lights.new("SunLight", type='SUN')), (0, 0, 10))
     sun.data.energy = energy
 
     # Point the sun in the given direction
@@ -118,9 +90,7 @@ def setup_sun_light(energy=3.0, direction=(-0.5, -0.5, -1.0)):
 
 def setup_area_light(location=(4, -4, 6), energy=200, size=3):
     """Add a soft area light."""
-    bpy.ops.object.light_add(type='AREA', location=location)
-    light = bpy.context.active_object
-    light.name = "AreaLight"
+    light = new_object("AreaLight", own(bpy.data.lights.new("AreaLight", type='AREA')), location)
     light.data.energy = energy
     light.data.size = size
     return light
@@ -128,7 +98,7 @@ def setup_area_light(location=(4, -4, 6), energy=200, size=3):
 
 def setup_world_color(color=(0.05, 0.05, 0.08, 1.0)):
     """Set the world background to a solid color."""
-    world = bpy.data.worlds.new("ScriptWorld")
+    world = own(bpy.data.worlds.new("ScriptWorld"))
     bpy.context.scene.world = world
     world.use_nodes = True
     bg_node = world.node_tree.nodes["Background"]
@@ -136,6 +106,91 @@ def setup_world_color(color=(0.05, 0.05, 0.08, 1.0)):
     bg_node.inputs["Strength"].default_value = 1.0
 
 
+# Render profiles — output fidelity, chosen with --profile (build tiers, in
+# scripts/utils/build.py, decide how much of the scene is built instead).
+#   resolution_scale:  percent, applied on top of the script's resolution_percentage
+#   frame_step:        render every Nth frame (direct renders; the video keeps its length)
+#   eevee_samples, cycles_samples: render samples (None keeps Blender's)
+#   color_mode, color_depth, compression: PNG frames (sequences and intermediates)
+#   crf, preset:       H.264 quality and x264 speed for MP4s
+RENDER_PROFILES = {
+    "preview": {
+        "resolution_scale": 50,
+        "frame_step": 2,
+        "eevee_samples": 4,
+        "cycles_samples": 16,
+        "color_mode": 'RGB',
+        "color_depth": '8',
+        "compression": 15,
+        "crf": 28,
+        "preset": 'veryfast',
+    },
+    "review": {
+        "resolution_scale": 75,
+        "frame_step": 1,
+        "eevee_samples": 16,
+        "cycles_samples": 64,
+        "color_mode": 'RGB',
+        "color_depth": '8',
+        "compression": 15,
+        "crf": 23,
+        "preset": 'fast',
+    },
+    "final": {
+        "resolution_scale": 100,
+        "frame_step": 1,
+        "eevee_samples": None,
+        "cycles_samples": None,
+        "color_mode": 'RGBA',
+        "color_depth": '8',
+        "compression": 15,
+        "crf": 18,
+        "preset": 'medium',
+    },
+}
+
+DEFAULT_PROFILE = "final"
+
+# Engines --engine can pick instead of the script's own
+RENDER_ENGINES = {
+    "eevee": 'BLENDER_EEVEE',
+    "workbench": 'BLENDER_WORKBENCH',
+    "cycles": 'CYCLES',
+}
+
+_render_profile = {"name": DEFAULT_PROFILE}
+
+# Blender's own encoder names its quality and speed steps: (highest CRF, name)
+_BLENDER_CRF = ((17, 'PERC_LOSSLESS'), (20, 'HIGH'), (23, 'MEDIUM'), (26, 'LOW'), (29, 'VERYLOW'))
+_BLENDER_PRESET = {'ultrafast': 'REALTIME', 'superfast': 'REALTIME', 'veryfast': 'REALTIME',
+                   'slow': 'BEST', 'slower': 'BEST', 'veryslow': 'BEST'}
+
+
+def use_render_profile(name):
+    """Make a RENDER_PROFILES entry the active one. Returns its settings."""
+    if name not in RENDER_PROFILES:
+        print(f"⚠️  Unknown render profile '{name}', using '{DEFAULT_PROFILE}'")
+        name = DEFAULT_PROFILE
+    _render_profile["name"] = name
+    return get_render_profile()
+
+
+def get_render_profile():
+    """The active render profile's settings, plus its "name"."""
+    return dict(RENDER_PROFILES[_render_profile["name"]], name=_render_profile["name"])
+
+
+def h264_args(profile=None):
+    """ffmpeg encoder options for MP4s built from PNG frames (default: active profile)."""
+    profile = profile or get_render_profile()
+    return [
+        '-c:v', 'libx264',                      # H.264 codec
+        '-crf', str(profile["crf"]),            # Quality (lower = better, 18 is visually lossless)
+        '-pix_fmt', 'yuv420p',                  # Compatibility
+        '-preset', profile["preset"],           # Encoding speed/quality tradeoff
+    ]
+
+
 def setup_render(
     engine='BLENDER_EEVEE',
     resolution=(1920, 1080),
@@ -144,27 +199,30 @@ def setup_render(
     frame_end=120,
     output_path='./output/render',
     file_format='FFMPEG',
+    resolution_percentage=100,
+    profile=None,
 ):
     """
-    Configure render settings optimized for Blender 5.0 and Apple Silicon.
+    Configure render settings optimized for Blender 5.0 and this host's
+    render device (see scripts.utils.render_device).
 
     Defaults to FFMPEG direct video export for speed on modern hardware,
     but supports PNG sequences for robust production rendering.
+    resolution_percentage scales the output (draft builds render smaller).
+    profile names a RENDER_PROFILES entry (default: --profile, else "final");
+    it scales the resolution further and sets samples, frame step, PNG and
+    encoder settings. --engine overrides `engine` (see RENDER_ENGINES).
     """
     scene = bpy.context.scene
+    build = get_build_options()
+    profile = use_render_profile(profile or build["profile"])
+    if build["engine"] in RENDER_ENGINES:
+        engine = RENDER_ENGINES[build["engine"]]
+    elif build["engine"] is not None:
+        print(f"⚠️  Unknown engine '{build['engine']}', using {engine}")
     
-    # 1. Hardware Optimization (Apple Silicon Metal)
-    try:
-        cycles_prefs = bpy.context.preferences.addons['cycles'].preferences
-        cycles_prefs.compute_device_type = 'METAL'
-        # Refresh devices and enable GPU
-        cycles_prefs.get_devices()
-        for device in cycles_prefs.devices:
-            if device.type == 'METAL':
-                device.use = True
-        scene.cycles.device = 'GPU'
-    except Exception as e:
-        print(f"⚠️ Could not enable Metal GPU: {e}")
+    # 1. Device: this host's GPU backend or all its allotted CPU cores
+    configure_render_device(scene)
 
     # 2. Engine Setup
     # Blender 5.0 uses EEVEE as the primary real-time engine (formerly EEVEE_NEXT)
@@ -172,9 +230,18 @@ def setup_render(
 
     scene.render.resolution_x = resolution[0]
     scene.render.resolution_y = resolution[1]
+    scene.render.resolution_percentage = max(1, round(resolution_percentage * profile["resolution_scale"] / 100))
     scene.render.fps = fps
     scene.frame_start = frame_start
     scene.frame_end = frame_end
+    # Skipped frames stretch the ones rendered, so the video keeps its length
+    scene.frame_step = profile["frame_step"]
+    scene.render.fps_base = profile["frame_step"]
+
+    if profile["eevee_samples"] is not None:
+        scene.eevee.taa_render_samples = profile["eevee_samples"]
+    if profile["cycles_samples"] is not None and hasattr(scene, "cycles"):
+        scene.cycles.samples = profile["cycles_samples"]
 
     # 3. Output Configuration
     image_settings = scene.render.image_settings
@@ -189,8 +256,9 @@ def setup_render(
         # Optimized for M4 Pro playback compatibility
         scene.render.ffmpeg.format = 'MPEG4'
         scene.render.ffmpeg.codec = 'H264'
-        scene.render.ffmpeg.constant_rate_factor = 'HIGH'
-        scene.render.ffmpeg.ffmpeg_preset = 'GOOD'
+        scene.render.ffmpeg.constant_rate_factor = next(
+            (name for crf, name in _BLENDER_CRF if profile["crf"] <= crf), 'LOWEST')
+        scene.render.ffmpeg.ffmpeg_preset = _BLENDER_PRESET.get(profile["preset"], 'GOOD')
         
         # Ensure path has .mp4 extension for direct video
         if not output_path.lower().endswith('.mp4'):
@@ -209,16 +277,18 @@ def setup_render(
     scene.render.filepath = output_path
 
     if file_format == 'PNG':
-        image_settings.color_mode = 'RGBA'
-        image_settings.compression = 15
-
+        image_settings.color_mode = profile["color_mode"]
+        image_settings.color_depth = profile["color_depth"]
+        image_settings.compression = profile["compression"]
 
 
-
-def frames_to_video(frames_dir='./output/frames/', output_file='./output/animation.mp4', fps=30):
+def frames_to_video(frames_dir='./output/frames/', output_file='./output/animation.mp4', fps=30,
+                    start_frame=None):
     """
     Stitch rendered PNG frames into an MP4 video using ffmpeg CLI.
     Call this after bpy.ops.render.render(animation=True).
+    start_frame: number of the first frame file, if the frames don't start
+    near 0001 (a --frames window, say).
 
     Requires ffmpeg to be installed (brew install ffmpeg).
     """
@@ -240,11 +310,9 @@ def frames_to_video(frames_dir='./output/frames/', output_file='./output/animati
     cmd = [
         'ffmpeg', '-y',                         # Overwrite output
         '-framerate', str(fps),                  # Input framerate
+        *(['-start_number', str(start_frame)] if start_frame is not None else []),
         '-i', os.path.join(frames_dir, '%04d.png'),  # Frame pattern
-        '-c:v', 'libx264',                      # H.264 codec
-        '-crf', '18',                            # Quality (lower = better, 18 is visually lossless)
-        '-pix_fmt', 'yuv420p',                   # Compatibility
-        '-preset', 'medium',                     # Encoding speed/quality tradeoff
+        *h264_args(),
         output_file,
     ]
 
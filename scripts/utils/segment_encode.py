@@ -0,0 +1,180 @@
+"""
+Segment encoding — encode a PNG sequence as several segments side by side.
+
+frames_to_video() runs one x264 pass over the whole sequence, which can't
+use a many-core machine fully, and has to run again in full after any
+change. encode_segments() instead:
+  1. cuts the sequence at given frames (act boundaries, say),
+  2. hashes each segment's frames, plus the encoder settings,
+  3. encodes every segment whose hash isn't cached yet, several ffmpeg
+     jobs at once, each on its share of the cores,
+  4. joins the segments with ffmpeg's concat demuxer, without re-encoding.
+
+Every segment is encoded with the same settings and a fixed keyframe
+interval, so the joined stream plays as one. Encoded segments are kept in
+a cache, one MP4 per hash. A change to one act's frames changes that
+segment's hash only, so only that segment is encoded again.
+
+Usage (after the frames are rendered):
+    segments = segment_ranges([("prologue", 1), ("act1", 330)], 1, 1300)
+    encode_segments("./output/finding_the_one_frames", "./output/finding_the_one.mp4", segments)
+"""
+import hashlib
+import os
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from scripts.utils.parallel_render import frame_path, missing_frames, worker_threads
+from scripts.utils.render_device import allotted_cores
+from scripts.utils.scene import h264_args
+
+
+DEFAULT_CACHE = "./output/segment_cache"
+KEYFRAME_SECONDS = 2    # keyframe interval, the same in every segment
+
+
+# ──────────────────────────────────────────────
+# Planning
+# ──────────────────────────────────────────────
+
+def segment_ranges(cuts, frame_start, frame_end):
+    """
+    (name, first frame) cut points → [(name, start, end)] over a range.
+
+    Each segment runs until the frame before the next cut. Segments are
+    clipped to the inclusive range; ones outside it are dropped, and frames
+    before the first cut join the first segment.
+    """
+    cuts = sorted(cuts, key=lambda cut: cut[1])
+    segments = []
+    for k, (name, start) in enumerate(cuts):
+        end = cuts[k + 1][1] - 1 if k + 1 < len(cuts) else frame_end
+        start = frame_start if k == 0 else max(start, frame_start)
+        end = min(end, frame_end)
+        if start <= end:
+            segments.append((name, start, end))
+    return segments
+
+
+def encoder_args(fps):
+    """ffmpeg output options shared by every segment."""
+    return [*h264_args(), '-g', str(fps * KEYFRAME_SECONDS), '-keyint_min', str(fps * KEYFRAME_SECONDS)]
+
+
+def segment_key(frames_dir, start, end, fps):
+    """Hash of a segment's frames (their bytes) and the encoder settings."""
+    digest = hashlib.sha1()
+    digest.update(repr((encoder_args(fps), fps, end - start + 1)).encode())
+    for frame in range(start, end + 1):
+        with open(frame_path(frames_dir, frame), "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def segment_command(frames_dir, start, end, fps, output_file, threads):
+    """ffmpeg command encoding frames start..end of frames_dir to output_file."""
+    return [
+        'ffmpeg', '-y', '-loglevel', 'error',
+        '-framerate', str(fps),
+        '-start_number', str(start),
+        '-i', os.path.join(frames_dir, '%04d.png'),
+        '-frames:v', str(end - start + 1),
+        *encoder_args(fps),
+        '-threads', str(threads),
+        output_file,
+    ]
+
+
+# ──────────────────────────────────────────────
+# Encoding
+# ──────────────────────────────────────────────
+
+def _encode(frames_dir, segment, fps, cached, threads):
+    """Encode one segment into the cache. Returns ffmpeg's errors, or None."""
+    _, start, end = segment
+    partial = cached[:-len(".mp4")] + ".partial.mp4"
+    result = subprocess.run(segment_command(frames_dir, start, end, fps, partial, threads),
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        if os.path.exists(partial):
+            os.remove(partial)
+        return result.stderr.strip() or f"exit {result.returncode}"
+    # Only complete segments take the cache name
+    os.replace(partial, cached)
+    return None
+
+
+def concat_segments(paths, output_file):
+    """Join MP4 segments encoded with matching settings, without re-encoding."""
+    handle, list_file = tempfile.mkstemp(suffix=".txt", prefix="segments_")
+    with os.fdopen(handle, "w") as f:
+        for path in paths:
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+    try:
+        return subprocess.run(
+            ['ffmpeg', '-y', '-loglevel', 'error', '-f', 'concat', '-safe', '0',
+             '-i', list_file, '-c', 'copy', '-movflags', '+faststart', output_file],
+            capture_output=True, text=True,
+        )
+    finally:
+        os.remove(list_file)
+
+
+def encode_segments(frames_dir, output_file, segments, fps=30, jobs=None,
+                    cache_dir=DEFAULT_CACHE):
+    """
+    Encode a PNG sequence segment by segment and join the segments.
+
+    Args:
+        frames_dir: PNG sequence ("####.png")
+        output_file: MP4 to write
+        segments: (name, start, end) from segment_ranges()
+        fps: Video frame rate
+        jobs: ffmpeg processes at once (default: one per segment to encode,
+              at most one per core)
+        cache_dir: Where encoded segments are kept, by hash
+    Returns True if the video was written.
+    """
+    started = time.time()
+    missing = [f for _, start, end in segments for f in missing_frames(frames_dir, start, end)]
+    if missing:
+        print(f"⚠️  {len(missing)} frames missing from {frames_dir}, first {missing[0]} — not encoding")
+        return False
+    os.makedirs(cache_dir, exist_ok=True)
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+
+    cores = allotted_cores()
+    with ThreadPoolExecutor(max_workers=min(len(segments), cores) or 1) as pool:
+        keys = list(pool.map(lambda s: segment_key(frames_dir, s[1], s[2], fps), segments))
+    paths = [os.path.join(cache_dir, f"{key}.mp4") for key in keys]
+    dirty = [(segment, path) for segment, path in zip(segments, paths) if not os.path.exists(path)]
+
+    if dirty:
+        jobs = max(1, min(jobs or len(dirty), cores))
+        threads = worker_threads(jobs, cores)
+        names = ", ".join(segment[0] for segment, _ in dirty)
+        print(f"🎬 Encoding {len(dirty)}/{len(segments)} segments ({names}) "
+              f"with {jobs} jobs × {threads} threads...")
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            errors = list(pool.map(
+                lambda item: _encode(frames_dir, item[0], fps, item[1], threads), dirty))
+        failed = [(segment[0], error) for (segment, _), error in zip(dirty, errors) if error]
+        if failed:
+            for name, error in failed:
+                print(f"❌ ffmpeg failed on segment '{name}': {error}")
+            print("   Make sure ffmpeg is installed: brew install ffmpeg")
+            return False
+    else:
+        print(f"♻️  All {len(segments)} segments unchanged, reusing the cache")
+
+    result = concat_segments(paths, output_file)
+    if result.returncode != 0:
+        print(f"❌ ffmpeg failed joining segments: {result.stderr.strip()}")
+        return False
+    print(f"✅ Video saved to {output_file} ({len(dirty)} segments encoded, "
+          f"{time.time() - started:.0f}s)")
+    return True
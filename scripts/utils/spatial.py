@@ -0,0 +1,41 @@
+"""
+Spatial index — find the items inside a window along one axis.
+
+Ambient systems keep asking "which of these shapes are inside the camera
+window at this frame?". Scanning every shape each time costs O(N) per
+query; sorting once by the axis and bisecting the window's ends costs
+O(log N) per query plus the k items returned, so fields can grow to
+thousands of shapes.
+
+Usage:
+    index = build_axis_index(triangles, key=lambda t: t[2])   # world X
+    for tri in query_range(index, cam_x - 10, cam_x + 10):
+        ...
+"""
+from bisect import bisect_left, bisect_right
+
+
+def build_axis_index(items, key):
+    """
+    Sort items by one coordinate for range queries.
+
+    Args:
+        items: Anything iterable
+        key: function(item) -> coordinate, e.g. world X
+    Returns the index (a dict of parallel "keys" and "items" lists, sorted
+    by coordinate; equal coordinates keep their original order).
+    """
+    ordered = sorted(items, key=key)
+    return {"keys": [key(item) for item in ordered], "items": ordered}
+
+
+def range_bounds(index, low, high):
+    """(start, stop) positions in index["items"] of items with low <= coordinate <= high."""
+    keys = index["keys"]
+    return bisect_left(keys, low), bisect_right(keys, high)
+
+
+def query_range(index, low, high):
+    """Items with low <= coordinate <= high, in coordinate order."""
+    start, stop = range_bounds(index, low, high)
+    return index["items"][start:stop]
@@ -0,0 +1,275 @@
+"""
+Swarm — step thousands of 2D agents at once with NumPy.
+
+Every agent is a row in a few arrays (position, velocity, home height), and
+each step works on all of them together:
+  - separation pushes agents apart inside `separation_radius`
+  - cohesion and alignment pull each agent towards its neighbours' centre
+    and velocity inside `neighbour_radius`
+  - a spring pulls each agent back towards its home height
+  - obstacles (x, y, radius) push agents out of a soft disc around them
+  - wrapping keeps X inside a window that scrolls with the camera
+
+Neighbours come from a uniform-grid spatial hash (neighbour_pairs()), so a
+step costs O(N) for an even crowd instead of O(N²). The pair list is built
+with a little extra reach (`skin`) and reused for `relist` frames; in
+between, a step only re-measures the listed pairs. Agents that close more
+than the skin in that time meet a few frames late, which soft separation
+hides.
+
+Wrapping only changes where an agent is simulated. Each agent also keeps an
+unwrapped X that moves continuously, and simulate_swarm() returns that.
+Baked samples then interpolate smoothly, and whatever draws them (a
+Geometry Nodes tree, say) wraps them again per frame.
+
+Usage:
+    swarm = create_swarm(start_positions, separation_radius=0.2)
+    frames, positions = simulate_swarm(swarm, 1, 4140, obstacles_at, window_at)
+"""
+import numpy as np
+
+
+# Tuning for create_swarm(); distances in world units, speeds per frame
+SWARM_DEFAULTS = {
+    "neighbour_radius": 0.35,
+    "separation_radius": 0.15,
+    "separation": 0.02,
+    "cohesion": 0.002,
+    "alignment": 0.05,
+    "home": 0.0005,
+    "avoidance": 0.03,
+    "damping": 0.96,
+    "max_speed": 0.03,
+    "skin": 0.1,
+    "relist": 15,
+}
+
+
+# ──────────────────────────────────────────────
+# Neighbours
+# ──────────────────────────────────────────────
+
+# Own cell plus half the surrounding ones, so every pair of cells is visited once
+_HALF_NEIGHBOURHOOD = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+
+
+def neighbour_pairs(points, radius):
+    """
+    Every pair of points closer than `radius`, each pair once.
+
+    Points are bucketed into a grid of `radius`-sized cells, sorted by cell,
+    and matched only against their own and neighbouring cells.
+
+    Args:
+        points: (N, 2) array
+        radius: Neighbour distance
+    Returns (i, j, offset, distance): index arrays, points[j] - points[i],
+    and its length.
+    """
+    n = len(points)
+    empty = np.zeros(0, dtype=np.int64)
+    if n < 2:
+        return empty, empty, np.zeros((0, 2)), np.zeros(0)
+
+    cells = np.floor(points / radius).astype(np.int64)
+    cells -= cells.min(axis=0)
+    width = cells[:, 1].max() + 3
+    keys = (cells[:, 0] + 1) * width + cells[:, 1] + 1
+    # Work in cell order: each cell's points are one contiguous run
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    sorted_points = points[order]
+    cell_keys, cell_start, cell_count = np.unique(sorted_keys, return_index=True, return_counts=True)
+
+    pairs_i, pairs_j = [], []
+    for dx, dy in _HALF_NEIGHBOURHOOD:
+        # Runs of neighbouring cells, looked up once per occupied cell
+        target = cell_keys + dx * width + dy
+        slot = np.minimum(np.searchsorted(cell_keys, target), len(cell_keys) - 1)
+        found = cell_keys[slot] == target
+        counts = np.where(found, cell_count[slot], 0)
+        starts = cell_start[slot]
+        # ...then repeated for every point in the cell
+        per_point = np.repeat(counts, cell_count)
+        per_start = np.repeat(starts, cell_count)
+        total = per_point.sum()
+        if total == 0:
+            continue
+        i = np.repeat(np.arange(n), per_point)
+        run_start = np.repeat(np.cumsum(per_point) - per_point, per_point)
+        j = np.repeat(per_start, per_point) + np.arange(total) - run_start
+        if (dx, dy) == (0, 0):
+            keep = i < j
+            i, j = i[keep], j[keep]
+        offset = sorted_points[j] - sorted_points[i]
+        distance = np.hypot(offset[:, 0], offset[:, 1])
+        close = distance < radius
+        pairs_i.append(i[close])
+        pairs_j.append(j[close])
+
+    i, j = order[np.concatenate(pairs_i)], order[np.concatenate(pairs_j)]
+    offset = points[j] - points[i]
+    return i, j, offset, np.hypot(offset[:, 0], offset[:, 1])
+
+
+def _scatter(index, values, n):
+    """Sum rows of `values` into an (n, 2) array at `index`."""
+    return np.stack([
+        np.bincount(index, weights=values[:, 0], minlength=n),
+        np.bincount(index, weights=values[:, 1], minlength=n),
+    ], axis=1)
+
+
+# ──────────────────────────────────────────────
+# Simulation
+# ──────────────────────────────────────────────
+
+def create_swarm(positions, velocities=None, **params):
+    """
+    Create a swarm at (N, 2) start positions.
+
+    Each agent's start height is its home height. `params` override
+    SWARM_DEFAULTS. Returns the swarm (a dict of arrays and settings).
+    """
+    positions = np.array(positions, dtype=np.float64)
+    settings = dict(SWARM_DEFAULTS)
+    settings.update(params)
+    return {
+        "position": positions,
+        "velocity": (np.zeros_like(positions) if velocities is None
+                     else np.array(velocities, dtype=np.float64)),
+        "home_y": positions[:, 1].copy(),
+        "unwrap": np.zeros(len(positions)),   # unwrapped X minus simulated X
+        "pairs": None,                        # reused neighbour list (i, j)
+        "listed_at": 0.0,                     # frames since it was built
+        "params": settings,
+    }
+
+
+def step_swarm(swarm, obstacles=(), window=None, dt=1.0):
+    """
+    Advance the swarm by `dt` frames.
+
+    Args:
+        swarm: From create_swarm()
+        obstacles: (x, y, radius) discs agents are pushed out of
+        window: (left, span): X is wrapped into [left, left + span)
+        dt: Frames to advance
+    """
+    p, v, s = swarm["position"], swarm["velocity"], swarm["params"]
+    n = len(p)
+    acc = np.zeros_like(p)
+
+    i, j, offset, distance = _current_pairs(swarm, window)
+
+    # Separation: equal and opposite pushes, stronger the closer the pair
+    close = distance < s["separation_radius"]
+    if close.any():
+        d = np.maximum(distance[close], 1e-6)
+        push = offset[close] * ((1.0 - d / s["separation_radius"]) / d)[:, None] * s["separation"]
+        acc += _scatter(j[close], push, n) - _scatter(i[close], push, n)
+
+    # Cohesion and alignment towards the neighbourhood average
+    count = np.bincount(i, minlength=n) + np.bincount(j, minlength=n)
+    has = count > 0
+    if has.any():
+        towards = _scatter(i, offset, n) - _scatter(j, offset, n)
+        dv = v[j] - v[i]
+        matching = _scatter(i, dv, n) - _scatter(j, dv, n)
+        acc[has] += (s["cohesion"] * towards[has] + s["alignment"] * matching[has]) / count[has, None]
+
+    # Home height
+    acc[:, 1] += s["home"] * (swarm["home_y"] - p[:, 1])
+
+    # Obstacles: a soft disc, strongest at the centre
+    for ox, oy, radius in obstacles:
+        away = p - (ox, oy)
+        d = np.hypot(away[:, 0], away[:, 1])
+        inside = d < radius
+        if inside.any():
+            d_in = np.maximum(d[inside], 1e-6)
+            falloff = (1.0 - d_in / radius) ** 2 / d_in
+            acc[inside] += away[inside] * (falloff * s["avoidance"])[:, None]
+
+    # Integrate with damping and a speed cap
+    v += acc * dt
+    v *= s["damping"] ** dt
+    speed = np.hypot(v[:, 0], v[:, 1])
+    fast = speed > s["max_speed"]
+    v[fast] *= (s["max_speed"] / speed[fast])[:, None]
+    p += v * dt
+
+    if window is not None:
+        left, span = window
+        wrapped = left + np.mod(p[:, 0] - left, span)
+        swarm["unwrap"] += p[:, 0] - wrapped
+        p[:, 0] = wrapped
+    swarm["listed_at"] += dt
+
+
+def _current_pairs(swarm, window):
+    """
+    Neighbour pairs within `neighbour_radius`, from the reused pair list.
+
+    The list holds every pair within `neighbour_radius + skin`, and is
+    rebuilt every `relist` frames. Offsets
+    across the wrap seam are taken the short way round, so an agent that
+    just wrapped drops out of its old pairs instead of pulling on them.
+    """
+    p, s = swarm["position"], swarm["params"]
+    radius = s["neighbour_radius"]
+    if swarm["pairs"] is None or swarm["listed_at"] >= s["relist"]:
+        i, j, _, _ = neighbour_pairs(p, radius + s["skin"])
+        swarm["pairs"] = (i, j)
+        swarm["listed_at"] = 0.0
+    i, j = swarm["pairs"]
+
+    offset = p[j] - p[i]
+    if window is not None:
+        span = window[1]
+        offset[:, 0] -= span * np.round(offset[:, 0] / span)
+    distance = np.hypot(offset[:, 0], offset[:, 1])
+    close = distance < radius
+    return i[close], j[close], offset[close], distance[close]
+
+
+def unwrapped_positions(swarm):
+    """(N, 2) positions with X unwrapped — continuous over time."""
+    positions = swarm["position"].copy()
+    positions[:, 0] += swarm["unwrap"]
+    return positions
+
+
+def simulate_swarm(swarm, frame_start, frame_end, obstacles_at=None, window_at=None,
+                   step=1, sample=10):
+    """
+    Run the swarm over a frame range and sample its unwrapped positions.
+
+    Args:
+        swarm: From create_swarm()
+        frame_start, frame_end: Inclusive frame range
+        obstacles_at: function(frame) -> obstacles for step_swarm()
+        window_at: function(frame) -> window for step_swarm()
+        step: Frames per simulation step
+        sample: Frames between samples (rounded to whole steps; the last
+                frame is always sampled)
+    Returns (sample frames, (S, N, 2) array of unwrapped positions).
+    """
+    sample = max(step, sample - sample % step)
+    frames, samples = [], []
+    f = frame_start
+    while True:
+        if (f - frame_start) % sample == 0 or f >= frame_end:
+            frames.append(min(f, frame_end))
+            samples.append(unwrapped_positions(swarm))
+        if f >= frame_end:
+            break
+        dt = min(step, frame_end - f)
+        step_swarm(
+            swarm,
+            obstacles_at(f) if obstacles_at is not None else (),
+            window_at(f) if window_at is not None else None,
+            dt,
+        )
+        f += dt
+    return frames, np.stack(samples)
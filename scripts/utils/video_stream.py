@@ -0,0 +1,215 @@
+"""
+Streaming encode — feed frames to ffmpeg while the render is still running.
+
+frames_to_video() starts ffmpeg once the whole PNG sequence exists, so a
+render costs render time plus encode time. A video stream instead keeps
+one ffmpeg process open from the first frame and pipes each finished frame
+into it as soon as it lands, so the MP4 is done seconds after the last
+frame renders.
+
+Frames can finish in any order (parallel workers render chunks side by
+side); the stream holds early frames back and writes them in frame order.
+A background thread does the writing, so the render never waits on the
+encoder. The intermediate PNGs are written uncompressed (they're only read
+once) and deleted once piped, unless keep_frames is set.
+
+Two ways to feed a stream:
+  - render_streaming() in this process: a render_write handler feeds each
+    frame as Blender writes it
+  - with workers: follow_frames() polls the frame directory and feeds every
+    frame whose PNG is complete
+
+Usage:
+    render_streaming("./output/finding_the_one.mp4", "./output/finding_the_one_frames")
+"""
+import os
+import queue
+import subprocess
+import threading
+
+import bpy
+
+from scripts.utils.parallel_render import (
+    frame_path, render_in_parallel, use_png_output, restore_output,
+)
+from scripts.utils.scene import h264_args
+
+
+# Every PNG ends with this IEND chunk, so a file that does is fully written
+_PNG_END = b"\x00\x00\x00\x00IEND\xaeB`\x82"
+
+
+# ──────────────────────────────────────────────
+# Stream
+# ──────────────────────────────────────────────
+
+def _write_frames(stream):
+    """Writer thread: pipe queued PNGs into ffmpeg, in the order queued."""
+    while True:
+        path = stream["queue"].get()
+        if path is None:
+            break
+        try:
+            with open(path, "rb") as f:
+                stream["process"].stdin.write(f.read())
+            if not stream["keep_frames"]:
+                os.remove(path)
+        except (OSError, ValueError) as e:
+            stream["error"] = stream["error"] or str(e)
+
+
+def open_video_stream(output_file, frame_start, frame_end, fps=30, keep_frames=False):
+    """
+    Start ffmpeg reading PNGs from a pipe and encoding them to output_file.
+
+    Args:
+        output_file: MP4 to write
+        frame_start, frame_end: Inclusive range the stream expects
+        fps: Video frame rate
+        keep_frames: Leave each PNG on disk after piping it
+    Returns the stream (a dict); feed it with feed_frame(), finish with
+    close_video_stream().
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    process = subprocess.Popen(
+        ['ffmpeg', '-y', '-loglevel', 'error',
+         '-f', 'image2pipe', '-c:v', 'png', '-framerate', str(fps), '-i', '-',
+         *h264_args(), output_file],
+        stdin=subprocess.PIPE, stderr=subprocess.PIPE,
+    )
+    stream = {
+        "process": process,
+        "output": output_file,
+        "next": frame_start,          # next frame ffmpeg needs
+        "end": frame_end,
+        "pending": {},                # frame -> PNG that arrived ahead of its turn
+        "queue": queue.Queue(),       # PNGs handed to the writer thread
+        "delivered": set(),           # frames handed over so far
+        "keep_frames": keep_frames,
+        "error": None,
+    }
+    stream["writer"] = threading.Thread(target=_write_frames, args=(stream,), daemon=True)
+    stream["writer"].start()
+    return stream
+
+
+def feed_frame(stream, frame, path):
+    """
+    Hand a finished frame to the stream. Frames ahead of their turn wait
+    until every earlier frame has arrived.
+    """
+    if frame < stream["next"] or frame > stream["end"] or frame in stream["pending"]:
+        return
+    stream["pending"][frame] = path
+    stream["delivered"].add(frame)
+    while stream["next"] in stream["pending"]:
+        stream["queue"].put(stream["pending"].pop(stream["next"]))
+        stream["next"] += 1
+
+
+def close_video_stream(stream):
+    """
+    Wait for the queued frames to be encoded and finish the file.
+    Returns True if every expected frame went in and ffmpeg succeeded.
+    """
+    stream["queue"].put(None)
+    stream["writer"].join()
+    try:
+        stream["process"].stdin.close()
+    except OSError:
+        pass
+    stream["process"].wait()
+    errors = stream["process"].stderr.read().decode(errors="replace").strip()
+
+    missing = stream["end"] - stream["next"] + 1
+    if stream["process"].returncode != 0 or stream["error"]:
+        print(f"❌ ffmpeg failed: {errors or stream['error']}")
+        print("   Make sure ffmpeg is installed: brew install ffmpeg")
+        return False
+    if missing > 0:
+        print(f"⚠️  Video stopped at frame {stream['next'] - 1}: {missing} frames never arrived")
+        return False
+    print(f"✅ Video saved to {stream['output']}")
+    return True
+
+
+# ──────────────────────────────────────────────
+# Feeding from a render
+# ──────────────────────────────────────────────
+
+def png_complete(path):
+    """True if the PNG at `path` has been written out to its end."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(-len(_PNG_END), os.SEEK_END)
+            return f.read() == _PNG_END
+    except OSError:
+        return False
+
+
+def follow_frames(stream, frames_dir):
+    """Feed every frame that has finished landing in frames_dir since the last call."""
+    for frame in range(stream["next"], stream["end"] + 1):
+        if frame in stream["delivered"]:
+            continue
+        path = frame_path(frames_dir, frame)
+        if png_complete(path):
+            feed_frame(stream, frame, path)
+
+
+def render_streaming(video_file, frames_dir, frame_start=None, frame_end=None,
+                     fps=None, workers=1, keep_frames=False):
+    """
+    Render the scene's frames and encode them to video as they finish.
+
+    Args:
+        video_file: MP4 to write
+        frames_dir: Where the intermediate PNGs go
+        frame_start, frame_end: Inclusive range (default: the scene's)
+        fps: Video frame rate (default: the scene's)
+        workers: >1 renders with render_in_parallel() and follows its output
+        keep_frames: Keep the PNG sequence as well as the video
+    Returns True if the video is complete.
+    """
+    scene = bpy.context.scene
+    frame_start = scene.frame_start if frame_start is None else frame_start
+    frame_end = scene.frame_end if frame_end is None else frame_end
+    fps = fps or scene.render.fps
+    os.makedirs(frames_dir, exist_ok=True)
+    stream = open_video_stream(video_file, frame_start, frame_end, fps, keep_frames)
+
+    if workers > 1:
+        try:
+            render_in_parallel(
+                workers, frames_dir, frame_start, frame_end, compression=0,
+                on_poll=lambda: follow_frames(stream, frames_dir),
+                delivered=stream["delivered"],
+            )
+            follow_frames(stream, frames_dir)
+        finally:
+            complete = close_video_stream(stream)
+        return complete
+
+    def on_write(scene, *args):
+        frame = scene.frame_current
+        feed_frame(stream, frame, scene.render.frame_path(frame=frame))
+
+    # Blender writes into existing files in place; start from fresh ones so
+    # nothing else sharing them (an earlier build's frames) is overwritten
+    for frame in range(frame_start, frame_end + 1):
+        if os.path.lexists(frame_path(frames_dir, frame)):
+            os.remove(frame_path(frames_dir, frame))
+
+    saved = use_png_output(scene, os.path.join(os.path.abspath(frames_dir), "####"), compression=0)
+    # Every frame goes into the stream, even under a profile that steps frames
+    frame_range = (scene.frame_start, scene.frame_end, scene.frame_step)
+    scene.frame_start, scene.frame_end, scene.frame_step = frame_start, frame_end, 1
+    bpy.app.handlers.render_write.append(on_write)
+    try:
+        bpy.ops.render.render(animation=True)
+    finally:
+        bpy.app.handlers.render_write.remove(on_write)
+        restore_output(scene, saved)
+        scene.frame_start, scene.frame_end, scene.frame_step = frame_range
+        complete = close_video_stream(stream)
+    return complete
@@ -0,0 +1,165 @@
+"""
+Render visibility — hide objects on the frames nobody can see them.
+
+Shapes parked off to the side, faded to black or shrunk to nothing still
+cost the render engine every frame: it syncs, sorts and shades them anyway.
+key_render_visibility() reads each object's finished animation and keys
+hide_render / hide_viewport over the stretches where it is outside the
+camera's view, has zero emission or zero scale, so per-frame cost follows
+the number of objects actually on screen.
+
+It runs once all animation is keyed (and interpolation flattened), since it
+evaluates the final F-Curves. Its keys are written directly rather than
+through insert_key(): they are derived from the finished curves, so the key
+step and window have nothing left to thin.
+
+Assumptions that hold for flat emission scenes: a top-down orthographic
+camera, a black world (zero emission is invisible), uniform scale, and
+parents that only translate their children.
+"""
+import bpy
+
+from scripts.utils.animation import get_fcurves, channel_at, world_xy_at
+from scripts.utils.materials import EMISSION_STRENGTH_ATTRIBUTE
+
+
+HIDE_PATHS = ("hide_render", "hide_viewport")
+
+
+# ──────────────────────────────────────────────
+# Evaluating finished animation
+# ──────────────────────────────────────────────
+
+def _emission_at(obj):
+    """function(frame) -> emission strength, or None if the object isn't emission-only."""
+    mat = obj.active_material
+    if mat is None or mat.node_tree is None:
+        return None
+    emission = next((n for n in mat.node_tree.nodes if n.type == 'EMISSION'), None)
+    if emission is None:
+        return None
+
+    strength = emission.inputs["Strength"]
+    if not strength.is_linked:
+        return channel_at(mat.node_tree, strength.path_from_id("default_value"), 0, strength.default_value)
+    # Attribute material: strength comes from the object's own property
+    if EMISSION_STRENGTH_ATTRIBUTE in obj.keys():
+        path = f'["{EMISSION_STRENGTH_ATTRIBUTE}"]'
+        return channel_at(obj, path, 0, obj[EMISSION_STRENGTH_ATTRIBUTE])
+    return None
+
+
+def _radius(obj):
+    """Distance from the origin to the farthest vertex, before scaling."""
+    return max((v.co.length for v in obj.data.vertices), default=0.0)
+
+
+# ──────────────────────────────────────────────
+# Hidden intervals
+# ──────────────────────────────────────────────
+
+def hidden_intervals(obj, camera, frame_start, frame_end, margin=1.0, aspect=None):
+    """
+    Inclusive (start, end) frame intervals in which `obj` can't be seen.
+
+    Args:
+        obj: A mesh object
+        camera: The scene's orthographic camera
+        frame_start, frame_end: Frames to check
+        margin: World units around the view still counted as on screen
+                (room for glow)
+        aspect: Render height / width (default: the scene's resolution)
+    """
+    if aspect is None:
+        render = bpy.context.scene.render
+        aspect = render.resolution_y / render.resolution_x
+
+    x, y = world_xy_at(obj)
+    cam_x, cam_y = world_xy_at(camera)
+    ortho = channel_at(camera.data, "ortho_scale", 0, camera.data.ortho_scale)
+    scale = channel_at(obj, "scale", 0, obj.scale.x)
+    emission = _emission_at(obj)
+    radius = _radius(obj)
+
+    intervals = []
+    for f in range(frame_start, frame_end + 1):
+        s = abs(scale(f))
+        hidden = s < 1e-4 or (emission is not None and emission(f) <= 1e-4)
+        if not hidden:
+            reach = radius * s + margin
+            # ortho_scale spans the longer side of the frame
+            half = ortho(f) / 2
+            half_width, half_height = (half, half * aspect) if aspect <= 1 else (half / aspect, half)
+            hidden = (
+                abs(x(f) - cam_x(f)) > half_width + reach
+                or abs(y(f) - cam_y(f)) > half_height + reach
+            )
+        if not hidden:
+            continue
+        if intervals and intervals[-1][1] == f - 1:
+            intervals[-1][1] = f
+        else:
+            intervals.append([f, f])
+    return [tuple(interval) for interval in intervals]
+
+
+def _clear_hide_keys(obj):
+    for fcurve in get_fcurves(obj):
+        if fcurve.data_path in HIDE_PATHS:
+            fcurve.keyframe_points.clear()
+    obj.hide_render = False
+    obj.hide_viewport = False
+
+
+def _key_hidden(obj, hidden, frame):
+    for path in HIDE_PATHS:
+        setattr(obj, path, hidden)
+        obj.keyframe_insert(data_path=path, frame=frame)
+
+
+def key_render_visibility(camera, objects=None, frame_start=None, frame_end=None,
+                          margin=1.0, min_frames=3):
+    """
+    Key hide_render / hide_viewport on every stretch an object can't be seen.
+
+    Each hidden interval gets a visible key the frame before and after it
+    and a hidden key on its first and last frame, so the switch lands on
+    the right frames whatever the interpolation.
+
+    Args:
+        camera: The scene's orthographic camera
+        objects: Objects to check (default: the scene's meshes, except
+                 Geometry Nodes carriers, whose instances spread out)
+        frame_start, frame_end: Frames to check (default: the scene's range)
+        margin: See hidden_intervals()
+        min_frames: Shorter hidden stretches are left visible
+    Returns (objects hidden at some point, intervals keyed).
+    """
+    scene = bpy.context.scene
+    frame_start = scene.frame_start if frame_start is None else frame_start
+    frame_end = scene.frame_end if frame_end is None else frame_end
+    if objects is None:
+        objects = [
+            obj for obj in scene.objects
+            if obj.type == 'MESH' and not any(m.type == 'NODES' for m in obj.modifiers)
+        ]
+
+    hidden_objects = keyed = 0
+    for obj in objects:
+        _clear_hide_keys(obj)
+        intervals = [
+            (start, end)
+            for start, end in hidden_intervals(obj, camera, frame_start, frame_end, margin)
+            if end - start + 1 >= min_frames
+        ]
+        for start, end in intervals:
+            if start > frame_start:
+                _key_hidden(obj, False, start - 1)
+            _key_hidden(obj, True, start)
+            _key_hidden(obj, True, end)
+            if end < frame_end:
+                _key_hidden(obj, False, end + 1)
+        if intervals:
+            hidden_objects += 1
+            keyed += len(intervals)
+    return hidden_objects, keyed
@@ -0,0 +1,323 @@
+"""
+Workbench flat colour — render emission-only scenes without EEVEE.
+
+A scene made of pure emission shapes on a black world, seen through an
+orthographic camera, needs nothing from EEVEE but each shape's colour.
+Workbench with flat lighting draws exactly that, on the CPU too (EEVEE
+needs a GPU), at a fraction of the cost. use_workbench_flat() converts the
+finished scene:
+  - every mesh object's colour becomes its emission colour × strength,
+    keyed wherever the material (or the object's own emission properties,
+    for shared attribute materials) is keyed,
+  - Geometry Nodes fields drawn with an 'INSTANCER' attribute material
+    take their points' average colour × the carrier's "flat_strength"
+    property, and instances with zero emission strength are removed (flat
+    shading can't fade them to black),
+  - the world colour becomes the Background node's colour × strength,
+  - Workbench draws object colours unlit, with no shadows, cavity,
+    specular or outline.
+
+Colours stay in scene-linear values, so the scene's view transform tone
+maps both engines alike. Fields get one colour each: per-instance shades
+within a field are averaged.
+
+compare_engines() renders a few frames with both engines and reports the
+difference, for checking the conversion against the reference engine.
+
+Usage (after everything is keyed):
+    use_workbench_flat()
+    compare_engines([1, 1500, 3000])
+"""
+import os
+import tempfile
+
+import bpy
+import numpy as np
+
+from scripts.utils.animation import get_fcurves, channel_at
+from scripts.utils.instancing import node, math_node
+from scripts.utils.materials import EMISSION_STRENGTH_ATTRIBUTE
+from scripts.utils.parallel_render import use_png_output, restore_output
+
+
+# Carrier property: emission strength of a field's lit instances, for flat shading
+FLAT_STRENGTH_PROPERTY = "flat_strength"
+
+# Name of the node use_workbench_flat() adds to a field's tree
+_CULL_NODE = "FlatCullUnlit"
+
+
+# ──────────────────────────────────────────────
+# Reading emission
+# ──────────────────────────────────────────────
+
+def _channels(id_data, data_path, size, default):
+    """([function(frame) per component], key frames) of a property."""
+    evaluate = [channel_at(id_data, data_path, i, default[i]) for i in range(size)]
+    frames = {
+        round(kp.co.x)
+        for fcurve in get_fcurves(id_data) if fcurve.data_path == data_path
+        for kp in fcurve.keyframe_points
+    }
+    return evaluate, frames
+
+
+def _socket_channels(tree, socket, size):
+    value = socket.default_value
+    default = list(value) if size > 1 else [value]
+    return _channels(tree, socket.path_from_id("default_value"), size, default)
+
+
+def _property_channels(obj, name, size, fallback):
+    if name not in obj.keys():
+        return [lambda frame, v=v: v for v in fallback], set()
+    value = obj[name]
+    default = list(value) if size > 1 else [value]
+    return _channels(obj, f'["{name}"]', size, default)
+
+
+def _attribute_source(socket):
+    """The Attribute node feeding `socket`, or None."""
+    if not socket.is_linked:
+        return None
+    source = socket.links[0].from_node
+    return source if source.type == 'ATTRIBUTE' else None
+
+
+def _point_color_mean(obj, name):
+    """Average of a carrier's colour attribute over the points that carry one."""
+    attribute = obj.data.attributes.get(name) if obj.type == 'MESH' else None
+    if attribute is None or len(attribute.data) == 0:
+        return [1.0, 1.0, 1.0, 1.0]
+    colors = np.empty(len(attribute.data) * 4, dtype=np.float32)
+    attribute.data.foreach_get("color", colors)
+    colors = colors.reshape(-1, 4)
+    # Baked carriers pad their attributes with zeros past the real points
+    carried = colors[colors[:, 3] > 0]
+    return carried.mean(axis=0).tolist() if len(carried) else [1.0, 1.0, 1.0, 1.0]
+
+
+def flat_color(obj, material):
+    """
+    The colour flat shading should give `obj`: (key frames, function(frame) -> RGBA).
+
+    Returns None if `material` has no Emission node.
+    """
+    tree = material.node_tree if material.use_nodes else None
+    emission = next((n for n in tree.nodes if n.type == 'EMISSION'), None) if tree else None
+    if emission is None:
+        return None
+
+    color_socket, strength_socket = emission.inputs["Color"], emission.inputs["Strength"]
+    color_node, strength_node = _attribute_source(color_socket), _attribute_source(strength_socket)
+    instancer = any(n is not None and n.attribute_type == 'INSTANCER' for n in (color_node, strength_node))
+
+    if color_node is None:
+        color, color_frames = _socket_channels(tree, color_socket, 4)
+    elif instancer:
+        mean = _point_color_mean(obj, color_node.attribute_name)
+        color, color_frames = [lambda frame, v=v: v for v in mean], set()
+    else:
+        color, color_frames = _property_channels(obj, color_node.attribute_name, 4, [1.0] * 4)
+
+    if strength_node is None:
+        strength, strength_frames = _socket_channels(tree, strength_socket, 1)
+    else:
+        name = FLAT_STRENGTH_PROPERTY if instancer else strength_node.attribute_name
+        strength, strength_frames = _property_channels(obj, name, 1, [1.0])
+
+    def color_at(frame):
+        s = strength[0](frame)
+        return [c(frame) * s for c in color[:3]] + [color[3](frame)]
+
+    return sorted(color_frames | strength_frames), color_at
+
+
+# ──────────────────────────────────────────────
+# Converting the scene
+# ──────────────────────────────────────────────
+
+def key_flat_color(obj, frames, color_at):
+    """Set obj.color from color_at(frame), keyed (linearly) on `frames` if there are several."""
+    frames = frames or [bpy.context.scene.frame_start]
+    obj.color = color_at(frames[0])
+    # Keys from an earlier conversion are replaced, even by a single one
+    keyed = any(fcurve.data_path == "color" for fcurve in get_fcurves(obj))
+    if len(frames) < 2 and not keyed:
+        return
+    obj.keyframe_insert(data_path="color", frame=frames[0])
+
+    values = np.array([color_at(f) for f in frames], dtype=np.float32)
+    for fcurve in get_fcurves(obj):
+        if fcurve.data_path != "color":
+            continue
+        points = fcurve.keyframe_points
+        points.clear()
+        points.add(len(frames))
+        co = np.column_stack([np.array(frames, dtype=np.float32), values[:, fcurve.array_index]])
+        points.foreach_set("co", co.ravel())
+        for kp in points:
+            kp.interpolation = 'LINEAR'
+        fcurve.update()
+
+
+def cull_unlit_instances(tree):
+    """
+    Remove instances whose emission strength attribute is zero before they
+    reach the tree's output. Does nothing if the tree already does.
+    """
+    if _CULL_NODE in tree.nodes:
+        return
+    output = next(n for n in tree.nodes if n.type == 'GROUP_OUTPUT')
+    target = output.inputs[0]
+    if not target.is_linked:
+        return
+    source = target.links[0].from_socket
+
+    strength = node(tree, 'GeometryNodeInputNamedAttribute',
+                    {"Name": EMISSION_STRENGTH_ATTRIBUTE}, data_type='FLOAT')
+    # Only where the attribute exists: a missing one reads as zero
+    unlit = node(tree, 'FunctionNodeBooleanMath', {
+        0: strength.outputs["Exists"],
+        1: math_node(tree, 'LESS_THAN', strength.outputs["Attribute"], 1e-6),
+    }, operation='AND')
+    cull = node(tree, 'GeometryNodeDeleteGeometry',
+                {"Geometry": source, "Selection": unlit.outputs[0]}, domain='INSTANCE')
+    cull.name = _CULL_NODE
+    tree.links.new(cull.outputs[0], target)
+
+
+def field_tree(obj):
+    """The node tree of a Geometry Nodes carrier, or None."""
+    for modifier in obj.modifiers:
+        if modifier.type == 'NODES' and modifier.node_group is not None:
+            return modifier.node_group
+    return None
+
+
+def field_material(tree):
+    """The material a field's tree sets on its instances, or None."""
+    for n in tree.nodes:
+        if n.bl_idname == 'GeometryNodeSetMaterial' and n.inputs["Material"].default_value:
+            return n.inputs["Material"].default_value
+    return None
+
+
+def use_workbench_flat(scene=None, antialiasing='8'):
+    """
+    Convert the scene's emission to Workbench flat colours and render with
+    Workbench.
+
+    Run once everything is keyed; running it again redoes the conversion.
+
+    Args:
+        scene: Scene to convert (default: the current one)
+        antialiasing: Workbench render anti-aliasing samples ('OFF', 'FXAA',
+                      '5', '8', '11', '16', '32')
+    Returns the number of objects given a flat colour.
+    """
+    scene = scene or bpy.context.scene
+    converted = 0
+    for obj in scene.objects:
+        if obj.type != 'MESH':
+            continue
+        tree = field_tree(obj)
+        material = (field_material(tree) if tree else None) or obj.active_material
+        if material is None:
+            continue
+        color = flat_color(obj, material)
+        if color is None:
+            obj.color = tuple(material.diffuse_color)
+            continue
+        if tree is not None:
+            cull_unlit_instances(tree)
+        key_flat_color(obj, *color)
+        converted += 1
+
+    world = scene.world
+    if world is not None and world.use_nodes:
+        background = next((n for n in world.node_tree.nodes if n.type == 'BACKGROUND'), None)
+        if background is not None:
+            strength = background.inputs["Strength"].default_value
+            world.color = [c * strength for c in background.inputs["Color"].default_value[:3]]
+
+    scene.render.engine = 'BLENDER_WORKBENCH'
+    scene.display.render_aa = antialiasing
+    shading = scene.display.shading
+    shading.light = 'FLAT'
+    shading.color_type = 'OBJECT'
+    shading.show_shadows = False
+    shading.show_cavity = False
+    shading.show_specular_highlight = False
+    shading.show_object_outline = False
+    shading.show_xray = False
+    return converted
+
+
+# ──────────────────────────────────────────────
+# Checking against the reference engine
+# ──────────────────────────────────────────────
+
+def _load_pixels(path):
+    image = bpy.data.images.load(path, check_existing=False)
+    try:
+        pixels = np.empty(len(image.pixels), dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+        return pixels.reshape(image.size[1], image.size[0], -1)[..., :3]
+    finally:
+        bpy.data.images.remove(image)
+
+
+def compare_images(reference, candidate, tolerance=0.02):
+    """
+    Per-pixel difference between two renders of the same size.
+
+    Returns {"mean": mean abs difference, "max": largest, "over": share of
+    pixels differing by more than `tolerance` in any channel}.
+    """
+    a, b = _load_pixels(reference), _load_pixels(candidate)
+    if a.shape != b.shape:
+        raise ValueError(f"Can't compare {a.shape[1]}×{a.shape[0]} with {b.shape[1]}×{b.shape[0]}")
+    difference = np.abs(a - b)
+    return {
+        "mean": float(difference.mean()),
+        "max": float(difference.max()),
+        "over": float((difference.max(axis=2) > tolerance).mean()),
+    }
+
+
+def compare_engines(frames, reference_engine='BLENDER_EEVEE', tolerance=0.02,
+                    max_over=0.01, directory=None):
+    """
+    Render `frames` with the reference engine and with Workbench, and
+    compare them (see compare_images()). Run after use_workbench_flat().
+
+    A frame passes if at most `max_over` of its pixels differ by more than
+    `tolerance`. Renders go to `directory` (default: a new temp dir).
+    Returns {frame: comparison, with "passed"}.
+    """
+    scene = bpy.context.scene
+    directory = directory or tempfile.mkdtemp(prefix="engine_compare_")
+    engine, current = scene.render.engine, scene.frame_current
+    saved = use_png_output(scene, "")
+    results = {}
+    try:
+        for frame in frames:
+            scene.frame_set(frame)
+            paths = {}
+            for name in (reference_engine, 'BLENDER_WORKBENCH'):
+                scene.render.engine = name
+                paths[name] = os.path.join(directory, f"{frame:04d}_{name.lower()}.png")
+                scene.render.filepath = paths[name]
+                bpy.ops.render.render(write_still=True)
+            result = compare_images(paths[reference_engine], paths['BLENDER_WORKBENCH'], tolerance)
+            result["passed"] = result["over"] <= max_over
+            results[frame] = result
+            mark = "✅" if result["passed"] else "❌"
+            print(f"   {mark} Frame {frame}: mean {result['mean']:.4f}, max {result['max']:.3f}, "
+                  f"{result['over']:.2%} of pixels over {tolerance}")
+    finally:
+        restore_output(scene, saved)
+        scene.render.engine = engine
+        scene.frame_set(current)
+    return results
@@ -4,6 +4,7 @@ Tests for addon/script_watcher.py — hot-reload addon.
 import bpy
 import sys
 import os
+import json
 import time
 import tempfile
 from tests.run_tests import test, assert_eq, assert_true, assert_false, assert_gt, assert_near
@@ -53,10 +54,12 @@ def test_addon_unregister():
 
 @test
 def test_addon_reset_scene_clears_all():
-    """Addon's reset_scene should clear objects and materials."""
+    """Addon's reset_scene should clear the build's objects and materials."""
+    from scripts.utils.materials import create_emission_material
+    sw.reset_scene()
     bpy.ops.mesh.primitive_cube_add()
     bpy.ops.mesh.primitive_uv_sphere_add()
-    bpy.data.materials.new("AddonTestMat")
+    create_emission_material("AddonTestMat")
     assert_gt(len(bpy.data.objects), 0)
 
     sw.reset_scene()
@@ -65,6 +68,22 @@ def test_addon_reset_scene_clears_all():
     assert_eq(len(bpy.data.materials), 0, "Materials should be cleared")
 
 
+@test
+def test_addon_reset_scene_keeps_hand_made_data():
+    """Objects and materials made outside the build survive reset_scene."""
+    sw.reset_scene()
+    mat = bpy.data.materials.new("HandMadeMat")
+    obj = bpy.data.objects.new("HandMade", bpy.data.meshes.new("HandMadeMesh"))
+    bpy.context.scene.collection.objects.link(obj)
+    bpy.ops.mesh.primitive_cube_add()
+
+    sw.reset_scene()
+
+    assert_eq([o.name for o in bpy.data.objects], ["HandMade"])
+    assert_true(bpy.data.materials.get("HandMadeMat") is not None)
+    bpy.data.batch_remove([obj, obj.data, mat])
+
+
 @test
 def test_addon_reset_scene_preserves_addon():
     """reset_scene should NOT kill the script_watcher addon."""
@@ -225,3 +244,323 @@ def test_watcher_timer_returns_interval_when_watching():
     finally:
         sw._watcher_state["is_watching"] = False
         os.unlink(tmp_path)
+
+
+# ──────────────────────────────────────────────
+# Progressive Build
+# ──────────────────────────────────────────────
+
+@test
+def test_progressive_window_off_by_default():
+    """progressive_window should return None unless progressive builds are on."""
+    scene = bpy.context.scene
+    scene.script_watcher.progressive = False
+    assert_eq(sw.progressive_window(scene), None)
+
+
+@test
+def test_progressive_window_follows_playhead():
+    """The first-build window should be centred on the playhead."""
+    scene = bpy.context.scene
+    props = scene.script_watcher
+    props.progressive = True
+    props.pin_range = False
+    props.window_radius = 50
+    scene.frame_set(2800)
+    try:
+        assert_eq(sw.progressive_window(scene), (2750, 2850))
+    finally:
+        props.progressive = False
+        scene.frame_set(1)
+
+
+@test
+def test_progressive_window_pinned_range():
+    """A pinned range should be used as-is, regardless of the playhead."""
+    scene = bpy.context.scene
+    props = scene.script_watcher
+    props.progressive = True
+    props.pin_range = True
+    props.pin_start = 2940
+    props.pin_end = 2790
+    try:
+        assert_eq(sw.progressive_window(scene), (2790, 2940))
+    finally:
+        props.progressive = False
+        props.pin_range = False
+
+
+# ──────────────────────────────────────────────
+# Staged Build
+# ──────────────────────────────────────────────
+
+@test
+def test_staged_build_falls_back_without_window():
+    """In background mode there's nothing on screen to keep, so builds happen in place."""
+    assert_true(bpy.app.background, "The suite runs in background mode")
+    assert_eq(sw._build_window(), None)
+    assert_eq(sw.begin_staged_build(), None)
+
+
+@test
+def test_execute_script_builds_through_staged_scene():
+    """A script using bpy.ops builds into the staging scene, which then replaces the old one."""
+    wm = bpy.context.window_manager
+    assert_true(len(wm.windows) > 0, "Background Blender still has a window")
+    with tempfile.NamedTemporaryFile(
+        mode='w', suffix='.py', delete=False,
+        dir=os.path.join(PROJECT_ROOT, 'scripts', 'animations')
+    ) as f:
+        f.write("""
+import bpy
+import sys, os
+project_root = os.getcwd()
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from scripts.utils.scene import reset_scene
+reset_scene()
+bpy.ops.mesh.primitive_cube_add(location=(1, 2, 3))
+bpy.context.active_object.name = "StagedCubeFromScript"
+""")
+        tmp_path = f.name
+
+    # Stage as the UI would, against the background window
+    build_window = sw._build_window
+    sw._build_window = lambda: wm.windows[0]
+    try:
+        sw.reset_scene()
+        old_scene = wm.windows[0].scene
+        scene_name = old_scene.name
+        assert_true(sw.execute_script(tmp_path), "The staged build should succeed")
+        sw.finish_freeing()
+
+        new_scene = wm.windows[0].scene
+        assert_eq(new_scene.name, scene_name)
+        assert_true("StagedCubeFromScript" in new_scene.objects)
+        assert_near(new_scene.objects["StagedCubeFromScript"].location.z, 3.0, tolerance=0.01)
+        assert_false(scene_name + sw.RETIRED_SUFFIX in bpy.data.scenes,
+                     "The previous scene should be freed")
+    finally:
+        sw._build_window = build_window
+        os.unlink(tmp_path)
+
+
+@test
+def test_retire_and_restore_build_data():
+    """Retiring renames the scene and its datablocks; restoring undoes it."""
+    sw.reset_scene()
+    scene = bpy.context.scene
+    scene_name = scene.name
+    bpy.ops.mesh.primitive_cube_add()
+    bpy.context.active_object.name = "StageCube"
+
+    retired = sw.retire_build_data(scene)
+    try:
+        assert_eq(scene.name, scene_name + sw.RETIRED_SUFFIX)
+        assert_true("StageCube" + sw.RETIRED_SUFFIX in bpy.data.objects)
+        assert_false("StageCube" in bpy.data.objects)
+    finally:
+        sw.restore_build_data(retired)
+
+    assert_eq(scene.name, scene_name)
+    assert_true("StageCube" in bpy.data.objects)
+
+
+@test
+def test_retire_build_data_leaves_other_scenes_alone():
+    """Only data the retired scene alone uses is renamed."""
+    sw.reset_scene()
+    scene = bpy.context.scene
+    other = bpy.data.scenes.new("OtherScene")
+    kept = bpy.data.objects.new("OtherCube", bpy.data.meshes.new("OtherMesh"))
+    other.collection.objects.link(kept)
+
+    retired = sw.retire_build_data(scene)
+    try:
+        assert_eq(kept.name, "OtherCube")
+        assert_eq(kept.data.name, "OtherMesh")
+        assert_eq(other.name, "OtherScene")
+    finally:
+        sw.restore_build_data(retired)
+        bpy.data.batch_remove([kept, kept.data, other])
+
+
+@test
+def test_staged_reload_keeps_hand_made_objects():
+    """A staged reload frees the old build but carries hand-made objects across."""
+    from scripts.utils.ownership import build_collection
+    old_scene = bpy.data.scenes.new("StagedOld")
+    built = bpy.data.objects.new("BuiltCube", bpy.data.meshes.new("BuiltMesh"))
+    build_collection(old_scene).objects.link(built)
+    hand_made = bpy.data.objects.new("HandMade", bpy.data.meshes.new("HandMesh"))
+    old_scene.collection.objects.link(hand_made)
+
+    retired = sw.retire_build_data(old_scene)
+    assert_eq(hand_made.name, "HandMade", "Hand-made objects aren't retired")
+    new_scene = bpy.data.scenes.new(retired[0][1])
+    build_collection(new_scene).objects.link(
+        bpy.data.objects.new("BuiltCube", bpy.data.meshes.new("BuiltMesh")))
+    sw.commit_staged_build({
+        "window": None,
+        "old_scene": old_scene.name,
+        "new_scene": new_scene.name,
+        "retired": retired,
+        "existing": set(),
+    })
+    sw.finish_freeing()
+
+    try:
+        assert_eq(new_scene.name, "StagedOld")
+        assert_true("HandMade" in new_scene.collection.objects)
+        assert_true("HandMesh" in bpy.data.meshes)
+        assert_false("BuiltCube" + sw.RETIRED_SUFFIX in bpy.data.objects,
+                     "The previous build should be freed")
+        assert_true("BuiltCube" in new_scene.objects)
+    finally:
+        bpy.data.batch_remove([hand_made, hand_made.data, new_scene]
+                              + list(new_scene.collection.children_recursive)
+                              + [obj for obj in new_scene.objects if obj != hand_made])
+
+
+@test
+def test_abort_staged_build_keeps_previous_scene():
+    """A failed staged build is thrown away and the old names come back."""
+    sw.reset_scene()
+    scene = bpy.context.scene
+    scene_name = scene.name
+    bpy.ops.mesh.primitive_cube_add()
+    bpy.context.active_object.name = "OldCube"
+
+    retired = sw.retire_build_data(scene)
+    existing = {(attr, block.name) for attr in sw.BUILD_DATA + ("collections",)
+                for block in getattr(bpy.data, attr)}
+    new_scene = bpy.data.scenes.new(scene_name)
+    half_built = bpy.data.objects.new("OldCube", bpy.data.meshes.new("HalfMesh"))
+    new_scene.collection.objects.link(half_built)
+
+    sw.abort_staged_build({
+        "window": None,
+        "old_scene": scene.name,
+        "new_scene": new_scene.name,
+        "retired": retired,
+        "existing": existing,
+    })
+
+    assert_eq(scene.name, scene_name)
+    assert_eq(len(bpy.data.scenes), 1, "The staging scene should be removed")
+    assert_true("OldCube" in bpy.data.objects)
+    assert_false("HalfMesh" in bpy.data.meshes, "Half-built data should be freed")
+
+
+# ──────────────────────────────────────────────
+# Control Server
+# ──────────────────────────────────────────────
+
+@test
+def test_control_rejects_bad_requests():
+    """Malformed JSON and unknown commands get an error reply, not an exception."""
+    reply = sw.handle_control_command(b"not json")
+    assert_false(reply["ok"])
+
+    reply = sw.handle_control_command('{"cmd": "explode", "id": 7}')
+    assert_false(reply["ok"])
+    assert_eq(reply["id"], 7)
+
+
+@test
+def test_control_set_frame_and_stats():
+    """set-frame moves the playhead; stats reports it."""
+    reply = sw.handle_control_command('{"cmd": "set-frame", "frame": 42, "id": 1}')
+    assert_true(reply["ok"])
+    assert_eq(bpy.context.scene.frame_current, 42)
+
+    reply = sw.handle_control_command('{"cmd": "stats"}')
+    assert_true(reply["ok"])
+    assert_eq(reply["frame"], 42)
+    assert_true("last_build_seconds" in reply)
+    bpy.context.scene.frame_set(1)
+
+
+@test
+def test_control_missing_field():
+    """A command missing a required field says which one."""
+    reply = sw.handle_control_command('{"cmd": "set-frame"}')
+    assert_false(reply["ok"])
+    assert_true("frame" in reply["error"])
+
+
+@test
+def test_control_server_round_trip():
+    """A command sent over the socket is answered on the next timer tick."""
+    import socket
+
+    port = sw.start_control_server(0)
+    client = socket.create_connection(("127.0.0.1", port), timeout=2.0)
+    try:
+        with open(sw.control_token_path(port)) as f:
+            token = f.read()
+        assert_eq(os.stat(sw.control_token_path(port)).st_mode & 0o777, 0o600)
+        sw._control_timer()  # accept
+        client.sendall(json.dumps({"cmd": "set-frame", "frame": 9, "id": 3, "token": token}).encode() + b"\n")
+        time.sleep(0.05)
+        sw._control_timer()  # handle
+
+        reply = json.loads(client.makefile("r").readline())
+        assert_true(reply["ok"])
+        assert_eq(reply["id"], 3)
+        assert_eq(bpy.context.scene.frame_current, 9)
+    finally:
+        client.close()
+        sw.stop_control_server()
+        bpy.context.scene.frame_set(1)
+
+
+@test
+def test_control_server_closes_untrusted_connections():
+    """Non-JSON lines and requests without the token close the connection unanswered."""
+    import socket
+
+    bpy.context.scene.frame_set(1)
+    port = sw.start_control_server(0)
+    try:
+        for payload in (b"POST / HTTP/1.1\r\n", b'{"cmd": "set-frame", "frame": 5, "token": "guess"}\n'):
+            client = socket.create_connection(("127.0.0.1", port), timeout=2.0)
+            try:
+                sw._control_timer()  # accept
+                client.sendall(payload)
+                time.sleep(0.05)
+                sw._control_timer()  # handle
+                assert_eq(len(sw._watcher_state["control_clients"]), 0)
+            finally:
+                client.close()
+        assert_eq(bpy.context.scene.frame_current, 1)
+    finally:
+        sw.stop_control_server()
+
+
+@test
+def test_control_never_takes_paths_from_requests():
+    """A "file" is refused, and stills can't be written outside ./output."""
+    reply = sw.handle_control_command('{"cmd": "reload", "file": "/tmp/evil.py"}')
+    assert_false(reply["ok"])
+    assert_true("file" in reply["error"])
+
+    for path in ("/tmp/still.png", "output/../../still.png", "scripts/still.png"):
+        reply = sw.handle_control_command(json.dumps({"cmd": "render-still", "frame": 1, "path": path}))
+        assert_false(reply["ok"], f"{path} should be refused")
+        assert_true("output" in reply["error"])
+
+
+@test
+def test_control_command_errors_become_replies():
+    """Any exception a command raises is answered, so the control timer keeps running."""
+    def broken(request):
+        raise OSError("disk full")
+
+    sw.CONTROL_COMMANDS["broken"] = broken
+    try:
+        reply = sw.handle_control_command('{"cmd": "broken", "id": 4}')
+    finally:
+        del sw.CONTROL_COMMANDS["broken"]
+    assert_false(reply["ok"])
+    assert_eq(reply["error"], "disk full")
@@ -0,0 +1,138 @@
+"""
+Tests for scripts/utils/build.py — build tiers and option resolution.
+"""
+from tests.run_tests import test, assert_eq, assert_true
+
+from scripts.utils.build import (
+    BUILD_TIERS,
+    DEFAULT_TIER,
+    parse_build_args,
+    parse_frame_range,
+    set_build_overrides,
+    clear_build_overrides,
+    get_build_options,
+)
+
+
+# ──────────────────────────────────────────────
+# Argument parsing
+# ──────────────────────────────────────────────
+
+@test
+def test_parse_build_args_tier_forms():
+    """--tier accepts both '--tier draft' and '--tier=draft'."""
+    assert_eq(parse_build_args(["--tier", "draft"]), {"tier": "draft"})
+    assert_eq(parse_build_args(["--tier=review"]), {"tier": "review"})
+
+
+@test
+def test_parse_build_args_profile():
+    """--profile takes a name in either form and defaults to final."""
+    assert_eq(parse_build_args(["--profile", "preview"]), {"profile": "preview"})
+    assert_eq(parse_build_args(["--profile=review", "--tier", "draft"]),
+              {"profile": "review", "tier": "draft"})
+    assert_eq(get_build_options()["profile"], "final")
+
+
+@test
+def test_parse_build_args_engine():
+    """--engine takes a name in either form; by default the script's engine is kept."""
+    assert_eq(parse_build_args(["--engine", "workbench"]), {"engine": "workbench"})
+    assert_eq(parse_build_args(["--engine=cycles"]), {"engine": "cycles"})
+    assert_eq(get_build_options()["engine"], None)
+
+
+@test
+def test_parse_build_args_frames():
+    """--frames takes START-END in either form; bad ranges are ignored."""
+    assert_eq(parse_build_args(["--frames", "2790-2940"]), {"frames": (2790, 2940)})
+    assert_eq(parse_build_args(["--frames=1200"]), {"frames": (1200, 1200)})
+    assert_eq(parse_build_args(["--frames", "soon"]), {})
+    assert_eq(parse_frame_range("40-10"), (10, 40))
+
+
+@test
+def test_parse_build_args_workers():
+    """--workers takes a positive count; anything else is ignored."""
+    assert_eq(parse_build_args(["--workers", "4"]), {"workers": 4})
+    assert_eq(parse_build_args(["--workers=8", "--tier", "draft"]), {"workers": 8, "tier": "draft"})
+    assert_eq(parse_build_args(["--workers", "0"]), {})
+    assert_eq(parse_build_args(["--workers", "many"]), {})
+
+
+@test
+def test_parse_build_args_incremental():
+    """--incremental is a plain switch."""
+    assert_eq(parse_build_args(["--incremental"]), {"incremental": True})
+    assert_eq(get_build_options()["incremental"], False)
+
+
+@test
+def test_parse_build_args_stream():
+    """--stream and --keep-frames are plain switches, off by default."""
+    assert_eq(parse_build_args(["--stream", "--keep-frames"]),
+              {"stream": True, "keep_frames": True})
+    options = get_build_options()
+    assert_eq((options["stream"], options["keep_frames"]), (False, False))
+
+
+@test
+def test_parse_build_args_flat_preview():
+    """--flat-preview is a plain switch, off by default."""
+    assert_eq(parse_build_args(["--flat-preview"]), {"flat_preview": True})
+    assert_eq(get_build_options()["flat_preview"], False)
+
+
+@test
+def test_parse_build_args_lottie():
+    """--lottie is a plain switch, off by default."""
+    assert_eq(parse_build_args(["--lottie"]), {"lottie": True})
+    assert_eq(get_build_options()["lottie"], False)
+
+
+@test
+def test_parse_build_args_ignores_unknown():
+    """Script paths and unrelated flags are ignored."""
+    assert_eq(parse_build_args(["/tmp/script.py", "--verbose"]), {})
+
+
+# ──────────────────────────────────────────────
+# Tier resolution
+# ──────────────────────────────────────────────
+
+@test
+def test_default_tier_is_final():
+    """With no flags or overrides the build is the full-fidelity tier."""
+    clear_build_overrides()
+    options = get_build_options()
+    assert_eq(DEFAULT_TIER, "final")
+    assert_eq(options["key_step"], BUILD_TIERS[options["tier"]]["key_step"])
+
+
+@test
+def test_final_tier_changes_nothing():
+    """The final tier must build exactly what an untiered build did."""
+    final = BUILD_TIERS["final"]
+    assert_eq(final["key_step"], 1)
+    assert_eq(final["ambient"], 1.0)
+    assert_eq(final["resolution_percentage"], 100)
+
+
+@test
+def test_overrides_select_tier():
+    """Watcher overrides win and pull in that tier's settings."""
+    set_build_overrides(tier="draft")
+    options = get_build_options()
+    clear_build_overrides()
+    assert_eq(options["tier"], "draft")
+    assert_eq(options["key_step"], BUILD_TIERS["draft"]["key_step"])
+    assert_true(options["ambient"] < 1.0)
+
+
+@test
+def test_unknown_tier_falls_back():
+    """An unknown tier name falls back to the default tier."""
+    set_build_overrides(tier="ultra")
+    options = get_build_options()
+    clear_build_overrides()
+    assert_eq(options["tier"], DEFAULT_TIER)
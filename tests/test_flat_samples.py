@@ -0,0 +1,79 @@
+"""
+Tests for scripts/utils/flat_samples.py — sampling a flat scene for the rasterizer.
+"""
+import os
+import tempfile
+
+import bpy
+import numpy as np
+from tests.run_tests import test, assert_eq, assert_near
+
+from scripts.utils.scene import reset_scene, setup_ortho_camera
+from scripts.utils.keying import reset_key_gate, insert_key
+from scripts.utils.animation import get_fcurves
+from scripts.utils.materials import create_emission_material, assign_material
+from scripts.utils.primitives import create_primitive
+from scripts.utils.flat_samples import sample_channel, sample_flat_scene
+from scripts.utils.raster import load_flat_samples
+
+
+@test
+def test_sample_channel_matches_the_curve():
+    """Linear curves are interpolated in bulk, and agree with fcurve.evaluate()."""
+    reset_scene()
+    reset_key_gate()
+    obj = create_primitive("Mover", "plane", 1.0)
+    insert_key(obj, "location", 0.0, 1, index=0)
+    insert_key(obj, "location", 4.0, 5, index=0)
+    for fcurve in get_fcurves(obj):
+        for kp in fcurve.keyframe_points:
+            kp.interpolation = 'LINEAR'
+    values = sample_channel(obj, "location", 0, 0.0, np.arange(0, 8))
+    assert_eq([round(v, 6) for v in values], [0.0, 0.0, 1.0, 2.0, 3.0, 4.0, 4.0, 4.0])
+    assert_eq(list(sample_channel(obj, "location", 1, 2.5, [1, 2])), [2.5, 2.5])
+
+
+@test
+def test_sample_flat_scene_records_lit_shapes():
+    """Each frame lists its lit shapes with their transform and emission."""
+    reset_scene()
+    reset_key_gate()
+    scene = bpy.context.scene
+    scene.frame_start, scene.frame_end = 1, 3
+    setup_ortho_camera(ortho_scale=10)
+    obj = create_primitive("Pulse", "plane", 1.0, location=(2.0, 1.0, 0.0))
+    mat = create_emission_material("PulseMat", color=(1.0, 0.5, 0.0, 1.0), strength=2.0)
+    assign_material(obj, mat)
+    strength = mat.node_tree.nodes["Emission"].inputs["Strength"]
+    insert_key(strength, "default_value", 2.0, 1)
+    insert_key(strength, "default_value", 0.0, 3)
+
+    path = os.path.join(tempfile.mkdtemp(), "flat.npz")
+    assert_eq(sample_flat_scene(path), 2)
+    samples = load_flat_samples(path)
+    assert_eq(samples["frame_offsets"].tolist(), [0, 1, 2, 2])
+    assert_eq(samples["shape_count"].tolist(), [2])
+    assert_near(float(samples["item_matrix"][0, 0, 2]), 2.0)
+    assert_near(float(samples["item_matrix"][0, 1, 2]), 1.0)
+    assert_near(float(samples["item_color"][1, 0]), 1.0)
+    assert_near(float(samples["camera"][0, 2]), 10.0)
+
+
+@test
+def test_sample_flat_scene_follows_keyed_visibility():
+    """Keyed hide_render hides a shape on its hidden frames only, whatever value it was left at."""
+    reset_scene()
+    reset_key_gate()
+    scene = bpy.context.scene
+    scene.frame_start, scene.frame_end = 1, 3
+    setup_ortho_camera(ortho_scale=10)
+    obj = create_primitive("Leaver", "plane", 1.0)
+    assign_material(obj, create_emission_material("LeaverMat", color=(1.0, 1.0, 1.0, 1.0), strength=1.0))
+    for frame, hidden in ((1, False), (2, True), (3, True)):
+        obj.hide_render = hidden
+        obj.keyframe_insert(data_path="hide_render", frame=frame)
+    assert_eq(obj.hide_render, True)
+
+    path = os.path.join(tempfile.mkdtemp(), "flat.npz")
+    assert_eq(sample_flat_scene(path), 1)
+    assert_eq(load_flat_samples(path)["frame_offsets"].tolist(), [0, 1, 1, 1])
@@ -0,0 +1,99 @@
+"""
+Tests for scripts/utils/frame_store.py — per-frame hashes and the frame store.
+"""
+import os
+import tempfile
+from tests.run_tests import test, assert_eq, assert_true, assert_false
+
+from scripts.utils.scene import reset_scene, setup_ortho_camera
+from scripts.utils.keying import reset_key_gate, insert_key
+from scripts.utils.animation import get_fcurves
+from scripts.utils.materials import create_emission_material, assign_material
+from scripts.utils.primitives import create_primitive
+from scripts.utils.parallel_render import frame_path
+from scripts.utils.frame_store import (
+    frame_hashes, stored_path, store_frame, link_frame,
+)
+
+
+def _moving_square():
+    reset_scene()
+    reset_key_gate()
+    setup_ortho_camera(ortho_scale=20)
+    obj = create_primitive("Mover", "plane", 1.0)
+    assign_material(obj, create_emission_material("MoverMat"))
+    for f, x in ((1, 0), (10, 0), (20, 5), (30, 5)):
+        insert_key(obj, "location", (x, 0, 0), f)
+    _linear(obj)
+    return obj
+
+
+def _linear(obj):
+    for fcurve in get_fcurves(obj):
+        for point in fcurve.keyframe_points:
+            point.interpolation = 'LINEAR'
+
+
+# ──────────────────────────────────────────────
+# Hashing
+# ──────────────────────────────────────────────
+
+@test
+def test_held_frames_share_a_hash():
+    """Frames where nothing moves hash the same; moving frames differ."""
+    _moving_square()
+    hashes = frame_hashes(1, 30)
+    assert_eq(hashes[1], hashes[10])
+    assert_eq(hashes[20], hashes[30])
+    assert_eq(len({hashes[f] for f in range(10, 21)}), 11)
+
+
+@test
+def test_a_late_change_only_rehashes_late_frames():
+    """Moving a key late in the timeline leaves earlier frames' hashes alone."""
+    obj = _moving_square()
+    before = frame_hashes(1, 30)
+    insert_key(obj, "location", (8, 0, 0), 30)
+    _linear(obj)
+    after = frame_hashes(1, 30)
+    assert_eq([f for f in range(1, 31) if before[f] != after[f]], list(range(21, 31)))
+
+
+@test
+def test_static_changes_rehash_every_frame():
+    """A change nobody animates (a material colour) touches every frame."""
+    obj = _moving_square()
+    before = frame_hashes(1, 30)
+    obj.active_material.node_tree.nodes["Emission"].inputs["Color"].default_value = (1, 0, 0, 1)
+    after = frame_hashes(1, 30)
+    assert_false(any(before[f] == after[f] for f in range(1, 31)))
+
+
+# ──────────────────────────────────────────────
+# Store
+# ──────────────────────────────────────────────
+
+@test
+def test_stored_frames_link_into_the_sequence():
+    """A stored frame appears in the output sequence under every frame that uses it."""
+    store_dir, frames_dir = tempfile.mkdtemp(), tempfile.mkdtemp()
+    rendered = os.path.join(tempfile.mkdtemp(), "render.png")
+    with open(rendered, "wb") as f:
+        f.write(b"pixels")
+    store_frame(store_dir, "ab12cd", rendered)
+    assert_true(os.path.exists(stored_path(store_dir, "ab12cd")))
+
+    for frame in (7, 8):
+        link_frame(store_dir, "ab12cd", frames_dir, frame)
+        with open(frame_path(frames_dir, frame), "rb") as f:
+            assert_eq(f.read(), b"pixels")
+    # Linking again (a second run) replaces the old entry cleanly
+    link_frame(store_dir, "ab12cd", frames_dir, 7)
+    assert_eq(sorted(os.listdir(frames_dir)), ["0007.png", "0008.png"])
+
+
+    # A render writing into the sequence in place leaves the store alone
+    with open(frame_path(frames_dir, 7), "r+b") as f:
+        f.write(b"PIXELS")
+    with open(stored_path(store_dir, "ab12cd"), "rb") as f:
+        assert_eq(f.read(), b"pixels")
@@ -0,0 +1,105 @@
+"""
+Tests for scripts/utils/instancing.py — Geometry Nodes instance fields.
+"""
+import bpy
+from tests.run_tests import test, assert_eq, assert_true, assert_near
+
+from scripts.utils.scene import reset_scene
+from scripts.utils.instancing import (
+    create_point_carrier,
+    create_baked_carrier,
+    baked_position,
+    add_geometry_nodes,
+    new_geometry_tree,
+    node,
+    math_node,
+    keyable_value,
+)
+
+
+# ──────────────────────────────────────────────
+# Carrier objects
+# ──────────────────────────────────────────────
+
+@test
+def test_point_carrier_stores_points_and_attributes():
+    """One vertex per instance, with float and colour attributes."""
+    reset_scene()
+    carrier = create_point_carrier(
+        "Field",
+        [(0, 0, 0), (1, 2, 0), (3, 4, 0)],
+        {"speed": [0.1, 0.2, 0.3], "emission_color": [(1, 0, 0, 1)] * 3},
+    )
+    mesh = carrier.data
+    assert_eq(len(mesh.vertices), 3)
+    assert_near(mesh.vertices[1].co.y, 2.0)
+    assert_near(mesh.attributes["speed"].data[2].value, 0.3)
+    assert_eq(mesh.attributes["emission_color"].data_type, 'FLOAT_COLOR')
+    assert_true(carrier.name in bpy.context.scene.objects)
+
+
+@test
+def test_baked_carrier_interpolates_between_samples():
+    """baked_position() keeps the real points and blends neighbouring samples."""
+    reset_scene()
+    samples = [
+        [(0, 0), (10, 0)],
+        [(2, 4), (10, 2)],
+        [(4, 8), (10, 4)],
+    ]
+    carrier = create_baked_carrier("Baked", samples, {"speed": [0.5, 1.5]})
+    assert_eq(len(carrier.data.vertices), 6)
+    assert_near(carrier.data.attributes["speed"].data[1].value, 1.5)
+
+    tree, group_in, group_out = new_geometry_tree("BakedNodes")
+    points, position = baked_position(tree, group_in.outputs[0], 2, 3, 1.5)
+    moved = node(tree, 'GeometryNodeSetPosition', {"Geometry": points, "Position": position})
+    tree.links.new(moved.outputs[0], group_out.inputs[0])
+    add_geometry_nodes(carrier, tree)
+
+    evaluated = carrier.evaluated_get(bpy.context.evaluated_depsgraph_get())
+    vertices = evaluated.data.vertices
+    assert_eq(len(vertices), 2)
+    assert_near(vertices[0].co.x, 3.0)
+    assert_near(vertices[0].co.y, 6.0)
+    assert_near(vertices[1].co.y, 3.0)
+
+
+# ──────────────────────────────────────────────
+# Node trees
+# ──────────────────────────────────────────────
+
+@test
+def test_instance_tree_evaluates_to_instances():
+    """A carrier with an Instance on Points tree evaluates to one instance per point."""
+    reset_scene()
+    carrier = create_point_carrier("Field", [(i, 0, 0) for i in range(100)])
+    tree, group_in, group_out = new_geometry_tree("FieldNodes")
+    square = node(tree, 'GeometryNodeMeshGrid', {"Size X": 0.1, "Size Y": 0.1})
+    instances = node(tree, 'GeometryNodeInstanceOnPoints', {
+        "Points": group_in.outputs[0],
+        "Instance": square.outputs["Mesh"],
+    })
+    tree.links.new(instances.outputs[0], group_out.inputs[0])
+    add_geometry_nodes(carrier, tree)
+
+    evaluated = carrier.evaluated_get(bpy.context.evaluated_depsgraph_get())
+    # Hold each step: the point cloud is freed along with its geometry set
+    geometry = evaluated.evaluated_geometry()
+    points = geometry.instances_pointcloud()
+    assert_eq(len(points.points), 100)
+
+
+@test
+def test_math_node_and_keyable_value():
+    """math_node wires sockets and constants; keyable values take keyframes."""
+    reset_scene()
+    tree, _, _ = new_geometry_tree("Maths")
+    density = keyable_value(tree, "Density", 2.0)
+    product = math_node(tree, 'MULTIPLY', density, 0.5)
+    assert_eq(product.node.operation, 'MULTIPLY')
+    assert_true(product.node.inputs[0].is_linked)
+    assert_near(product.node.inputs[1].default_value, 0.5)
+
+    density.keyframe_insert("default_value", frame=1)
+    assert_true(tree.animation_data is not None)
@@ -0,0 +1,239 @@
+"""
+Tests for scripts/utils/keying.py — windowed and deferred keyframe insertion.
+"""
+import bpy
+from tests.run_tests import test, assert_eq, assert_true, assert_false, assert_near
+
+from scripts.utils.scene import reset_scene
+from scripts.utils.keying import (
+    reset_key_gate,
+    set_key_window,
+    close_key_window,
+    set_key_step,
+    close_key_runs,
+    get_key_window,
+    key_in_window,
+    insert_key,
+    pending_key_count,
+    when_keys_flushed,
+    flush_pending_keys,
+)
+
+
+def _cube():
+    bpy.ops.mesh.primitive_cube_add()
+    return bpy.context.active_object
+
+
+# ──────────────────────────────────────────────
+# Default gate
+# ──────────────────────────────────────────────
+
+@test
+def test_insert_key_writes_immediately_by_default():
+    """With no window set, insert_key behaves like keyframe_insert."""
+    reset_scene()
+    reset_key_gate()
+    cube = _cube()
+
+    assert_true(insert_key(cube, "location", (4.0, 0, 0), 10))
+
+    bpy.context.scene.frame_set(10)
+    assert_near(cube.location.x, 4.0, tolerance=0.01)
+    assert_eq(pending_key_count(), 0)
+
+
+@test
+def test_insert_key_indexed():
+    """insert_key with an index keys only that component."""
+    reset_scene()
+    reset_key_gate()
+    cube = _cube()
+
+    insert_key(cube, "rotation_euler", 1.5, 5, index=2)
+
+    bpy.context.scene.frame_set(5)
+    assert_near(cube.rotation_euler.z, 1.5, tolerance=0.01)
+
+
+# ──────────────────────────────────────────────
+# Key window
+# ──────────────────────────────────────────────
+
+@test
+def test_set_key_window_normalises_order():
+    """set_key_window should accept (end, start) and store (start, end)."""
+    set_key_window((50, 10))
+    assert_eq(get_key_window(), (10, 50))
+    assert_true(key_in_window(10))
+    assert_true(key_in_window(50))
+    assert_false(key_in_window(51))
+    reset_key_gate()
+
+
+@test
+def test_window_drops_outside_keys():
+    """Keys outside the window are dropped when not deferring."""
+    reset_scene()
+    reset_key_gate()
+    cube = _cube()
+
+    set_key_window((10, 20))
+    assert_true(insert_key(cube, "location", (1.0, 0, 0), 15))
+    assert_false(insert_key(cube, "location", (9.0, 0, 0), 30))
+    assert_eq(pending_key_count(), 0, "Dropped keys should not be queued")
+    reset_key_gate()
+
+    bpy.context.scene.frame_set(30)
+    assert_near(cube.location.x, 1.0, tolerance=0.01,
+                msg="Only the in-window key should exist")
+
+
+@test
+def test_window_keeps_edge_keys():
+    """keep_edges writes each channel's nearest key either side of the window."""
+    reset_scene()
+    reset_key_gate()
+    cube = _cube()
+
+    set_key_window((10, 20), keep_edges=True)
+    for frame in (1, 5, 25, 40):
+        insert_key(cube, "location", float(frame), frame, index=0)
+    assert_eq(close_key_window(), 2)
+    reset_key_gate()
+
+    from scripts.utils.animation import get_fcurves
+    frames = sorted(round(kp.co[0]) for kp in get_fcurves(cube)[0].keyframe_points)
+    assert_eq(frames, [5, 25])
+    bpy.context.scene.frame_set(15)
+    assert_near(cube.location.x, 15.0, tolerance=0.01,
+                msg="The window should interpolate between the edge keys")
+
+
+@test
+def test_deferred_keys_flush_later():
+    """Deferred keys are written by flush_pending_keys."""
+    reset_scene()
+    reset_key_gate()
+    cube = _cube()
+
+    set_key_window((10, 20), defer=True)
+    insert_key(cube, "location", (1.0, 0, 0), 15)
+    insert_key(cube, "location", (7.0, 0, 0), 40)
+    assert_eq(pending_key_count(), 1)
+
+    remaining = flush_pending_keys()
+    assert_eq(remaining, 0)
+
+    bpy.context.scene.frame_set(40)
+    assert_near(cube.location.x, 7.0, tolerance=0.01)
+    reset_key_gate()
+
+
+@test
+def test_deferred_keys_last_write_wins():
+    """Two deferred writes to the same channel and frame keep the last value."""
+    reset_scene()
+    reset_key_gate()
+    cube = _cube()
+
+    set_key_window((1, 5), defer=True)
+    insert_key(cube, "location", 2.0, 60, index=0)
+    insert_key(cube, "location", 3.0, 60, index=0)
+    assert_eq(pending_key_count(), 1)
+
+    flush_pending_keys()
+    bpy.context.scene.frame_set(60)
+    assert_near(cube.location.x, 3.0, tolerance=0.01)
+    reset_key_gate()
+
+
+@test
+def test_flush_fills_nearest_frames_first():
+    """A budget-limited flush writes keys closest to the centre first."""
+    reset_scene()
+    reset_key_gate()
+    cube = _cube()
+
+    set_key_window((100, 100), defer=True)
+    for frame in (10, 300, 120, 90):
+        insert_key(cube, "location", float(frame), frame, index=0)
+
+    # A zero budget still writes one key per call
+    flush_pending_keys(time_budget=0.0)
+    flush_pending_keys(time_budget=0.0)
+    assert_eq(pending_key_count(), 2)
+
+    fcurve_frames = set()
+    bpy.context.scene.frame_set(90)
+    fcurve_frames.add(round(cube.location.x))
+    bpy.context.scene.frame_set(120)
+    fcurve_frames.add(round(cube.location.x))
+    assert_eq(fcurve_frames, {90, 120}, "Frames nearest 100 should be keyed first")
+    reset_key_gate()
+
+
+@test
+def test_when_keys_flushed_runs_after_drain():
+    """Callbacks registered with when_keys_flushed fire once the queue is empty."""
+    reset_scene()
+    reset_key_gate()
+    cube = _cube()
+    calls = []
+
+    when_keys_flushed(lambda: calls.append("idle"))
+    assert_eq(calls, [], "Nothing pending — callback should not be registered")
+
+    set_key_window((1, 1), defer=True)
+    insert_key(cube, "location", 1.0, 50, index=0)
+    when_keys_flushed(lambda: calls.append("flushed"))
+    assert_eq(calls, [])
+
+    flush_pending_keys()
+    assert_eq(calls, ["flushed"])
+    reset_key_gate()
+
+
+# ──────────────────────────────────────────────
+# Key step
+# ──────────────────────────────────────────────
+
+def _keyed_frames(obj):
+    """Sorted keyframe frames on an object's first F-Curve."""
+    from scripts.utils.animation import get_fcurves
+    fcurves = get_fcurves(obj)
+    return sorted(round(kp.co[0]) for kp in fcurves[0].keyframe_points)
+
+
+@test
+def test_key_step_thins_runs_but_keeps_ends():
+    """A per-frame run keeps its first key, grid keys and its last key."""
+    reset_scene()
+    reset_key_gate()
+    cube = _cube()
+
+    set_key_step(5, origin=1)
+    for frame in range(1, 14):
+        insert_key(cube, "location", float(frame), frame, index=0)
+    close_key_runs()
+    reset_key_gate()
+
+    assert_eq(_keyed_frames(cube), [1, 6, 11, 13])
+    bpy.context.scene.frame_set(13)
+    assert_near(cube.location.x, 13.0, tolerance=0.01, msg="Run end must be exact")
+
+
+@test
+def test_key_step_keeps_isolated_keys():
+    """Keys that are not part of a per-frame run are never thinned."""
+    reset_scene()
+    reset_key_gate()
+    cube = _cube()
+
+    set_key_step(5, origin=1)
+    for frame in (2, 9, 17):
+        insert_key(cube, "location", float(frame), frame, index=0)
+    close_key_runs()
+    reset_key_gate()
+
+    assert_eq(_keyed_frames(cube), [2, 9, 17])
@@ -0,0 +1,110 @@
+"""
+Tests for scripts/utils/lottie.py — exporting a flat scene as a Lottie animation.
+"""
+import json
+import os
+import tempfile
+
+import bpy
+import numpy as np
+from tests.run_tests import test, assert_eq, assert_true, assert_near
+
+from scripts.utils.scene import reset_scene, setup_ortho_camera
+from scripts.utils.keying import reset_key_gate, insert_key
+from scripts.utils.animation import get_fcurves
+from scripts.utils.materials import create_emission_material, assign_material
+from scripts.utils.primitives import create_primitive
+from scripts.utils.lottie import thin_keys, animated, export_lottie
+
+
+# ──────────────────────────────────────────────
+# Key thinning
+# ──────────────────────────────────────────────
+
+@test
+def test_thin_keys_keeps_only_corners():
+    """A piecewise-linear path keeps its ends and corners, nothing in between."""
+    values = np.concatenate([np.linspace(0, 10, 11), np.full(10, 10.0), np.linspace(9, 0, 10)])
+    assert_eq(thin_keys(values, 0.01), [0, 10, 20, 30])
+    assert_eq(thin_keys([1.0, 2.0], 0.01), [0, 1])
+
+
+@test
+def test_thin_keys_respects_tolerance_in_every_dimension():
+    """Leaving a key out never moves any dimension by more than the tolerance."""
+    frames = np.arange(120)
+    values = np.column_stack([np.sin(frames / 10) * 50, frames * 0.5])
+    keep = thin_keys(values, 0.5)
+    assert_true(len(keep) < len(frames) // 2)
+    for d in range(2):
+        rebuilt = np.interp(frames, keep, values[keep, d])
+        assert_true(np.abs(rebuilt - values[:, d]).max() <= 0.5)
+
+
+@test
+def test_animated_static_channel_is_a_plain_value():
+    """A channel that never moves is written without keys."""
+    assert_eq(animated(np.arange(5), np.full(5, 30.0), 0.1, scalar=True), {"a": 0, "k": 30.0})
+    moving = animated(np.arange(5), np.arange(5.0), 0.1, scalar=True)
+    assert_eq([key["t"] for key in moving["k"]], [0, 4])
+
+
+# ──────────────────────────────────────────────
+# Export
+# ──────────────────────────────────────────────
+
+@test
+def test_export_lottie_writes_thinned_shape_layer():
+    """A keyed emission plane becomes a shape layer under the camera with two position keys."""
+    reset_scene()
+    reset_key_gate()
+    scene = bpy.context.scene
+    scene.frame_start, scene.frame_end = 1, 25
+    scene.render.resolution_x, scene.render.resolution_y = 200, 100
+    scene.render.resolution_percentage = 100
+    setup_ortho_camera(ortho_scale=10)
+    obj = create_primitive("Glide", "plane", 1.0)
+    assign_material(obj, create_emission_material("GlideMat", color=(1.0, 1.0, 1.0, 1.0), strength=1.0))
+    insert_key(obj, "location", 0.0, 1, index=0)
+    insert_key(obj, "location", 2.0, 25, index=0)
+    for fcurve in get_fcurves(obj):
+        for kp in fcurve.keyframe_points:
+            kp.interpolation = 'LINEAR'
+
+    path = os.path.join(tempfile.mkdtemp(), "glide.json")
+    assert_eq(export_lottie(path), 1)
+    with open(path) as f:
+        animation = json.load(f)
+    assert_eq((animation["w"], animation["h"], animation["op"]), (200, 100, 25))
+
+    camera, layer, background = animation["layers"]
+    assert_eq(camera["ty"], 3)
+    assert_eq((layer["ty"], layer["parent"], layer["nm"]), (4, 1, "Glide"))
+    assert_eq(background["ty"], 1)
+    keys = layer["ks"]["p"]["k"]
+    assert_eq([key["t"] for key in keys], [0, 24])
+    # 10 units across 200 pixels
+    assert_near(keys[-1]["s"][0], 40.0)
+    assert_eq(layer["shapes"][0]["it"][-2]["c"]["k"], [1.0, 1.0, 1.0, 1.0])
+
+
+@test
+def test_export_lottie_follows_keyed_visibility():
+    """A shape left hidden at the end of the film is still exported, up to its last visible frame."""
+    reset_scene()
+    reset_key_gate()
+    scene = bpy.context.scene
+    scene.frame_start, scene.frame_end = 1, 10
+    setup_ortho_camera(ortho_scale=10)
+    obj = create_primitive("Leaver", "plane", 1.0)
+    assign_material(obj, create_emission_material("LeaverMat", color=(1.0, 1.0, 1.0, 1.0), strength=1.0))
+    for frame, hidden in ((5, False), (6, True)):
+        obj.hide_render = hidden
+        obj.keyframe_insert(data_path="hide_render", frame=frame)
+
+    path = os.path.join(tempfile.mkdtemp(), "leaver.json")
+    assert_eq(export_lottie(path), 1)
+    with open(path) as f:
+        layer = json.load(f)["layers"][1]
+    assert_eq((layer["ip"], layer["op"]), (0, 5))
+
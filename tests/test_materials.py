@@ -2,15 +2,18 @@
 Tests for scripts/utils/materials.py — material creation helpers.
 """
 import bpy
-from tests.run_tests import test, assert_eq, assert_true, assert_near, assert_gt
+from tests.run_tests import test, assert_eq, assert_true, assert_false, assert_near, assert_gt
 
 from scripts.utils.scene import reset_scene
 from scripts.utils.materials import (
     create_principled_material,
     create_glass_material,
     create_emission_material,
+    create_attribute_emission_material,
+    set_emission_attributes,
     assign_material,
 )
+from scripts.utils.keying import reset_key_gate, insert_key
 
 
 # ──────────────────────────────────────────────
@@ -114,6 +117,50 @@ def test_emission_material():
     assert_near(emission.inputs["Strength"].default_value, 10.0)
 
 
+@test
+def test_attribute_emission_material_reads_object_properties():
+    """Colour and strength come from per-object Attribute nodes."""
+    reset_scene()
+    mat = create_attribute_emission_material("Shared")
+
+    attrs = {n.attribute_name: n for n in mat.node_tree.nodes if n.type == 'ATTRIBUTE'}
+    assert_eq(set(attrs), {"emission_color", "emission_strength"})
+    for node in attrs.values():
+        assert_eq(node.attribute_type, 'OBJECT')
+    emission = [n for n in mat.node_tree.nodes if n.type == 'EMISSION'][0]
+    assert_true(emission.inputs["Color"].is_linked)
+    assert_true(emission.inputs["Strength"].is_linked)
+
+
+@test
+def test_attribute_emission_material_fixed_strength():
+    """With a strength given, only colour is per object."""
+    reset_scene()
+    mat = create_attribute_emission_material("Dust", strength=0.5)
+    emission = [n for n in mat.node_tree.nodes if n.type == 'EMISSION'][0]
+    assert_false(emission.inputs["Strength"].is_linked)
+    assert_near(emission.inputs["Strength"].default_value, 0.5)
+
+
+@test
+def test_emission_attributes_are_keyable():
+    """Objects sharing a material key their own strength property."""
+    reset_scene()
+    reset_key_gate()
+    mat = create_attribute_emission_material("Shared")
+    bpy.ops.mesh.primitive_plane_add()
+    plane = bpy.context.active_object
+    set_emission_attributes(plane, color=(0.2, 0.2, 0.2, 1), strength=0.4)
+    assign_material(plane, mat)
+
+    insert_key(plane, '["emission_strength"]', 0.0, 1)
+    insert_key(plane, '["emission_strength"]', 1.0, 11)
+    bpy.context.scene.frame_set(11)
+    assert_near(plane["emission_strength"], 1.0, tolerance=0.01)
+    assert_near(plane["emission_color"][0], 0.2, tolerance=0.01)
+    assert_eq(len(bpy.data.materials), 1)
+
+
 @test
 def test_emission_material_has_output():
     """create_emission_material should connect emission to material output."""
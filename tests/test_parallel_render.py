@@ -0,0 +1,57 @@
+"""
+Tests for scripts/utils/parallel_render.py — splitting renders across workers.
+"""
+import os
+import tempfile
+from tests.run_tests import test, assert_eq, assert_true
+
+from scripts.utils.parallel_render import (
+    split_frames,
+    missing_frames,
+    frame_path,
+    frame_runs,
+    worker_threads,
+    worker_command,
+)
+
+
+# ──────────────────────────────────────────────
+# Planning
+# ──────────────────────────────────────────────
+
+@test
+def test_split_frames_covers_the_range_in_even_chunks():
+    """Chunks are contiguous, cover every frame once and differ by at most one frame."""
+    chunks = split_frames(1, 4140, 4)
+    assert_eq(len(chunks), 16)
+    assert_eq(chunks[0][0], 1)
+    assert_eq(chunks[-1][1], 4140)
+    for (_, end), (start, _) in zip(chunks, chunks[1:]):
+        assert_eq(start, end + 1)
+    sizes = {end - start + 1 for start, end in chunks}
+    assert_true(max(sizes) - min(sizes) <= 1)
+    # Never more chunks than frames
+    assert_eq(split_frames(10, 12, 8), [(10, 10), (11, 11), (12, 12)])
+
+
+@test
+def test_missing_frames_and_runs():
+    """Absent and empty frame files count as missing; runs regroup them."""
+    frames_dir = tempfile.mkdtemp()
+    for frame, data in ((1, b"png"), (2, b""), (4, b"png")):
+        with open(frame_path(frames_dir, frame), "wb") as f:
+            f.write(data)
+    assert_eq(missing_frames(frames_dir, 1, 6), [2, 3, 5, 6])
+    assert_eq(frame_runs([6, 2, 3, 5]), [(2, 3), (5, 6)])
+
+
+@test
+def test_worker_command_renders_one_chunk():
+    """Workers get the chunk's range before -a and a share of the cores."""
+    command = worker_command("/tmp/scene.blend", "/tmp/frames", (101, 200), 4, blender="blender")
+    assert_eq(command[:3], ["blender", "--background", "/tmp/scene.blend"])
+    assert_eq(command[-5:], ["-s", "101", "-e", "200", "-a"])
+    assert_eq(command[command.index("--threads") + 1], "4")
+    assert_eq(command[command.index("--render-output") + 1], os.path.join("/tmp/frames", "####"))
+    assert_eq(worker_threads(3, cores=32), 10)
+    assert_eq(worker_threads(64, cores=32), 1)
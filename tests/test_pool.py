@@ -0,0 +1,73 @@
+"""
+Tests for scripts/utils/pool.py — reusable objects for spawned effects.
+"""
+import bpy
+from tests.run_tests import test, assert_eq, assert_true, assert_near
+
+from scripts.utils.scene import reset_scene
+from scripts.utils.keying import reset_key_gate
+from scripts.utils.materials import set_emission_attributes
+from scripts.utils.primitives import create_primitive
+from scripts.utils.pool import create_pool, spawn
+
+
+def _square_pool():
+    def make(i):
+        obj = create_primitive(f"Sq_{i}", "plane", 0.2)
+        set_emission_attributes(obj, strength=0.0)
+        return obj
+    return create_pool(make)
+
+
+# ──────────────────────────────────────────────
+# Pools
+# ──────────────────────────────────────────────
+
+@test
+def test_pool_size_is_peak_concurrency():
+    """Spawning every 10 frames with 40-frame lives needs 5 objects, not one per spawn."""
+    reset_scene()
+    reset_key_gate()
+    pool = _square_pool()
+    for f in range(10, 310, 10):
+        spawn(pool, f, 40, (f * 0.1, 0, 0))
+    assert_eq(pool["spawns"], 30)
+    assert_eq(len(pool["objects"]), 5)
+
+
+@test
+def test_spawn_keys_one_life():
+    """A spawned object appears at its position and is hidden again after its life."""
+    reset_scene()
+    reset_key_gate()
+    pool = _square_pool()
+    obj = spawn(pool, 20, 10, (3, 1, 0), scale=(1.0, 0.5), strength=(2.0, 0.0))
+    scene = bpy.context.scene
+
+    scene.frame_set(20)
+    assert_near(obj.scale.x, 1.0)
+    assert_near(obj.location.x, 3.0)
+    assert_near(obj["emission_strength"], 2.0)
+    assert_eq(obj.hide_render, False)
+    scene.frame_set(19)
+    assert_near(obj.scale.x, 0.0)
+    assert_eq(obj.hide_render, True)
+    scene.frame_set(30)
+    assert_eq(obj.hide_render, False)
+    scene.frame_set(31)
+    assert_near(obj.scale.x, 0.0)
+    assert_eq(obj.hide_render, True)
+
+
+@test
+def test_reused_object_holds_position_while_alive():
+    """A reused object does not slide towards its next spot during its current life."""
+    reset_scene()
+    reset_key_gate()
+    pool = _square_pool()
+    first = spawn(pool, 10, 10, (0, 0, 0))
+    second = spawn(pool, 30, 10, (5, 0, 0))
+    assert_true(first == second, "Object should be reused once free")
+
+    bpy.context.scene.frame_set(20)
+    assert_near(first.location.x, 0.0)
@@ -0,0 +1,79 @@
+"""
+Tests for scripts/utils/primitives.py — operator-free object creation.
+"""
+import bpy
+from tests.run_tests import test, assert_eq, assert_true, assert_false, assert_near
+
+from scripts.utils.scene import reset_scene
+from scripts.utils.materials import create_emission_material, assign_material
+from scripts.utils.primitives import (
+    primitive_mesh,
+    new_object,
+    create_primitive,
+    link_objects,
+)
+
+
+# ──────────────────────────────────────────────
+# Mesh cache
+# ──────────────────────────────────────────────
+
+@test
+def test_primitive_mesh_is_cached_per_shape_and_size():
+    """The same shape and size returns the same mesh; a new size builds a new one."""
+    reset_scene()
+    plane = primitive_mesh("plane", 0.6)
+    assert_true(primitive_mesh("plane", 0.6) == plane)
+    assert_false(primitive_mesh("plane", 0.3) == plane)
+    assert_eq(len(plane.vertices), 4)
+    assert_eq(len(primitive_mesh("equilateral_tri", 0.55).vertices), 3)
+
+
+@test
+def test_primitive_mesh_survives_reset():
+    """A cached mesh removed by reset_scene() is rebuilt on next use."""
+    reset_scene()
+    primitive_mesh("plane", 1.0)
+    reset_scene()
+    mesh = primitive_mesh("plane", 1.0)
+    assert_eq(len(mesh.vertices), 4)
+
+
+# ──────────────────────────────────────────────
+# Objects
+# ──────────────────────────────────────────────
+
+@test
+def test_create_primitive_shares_mesh_not_material():
+    """Instances share one mesh but each keeps its own material."""
+    reset_scene()
+    a = create_primitive("A", "plane", 0.6, location=(1, 2, 0))
+    b = create_primitive("B", "plane", 0.6)
+    assign_material(a, create_emission_material("MatA"))
+    assign_material(b, create_emission_material("MatB"))
+
+    assert_true(a.data == b.data, "Mesh should be shared")
+    assert_eq(a.active_material.name, "MatA")
+    assert_eq(b.active_material.name, "MatB")
+    assert_near(a.location.y, 2.0)
+    assert_true(a.name in bpy.context.scene.objects)
+
+
+@test
+def test_link_objects_links_a_batch():
+    """Objects created with link=False join the scene in one call."""
+    reset_scene()
+    objs = [create_primitive(f"Tri_{i}", "equilateral_tri", 0.5, link=False) for i in range(20)]
+    assert_eq(len(bpy.context.scene.objects), 0)
+    link_objects(objs)
+    assert_eq(len(bpy.context.scene.objects), 20)
+    assert_eq(len(bpy.data.meshes), 1)
+
+
+@test
+def test_new_object_empty():
+    """new_object without data makes an empty."""
+    reset_scene()
+    empty = new_object("Target", None, (0, 0, 3))
+    assert_eq(empty.type, 'EMPTY')
+    assert_near(empty.location.z, 3.0)
@@ -0,0 +1,83 @@
+"""
+Tests for scripts/utils/raster.py — the NumPy flat rasterizer.
+"""
+import numpy as np
+from tests.run_tests import test, assert_eq, assert_true, assert_near
+
+from scripts.utils.raster import rasterize, render_frame, to_srgb8
+
+
+def _square(x, y, size):
+    """A pixel-space square as two triangles sharing a diagonal."""
+    a, b, c, d = (x, y), (x + size, y), (x + size, y + size), (x, y + size)
+    return [[a, b, c], [a, c, d]]
+
+
+def _samples(items, camera=(0.0, 0.0, 4.0), background=(0.0, 0.0, 0.0)):
+    """A one-frame flat samples dict drawing unit squares at (x, y, emission)."""
+    return {
+        "frames": np.array([1]),
+        "resolution": np.array([8, 8]),
+        "background": np.array(background, np.float32),
+        "camera": np.array([camera], np.float32),
+        "triangles": np.array(_square(-0.5, -0.5, 1.0), np.float32),
+        "shape_start": np.array([0]),
+        "shape_count": np.array([2]),
+        "frame_offsets": np.array([0, len(items)]),
+        "item_shape": np.zeros(len(items), np.int32),
+        "item_matrix": np.array([[[1, 0, x], [0, 1, y]] for x, y, _ in items], np.float32).reshape(-1, 2, 3),
+        "item_color": np.array([[e, e, e] for _, _, e in items], np.float32).reshape(-1, 3),
+    }
+
+
+# ──────────────────────────────────────────────
+# Coverage
+# ──────────────────────────────────────────────
+
+@test
+def test_rasterize_covers_each_pixel_once():
+    """A square split into two triangles covers its area once, diagonal included."""
+    image = rasterize(np.array(_square(2, 3, 10), float), np.ones((2, 3)), 20, 20)
+    assert_eq(float(image[..., 0].sum()), 100.0)
+    assert_eq(float(image.max()), 1.0)
+    assert_eq(float(image[3:13, 2:12, 0].min()), 1.0)
+
+
+@test
+def test_rasterize_ignores_winding_and_clips():
+    """Either winding draws the same; shapes off the image are clipped."""
+    clockwise = np.array([[[0, 0], [0, 6], [6, 0]]], float)
+    counter = np.array([[[0, 0], [6, 0], [0, 6]]], float)
+    assert_eq(rasterize(clockwise, np.ones((1, 3)), 8, 8).tolist(),
+              rasterize(counter, np.ones((1, 3)), 8, 8).tolist())
+    image = rasterize(np.array(_square(-5, -5, 7), float), np.ones((2, 3)), 8, 8)
+    assert_eq(float(image[..., 0].sum()), 4.0)
+
+
+# ──────────────────────────────────────────────
+# Frames
+# ──────────────────────────────────────────────
+
+@test
+def test_render_frame_adds_emission_and_clamps():
+    """Overlapping emission adds up and clamps to white."""
+    # 8 px across 4 units: a unit square is 2×2 px
+    samples = _samples([(0.0, 0.0, 0.6), (0.0, 0.0, 0.6), (1.0, 1.0, 0.2)])
+    frame = render_frame(samples, 0, 8, 8)
+    assert_eq(frame.shape, (8, 8, 3))
+    assert_eq(int(frame[3:5, 3:5].min()), 255)
+    assert_eq(int(frame[1:3, 5:7, 0].max()), int(to_srgb8(np.array([0.2]))[0]))
+    assert_eq(int(frame[0, 0, 0]), 0)
+
+
+@test
+def test_render_frame_supersampling_averages():
+    """A half-covered pixel comes out half as bright (in linear) with supersampling."""
+    # Shifted a quarter unit (half a pixel): its left and right columns are half covered
+    samples = _samples([(0.25, 0.0, 1.0)])
+    half = int(to_srgb8(np.array([0.5]))[0])
+    frame = render_frame(samples, 0, 8, 8, supersample=2)
+    assert_eq(int(frame[4, 4, 0]), 255)
+    assert_eq((int(frame[4, 3, 0]), int(frame[4, 5, 0])), (half, half))
+    assert_true(0 < half < 255)
+    assert_near(float(frame[..., 0].astype(float).sum()), 2 * 255 + 4 * half)
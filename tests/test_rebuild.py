@@ -0,0 +1,170 @@
+"""
+Tests for scripts/utils/rebuild.py — config dependency tracking and partial rebuilds.
+"""
+import bpy
+import types
+from tests.run_tests import test, assert_eq, assert_true, assert_false, assert_near
+
+from scripts.utils.scene import reset_scene
+from scripts.utils.keying import reset_key_gate, insert_key
+from scripts.utils.rebuild import (
+    snapshot_config,
+    changed_config_names,
+    config_names_read,
+    plan_rebuild,
+    run_stage,
+    stage_mode,
+    finish_rebuild,
+)
+from scripts.animations.finding_the_one import config
+from scripts.animations.finding_the_one.valley import animate_valley
+from scripts.animations.finding_the_one.systems import animate_background_triangles
+
+CONFIG_NAME = config.__name__
+
+
+# ──────────────────────────────────────────────
+# Config snapshots
+# ──────────────────────────────────────────────
+
+@test
+def test_snapshot_config_copies_constants():
+    """Snapshots hold UPPER_CASE names only, as independent copies."""
+    module = types.SimpleNamespace(SPEED=2, CURVE=[(1, 0.5)], helper=len)
+    snapshot = snapshot_config(module)
+    assert_eq(set(snapshot), {"SPEED", "CURVE"})
+
+    module.CURVE.append((9, 1.0))
+    assert_eq(snapshot["CURVE"], [(1, 0.5)], "Snapshot should not alias the module")
+
+
+@test
+def test_changed_config_names():
+    """Changed, added and removed names are all reported."""
+    old = {"A": 1, "B": 2, "C": 3}
+    new = {"A": 1, "B": 5, "D": 4}
+    assert_eq(changed_config_names(old, new), {"B", "C", "D"})
+
+
+# ──────────────────────────────────────────────
+# Static config reads
+# ──────────────────────────────────────────────
+
+@test
+def test_config_names_read_direct():
+    """A stage's own config imports are found."""
+    reads = config_names_read(animate_valley, CONFIG_NAME)
+    assert_true("VALLEY_START" in reads)
+    assert_true("VALLEY_END" in reads)
+    assert_false("ACT4_END" in reads)
+
+
+@test
+def test_config_names_read_follows_calls():
+    """Names read by project functions a stage calls count as the stage's reads."""
+    # apply_pulse's default period comes from config, via helpers.py
+    reads = config_names_read(animate_valley, CONFIG_NAME)
+    assert_true("PULSE_BASE_PERIOD" in reads)
+
+    reads = config_names_read(animate_background_triangles, CONFIG_NAME)
+    assert_true("BG_TRI_EMISSION" in reads)
+    assert_false("ACT3_START" in reads)
+
+
+# ──────────────────────────────────────────────
+# Planning and partial runs
+# ──────────────────────────────────────────────
+
+def _key_x(obj, value, frame):
+    insert_key(obj, "location", value, frame, index=0)
+
+
+def _stage_a(obj, offset):
+    for f in range(1, 11):
+        _key_x(obj, float(f) + offset, f)
+    return offset
+
+
+def _stage_b(obj):
+    _key_x(obj, 100.0, 10)
+
+
+_STAGES = [
+    ("a", _stage_a, (), False),
+    ("b", _stage_b, ("a",), False),
+]
+
+
+def _options(memo, partial):
+    return {"tier": "final", "memo": memo, "partial": partial}
+
+
+@test
+def test_plan_without_memo_is_full():
+    """Outside the watcher every build is a full build."""
+    reset_key_gate()
+    plan = plan_rebuild(_STAGES, config, _options(None, False))
+    assert_true(plan["full"])
+    assert_eq(stage_mode(plan, "a"), "write")
+    finish_rebuild(plan)
+
+
+@test
+def test_partial_rebuild_updates_only_changed_keys():
+    """A re-run stage writes its new keys; later stages keep their overrides."""
+    reset_scene()
+    reset_key_gate()
+    bpy.ops.mesh.primitive_cube_add()
+    cube = bpy.context.active_object
+    memo = {}
+
+    plan = plan_rebuild(_STAGES, config, _options(memo, False))
+    run_stage(plan, "a", _stage_a, cube, 0.0)
+    run_stage(plan, "b", _stage_b, cube)
+    finish_rebuild(plan)
+
+    # Same config, partial allowed — force stage "a" dirty by hand
+    plan = plan_rebuild(_STAGES, config, _options(memo, True))
+    assert_false(plan["full"])
+    plan["dirty"].add("a")
+    run_stage(plan, "a", _stage_a, cube, 5.0)
+    assert_eq(stage_mode(plan, "b"), "capture", "Changed result should dirty stage b")
+    run_stage(plan, "b", _stage_b, cube)
+    finish_rebuild(plan)
+    reset_key_gate()
+
+    bpy.context.scene.frame_set(3)
+    assert_near(cube.location.x, 8.0, tolerance=0.01)
+    bpy.context.scene.frame_set(10)
+    assert_near(cube.location.x, 100.0, tolerance=0.01, msg="Stage b still wins frame 10")
+
+
+@test
+def test_frame_window_skips_creating_stages_outside_it():
+    """A creating stage whose span misses the frame window is not run."""
+    reset_key_gate()
+    stages = [("a", _stage_a, (), False), ("trails", _stage_b, (), True)]
+    options = dict(_options(None, False), frames=(1, 10))
+    plan = plan_rebuild(stages, config, options, spans={"a": (50, 60), "trails": (50, 60)})
+    assert_eq(stage_mode(plan, "a"), "write", "Non-creating stages always run")
+    assert_eq(stage_mode(plan, "trails"), "outside")
+    assert_eq(run_stage(plan, "trails", _stage_b, None), None)
+    assert_true("skipped trails" in finish_rebuild(plan))
+
+
+@test
+def test_render_settings_change_forces_full_rebuild():
+    """A new render profile or engine needs setup_render(), which only full builds run."""
+    reset_key_gate()
+    memo = {}
+    plan = plan_rebuild(_STAGES, config, dict(_options(memo, False), profile="final", engine=None))
+    finish_rebuild(plan)
+
+    for changed in ({"profile": "preview", "engine": None}, {"profile": "final", "engine": "workbench"}):
+        plan = plan_rebuild(_STAGES, config, dict(_options(memo, True), **changed))
+        assert_true(plan["full"], f"{changed} should force a full rebuild")
+        assert_true("render" in plan["reason"])
+        finish_rebuild(plan)
+        plan = plan_rebuild(_STAGES, config, dict(_options(memo, False), profile="final", engine=None))
+        finish_rebuild(plan)
+    reset_key_gate()
@@ -0,0 +1,78 @@
+"""
+Tests for scripts/utils/render_device.py — per-host render device setup.
+"""
+import json
+import os
+import tempfile
+
+import bpy
+from tests.run_tests import test, assert_eq, assert_true, assert_near
+
+from scripts.utils.scene import reset_scene
+from scripts.utils.render_device import (
+    cgroup_cpu_limit, allotted_cores, load_device_overrides, configure_render_device,
+)
+
+
+# ──────────────────────────────────────────────
+# Cores
+# ──────────────────────────────────────────────
+
+@test
+def test_cgroup_cpu_limit_reads_v2_and_v1_quotas():
+    """A quota rounds up to whole cores; no quota means no limit."""
+    root = tempfile.mkdtemp()
+    assert_eq(cgroup_cpu_limit(root), None)
+
+    with open(os.path.join(root, "cpu.max"), "w") as f:
+        f.write("250000 100000\n")
+    assert_eq(cgroup_cpu_limit(root), 3)
+    with open(os.path.join(root, "cpu.max"), "w") as f:
+        f.write("max 100000\n")
+    assert_eq(cgroup_cpu_limit(root), None)
+
+    os.remove(os.path.join(root, "cpu.max"))
+    os.makedirs(os.path.join(root, "cpu"))
+    with open(os.path.join(root, "cpu", "cpu.cfs_quota_us"), "w") as f:
+        f.write("150000")
+    with open(os.path.join(root, "cpu", "cpu.cfs_period_us"), "w") as f:
+        f.write("100000")
+    assert_eq(cgroup_cpu_limit(root), 2)
+
+
+@test
+def test_allotted_cores_within_machine():
+    """Allotted cores are at least one and never more than the machine has."""
+    cores = allotted_cores()
+    assert_true(1 <= cores <= (os.cpu_count() or 1))
+
+
+# ──────────────────────────────────────────────
+# Overrides and configuration
+# ──────────────────────────────────────────────
+
+@test
+def test_load_device_overrides_drops_unknown_keys():
+    """Known keys are kept with the file they came from; unknown ones are dropped."""
+    path = os.path.join(tempfile.mkdtemp(), "render_device.json")
+    assert_eq(load_device_overrides(path), {})
+    with open(path, "w") as f:
+        json.dump({"device": "CPU", "threads": 6, "colour": "blue"}, f)
+    assert_eq(load_device_overrides(path), {"device": "CPU", "threads": 6, "source": path})
+
+
+@test
+def test_configure_render_device_cpu():
+    """A CPU configuration fixes the thread count and sets Cycles' CPU options."""
+    reset_scene()
+    scene = bpy.context.scene
+    config = configure_render_device(scene, {"device": "CPU", "threads": 3, "adaptive_threshold": 0.05})
+
+    assert_eq(config["device"], "CPU")
+    assert_eq(scene.render.threads_mode, 'FIXED')
+    assert_eq(scene.render.threads, 3)
+    assert_true(scene.render.use_persistent_data)
+    assert_eq(scene.cycles.device, 'CPU')
+    assert_true(scene.cycles.use_adaptive_sampling)
+    assert_near(scene.cycles.adaptive_threshold, 0.05)
+    assert_eq(scene.cycles.tile_size, config["tile_size"])
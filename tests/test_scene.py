@@ -14,8 +14,11 @@ from scripts.utils.scene import (
     setup_area_light,
     setup_world_color,
     setup_render,
+    get_render_profile,
+    h264_args,
     mathutils_vector,
 )
+from scripts.utils.materials import create_emission_material, create_principled_material
 
 
 # ──────────────────────────────────────────────
@@ -40,8 +43,8 @@ def test_reset_scene_clears_objects():
 def test_reset_scene_clears_materials():
     """reset_scene should remove all materials."""
     reset_scene()
-    bpy.data.materials.new("TestMat1")
-    bpy.data.materials.new("TestMat2")
+    create_emission_material("TestMat1")
+    create_principled_material("TestMat2")
     assert_eq(len(bpy.data.materials), 2)
 
     reset_scene()
@@ -52,7 +55,7 @@ def test_reset_scene_clears_materials():
 def test_reset_scene_clears_worlds():
     """reset_scene should remove all worlds."""
     reset_scene()
-    bpy.data.worlds.new("TestWorld")
+    setup_world_color()
     assert_gt(len(bpy.data.worlds), 0)
 
     reset_scene()
@@ -70,6 +73,35 @@ def test_reset_scene_resets_frame():
     assert_eq(bpy.context.scene.frame_current, 1, "Frame should be reset to 1")
 
 
+@test
+def test_reset_scene_keeps_hand_made_objects():
+    """Objects linked outside the build collection are left alone."""
+    reset_scene()
+    hand_made = bpy.data.objects.new("HandMade", None)
+    bpy.context.scene.collection.objects.link(hand_made)
+    bpy.ops.mesh.primitive_cube_add()
+    assert_true(bpy.context.active_object.users_collection[0].name.startswith("ScriptBuild"))
+
+    reset_scene()
+    assert_eq([obj.name for obj in bpy.data.objects], ["HandMade"])
+    bpy.data.objects.remove(hand_made)
+
+
+@test
+def test_reset_scene_removes_build_actions():
+    """Actions animating the build go with it."""
+    reset_scene()
+    bpy.ops.mesh.primitive_cube_add()
+    cube = bpy.context.active_object
+    cube.keyframe_insert("location", frame=1)
+    mat = create_emission_material("Keyed")
+    mat.node_tree.nodes["Emission"].inputs["Strength"].keyframe_insert("default_value", frame=1)
+    assert_eq(len(bpy.data.actions), 2)
+
+    reset_scene()
+    assert_eq(len(bpy.data.actions), 0)
+
+
 @test
 def test_clear_scene_is_alias():
     """clear_scene should behave the same as reset_scene."""
@@ -257,6 +289,27 @@ def test_setup_render_output_path_trailing_slash():
                 "Output path should end with /")
 
 
+@test
+def test_setup_render_preview_profile():
+    """A profile scales the resolution, steps frames and keeps the video's length."""
+    reset_scene()
+    setup_render(fps=30, resolution_percentage=50, output_path='./output/test/',
+                 file_format='PNG', profile='preview')
+
+    scene = bpy.context.scene
+    assert_eq(scene.render.resolution_percentage, 25)
+    assert_eq(scene.frame_step, 2)
+    assert_near(scene.render.fps / scene.render.fps_base, 15.0)
+    assert_eq(scene.render.image_settings.color_mode, 'RGB')
+    assert_eq(get_render_profile()["name"], 'preview')
+    assert_true('veryfast' in h264_args())
+
+    setup_render(output_path='./output/test/', file_format='PNG', profile='final')
+    assert_eq(scene.frame_step, 1)
+    assert_eq(scene.render.image_settings.color_mode, 'RGBA')
+    assert_eq(h264_args()[h264_args().index('-crf') + 1], '18')
+
+
 # ──────────────────────────────────────────────
 # mathutils_vector
 # ──────────────────────────────────────────────
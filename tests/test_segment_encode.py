@@ -0,0 +1,59 @@
+"""
+Tests for scripts/utils/segment_encode.py — per-segment encoding and its cache.
+"""
+import tempfile
+from tests.run_tests import test, assert_eq, assert_true
+
+from scripts.utils.parallel_render import frame_path
+from scripts.utils.segment_encode import segment_ranges, segment_key, segment_command
+
+
+CUTS = [("prologue", 1), ("act1", 330), ("act2", 1670)]
+
+
+# ──────────────────────────────────────────────
+# Planning
+# ──────────────────────────────────────────────
+
+@test
+def test_segment_ranges_run_to_the_next_cut():
+    """Each segment ends the frame before the next cut; the last ends with the range."""
+    assert_eq(segment_ranges(CUTS, 1, 2000),
+              [("prologue", 1, 329), ("act1", 330, 1669), ("act2", 1670, 2000)])
+
+
+@test
+def test_segment_ranges_clip_to_a_window():
+    """Segments outside a --frames window are dropped, the rest clipped."""
+    assert_eq(segment_ranges(CUTS, 300, 400), [("prologue", 300, 329), ("act1", 330, 400)])
+    assert_eq(segment_ranges(CUTS, 1700, 1800), [("act2", 1700, 1800)])
+
+
+@test
+def test_segment_command_encodes_only_its_frames():
+    """A segment's ffmpeg command starts at its first frame and stops after its last."""
+    cmd = segment_command("/tmp/frames", 330, 1669, 30, "/tmp/act1.mp4", 4)
+    assert_eq(cmd[cmd.index("-start_number") + 1], "330")
+    assert_eq(cmd[cmd.index("-frames:v") + 1], "1340")
+    assert_eq(cmd[cmd.index("-g") + 1], "60")
+    assert_eq(cmd[-1], "/tmp/act1.mp4")
+
+
+# ──────────────────────────────────────────────
+# Cache keys
+# ──────────────────────────────────────────────
+
+@test
+def test_segment_key_changes_only_with_its_frames():
+    """Editing a frame changes its segment's key and no other."""
+    frames_dir = tempfile.mkdtemp()
+    for frame in range(1, 11):
+        with open(frame_path(frames_dir, frame), "wb") as f:
+            f.write(b"frame %d" % frame)
+    first, second = segment_key(frames_dir, 1, 5, 30), segment_key(frames_dir, 6, 10, 30)
+    with open(frame_path(frames_dir, 7), "wb") as f:
+        f.write(b"edited")
+    assert_eq(segment_key(frames_dir, 1, 5, 30), first)
+    assert_true(segment_key(frames_dir, 6, 10, 30) != second)
+    # The frame rate is part of the encode, so part of the key
+    assert_true(segment_key(frames_dir, 1, 5, 24) != first)
@@ -0,0 +1,28 @@
+"""
+Tests for scripts/utils/spatial.py — axis-sorted range queries.
+"""
+from tests.run_tests import test, assert_eq
+
+from scripts.utils.spatial import build_axis_index, range_bounds, query_range
+
+
+# ──────────────────────────────────────────────
+# Range queries
+# ──────────────────────────────────────────────
+
+@test
+def test_query_range_is_inclusive_and_sorted():
+    """Items on either edge of the window are included, in coordinate order."""
+    index = build_axis_index([("c", 3.0), ("a", 1.0), ("d", 4.0), ("b", 2.0)], key=lambda t: t[1])
+    assert_eq([name for name, _ in query_range(index, 2.0, 3.0)], ["b", "c"])
+    assert_eq(query_range(index, 10.0, 20.0), [])
+
+
+@test
+def test_range_bounds_match_a_linear_scan():
+    """Bisected bounds select exactly the items a full scan would."""
+    xs = [(i * 7919) % 101 * 0.5 for i in range(200)]
+    index = build_axis_index(xs, key=lambda x: x)
+    for low in (-1.0, 0.0, 12.5, 49.0):
+        start, stop = range_bounds(index, low, low + 10.0)
+        assert_eq(index["items"][start:stop], sorted(x for x in xs if low <= x <= low + 10.0))
@@ -0,0 +1,64 @@
+"""
+Tests for scripts/utils/swarm.py — vectorised crowd simulation.
+"""
+import numpy as np
+from tests.run_tests import test, assert_eq, assert_true, assert_gt
+
+from scripts.utils.swarm import (
+    neighbour_pairs, create_swarm, step_swarm, simulate_swarm,
+)
+
+
+# ──────────────────────────────────────────────
+# Neighbours
+# ──────────────────────────────────────────────
+
+@test
+def test_neighbour_pairs_match_brute_force():
+    """The grid finds exactly the pairs a full comparison does, each once."""
+    rng = np.random.default_rng(3)
+    points = rng.uniform(-3, 3, (300, 2))
+    points[:50] = np.round(points[:50], 1)   # some on cell edges, some duplicated
+    i, j, offset, _ = neighbour_pairs(points, 0.4)
+    found = sorted(tuple(sorted(pair)) for pair in zip(i.tolist(), j.tolist()))
+    expected = [
+        (a, b) for a in range(300) for b in range(a + 1, 300)
+        if np.hypot(*(points[a] - points[b])) < 0.4
+    ]
+    assert_eq(found, expected)
+    assert_true(np.allclose(offset, points[j] - points[i]))
+
+
+# ──────────────────────────────────────────────
+# Simulation
+# ──────────────────────────────────────────────
+
+@test
+def test_separation_and_obstacles_push_agents_away():
+    """Two crowded agents drift apart; an obstacle clears its disc."""
+    swarm = create_swarm([(0.0, 0.0), (0.05, 0.0)], cohesion=0.0, alignment=0.0)
+    for _ in range(20):
+        step_swarm(swarm)
+    assert_gt(swarm["position"][1, 0] - swarm["position"][0, 0], 0.05)
+
+    swarm = create_swarm([(0.3, 0.0), (-0.2, 0.1)], cohesion=0.0, alignment=0.0, home=0.0)
+    for _ in range(100):
+        step_swarm(swarm, obstacles=[(0.0, 0.0, 1.0)])
+    assert_gt(np.hypot(swarm["position"][:, 0], swarm["position"][:, 1]).min(), 0.9)
+
+
+@test
+def test_wrapping_stays_in_window_and_unwrapped_x_is_continuous():
+    """Simulated X stays inside the scrolling window; sampled X never jumps."""
+    rng = np.random.default_rng(5)
+    swarm = create_swarm(rng.uniform(-2, 2, (200, 2)))
+    frames, samples = simulate_swarm(
+        swarm, 1, 200, window_at=lambda f: (f * 0.05 - 2.0, 4.0), step=2, sample=10,
+    )
+    assert_eq(frames[0], 1)
+    assert_eq(frames[-1], 200)
+    # The last step ran from frame 199, in that frame's window
+    left = 199 * 0.05 - 2.0
+    x = swarm["position"][:, 0]
+    assert_true(((x >= left) & (x < left + 4.0)).all())
+    assert_true(np.abs(np.diff(samples[:, :, 0], axis=0)).max() < 1.0)
@@ -0,0 +1,76 @@
+"""
+Tests for scripts/utils/video_stream.py — encoding frames as they render.
+"""
+import os
+import queue
+import tempfile
+from tests.run_tests import test, assert_eq, assert_true, assert_false
+
+from scripts.utils.video_stream import feed_frame, png_complete, _PNG_END
+
+
+def _stream(frame_start, frame_end):
+    """A stream without an ffmpeg process, to watch what feed_frame() queues."""
+    return {
+        "next": frame_start, "end": frame_end, "pending": {},
+        "queue": queue.Queue(), "delivered": set(),
+    }
+
+
+def _queued(stream):
+    paths = []
+    while not stream["queue"].empty():
+        paths.append(stream["queue"].get())
+    return paths
+
+
+# ──────────────────────────────────────────────
+# Ordering
+# ──────────────────────────────────────────────
+
+@test
+def test_feed_frame_writes_in_frame_order():
+    """Early frames wait until every earlier frame has arrived."""
+    stream = _stream(1, 5)
+    feed_frame(stream, 3, "3.png")
+    feed_frame(stream, 2, "2.png")
+    assert_eq(_queued(stream), [])
+    feed_frame(stream, 1, "1.png")
+    assert_eq(_queued(stream), ["1.png", "2.png", "3.png"])
+    feed_frame(stream, 5, "5.png")
+    feed_frame(stream, 4, "4.png")
+    assert_eq(_queued(stream), ["4.png", "5.png"])
+    assert_eq(stream["next"], 6)
+    assert_eq(stream["delivered"], {1, 2, 3, 4, 5})
+
+
+@test
+def test_feed_frame_ignores_repeats_and_strays():
+    """Frames already written, already buffered or outside the range are dropped."""
+    stream = _stream(10, 12)
+    feed_frame(stream, 10, "a.png")
+    feed_frame(stream, 10, "b.png")
+    feed_frame(stream, 12, "c.png")
+    feed_frame(stream, 12, "d.png")
+    feed_frame(stream, 13, "e.png")
+    feed_frame(stream, 9, "f.png")
+    assert_eq(_queued(stream), ["a.png"])
+    assert_eq(stream["pending"], {12: "c.png"})
+
+
+# ──────────────────────────────────────────────
+# Following a frame directory
+# ──────────────────────────────────────────────
+
+@test
+def test_png_complete_needs_the_end_chunk():
+    """A PNG counts as written only once its IEND trailer is on disk."""
+    frames_dir = tempfile.mkdtemp()
+    path = os.path.join(frames_dir, "0001.png")
+    assert_false(png_complete(path))
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n" + b"\x00" * 32)
+    assert_false(png_complete(path))
+    with open(path, "ab") as f:
+        f.write(_PNG_END)
+    assert_true(png_complete(path))
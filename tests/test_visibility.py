@@ -0,0 +1,82 @@
+"""
+Tests for scripts/utils/visibility.py — keyed render visibility.
+"""
+import bpy
+from tests.run_tests import test, assert_eq, assert_true, assert_false
+
+from scripts.utils.scene import reset_scene, setup_ortho_camera
+from scripts.utils.keying import reset_key_gate, insert_key
+from scripts.utils.materials import create_emission_material, assign_material
+from scripts.utils.primitives import create_primitive
+from scripts.utils.visibility import hidden_intervals, key_render_visibility
+
+
+def _square(name, strength=1.0):
+    obj = create_primitive(name, "plane", 1.0)
+    assign_material(obj, create_emission_material(f"{name}Mat", strength=strength))
+    return obj
+
+
+# ──────────────────────────────────────────────
+# Hidden intervals
+# ──────────────────────────────────────────────
+
+@test
+def test_parked_object_is_hidden_until_it_enters_view():
+    """An object parked far off to the side is hidden until it moves into view."""
+    reset_scene()
+    reset_key_gate()
+    camera = setup_ortho_camera(ortho_scale=20)
+    obj = _square("Parked")
+    insert_key(obj, "location", (-60, 0, 0), 1)
+    insert_key(obj, "location", (-60, 0, 0), 10)
+    insert_key(obj, "location", (0, 0, 0), 11)
+    assert_eq(hidden_intervals(obj, camera, 1, 20, aspect=9 / 16), [(1, 10)])
+
+
+@test
+def test_faded_and_shrunk_frames_are_hidden():
+    """Zero emission or zero scale counts as unseen even in the middle of the view."""
+    reset_scene()
+    reset_key_gate()
+    camera = setup_ortho_camera(ortho_scale=20)
+    mat_obj = _square("Faded")
+    emission = mat_obj.active_material.node_tree.nodes["Emission"].inputs["Strength"]
+    insert_key(emission, "default_value", 1.0, 1)
+    insert_key(emission, "default_value", 0.0, 5)
+    insert_key(emission, "default_value", 0.0, 10)
+    assert_eq(hidden_intervals(mat_obj, camera, 1, 10, aspect=9 / 16), [(5, 10)])
+
+    shrunk = _square("Shrunk")
+    insert_key(shrunk, "scale", (0, 0, 0), 1)
+    insert_key(shrunk, "scale", (0, 0, 0), 3)
+    insert_key(shrunk, "scale", (1, 1, 1), 4)
+    assert_eq(hidden_intervals(shrunk, camera, 1, 10, aspect=9 / 16), [(1, 3)])
+
+
+# ──────────────────────────────────────────────
+# Keying
+# ──────────────────────────────────────────────
+
+@test
+def test_key_render_visibility_switches_on_exact_frames():
+    """hide_render is on inside the unseen stretch and off either side of it."""
+    reset_scene()
+    reset_key_gate()
+    camera = setup_ortho_camera(ortho_scale=20)
+    obj = _square("Visitor")
+    for f, x in ((1, 0), (10, 0), (11, 60), (20, 60), (21, 0), (30, 0)):
+        insert_key(obj, "location", (x, 0, 0), f)
+
+    hidden, intervals = key_render_visibility(camera, [obj], 1, 30)
+    assert_eq((hidden, intervals), (1, 1))
+    scene = bpy.context.scene
+    for frame, expected in ((10, False), (11, True), (20, True), (21, False)):
+        scene.frame_set(frame)
+        assert_eq(obj.hide_render, expected, f"frame {frame}")
+    assert_false(obj.hide_render)
+
+    # Running again replaces the keys rather than adding to them
+    key_render_visibility(camera, [obj], 1, 30)
+    scene.frame_set(15)
+    assert_true(obj.hide_render)
@@ -0,0 +1,155 @@
+"""
+Tests for scripts/utils/workbench.py — flat Workbench colours from emission.
+"""
+import os
+import tempfile
+
+import bpy
+from tests.run_tests import test, assert_eq, assert_true, assert_near
+
+from scripts.utils.scene import reset_scene, setup_world_color, setup_ortho_camera
+from scripts.utils.keying import reset_key_gate, insert_key
+from scripts.utils.materials import (
+    create_emission_material, create_attribute_emission_material,
+    set_emission_attributes, assign_material,
+)
+from scripts.utils.primitives import create_primitive
+from scripts.utils.instancing import create_point_carrier, new_geometry_tree, node, add_geometry_nodes
+from scripts.utils.workbench import (
+    use_workbench_flat, compare_images, compare_engines, FLAT_STRENGTH_PROPERTY,
+)
+
+
+def _color_at(obj, frame):
+    bpy.context.scene.frame_set(frame)
+    return list(obj.color)
+
+
+# ──────────────────────────────────────────────
+# Conversion
+# ──────────────────────────────────────────────
+
+@test
+def test_keyed_emission_becomes_keyed_object_colour():
+    """Object colour is emission colour × strength, following the material's keys."""
+    reset_scene()
+    reset_key_gate()
+    obj = create_primitive("Pulse", "plane", 1.0)
+    mat = create_emission_material("PulseMat", color=(0.5, 0.5, 0.5, 1.0), strength=2.0)
+    assign_material(obj, mat)
+    strength = mat.node_tree.nodes["Emission"].inputs["Strength"]
+    insert_key(strength, "default_value", 2.0, 1)
+    insert_key(strength, "default_value", 0.0, 11)
+
+    assert_eq(use_workbench_flat(), 1)
+    assert_eq(bpy.context.scene.render.engine, 'BLENDER_WORKBENCH')
+    assert_eq(bpy.context.scene.display.shading.color_type, 'OBJECT')
+    assert_near(_color_at(obj, 1)[0], 1.0)
+    assert_near(_color_at(obj, 6)[0], 0.5)
+    assert_near(_color_at(obj, 11)[0], 0.0)
+
+
+@test
+def test_attribute_material_reads_the_objects_own_emission():
+    """Objects sharing an attribute material each get their own colour."""
+    reset_scene()
+    reset_key_gate()
+    shared = create_attribute_emission_material("SharedMat")
+    dim, bright = create_primitive("Dim", "plane", 1.0), create_primitive("Bright", "plane", 1.0)
+    for obj, gray in ((dim, 0.2), (bright, 0.8)):
+        set_emission_attributes(obj, color=(gray, gray, gray, 1.0), strength=0.5)
+        assign_material(obj, shared)
+
+    use_workbench_flat()
+    assert_near(dim.color[0], 0.1)
+    assert_near(bright.color[0], 0.4)
+
+
+@test
+def test_field_gets_mean_colour_and_flat_strength():
+    """An instanced field takes its points' average colour × its flat strength."""
+    reset_scene()
+    reset_key_gate()
+    field = create_point_carrier("Field", [(0, 0, 0), (1, 0, 0)], {
+        "emission_color": [(0.2, 0.2, 0.2, 1.0), (0.4, 0.4, 0.4, 1.0)],
+    })
+    tree, group_in, group_out = new_geometry_tree("FieldNodes")
+    material = create_attribute_emission_material("FieldMat", attribute_type='INSTANCER')
+    square = node(tree, 'GeometryNodeMeshGrid', {"Size X": 0.1, "Size Y": 0.1})
+    shaped = node(tree, 'GeometryNodeSetMaterial', {"Geometry": square.outputs["Mesh"], "Material": material})
+    instances = node(tree, 'GeometryNodeInstanceOnPoints',
+                     {"Points": group_in.outputs[0], "Instance": shaped.outputs[0]})
+    tree.links.new(instances.outputs[0], group_out.inputs[0])
+    add_geometry_nodes(field, tree)
+    field[FLAT_STRENGTH_PROPERTY] = 0.5
+
+    use_workbench_flat()
+    assert_near(field.color[0], 0.15)
+    # Unlit instances are removed rather than drawn in the field's colour
+    assert_true(any(n.bl_idname == 'GeometryNodeDeleteGeometry' for n in tree.nodes))
+    use_workbench_flat()
+    assert_eq(sum(n.bl_idname == 'GeometryNodeDeleteGeometry' for n in tree.nodes), 1)
+
+
+@test
+def test_world_colour_follows_background():
+    """The Workbench background is the world's Background colour × strength."""
+    reset_scene()
+    setup_world_color(color=(0.1, 0.2, 0.3, 1.0))
+    use_workbench_flat()
+    assert_near(bpy.context.scene.world.color[2], 0.3)
+
+
+# ──────────────────────────────────────────────
+# Comparison
+# ──────────────────────────────────────────────
+
+@test
+def test_compare_images_counts_pixels_over_tolerance():
+    """Identical images match; a changed pixel shows up in max and share over tolerance."""
+    directory = tempfile.mkdtemp()
+    paths = []
+    for name, corner in (("a", 0.0), ("b", 0.5)):
+        image = bpy.data.images.new(name, 2, 2)
+        pixels = [0.0, 0.0, 0.0, 1.0] * 4
+        pixels[0:3] = [corner] * 3
+        image.pixels = pixels
+        image.filepath_raw = os.path.join(directory, f"{name}.png")
+        image.file_format = 'PNG'
+        image.save()
+        bpy.data.images.remove(image)
+        paths.append(os.path.join(directory, f"{name}.png"))
+
+    same = compare_images(paths[0], paths[0])
+    assert_eq((same["max"], same["over"]), (0.0, 0.0))
+    changed = compare_images(paths[0], paths[1])
+    assert_true(changed["max"] > 0.3)
+    assert_near(changed["over"], 0.25)
+
+
+@test
+def test_compare_engines_on_a_keyed_scene():
+    """A converted keyed emission scene renders the same in Workbench as in EEVEE."""
+    reset_scene()
+    reset_key_gate()
+    scene = bpy.context.scene
+    scene.render.resolution_x, scene.render.resolution_y = 160, 90
+    scene.render.resolution_percentage = 100
+    scene.render.filter_size = 0.0
+    scene.eevee.taa_render_samples = 1
+    setup_world_color(color=(0.0, 0.0, 0.0, 1.0))
+    # 10 pixels per unit with the centre on a pixel corner, so edges fall between pixels
+    setup_ortho_camera(ortho_scale=16)
+    obj = create_primitive("Card", "plane", 2.0)
+    mat = create_emission_material("CardMat", color=(0.6, 0.4, 0.2, 1.0), strength=1.0)
+    assign_material(obj, mat)
+    strength = mat.node_tree.nodes["Emission"].inputs["Strength"]
+    insert_key(strength, "default_value", 1.0, 1)
+    insert_key(strength, "default_value", 0.4, 11)
+
+    use_workbench_flat(antialiasing='OFF')
+    results = compare_engines([1, 6, 11])
+    assert_eq(scene.render.engine, 'BLENDER_WORKBENCH', "The scene's engine is put back")
+    for frame, result in results.items():
+        assert_true(result["passed"], f"Frame {frame}: {result['over']:.2%} of pixels over tolerance")
+